@@ -24,6 +24,7 @@ from .endpoints.chat.chat_router import router as chat_router
 from .endpoints.search.search_router import router as search_router
 from .endpoints.summary.summary_router import router as summary_router
 from .endpoints.tradingview.tradingview_router import router as tradingview_router
+from .endpoints.diagnostics.diagnostics_router import router as diagnostics_router
 
 # Well-known endpoints for MCP compatibility
 from .endpoints.well_known.well_known_router import router as well_known_router
@@ -70,6 +71,7 @@ api_router.include_router(chat_router, prefix="/chat", tags=["Chat"])
 api_router.include_router(search_router, prefix="/search", tags=["Search"])
 api_router.include_router(summary_router, prefix="/summary", tags=["Summary"])
 api_router.include_router(tradingview_router, prefix="/tradingview", tags=["TradingView"])
+api_router.include_router(diagnostics_router, prefix="/diagnostics", tags=["Diagnostics"])
 
 # Well-known endpoints for MCP compatibility
 api_router.include_router(well_known_router, prefix="", tags=["Well-Known"])
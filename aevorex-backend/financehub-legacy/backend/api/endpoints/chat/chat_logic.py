@@ -10,7 +10,9 @@ import json
 from typing import Optional, Dict, Any
 from fastapi import HTTPException
 
+from backend.config import settings
 from backend.config.model_catalogue import get_models_response, resolve_model
+from backend.core.ai.stream_relay import relay_sse
 from backend.api.endpoints.chat.schemas import ChatRequest, ChatResponse
 from backend.api.endpoints.chat.provider import OpenRouterProvider
 from backend.core.services.chat_tools import ChatTools, execute_tool
@@ -238,19 +240,12 @@ If the user asks about market hours, trading status, or exchange schedules, use
                 "content": system_message
             })
             
-            # Stream response
-            async def generate():
-                try:
-                    async for chunk in self.provider.stream(messages, model):
-                        yield f"data: {json.dumps({'content': chunk})}\n\n"
-                    yield "data: [DONE]\n\n"
-                except Exception as e:
-                    logger.error(f"Stream error: {e}")
-                    yield f"data: {json.dumps({'error': f'Stream failed: {str(e)}'})}\n\n"
-                    yield "data: [DONE]\n\n"
-            
+            # Stream response – deltas are coalesced into pre-encoded frames
             from fastapi.responses import StreamingResponse
-            return StreamingResponse(generate(), media_type="text/event-stream")
+            return StreamingResponse(
+                relay_frames(self.provider.stream(messages, model)),
+                media_type="text/event-stream",
+            )
             
         except Exception as e:
             logger.error(f"Deep chat error: {e}")
@@ -318,6 +313,18 @@ If the user asks about market hours, trading status, or exchange schedules, use
             logger.error(f"Rapid chat streaming failed: {e}", exc_info=True)
             raise
 
+def relay_frames(deltas, frame_prefix: bytes = b'data: {"content": ', **kwargs):
+    """Wrap an upstream delta iterator in the configured SSE relay."""
+    return relay_sse(
+        deltas,
+        frame_prefix=frame_prefix,
+        flush_interval=settings.AI.STREAM_FLUSH_INTERVAL_MS / 1000.0,
+        max_buffer_chars=settings.AI.STREAM_MAX_FRAME_CHARS,
+        max_queue=settings.AI.STREAM_MAX_QUEUE,
+        **kwargs,
+    )
+
+
 # Create global instance
 chat_logic = ChatLogic()
 
@@ -344,5 +351,46 @@ async def handle_deep_chat(request, cache_service=None, tier: str = "free"):
     """
     return await chat_logic.handle_deep_chat(request, cache_service, tier)
 
+def _deep_messages(ticker: str, message: str) -> list[dict]:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are an expert financial analyst providing deep, comprehensive "
+                f"analysis. The user is asking about {ticker}."
+            ),
+        },
+        {"role": "user", "content": message},
+    ]
+
+
+async def generate_deep_chat(ticker: str, message: str, model_id: str):
+    """Non-streaming deep analysis (used by the deep chat handler)."""
+    return await chat_logic.provider.generate(_deep_messages(ticker, message), model_id)
+
+
+def stream_deep_chat(ticker: str, message: str, model_id: str):
+    """Deep analysis as ready-to-send SSE frames in the handler's typed format.
+
+    Frames are `data: {"type": "token", "content": ...}` bytes; the caller
+    relays them as-is, with no re-parsing.
+    """
+    return relay_frames(
+        chat_logic.provider.stream(_deep_messages(ticker, message), model_id),
+        frame_prefix=b'data: {"type": "token", "content": ',
+        error_frame_prefix=b'data: {"type": "error", "message": ',
+        done_frame=None,
+    )
+
+
 # Export functions to module namespace for chat_router import
-__all__ = ["get_models_response", "handle_rapid_chat", "handle_deep_chat", "generate_rapid_chat", "stream_rapid_chat"]
\ No newline at end of file
+__all__ = [
+    "get_models_response",
+    "handle_rapid_chat",
+    "handle_deep_chat",
+    "generate_rapid_chat",
+    "stream_rapid_chat",
+    "generate_deep_chat",
+    "stream_deep_chat",
+    "relay_frames",
+]
\ No newline at end of file
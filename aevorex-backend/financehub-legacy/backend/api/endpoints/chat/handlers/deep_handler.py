@@ -21,9 +21,11 @@ logger = get_logger(__name__)
 
 
 # --- Helper: Standardized SSE Payload ---
-def _sse_frame(event_type: str, **kwargs) -> str:
+# Control frames are bytes like the relayed token frames, so EventSourceResponse
+# writes them verbatim instead of wrapping them in another `data:` line.
+def _sse_frame(event_type: str, **kwargs) -> bytes:
     payload = {"type": event_type, **kwargs}
-    return f"data: {json.dumps(payload)}\n\n"
+    return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
 
 
 # --- Main Deep Handler ---
@@ -95,37 +97,14 @@ async def _handle_deep_stream(
 ) -> EventSourceResponse:
     """Handle streaming deep chat."""
     
-    async def event_generator() -> AsyncGenerator[str, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         try:
             # Send initial event
             yield _sse_frame("start", ticker=ticker, model=model_id, type="deep_analysis")
             
-            # Get streaming response
-            streaming_response = await stream_deep_chat(ticker, message, model_id)
-            
-            # Process streaming response
-            async for chunk in streaming_response.body_iterator:
-                if chunk:
-                    try:
-                        # Parse SSE data
-                        chunk_str = chunk.decode('utf-8')
-                        if chunk_str.startswith("data: "):
-                            data_str = chunk_str[6:]  # Remove "data: " prefix
-                            if data_str.strip() == "[DONE]":
-                                yield _sse_frame("end")
-                                break
-                            
-                            # Parse JSON data
-                            data = json.loads(data_str)
-                            if "content" in data:
-                                yield _sse_frame("token", content=data["content"])
-                            elif "error" in data:
-                                yield _sse_frame("error", message=data["error"])
-                    except json.JSONDecodeError:
-                        continue
-                    except Exception as e:
-                        logger.warning(f"Error processing chunk: {e}")
-                        continue
+            # Relay pre-encoded token frames straight through (no re-parse)
+            async for frame in stream_deep_chat(ticker, message, model_id):
+                yield frame
             
             yield _sse_frame("end")
             
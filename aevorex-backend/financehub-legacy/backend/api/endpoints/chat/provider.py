@@ -3,13 +3,13 @@ OpenRouter Provider
 Handles LLM API calls through OpenRouter.
 """
 
-import json
 import logging
 from typing import Dict, List, AsyncGenerator
 from fastapi import HTTPException
 
 from backend.utils.logger_config import get_logger
 from backend.config.model_catalogue import resolve_model
+from backend.core.ai.stream_relay import StreamDone, extract_delta_content
 from .schemas import ChatResponse
 
 logger = get_logger(__name__)
@@ -110,22 +110,14 @@ class OpenRouterProvider:
                         raise HTTPException(status_code=401, detail="Invalid or unauthorized OpenRouter API key")
                     response.raise_for_status()
                     async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]  # Remove "data: " prefix
-                            if data_str.strip() == "[DONE]":
-                                break
-                            try:
-                                chunk = json.loads(data_str)
-                                if "choices" in chunk and len(chunk["choices"]) > 0:
-                                    delta = chunk["choices"][0].get("delta", {})
-                                    if "content" in delta:
-                                        yield delta["content"]
-                            except json.JSONDecodeError as jde:
-                                error_payload = {"error": f"JSON decode error: {str(jde)}", "raw": data_str}
-                                logger.error(f"OpenRouter stream JSON decode error: {jde} - Raw data: {data_str}")
-                                yield f"data: {json.dumps(error_payload)}\n\n"
+                        try:
+                            delta = extract_delta_content(line)
+                        except StreamDone:
+                            break
+                        if delta:
+                            yield delta
             except HTTPException:
                 raise
             except Exception as e:
                 logger.error(f"OpenRouter stream error: {e}. Payload: {payload}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                raise
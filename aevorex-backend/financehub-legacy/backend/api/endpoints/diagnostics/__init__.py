@@ -0,0 +1,11 @@
+"""
+Diagnostics API domain package.
+
+Admin-only runtime diagnostics:
+- Event-loop stall history (with captured stacks)
+- On-demand sampling profiler (folded stacks for flamegraphs)
+"""
+
+from .diagnostics_router import router
+
+__all__ = ["router"]
@@ -0,0 +1,102 @@
+"""
+Diagnostics API Router
+Admin-only endpoints for finding event-loop blockers under production load.
+
+Authentication is the `X-Admin-Key` header (settings.SUBSCRIPTION.ADMIN_API_KEY);
+without a configured key the endpoints answer 404.
+"""
+
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from backend.config import settings
+from backend.core.metrics.loop_diagnostics import (
+    ProfilerBusyError,
+    get_loop_stall_detector,
+    render_folded,
+)
+from backend.core.performance.executors import executor_stats
+from backend.utils.logger_config import get_logger
+
+router = APIRouter()
+
+logger = get_logger(__name__)
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)) -> None:
+    expected = settings.SUBSCRIPTION.ADMIN_API_KEY
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key"
+        )
+
+
+@router.get(
+    "/loop/stalls",
+    summary="Recent event-loop stalls",
+    dependencies=[Depends(require_admin_key)],
+)
+async def get_loop_stalls():
+    """
+    Returns the most recent event-loop stalls, newest first, each with the
+    route of the blocking task and the loop thread's stack at detection time.
+    """
+    return JSONResponse(
+        content={"status": "success", "data": get_loop_stall_detector().snapshot()}
+    )
+
+
+@router.get(
+    "/executors",
+    summary="Managed executor pool stats",
+    dependencies=[Depends(require_admin_key)],
+)
+async def get_executor_stats():
+    """
+    Returns per-pool limits, in-flight / queued calls and outcome counters
+    (completed, failed, timeouts, rejected, cancelled, abandoned).
+    """
+    return JSONResponse(content={"status": "success", "data": executor_stats()})
+
+
+@router.get(
+    "/profile",
+    summary="Sample the event loop (folded stacks)",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin_key)],
+)
+async def profile_event_loop(
+    seconds: float = Query(5.0, gt=0, description="Sampling duration"),
+    interval_ms: Optional[float] = Query(
+        None, gt=0, description="Sampling interval (default from settings)"
+    ),
+    all_threads: bool = Query(False, description="Sample every thread, not just the loop"),
+    include_idle: bool = Query(False, description="Keep samples of the idle loop"),
+):
+    """
+    Samples stacks for `seconds` and returns them in the folded format
+    (`frame;frame;frame count`) read by flamegraph.pl, speedscope and
+    Pyroscope.
+    """
+    cfg = settings.DIAGNOSTICS
+    seconds = min(seconds, cfg.PROFILER_MAX_SECONDS)
+    interval = (interval_ms or cfg.PROFILER_INTERVAL_MS) / 1000
+    try:
+        counts = await get_loop_stall_detector().profile(
+            seconds, interval, all_threads=all_threads, include_idle=include_idle
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    logger.info(
+        f"Profiled {seconds}s at {interval * 1000:.1f}ms: "
+        f"{sum(counts.values())} samples, {len(counts)} stacks"
+    )
+    return PlainTextResponse(
+        render_folded(counts),
+        headers={"Content-Disposition": "inline; filename=profile.folded"},
+    )
@@ -6,8 +6,8 @@ Handles company overview, financial statements, ratios, and earnings data.
 """
 
 from typing import Dict, Any, Optional
-import asyncio
 import time
+from backend.core.performance.executors import YFINANCE, run_blocking
 from backend.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -28,9 +28,8 @@ class YahooService:
             import yfinance as yf
             
             # Run yfinance in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            ticker = await loop.run_in_executor(None, yf.Ticker, symbol)
-            info = await loop.run_in_executor(None, getattr, ticker, 'info')
+            ticker = await run_blocking(YFINANCE, yf.Ticker, symbol)
+            info = await run_blocking(YFINANCE, getattr, ticker, 'info')
             
             if not info or 'symbol' not in info:
                 logger.warning(f"No overview data found for {symbol}")
@@ -77,13 +76,12 @@ class YahooService:
         try:
             import yfinance as yf
             
-            loop = asyncio.get_event_loop()
-            ticker = await loop.run_in_executor(None, yf.Ticker, symbol)
+            ticker = await run_blocking(YFINANCE, yf.Ticker, symbol)
             
             # Get financial statements
-            financials = await loop.run_in_executor(None, getattr, ticker, 'financials')
-            balance_sheet = await loop.run_in_executor(None, getattr, ticker, 'balance_sheet')
-            cashflow = await loop.run_in_executor(None, getattr, ticker, 'cashflow')
+            financials = await run_blocking(YFINANCE, getattr, ticker, 'financials')
+            balance_sheet = await run_blocking(YFINANCE, getattr, ticker, 'balance_sheet')
+            cashflow = await run_blocking(YFINANCE, getattr, ticker, 'cashflow')
             
             # Get latest annual data (most recent year)
             latest_financials = financials.iloc[0].to_dict() if not financials.empty else {}
@@ -136,9 +134,8 @@ class YahooService:
         try:
             import yfinance as yf
             
-            loop = asyncio.get_event_loop()
-            ticker = await loop.run_in_executor(None, yf.Ticker, symbol)
-            info = await loop.run_in_executor(None, getattr, ticker, 'info')
+            ticker = await run_blocking(YFINANCE, yf.Ticker, symbol)
+            info = await run_blocking(YFINANCE, getattr, ticker, 'info')
             
             if not info:
                 logger.warning(f"No ratio data found for {symbol}")
@@ -202,9 +199,8 @@ class YahooService:
         try:
             import yfinance as yf
             
-            loop = asyncio.get_event_loop()
-            ticker = await loop.run_in_executor(None, yf.Ticker, symbol)
-            info = await loop.run_in_executor(None, getattr, ticker, 'info')
+            ticker = await run_blocking(YFINANCE, yf.Ticker, symbol)
+            info = await run_blocking(YFINANCE, getattr, ticker, 'info')
             
             if not info:
                 logger.warning(f"No earnings data found for {symbol}")
@@ -248,9 +244,8 @@ class YahooService:
         try:
             import yfinance as yf
             
-            loop = asyncio.get_event_loop()
-            ticker = await loop.run_in_executor(None, yf.Ticker, symbol)
-            info = await loop.run_in_executor(None, getattr, ticker, 'info')
+            ticker = await run_blocking(YFINANCE, yf.Ticker, symbol)
+            info = await run_blocking(YFINANCE, getattr, ticker, 'info')
             
             if not info:
                 logger.warning(f"No baseline data found for {symbol}")
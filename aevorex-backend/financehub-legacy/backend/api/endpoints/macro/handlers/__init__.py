@@ -9,6 +9,7 @@ Contains specialized handlers for different types of macroeconomic data:
 - Fed Series: FRED time series observations
 - Fed Search: FRED data search functionality
 - ECB: European Central Bank dataflows and SDMX integration
+- Snapshot: Precomputed macro dashboard bundle (all headline indicators)
 """
 
 __all__ = []
@@ -7,15 +7,26 @@ ECB yield curve endpoints are available under /ecb/yield-curve/*.
 Available endpoints:
 - /curve/ust - US Treasury yield curve data
 - /curve/compare - Compare ECB vs UST yield curves with mathematical analysis
+- /curve/surface - ECB / UST curve history as a dates x maturities matrix with spreads, PCA and inversions
 """
 
 from fastapi import APIRouter, Depends, Query, status
 from fastapi.responses import JSONResponse
+from datetime import date
+from typing import Optional
 import logging
+import numpy as np
 from backend.core.services.macro.macro_service import MacroDataService, get_macro_service
 from backend.api.endpoints.macro.services.curve_service import CurveService
 from backend.api.endpoints.shared.response_builder import StandardResponseBuilder, MacroProvider, CacheStatus
 from backend.utils.cache_service import CacheService
+from backend.core.warehouse.curves import (
+    PCA_FACTORS,
+    SAMPLE_FREQUENCIES,
+    SPREADS,
+    CurveUnavailableError,
+    get_curve_surface_service,
+)
 from .ecb_handler import get_ecb_yield_curve
 
 router = APIRouter(
@@ -24,6 +35,8 @@ router = APIRouter(
 
 logger = logging.getLogger(__name__)
 
+SURFACE_ANALYTICS = ("spreads", "pca", "inversions")
+
 
 
 @router.get("/ust", summary="US Treasury Yield Curve")
@@ -275,6 +288,92 @@ async def compare_yield_curves(
         return JSONResponse(content=error_response, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@router.get("/surface", summary="Yield Curve Surface with Spreads, PCA and Inversions")
+async def get_curve_surface(
+    provider: MacroProvider = Query(MacroProvider.UST, description="Curve: ecb (AAA spot curve) or ust (Treasury par curve)"),
+    start_date: Optional[date] = Query(None, description="First date (default: full history)"),
+    end_date: Optional[date] = Query(None, description="Last date (default: latest curve)"),
+    maturities: Optional[str] = Query(None, description="Comma-separated maturities, e.g. 3M,2Y,10Y (default: all)"),
+    frequency: str = Query("d", description="d (every curve), w or m (last curve of each week / month)"),
+    analytics: str = Query(",".join(SURFACE_ANALYTICS), description="Comma-separated: spreads, pca, inversions (empty for the matrix only)"),
+    spreads: str = Query(",".join(SPREADS), description=f"Comma-separated spreads among {', '.join(SPREADS)}"),
+) -> dict:
+    """
+    The curve history as one dense matrix: `yields[i][j]` is the yield (percent)
+    of `maturities[j]` on `dates[i]` (null where not published). Spreads are in
+    basis points, aligned with `dates`; PCA runs on the returned curves and
+    inversion episodes are found on the daily curves of the window.
+    """
+    requested = [a.strip().lower() for a in analytics.split(",") if a.strip()]
+    spread_names = [name.strip().lower() for name in spreads.split(",") if name.strip()]
+    unknown = [a for a in requested if a not in SURFACE_ANALYTICS] + [n for n in spread_names if n not in SPREADS]
+    if provider not in (MacroProvider.ECB, MacroProvider.UST) or frequency not in SAMPLE_FREQUENCIES or unknown:
+        message = (
+            f"Unsupported parameters: {', '.join(unknown)}" if unknown
+            else f"Unsupported provider '{provider.value}' or frequency '{frequency}'"
+        )
+        error_response = StandardResponseBuilder.create_macro_error_response(
+            provider=provider, message=message, error_code="INVALID_PARAMETERS", series_id="CURVE_SURFACE"
+        )
+        return JSONResponse(content=error_response, status_code=status.HTTP_400_BAD_REQUEST)
+
+    service = get_curve_surface_service()
+    try:
+        synced = await service.refresh(provider.value)
+        surface = await service.surface(provider.value)
+    except CurveUnavailableError as e:
+        logger.error(f"Error in get_curve_surface: {e}")
+        error_response = StandardResponseBuilder.create_macro_error_response(
+            provider=provider, message=str(e), error_code="CURVE_FETCH_ERROR", series_id="CURVE_SURFACE"
+        )
+        return JSONResponse(content=error_response, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    window = surface.window(
+        start_date.isoformat() if start_date else None,
+        end_date.isoformat() if end_date else None,
+        maturities.split(",") if maturities else None,
+    )
+    sampled = window.sample(frequency)
+    data = {
+        "maturities": list(sampled.maturities),
+        "maturity_years": [round(float(y), 4) for y in sampled.years],
+        "dates": sampled.dates.astype(str).tolist(),
+        "yields": _json_floats(sampled.yields, 4),
+    }
+    if "spreads" in requested:
+        data["spreads"] = {name: _json_floats(values, 2) for name, values in sampled.spreads(spread_names).items()}
+    if "inversions" in requested:
+        data["inversions"] = window.inversions(window.spreads(spread_names))
+    if "pca" in requested:
+        pca = sampled.pca(len(PCA_FACTORS))
+        data["pca"] = None if pca is None else {
+            "maturities": pca["maturities"],
+            "mean": _json_floats(pca["mean"], 4),
+            "explained_variance": dict(zip(pca["factors"], _json_floats(pca["explained_variance"], 4))),
+            "loadings": dict(zip(pca["factors"], _json_floats(pca["loadings"], 4))),
+            "dates": pca["dates"].astype(str).tolist(),
+            "scores": dict(zip(pca["factors"], _json_floats(pca["scores"].T, 4))),
+        }
+
+    mcp_response = StandardResponseBuilder.create_macro_success_response(
+        provider=provider,
+        data=data,
+        series_id="CURVE_SURFACE",
+        start_date=data["dates"][0] if data["dates"] else None,
+        end_date=data["dates"][-1] if data["dates"] else None,
+        frequency={"d": "daily", "w": "weekly", "m": "monthly"}[frequency],
+        units="percent",
+        cache_status=CacheStatus.FRESH if synced else CacheStatus.CACHED,
+    )
+    return JSONResponse(content=mcp_response, status_code=status.HTTP_200_OK)
+
+
+def _json_floats(values: np.ndarray, digits: int) -> list:
+    """Rounded (nested) list of an array with NaN as None."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), None, np.round(values, digits)).tolist()
+
+
 @router.post("/spot", summary="Calculate Spot Rates from Yield Curve Data")
 async def calculate_spot_rates(
     curve_data: dict
@@ -8,6 +8,8 @@ Available endpoints:
 - /ecb/yield-curve - Complete ECB yield curve data
 - /ecb/yield-curve/latest - Latest ECB yield curve data
 - /ecb/yield-curve/{maturity} - Specific maturity yield
+- /ecb/fx/matrix - Cross-rate matrix of the ECB reference rates
+- /ecb/fx/convert - Batch currency conversion at ECB reference rates
 
 Source: Official ECB website with real-time data.
 """
@@ -18,10 +20,12 @@ from typing import Optional
 import httpx
 import logging
 import asyncio
+import math
 import xml.etree.ElementTree as ET
 import csv
 import io
 from backend.api.endpoints.shared.response_builder import StandardResponseBuilder, MacroProvider, CacheStatus
+from backend.core.warehouse.fx import FxUnavailableError, get_fx_matrix_service
 
 router = APIRouter()
 
@@ -327,4 +331,117 @@ async def get_ecb_yield_curve_maturity(
     )
 
 
+MAX_FX_CONVERSIONS = 1000
+
+
+def _csv(value: str) -> list:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _fx_error(message: str, error_code: str, series_id: str):
+    return StandardResponseBuilder.create_macro_error_response(
+        provider=MacroProvider.ECB,
+        message=message,
+        error_code=error_code,
+        series_id=series_id
+    )
+
+
+@router.get("/fx/matrix", summary="ECB FX Cross-Rate Matrix")
+async def get_ecb_fx_matrix(
+    on: Optional[date] = Query(None, alias="date", description="Rate date (default: latest fixing; earlier fixings are used for non-business days)"),
+    currencies: Optional[str] = Query(None, description="Comma-separated currency codes (default: all ECB reference currencies)"),
+):
+    service = get_fx_matrix_service()
+    try:
+        synced = await service.refresh()
+        block = await service.block()
+    except FxUnavailableError as e:
+        logger.error(f"Error in get_ecb_fx_matrix: {e}")
+        return _fx_error(str(e), "ECB_API_ERROR", "ECB_FX_MATRIX")
+
+    fixing, codes, matrix = block.matrix(on.isoformat() if on else None, _csv(currencies) if currencies else None)
+    if fixing is None:
+        return _fx_error(f"No ECB reference rates for {on}", "FX_RATES_NOT_FOUND", "ECB_FX_MATRIX")
+
+    data = {
+        "currencies": codes,
+        # matrix[i][j] = units of currencies[j] per one unit of currencies[i]
+        "matrix": [[None if value != value else round(float(value), 8) for value in row] for row in matrix],
+        "base": "EUR",
+    }
+    return StandardResponseBuilder.create_macro_success_response(
+        provider=MacroProvider.ECB,
+        data=data,
+        series_id="ECB_FX_MATRIX",
+        date=fixing,
+        frequency="daily",
+        units="cross rate",
+        cache_status=CacheStatus.FRESH if synced else CacheStatus.CACHED,
+    )
+
+
+@router.get("/fx/convert", summary="Batch ECB FX Conversion")
+async def convert_ecb_fx(
+    amounts: str = Query(..., description="Comma-separated amounts"),
+    from_currencies: str = Query(..., alias="from", description="Comma-separated source currencies (one, or one per amount)"),
+    to_currencies: str = Query(..., alias="to", description="Comma-separated target currencies (one, or one per amount)"),
+    dates: Optional[str] = Query(None, description="Comma-separated rate dates (one, or one per amount; default: latest fixing)"),
+):
+    try:
+        values = [float(amount) for amount in _csv(amounts)]
+    except ValueError:
+        return _fx_error("amounts must be numbers", "INVALID_PARAMETER", "ECB_FX_CONVERT")
+    if not all(math.isfinite(value) for value in values):
+        return _fx_error("amounts must be finite numbers", "INVALID_PARAMETER", "ECB_FX_CONVERT")
+    count = len(values)
+    if not 0 < count <= MAX_FX_CONVERSIONS:
+        return _fx_error(f"Between 1 and {MAX_FX_CONVERSIONS} amounts are supported", "INVALID_PARAMETER", "ECB_FX_CONVERT")
+
+    columns = {"from": _csv(from_currencies), "to": _csv(to_currencies), "date": _csv(dates) if dates else None}
+    for name, column in columns.items():
+        if column is not None and len(column) not in (1, count):
+            return _fx_error(f"'{name}' needs one value or one per amount", "INVALID_PARAMETER", "ECB_FX_CONVERT")
+        if column is not None and len(column) == 1:
+            columns[name] = column * count
+    try:
+        days = [date.fromisoformat(day).isoformat() for day in columns["date"]] if columns["date"] else None
+    except ValueError:
+        return _fx_error("dates must be YYYY-MM-DD", "INVALID_PARAMETER", "ECB_FX_CONVERT")
+
+    service = get_fx_matrix_service()
+    try:
+        synced = await service.refresh()
+        block = await service.block()
+    except FxUnavailableError as e:
+        logger.error(f"Error in convert_ecb_fx: {e}")
+        return _fx_error(str(e), "ECB_API_ERROR", "ECB_FX_CONVERT")
+
+    converted = block.convert(values, columns["from"], columns["to"], days)
+    data = {
+        "conversions": [
+            {
+                "amount": amount,
+                "from": source.upper(),
+                "to": target.upper(),
+                # Fixing actually used (the last one on or before the requested date)
+                "date": block.as_of(day),
+                "result": None if result != result else float(result),
+            }
+            for amount, source, target, day, result in zip(
+                values, columns["from"], columns["to"], days or [None] * count, converted
+            )
+        ],
+        "count": count,
+    }
+    return StandardResponseBuilder.create_macro_success_response(
+        provider=MacroProvider.ECB,
+        data=data,
+        series_id="ECB_FX_CONVERT",
+        frequency="daily",
+        units="currency",
+        cache_status=CacheStatus.FRESH if synced else CacheStatus.CACHED,
+    )
+
+
 __all__ = ["router"]
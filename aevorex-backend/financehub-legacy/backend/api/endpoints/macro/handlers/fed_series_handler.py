@@ -11,6 +11,7 @@ Handles economic indicators, observations, historical data, search, and related
 - Related Series: Discover connected series using tag-based relationships
 - Categories: Browse FRED's hierarchical category structure
 - Observations Alias: Alternative nested path for observations
+- Matrix: Several series aligned on one date axis in one request
 
 **Key Economic Data Available:**
 - Monetary Policy: FEDFUNDS, DFEDTARU, DFEDTARL, IORB, EFFR
@@ -135,6 +136,8 @@ async def get_fred_observations(
     frequency: Optional[str] = Query("m", description="Data frequency transformation: 'd'=daily, 'w'=weekly, 'bw'=biweekly, 'm'=monthly, 'q'=quarterly, 'sa'=semiannual, 'a'=annual"),
     units: Optional[str] = Query(None, description="Units transformation: 'lin'=levels, 'chg'=change, 'ch1'=change from year ago, 'pch'=percent change, 'pc1'=percent change from year ago, 'pca'=compounded annual rate of change, 'cch'=continuously compounded rate of change, 'cca'=continuously compounded annual rate of change, 'log'=natural log"),
     limit: Optional[int] = Query(60, ge=1, le=1000, description="Maximum number of observations to return (default: 60, max: 1000)"),
+    aggregation_method: str = Query("avg", regex="^(avg|sum|eop)$", description="Down-sampling method when frequency is coarser than the series: 'avg', 'sum', 'eop' (end of period)"),
+    rolling_window: Optional[int] = Query(None, ge=2, le=520, description="Add rolling_mean, rolling_std and zscore over this many observations"),
     view: Optional[str] = Query("full", regex="^(full|summary)$", description="Data view: 'full' for complete data, 'summary' for condensed view"),
     force_refresh: Optional[bool] = Query(False, description="Force cache refresh (bypass 1-hour TTL)"),
     cache_service=Depends(get_cache_service),
@@ -344,6 +347,8 @@ async def get_fred_observations(
             units=units,
             limit=limit,
             force_refresh=force_refresh,
+            aggregation_method=aggregation_method,
+            rolling_window=rolling_window,
         )
 
         # The service now returns MCP-ready response, so we can return it directly
@@ -373,6 +378,103 @@ async def get_fred_observations(
         )
 
 
+MAX_MATRIX_SERIES = 25
+
+
+@router.get("/fred/matrix", summary="FRED Multi-Series Matrix - Several Series Aligned on One Date Axis")
+async def get_fred_matrix(
+    series_ids: str = Query(..., description="Comma-separated FRED series IDs (max 25), e.g. 'FEDFUNDS,DGS10,UNRATE'"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD format)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD format)"),
+    frequency: Optional[str] = Query(None, description="Common frequency: 'd', 'w', 'bw', 'm', 'q', 'sa', 'a' (default: each series' native frequency)"),
+    units: Optional[str] = Query(None, description="Units transformation applied to every series ('lin', 'chg', 'ch1', 'pch', 'pc1', 'pca', 'cch', 'cca', 'log')"),
+    aggregation_method: str = Query("avg", regex="^(avg|sum|eop)$", description="Down-sampling method when frequency is coarser than a series: 'avg', 'sum', 'eop' (end of period)"),
+    align: str = Query("outer", regex="^(outer|inner|ffill)$", description="Date alignment: 'outer' (all dates, null gaps), 'inner' (dates every series has), 'ffill' (all dates, gaps carried forward)"),
+    force_refresh: Optional[bool] = Query(False, description="Force cache refresh"),
+    cache_service=Depends(get_cache_service),
+):
+    """
+    Load several FRED series in one request as a columnar matrix.
+
+    Replaces one `/fred/observations/{series_id}` call per dashboard widget:
+    every series shares the window, frequency and units, and the result is one
+    date axis plus one value array per series (null where a series has no
+    observation after alignment). Series that cannot be served are listed
+    under `data.errors`; the others are still returned.
+
+    **Example:** `/fred/matrix?series_ids=FEDFUNDS,DGS10,DGS2&frequency=m&align=ffill`
+
+    **📋 RESPONSE STRUCTURE:**
+    ```json
+    {
+      "status": "success",
+      "meta": {"provider": "fred", "frequency": "m"},
+      "data": {
+        "series_ids": ["FEDFUNDS", "DGS10"],
+        "align": "ffill",
+        "units": "lin",
+        "frequency": {"FEDFUNDS": "m", "DGS10": "m"},
+        "count": 2,
+        "dates": ["2025-07-01", "2025-08-01"],
+        "values": {"FEDFUNDS": [4.33, 4.33], "DGS10": [4.39, 4.26]}
+      }
+    }
+    ```
+
+    **🛡️ COST PROTECTION GUARDS:**
+    - At most 25 series per request
+    - Date cutoff as for single-series observations (the most permissive cutoff of the requested series),
+      also when `start_date` is omitted
+    """
+    ids = list(dict.fromkeys(s.strip().upper() for s in series_ids.split(",") if s.strip()))
+    if not ids or len(ids) > MAX_MATRIX_SERIES:
+        return JSONResponse(
+            content=StandardResponseBuilder.error(
+                f"series_ids must list between 1 and {MAX_MATRIX_SERIES} series.",
+                error_code="INVALID_PARAMETER",
+                meta={"provider": "fred", "cache_status": "error"},
+            ),
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        start_date = min(
+            _apply_date_cutoff(start_date, end_date, sid, default_to_cutoff=True)[0]
+            for sid in ids
+        )
+
+        fed_service = FedService(cache_service)
+        return await fed_service.get_observations_matrix(
+            ids,
+            start_date=start_date,
+            end_date=end_date,
+            frequency=frequency,
+            units=units,
+            aggregation_method=aggregation_method,
+            how=align,
+            force_refresh=force_refresh,
+        )
+    except ValueError as e:
+        logger.warning(f"Invalid FRED matrix request {ids}: {e}")
+        return JSONResponse(
+            content=StandardResponseBuilder.error(
+                str(e),
+                error_code="INVALID_PARAMETER",
+                meta={"provider": "fred", "cache_status": "error"},
+            ),
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    except Exception as e:
+        logger.error(f"Error fetching FRED matrix for {ids}: {e}", exc_info=True)
+        return JSONResponse(
+            content=StandardResponseBuilder.error(
+                "Internal server error fetching FRED observations.",
+                error_code="HANDLER_ERROR",
+                meta={"provider": "fred", "cache_status": "error"},
+            ),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @router.get("/fred/series/{series_id}/observations")
 async def get_series_observations_alias(
     series_id: str,
@@ -381,6 +483,8 @@ async def get_series_observations_alias(
     frequency: Optional[str] = Query("m", description="Data frequency (e.g., 'm', 'q', 'a')"),
     units: Optional[str] = Query(None, description="Units transformation (e.g., 'lin', 'chg')"),
     limit: Optional[int] = Query(60, ge=1, le=1000, description="Maximum number of observations to return (default: 60, max: 1000)"),
+    aggregation_method: str = Query("avg", regex="^(avg|sum|eop)$", description="Down-sampling method when frequency is coarser than the series: 'avg', 'sum', 'eop' (end of period)"),
+    rolling_window: Optional[int] = Query(None, ge=2, le=520, description="Add rolling_mean, rolling_std and zscore over this many observations"),
     view: Optional[str] = Query("full", regex="^(full|summary)$", description="Data view: 'full' for complete data, 'summary' for condensed view"),
     force_refresh: Optional[bool] = Query(False, description="Force cache refresh"),
     cache_service=Depends(get_cache_service),
@@ -459,6 +563,8 @@ async def get_series_observations_alias(
             units=units,
             limit=limit,
             force_refresh=force_refresh,
+            aggregation_method=aggregation_method,
+            rolling_window=rolling_window,
         )
 
         # Check if the response indicates an error
@@ -758,6 +864,7 @@ async def get_fred_search(
     - Keyword-based discovery of economic indicators
     - Results ranked by popularity and relevance
     - Pagination support for large result sets
+    - Answered from the local series catalog (BM25 ranking, prefix and typo tolerance) when it has matches
     - Cached results for improved performance
     
     **Popular Search Examples:**
@@ -878,10 +985,13 @@ async def get_fred_categories(
         )
 
 
-def _apply_date_cutoff(start_date: str, end_date: str, series_id: str) -> tuple[str, str]:
+def _apply_date_cutoff(
+    start_date: str, end_date: str, series_id: str, default_to_cutoff: bool = False
+) -> tuple[str, str]:
     """
     Apply date cutoff to prevent requests for very old data (pre-2000).
     Most users don't need data older than 25 years for practical analysis.
+    With `default_to_cutoff` a missing start_date (full history) starts at the cutoff.
     """
     from datetime import datetime
     
@@ -900,6 +1010,10 @@ def _apply_date_cutoff(start_date: str, end_date: str, series_id: str) -> tuple[
     # Use series-specific cutoff if available, otherwise use default
     series_cutoff = series_cutoffs.get(series_id, cutoff_date)
     
+    if not start_date and default_to_cutoff:
+        logger.info(f"Date cutoff applied for {series_id}: no start_date → {series_cutoff}")
+        return series_cutoff, end_date
+
     # Apply cutoff to start_date if it's too old
     if start_date:
         try:
@@ -0,0 +1,79 @@
+"""
+Macro Snapshot Handler
+
+Serves the precomputed macro dashboard snapshot (headline indicators of
+every macro endpoint plus the latest ECB / UST curves) in one response.
+
+Available endpoints:
+- /snapshot - Full snapshot; supports If-None-Match (ETag = snapshot version)
+- /snapshot/changes - Only the entries changed since a known version
+"""
+
+from fastapi import APIRouter, Query, Request, Response, status
+from typing import Optional
+import json
+import logging
+
+from backend.api.endpoints.shared.response_builder import StandardResponseBuilder, CacheStatus
+from backend.core.warehouse.snapshot import MacroSnapshot, get_macro_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _not_modified(snapshot: MacroSnapshot, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or f'"{snapshot.version}"' in tags
+
+
+def _snapshot_response(snapshot: MacroSnapshot, body: bytes, **meta) -> Response:
+    """Success envelope around an already serialized data payload."""
+    envelope_meta = StandardResponseBuilder.create_unified_meta(
+        provider="macro",
+        data_type="macro_snapshot",
+        cache_status=CacheStatus.CACHED,
+        additional_meta={"version": snapshot.version, "generated_at": snapshot.generated_at, **meta},
+    )
+    content = b'{"status":"success","meta":' + json.dumps(envelope_meta).encode() + b',"data":' + body + b"}"
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"ETag": snapshot.etag, "Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/", summary="Macro Dashboard Snapshot")
+async def get_macro_snapshot(request: Request) -> Response:
+    """
+    Headline macro indicators (latest value, previous value and change) and
+    the latest ECB / UST curves, rebuilt in the background. Send the ETag
+    back as If-None-Match to get 304 while nothing changed.
+    """
+    snapshot = await get_macro_snapshot_service().current()
+    if _not_modified(snapshot, request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": snapshot.etag})
+    return _snapshot_response(snapshot, snapshot.body)
+
+
+@router.get("/changes", summary="Macro Dashboard Snapshot Changes")
+async def get_macro_snapshot_changes(
+    since: str = Query(..., description="Snapshot version the client already has"),
+) -> Response:
+    """
+    Entries (indicators / curves) that changed since `since`, plus the ids
+    removed since. 304 if `since` is the current version; the full snapshot
+    (meta.full = true) if `since` is too old to diff against.
+    """
+    service = get_macro_snapshot_service()
+    snapshot = await service.current()
+    if since.strip('"') == snapshot.version:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": snapshot.etag})
+    changes = service.changes(snapshot, since.strip('"'))
+    if changes is None:
+        logger.debug(f"Unknown snapshot version {since}, sending the full snapshot")
+        return _snapshot_response(snapshot, snapshot.body, full=True)
+    body = json.dumps(changes, separators=(",", ":"), ensure_ascii=False).encode()
+    return _snapshot_response(snapshot, body, full=False)
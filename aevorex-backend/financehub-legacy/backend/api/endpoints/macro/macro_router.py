@@ -8,10 +8,11 @@ fixing rates, Federal Reserve data, inflation, and unemployment.
 **Complete Endpoint Coverage:**
 - **ECB**: /ecb/yield-curve/* (unified, real data)
 - **BUBOR**: /bubor/* (unified, real MNB data)
-- **Curves**: /curve/ust, /curve/compare (consolidated)
+- **Curves**: /curve/ust, /curve/compare, /curve/surface (consolidated)
 - **Fixings**: /fixing/estr, /fixing/euribor/*
 - **Fed Policy**: /fed-policy/rates (complete monetary policy key rates with multi-series support)
 - **Fed Series**: /fed-series/fred/* (complete FRED API integration)
+- **Snapshot**: /snapshot, /snapshot/changes (all headline indicators in one ETag-versioned response)
 
 **Complete FRED API Integration:**
 - **Series Metadata**: /fed-series/fred/series/{id} - Comprehensive series information
@@ -76,6 +77,7 @@ from .handlers.fed_search_handler import router as fed_search_handler
 from .handlers.ecb_handler import router as ecb_handler
 from .handlers.inflation_handler import router as inflation_handler
 from .handlers.unemployment_handler import router as unemployment_handler
+from .handlers.snapshot_handler import router as snapshot_handler
 
 router.include_router(bubor_handler, prefix="/bubor")
 router.include_router(curve_handler, prefix="/curve")
@@ -88,5 +90,6 @@ router.include_router(fed_series_handler, prefix="/fed")
 router.include_router(ecb_handler, prefix="/ecb")
 router.include_router(inflation_handler, prefix="/inflation")
 router.include_router(unemployment_handler, prefix="/unemployment")
+router.include_router(snapshot_handler, prefix="/snapshot")
 
 __all__ = ["router"]
\ No newline at end of file
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 import httpx
 from backend.utils.cache_service import CacheService
 from backend.api.endpoints.shared.response_builder import StandardResponseBuilder, MacroProvider, CacheStatus
+from backend.config import settings
+from backend.core.warehouse import ECB, SeriesNotFoundError, get_macro_warehouse, get_warehouse_sync
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +92,10 @@ class ECBService:
         try:
             # Get config first
             config = self.SERIES_CONFIG[series_key]
+
+            warehoused = await self._series_from_warehouse(series_key, config, start_date, end_date, force_refresh)
+            if warehoused is not None:
+                return warehoused
             
             # Check cache first
             cache_key = f"ecb:{series_key}:{start_date}:{end_date}"
@@ -167,6 +173,50 @@ class ECBService:
             logger.error(f"Error fetching {series_key} data: {str(e)}", exc_info=True)
             return self._error(f"Failed to fetch {series_key} data: {str(e)}")
     
+    async def _series_from_warehouse(
+        self,
+        series_key: str,
+        config: Dict[str, str],
+        start_date: str,
+        end_date: str,
+        force_refresh: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Serve a series window from the local macro warehouse.
+
+        The stored series is kept current with SDMX `updatedAfter` deltas, so
+        a new date range never refetches the history. Returns None when the
+        warehouse is disabled or unavailable (the caller then queries ECB
+        directly).
+        """
+        if not settings.MACRO_WAREHOUSE.ENABLED:
+            return None
+        try:
+            state, synced = await get_warehouse_sync().ecb(
+                config["resource_id"],
+                config["key"],
+                force=force_refresh,
+                title=config["description"],
+                units=config["units"],
+            )
+            rows = await get_macro_warehouse().window(ECB, state.series_id, start_date, end_date)
+        except SeriesNotFoundError:
+            logger.warning(f"ECB API: {series_key} series not found")
+            return self._error(f"{series_key} series not found in ECB database")
+        except Exception as e:
+            logger.warning(f"Macro warehouse unavailable for {series_key}, querying ECB directly: {e}")
+            return None
+
+        observations = [{"date": d, "value": v} for d, v in rows if v is not None]
+        return StandardResponseBuilder.create_macro_success_response(
+            provider=MacroProvider.ECB,
+            data=self._series_payload(observations, config),
+            series_id=config.get("key", f"ECB_{series_key}"),
+            frequency=config.get("frequency", "monthly"),
+            units=config.get("units", "percent"),
+            cache_status=CacheStatus.FRESH if synced else CacheStatus.CACHED
+        )
+
     async def get_hicp_data(
         self, 
         start_date: Optional[str] = None,
@@ -263,7 +313,27 @@ class ECBService:
             
             # Sort observations by date
             observations.sort(key=lambda x: x["date"])
+            return self._series_payload(observations, config)
             
+        except Exception as e:
+            logger.error(f"Error parsing SDMX response: {str(e)}", exc_info=True)
+            return StandardResponseBuilder.error(
+                f"Failed to parse ECB response: {str(e)}",
+                meta={"provider": "ecb", "cache_status": "error"}
+            )
+
+    def _series_payload(self, observations: List[Dict[str, Any]], config: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Build the standardized series payload (observations + statistics).
+
+        Args:
+            observations: Date-sorted {"date", "value"} dicts
+            config: Series configuration
+
+        Returns:
+            Parsed data in standardized format
+        """
+        try:
             # Calculate basic statistics
             values = [obs["value"] for obs in observations]
             stats = {}
@@ -300,9 +370,9 @@ class ECBService:
             )
             
         except Exception as e:
-            logger.error(f"Error parsing SDMX response: {str(e)}", exc_info=True)
+            logger.error(f"Error building ECB series payload: {str(e)}", exc_info=True)
             return StandardResponseBuilder.error(
-                f"Failed to parse ECB response: {str(e)}",
+                f"Failed to build ECB series payload: {str(e)}",
                 meta={"provider": "ecb", "cache_status": "error"}
             )
     
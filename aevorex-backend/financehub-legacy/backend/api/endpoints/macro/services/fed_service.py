@@ -5,11 +5,32 @@ import os
 import json
 import logging
 import asyncio
-from typing import Any, Dict, Optional, List
-from datetime import timedelta, datetime
+from typing import Any, Dict, Optional, List, Tuple
+from datetime import date, datetime
 
 import httpx
+import numpy as np
 from backend.api.endpoints.shared.response_builder import StandardResponseBuilder, MacroProvider, CacheStatus
+from backend.config import settings
+from backend.core.metrics import SERVICE_METRICS
+from backend.core.warehouse import (
+    FRED,
+    SeriesNotFoundError,
+    SeriesCatalog,
+    SeriesState,
+    get_macro_warehouse,
+    get_series_catalog,
+    get_warehouse_sync,
+)
+from backend.core.warehouse.transforms import (
+    SeriesArrays,
+    align,
+    canonical_frequency,
+    history_start,
+    rolling_stats,
+    series_analytics,
+    transform,
+)
 
 FRED_API_KEY = os.getenv("FINBOT_API_KEYS__FRED")
 FRED_BASE_URL = "https://api.stlouisfed.org/fred"
@@ -187,6 +208,32 @@ class FedService:
         # Otherwise, use user requested frequency
         return requested_frequency
 
+    # ------------------- LOCAL SERIES CATALOG -------------------
+    @staticmethod
+    def _series_catalog() -> Optional[SeriesCatalog]:
+        return get_series_catalog() if settings.MACRO_WAREHOUSE.CATALOG_ENABLED else None
+
+    async def _from_catalog(self, method: str, *args) -> Optional[Dict[str, Any]]:
+        """Answer from the local series catalog; None if disabled, unknown or failing."""
+        catalog = self._series_catalog()
+        if catalog is None:
+            return None
+        try:
+            return await getattr(catalog, method)(*args)
+        except Exception as e:
+            logger.warning(f"Series catalog {method} failed, querying FRED: {e}")
+            return None
+
+    async def _ingest_into_catalog(self, seriess: Optional[List[Dict[str, Any]]]) -> None:
+        """Add series seen in live FRED responses to the local catalog."""
+        catalog = self._series_catalog()
+        if catalog is None or not seriess:
+            return
+        try:
+            await catalog.ingest(seriess)
+        except Exception as e:
+            logger.warning(f"Series catalog update failed: {e}")
+
     # ------------------- SEARCH -------------------
     async def get_cached_search(self, query: str, limit: int, offset: int) -> Optional[Dict[str, Any]]:
         """
@@ -269,6 +316,14 @@ class FedService:
             Search results dict.
         """
         try:
+            local = await self._from_catalog("search", query, limit, offset)
+            if local and local["seriess"]:
+                logger.debug(f"Using local series catalog for search: {query}")
+                return StandardResponseBuilder.success(
+                    local,
+                    meta={"provider": "fred", "cache_status": "cached", "search_backend": "local_index", "mcp_ready": True}
+                )
+
             cached = await self.get_cached_search(query, limit, offset)
             if cached:
                 logger.debug(f"Using cached search results for: {query}")
@@ -285,6 +340,7 @@ class FedService:
                 return data
             
             await self.set_cached_search(query, limit, offset, data)
+            await self._ingest_into_catalog(data.get("seriess"))
             return StandardResponseBuilder.success(
                 data,
                 meta={"provider": "fred", "cache_status": "fresh", "mcp_ready": True}
@@ -307,6 +363,14 @@ class FedService:
             Related series dict.
         """
         try:
+            local = await self._from_catalog("related", series_id)
+            if local and local["seriess"]:
+                logger.debug(f"Using local series catalog for related series: {series_id}")
+                return StandardResponseBuilder.success(
+                    local,
+                    meta={"provider": "fred", "cache_status": "cached", "search_backend": "local_index", "mcp_ready": True}
+                )
+
             cached = await self.get_cached_related(series_id)
             if cached:
                 logger.debug(f"Using cached related series for: {series_id}")
@@ -569,6 +633,7 @@ class FedService:
                 return data
             
             await self.set_cached_metadata(series_id, data)
+            await self._ingest_into_catalog(data.get("seriess"))
             return StandardResponseBuilder.success(
                 data,
                 meta={"provider": "fred", "cache_status": "fresh", "mcp_ready": True}
@@ -590,6 +655,8 @@ class FedService:
         units: Optional[str] = None,
         limit: Optional[int] = None,
         force_refresh: bool = False,
+        aggregation_method: str = "avg",
+        rolling_window: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Retrieve series observations (time series data) from FRED API, with caching.
@@ -602,6 +669,8 @@ class FedService:
             units: Data units (e.g., 'lin', 'chg').
             limit: Maximum number of observations to return.
             force_refresh: If True, bypass the cache.
+            aggregation_method: 'avg', 'sum' or 'eop' when down-sampling.
+            rolling_window: If set, add rolling mean / std / z-score per observation.
         Returns:
             Series observations dict.
         """
@@ -618,16 +687,18 @@ class FedService:
         if fixed_series_id != series_id:
             logger.info(f"Fixed series ID: {series_id} -> {fixed_series_id}")
         
-        # Get series metadata to determine optimal frequency
-        try:
-            metadata = await self.get_series_metadata(fixed_series_id)
-            optimal_frequency = self._get_optimal_frequency(metadata, frequency)
-            if optimal_frequency != frequency:
-                logger.info(f"Using optimal frequency: {frequency} -> {optimal_frequency}")
-                frequency = optimal_frequency
-        except Exception as e:
-            logger.warning(f"Could not get metadata for frequency optimization: {e}")
-            # Continue with original frequency
+        # Get series metadata to determine optimal frequency (the warehouse
+        # knows the native frequency and never up-samples, so skip the call)
+        if not settings.MACRO_WAREHOUSE.ENABLED:
+            try:
+                metadata = await self.get_series_metadata(fixed_series_id)
+                optimal_frequency = self._get_optimal_frequency(metadata, frequency)
+                if optimal_frequency != frequency:
+                    logger.info(f"Using optimal frequency: {frequency} -> {optimal_frequency}")
+                    frequency = optimal_frequency
+            except Exception as e:
+                logger.warning(f"Could not get metadata for frequency optimization: {e}")
+                # Continue with original frequency
         
         # Try fallback series IDs if the main one fails
         fallback_ids = self._get_series_fallbacks(series_id)
@@ -636,10 +707,14 @@ class FedService:
         for attempt_id in fallback_ids:
             try:
                 # Create cache key for this attempt
-                attempt_cache_key = f"fed:observations:{attempt_id}:{start_date}:{end_date}:{frequency}:{units}:{limit}"
+                attempt_cache_key = (
+                    f"fed:observations:{attempt_id}:{start_date}:{end_date}:{frequency}:{units}:{limit}"
+                    f":{aggregation_method}:{rolling_window}"
+                )
                 # The _fetch_observations_for_series method now returns MCP-ready response
                 return await self._fetch_observations_for_series(
-                    attempt_id, start_date, end_date, frequency, units, limit, force_refresh, attempt_cache_key
+                    attempt_id, start_date, end_date, frequency, units, limit, force_refresh, attempt_cache_key,
+                    aggregation_method=aggregation_method, rolling_window=rolling_window,
                 )
             except ValueError as e:
                 last_error = e
@@ -673,13 +748,29 @@ class FedService:
         units: Optional[str] = None,
         limit: Optional[int] = None,
         force_refresh: bool = False,
-        cache_key: str = None
+        cache_key: str = None,
+        *,
+        aggregation_method: str = "avg",
+        rolling_window: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Fetch observations for a specific series ID (helper method for fallback logic).
         """
+        warehoused = await self._observations_from_warehouse(
+            series_id, start_date, end_date, frequency, units, limit, force_refresh, aggregation_method
+        )
+        if warehoused is not None:
+            if warehoused.get("status") == "error":
+                return warehoused
+            return await self._finalize_observations(
+                series_id, warehoused, force_refresh, rolling_window=rolling_window
+            )
+
         if not cache_key:
-            cache_key = f"fed:observations:{series_id}:{start_date}:{end_date}:{frequency}:{units}:{limit}"
+            cache_key = (
+                f"fed:observations:{series_id}:{start_date}:{end_date}:{frequency}:{units}:{limit}"
+                f":{aggregation_method}:{rolling_window}"
+            )
         if not force_refresh:
             cached = await self.cache.get(cache_key)
             if cached:
@@ -710,6 +801,7 @@ class FedService:
                 params["observation_end"] = end_date
             if frequency:
                 params["frequency"] = frequency
+                params["aggregation_method"] = aggregation_method
             if units:
                 params["units"] = units
             if limit:
@@ -776,10 +868,300 @@ class FedService:
                     else:
                         resp.raise_for_status()
                         data = resp.json()
-        
+
+        return await self._finalize_observations(
+            series_id, data, force_refresh, cache_key, rolling_window=rolling_window
+        )
+
+    async def _observations_from_warehouse(
+        self,
+        series_id: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        frequency: Optional[str],
+        units: Optional[str],
+        limit: Optional[int],
+        force_refresh: bool,
+        aggregation_method: str = "avg",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer an observations request from the local macro warehouse.
+
+        The stored native-frequency series is synced incrementally (at most one
+        small delta per sync interval); the window, frequency aggregation and
+        units transform are computed locally with NumPy from the in-memory base
+        series, in FRED's response shape. Returns
+        None when the warehouse is disabled or unavailable, so the caller falls
+        back to a direct FRED request.
+        """
+        if not settings.MACRO_WAREHOUSE.ENABLED or not FRED_API_KEY:
+            return None
+        try:
+            state, result, served_frequency = await self._warehouse_series(
+                series_id, start_date, end_date, frequency, units, force_refresh, aggregation_method
+            )
+        except SeriesNotFoundError:
+            logger.warning(f"FRED API error: Series {series_id} not found or invalid")
+            return {"status": "error", "series_id": series_id, "message": "not found or invalid"}
+        except Exception as e:
+            logger.warning(f"Macro warehouse unavailable for {series_id}, querying FRED directly: {e}")
+            return None
+
+        if limit:
+            result = result.head(limit)
+        rows = result.to_rows()
+        today = datetime.now().date().isoformat()
+        data = {
+            "realtime_start": today,
+            "realtime_end": today,
+            "observation_start": start_date or state.first_date,
+            "observation_end": end_date or state.last_date,
+            "units": units or "lin",
+            "output_type": 1,
+            "file_type": "json",
+            "order_by": "observation_date",
+            "sort_order": "asc",
+            "count": len(rows),
+            "offset": 0,
+            "limit": limit or 100000,
+            "observations": [
+                {"realtime_start": today, "realtime_end": today, "date": d, "value": v}
+                for d, v in rows
+            ],
+        }
+        requested = canonical_frequency(frequency)
+        if requested and requested != served_frequency:
+            data["frequency_fallback"] = {
+                "requested": frequency,
+                "actual": served_frequency,
+                "fallback_occurred": True,
+                "fallback_description": f"{frequency} → {served_frequency}",
+                "message": f"Series {series_id} cannot be served at frequency '{frequency}', using {served_frequency} frequency",
+            }
+        return data
+
+    async def get_observations_matrix(
+        self,
+        series_ids: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        frequency: Optional[str] = None,
+        units: Optional[str] = None,
+        aggregation_method: str = "avg",
+        how: str = "outer",
+        force_refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Several series over one window as a columnar matrix.
+
+        Each series comes from the warehouse (synced with at most
+        BATCH_CONCURRENCY series in flight, transformed locally from the
+        cached base arrays); series the warehouse cannot serve are fetched
+        directly with `fred_client.fetch_fred_series_matrix` over one shared
+        client, reusing per-series cache entries. The columns are then
+        aligned on one date axis (`outer`, `inner` or `ffill`, see
+        `transforms.align`). Series that fail are reported under `errors`
+        instead of failing the whole request.
+
+        Returns:
+            MCP-ready response whose data holds `dates` and one value array
+            per series in `values` (null where a series has no observation).
+        """
+        errors: Dict[str, str] = {}
+        wanted: Dict[str, str] = {}
+        for series_id in dict.fromkeys(series_ids):
+            availability = self._get_availability_status(series_id)
+            if availability["status"] == "not_available":
+                errors[series_id] = availability["message"]
+            else:
+                wanted[series_id] = self._fix_series_id(series_id)
+        if not FRED_API_KEY and wanted:
+            return StandardResponseBuilder.error(
+                "FRED API key not configured",
+                meta={"provider": "fred", "cache_status": "error"}
+            )
+
+        columns: Dict[str, SeriesArrays] = {}
+        served: Dict[str, str] = {}
+        cache_status = CacheStatus.CACHED
+        if settings.MACRO_WAREHOUSE.ENABLED:
+            semaphore = asyncio.Semaphore(settings.MACRO_WAREHOUSE.BATCH_CONCURRENCY)
+
+            async def load(series_id: str):
+                async with semaphore:
+                    return await self._warehouse_series(
+                        series_id, start_date, end_date, frequency, units, force_refresh, aggregation_method
+                    )
+
+            results = await asyncio.gather(
+                *(load(fixed) for fixed in wanted.values()), return_exceptions=True
+            )
+            for series_id, result in zip(list(wanted), results):
+                if isinstance(result, SeriesNotFoundError):
+                    errors[series_id] = "not found or invalid"
+                    del wanted[series_id]
+                elif isinstance(result, Exception):
+                    logger.warning(f"Macro warehouse unavailable for {series_id}, querying FRED directly: {result}")
+                else:
+                    _, columns[series_id], served[series_id] = result
+                    del wanted[series_id]
+
+        if wanted:
+            fetched, fetch_errors, fresh = await self._fetch_matrix_columns(
+                wanted, start_date, end_date, frequency, units, aggregation_method, force_refresh
+            )
+            columns.update(fetched)
+            errors.update(fetch_errors)
+            served.update({series_id: frequency or "native" for series_id in fetched})
+            if fresh:
+                cache_status = CacheStatus.FRESH
+
+        dates, values = align(columns, how)
+        order = [series_id for series_id in dict.fromkeys(series_ids) if series_id in columns]
+        data = {
+            "series_ids": order,
+            "align": how,
+            "units": units or "lin",
+            "frequency": served,
+            "count": len(dates),
+            "dates": dates.astype(str).tolist(),
+            "values": {
+                series_id: [
+                    None if np.isnan(v) else v for v in values[series_id].tolist()
+                ]
+                for series_id in order
+            },
+        }
+        if errors:
+            data["errors"] = errors
+        if not order:
+            return StandardResponseBuilder.create_macro_error_response(
+                provider=MacroProvider.FRED,
+                message=f"No data available for series {', '.join(series_ids)}",
+                error_code="FRED_API_ERROR",
+            )
+        return StandardResponseBuilder.create_macro_success_response(
+            provider=MacroProvider.FRED,
+            data=data,
+            start_date=start_date,
+            end_date=end_date,
+            frequency=frequency,
+            units=units,
+            cache_status=cache_status,
+        )
+
+    async def _fetch_matrix_columns(
+        self,
+        series_ids: Dict[str, str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        frequency: Optional[str],
+        units: Optional[str],
+        aggregation_method: str,
+        force_refresh: bool,
+    ) -> Tuple[Dict[str, SeriesArrays], Dict[str, str], bool]:
+        """Direct FRED path of `get_observations_matrix`: (columns, errors, fetched_any)."""
+        columns: Dict[str, SeriesArrays] = {}
+        errors: Dict[str, str] = {}
+
+        def cache_key(series_id: str) -> str:
+            return (
+                f"fed:matrix:{series_id}:{start_date}:{end_date}:{frequency}:{units}"
+                f":{aggregation_method}"
+            )
+
+        missing: Dict[str, str] = {}
+        for series_id, fixed in series_ids.items():
+            cached = None if force_refresh else await self.cache.get(cache_key(fixed))
+            if cached:
+                columns[series_id] = SeriesArrays.from_rows(
+                    (d, v) for d, v in json.loads(cached)
+                )
+            else:
+                missing[series_id] = fixed
+        if not missing or not HAS_FRED_CLIENT:
+            for series_id in missing:
+                errors[series_id] = "FRED client unavailable"
+            return columns, errors, False
+
+        start = date.fromisoformat(start_date) if start_date else date(1776, 7, 4)
+        end = date.fromisoformat(end_date) if end_date else date(9999, 12, 31)
+        concurrency = settings.MACRO_WAREHOUSE.BATCH_CONCURRENCY
+
+        async def fetch(client: httpx.AsyncClient, ids: List[str]) -> Dict[str, Dict[str, Optional[float]]]:
+            with SERVICE_METRICS.track_upstream(FRED):
+                return await fred_client.fetch_fred_series_matrix(
+                    client, FRED_API_KEY, ids, start, end, frequency, units,
+                    aggregation_method if frequency else None,
+                    max_concurrency=concurrency,
+                )
+
+        merged: Dict[str, Dict[str, Optional[float]]] = {}
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            try:
+                merged = await fetch(client, list(missing.values()))
+            except httpx.HTTPError as e:
+                # One bad series fails the whole gather: retry one by one to isolate it
+                logger.warning(f"FRED matrix request failed, fetching series individually: {e}")
+                for series_id, fixed in missing.items():
+                    try:
+                        for d, row in (await fetch(client, [fixed])).items():
+                            merged.setdefault(d, {}).update(row)
+                    except httpx.HTTPStatusError as err:
+                        status = err.response.status_code
+                        errors[series_id] = "not found or invalid" if status in (400, 404) else str(err)
+                    except httpx.HTTPError as err:
+                        errors[series_id] = str(err)
+
+        for series_id, fixed in missing.items():
+            if series_id in errors:
+                continue
+            rows = [(d, row[fixed]) for d, row in merged.items() if fixed in row]
+            columns[series_id] = SeriesArrays.from_rows(rows)
+            await self.cache.set(cache_key(fixed), json.dumps(rows), ttl=CACHE_EXPIRE_SECONDS)
+        return columns, errors, True
+
+    async def _warehouse_series(
+        self,
+        series_id: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        frequency: Optional[str],
+        units: Optional[str],
+        force_refresh: bool,
+        aggregation_method: str = "avg",
+    ) -> Tuple[SeriesState, SeriesArrays, str]:
+        """Sync one warehouse series and transform its window; returns (state, series, served frequency)."""
+        state, _ = await get_warehouse_sync().fred(series_id, FRED_API_KEY, force=force_refresh)
+        first = start_date
+        if start_date and ((units or "lin") != "lin" or frequency):
+            # Changes / aggregates at the window start need earlier, whole periods
+            first = history_start(start_date, state.frequency, frequency)
+        base = await get_macro_warehouse().series(FRED, series_id, state)
+        result, served_frequency = transform(
+            base.window(first, end_date),
+            state.frequency,
+            frequency,
+            aggregation_method,
+            units or "lin",
+            since=start_date,
+        )
+        return state, result, served_frequency
+
+    async def _finalize_observations(
+        self,
+        series_id: str,
+        data: Dict[str, Any],
+        force_refresh: bool,
+        cache_key: Optional[str] = None,
+        rolling_window: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Normalize, annotate availability, cache (direct FRED path only) and wrap."""
         # Normalize observations data
         if "observations" in data:
-            data["observations"] = self._normalize_observations(data["observations"])
+            data["observations"] = self._normalize_observations(
+                data["observations"], rolling_window
+            )
         
         # Add series ID fix info to response (only if this is the main method, not fallback)
         # This will be handled in the main get_series_observations method
@@ -795,7 +1177,8 @@ class FedService:
         else:
             data["status"] = "success"
         
-        await self.cache.set(cache_key, json.dumps(data), ttl=CACHE_EXPIRE_SECONDS)
+        if cache_key:
+            await self.cache.set(cache_key, json.dumps(data), ttl=CACHE_EXPIRE_SECONDS)
         
         # Return MCP-ready response
         if data.get("status") == "success":
@@ -830,12 +1213,13 @@ class FedService:
         except (ValueError, TypeError):
             return None
 
-    def _normalize_observations(self, observations: list) -> list:
+    def _normalize_observations(self, observations: list, rolling_window: Optional[int] = None) -> list:
         """
         Normalize a list of observations with enhanced analytics.
         
         Args:
             observations: List of observation dictionaries
+            rolling_window: If set, add rolling_mean / rolling_std / zscore to each observation
         Returns:
             Normalized observations with proper value types and analytics
         """
@@ -861,22 +1245,17 @@ class FedService:
                 
             normalized.append(normalized_obs)
         
-        # Calculate enhanced analytics
-        analytics = {}
-        if valid_values and len(valid_values) > 1:
-            # Moving averages (5-period and 20-period)
-            analytics["moving_averages"] = self._calculate_moving_averages(valid_values)
-            
-            # Percent changes
-            analytics["percent_changes"] = self._calculate_percent_changes(valid_values)
-            
-            # Basic statistics
-            analytics["statistics"] = {
-                "mean": round(sum(valid_values) / len(valid_values), 4),
-                "min": round(min(valid_values), 4),
-                "max": round(max(valid_values), 4),
-                "volatility": round(self._calculate_volatility(valid_values), 4)
-            }
+        # Calculate enhanced analytics (moving averages, percent changes,
+        # statistics) in one vectorized pass
+        values = np.asarray(valid_values, dtype=np.float64)
+        analytics = series_analytics(values)
+
+        if rolling_window and normalized:
+            rolling = rolling_stats(values, rolling_window)
+            for i, normalized_obs in enumerate(normalized):
+                for field, key in (("rolling_mean", "mean"), ("rolling_std", "std"), ("zscore", "zscore")):
+                    value = rolling[key][i]
+                    normalized_obs[field] = round(float(value), 6) if np.isfinite(value) else None
         
         # Add normalization statistics with analytics
         if observations:
@@ -893,40 +1272,6 @@ class FedService:
         
         return normalized
     
-    def _calculate_moving_averages(self, values: list) -> dict:
-        """Calculate 5-period and 20-period moving averages."""
-        if len(values) < 5:
-            return {"ma5": None, "ma20": None}
-        
-        ma5 = round(sum(values[-5:]) / 5, 4) if len(values) >= 5 else None
-        ma20 = round(sum(values[-20:]) / 20, 4) if len(values) >= 20 else None
-        
-        return {"ma5": ma5, "ma20": ma20}
-    
-    def _calculate_percent_changes(self, values: list) -> dict:
-        """Calculate period-over-period and year-over-year percent changes."""
-        if len(values) < 2:
-            return {"period_change": None, "yoy_change": None}
-        
-        # Period-over-period change (last vs previous)
-        period_change = round(((values[-1] - values[-2]) / values[-2]) * 100, 2) if values[-2] != 0 else None
-        
-        # Year-over-year change (if we have enough data)
-        yoy_change = None
-        if len(values) >= 12:  # Assuming monthly data
-            yoy_change = round(((values[-1] - values[-12]) / values[-12]) * 100, 2) if values[-12] != 0 else None
-        
-        return {"period_change": period_change, "yoy_change": yoy_change}
-    
-    def _calculate_volatility(self, values: list) -> float:
-        """Calculate standard deviation as volatility measure."""
-        if len(values) < 2:
-            return 0.0
-        
-        mean = sum(values) / len(values)
-        variance = sum((x - mean) ** 2 for x in values) / (len(values) - 1)
-        return variance ** 0.5
-
     # ------------------- CATEGORIES -------------------
     async def get_categories(self, category_id: int = 0) -> Dict[str, Any]:
         """
@@ -937,6 +1282,12 @@ class FedService:
         Returns:
             Categories dict.
         """
+        local = await self._from_catalog("category", category_id)
+        if local:
+            return StandardResponseBuilder.success(
+                local,
+                meta={"provider": "fred", "cache_status": "cached", "search_backend": "local_index", "mcp_ready": True}
+            )
         cache_key = f"fed:categories:{category_id}"
         cached = await self.cache.get(cache_key)
         if cached:
@@ -9,8 +9,8 @@ from typing import Dict, Any, Optional
 from datetime import date, timedelta, datetime
 import statistics
 import inspect
-import asyncio
 
+from backend.core.performance.executors import IO, run_blocking
 from backend.utils.logger_config import get_logger
 from backend.api.endpoints.shared.response_builder import StandardResponseBuilder, MacroProvider, CacheStatus
 from backend.core.fetchers.macro.ecb_client.standard_fetchers import fetch_ecb_estr_data
@@ -189,9 +189,8 @@ class FixingService:
             if inspect.iscoroutinefunction(get_latest_euribor_rates):
                 rates = await get_latest_euribor_rates()
             else:
-                # run sync function in thread to avoid blocking event loop
-                loop = asyncio.get_event_loop()
-                rates = await loop.run_in_executor(None, get_latest_euribor_rates)
+                # run sync scraper on the bounded I/O executor, not the loop
+                rates = await run_blocking(IO, get_latest_euribor_rates)
             
             result = StandardResponseBuilder.create_macro_success_response(
                 provider=MacroProvider.EMMI,
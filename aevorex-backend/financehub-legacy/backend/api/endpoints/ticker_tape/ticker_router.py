@@ -2,8 +2,10 @@
 Ticker Tape Data Endpoint - EODHD Only (MCP-Ready)
 ==================================================
 
-Simplified ticker tape endpoints using only EODHD API.
-No caching, no orchestrator - direct EODHD integration.
+Ticker tape endpoints using only EODHD API.
+Quotes come from the shared `TickerTapeHub` table (one batched upstream
+poller per distinct symbol set); `/stream` (SSE) and `/ws` (WebSocket)
+push per-symbol diffs to subscribers.
 Now with full MCP compatibility and standardized responses.
 
 MCP-READY FEATURES:
@@ -16,15 +18,20 @@ MCP-READY FEATURES:
 - Data source identification
 """
 
+import asyncio
+import json
 from datetime import datetime
-from typing import Annotated, Dict, Any, Optional
+from typing import Annotated, Dict, Any, List, Optional
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
 from fastapi.responses import JSONResponse
+from sse_starlette.sse import EventSourceResponse
 
 from backend.api.deps import get_http_client
+from backend.config import settings
 from backend.config.eodhd import settings as eodhd_settings
+from backend.core.ticker_tape_hub import get_ticker_tape_hub
 from backend.core.ticker_tape_service import (
     get_ticker_tape_data,
     get_single_ticker_data
@@ -83,9 +90,9 @@ async def get_ticker_tape_root(
     """
     Get real-time ticker tape data from EODHD API only.
     
-    Returns live market data for multiple symbols without caching.
-    Uses EODHD All World Extended API (300,000 requests/day).
-    No fallback providers, no cache - direct EODHD integration.
+    Returns live market data for multiple symbols from the shared quote
+    table (at most one poll interval old). Stale symbols are refreshed with
+    batched EODHD real-time requests.
     
     MCP-READY RESPONSE:
     - Standardized success/error responses
@@ -112,51 +119,12 @@ async def get_ticker_tape_root(
             logger.info(f"Using default symbols: {symbols_to_fetch}")
         
         symbols = symbols_to_fetch
-        
-        # Fetch data from EODHD - direct API calls
-        ticker_data = []
-        for symbol in symbols:
-            try:
-                # Direct EODHD API call
-                url = f"https://eodhd.com/api/real-time/{symbol}"
-                params = {
-                    "api_token": eodhd_settings.API_KEY,
-                    "fmt": "json"
-                }
-                
-                response = await http_client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if data and isinstance(data, dict):
-                    # Check if all critical fields are "NA" or null (invalid symbol detection)
-                    critical_fields = ["close", "change", "volume", "high", "low", "open"]
-                    field_values = [data.get(field) for field in critical_fields]
-                    
-                    # If all critical fields are "NA" or null, treat as invalid symbol
-                    if all(val == "NA" or val is None for val in field_values):
-                        logger.warning(f"Invalid symbol detected: {symbol} - all critical fields are NA/null")
-                        continue  # Skip this symbol, don't add to ticker_data
-                    
-                    ticker_item = {
-                        "symbol": symbol,
-                        "price": data.get("close"),
-                        "change": data.get("change"),
-                        "change_percent": data.get("change_percent"),
-                        "volume": data.get("volume"),
-                        "high": data.get("high"),
-                        "low": data.get("low"),
-                        "open": data.get("open"),
-                        "previous_close": data.get("previous_close"),
-                        "timestamp": data.get("timestamp"),
-                        "currency": data.get("currency", "USD")
-                    }
-                    ticker_data.append(ticker_item)
-                    
-            except Exception as e:
-                logger.error(f"Failed to fetch {symbol}: {e}")
-        
+
+        # Served from the shared quote table; only stale symbols hit EODHD
+        # (batched), so concurrent pollers share upstream requests
+        hub = get_ticker_tape_hub()
+        ticker_data, fetched = await hub.get_quotes(symbols, http_client)
+
         if not ticker_data:
             # MCP-ready error response for no data (likely invalid symbols)
             return JSONResponse(
@@ -180,16 +148,16 @@ async def get_ticker_tape_root(
                 data_type="ticker_tape",
                 symbol="multiple",
                 frequency="real_time",
-                cache_status=CacheStatus.FRESH,
+                cache_status=CacheStatus.FRESH if fetched else CacheStatus.CACHED,
                 provider_meta={
                     "total_symbols": len(ticker_data),
                     "requested_limit": limit,
                     "data_source": "eodhd_live",
                     "processing_time_ms": round(processing_time_ms, 2),
                     "symbols_processed": len(ticker_data),
-                    "symbols_failed": limit - len(ticker_data),
-                    "api_requests_made": len(ticker_data),
-                    "cache_status": "fresh",
+                    "symbols_failed": len(symbols) - len(ticker_data),
+                    "symbols_refreshed": fetched,
+                    "cache_status": "fresh" if fetched else "cached",
                     "data_freshness": "real_time",
                     "start_time": start_time.isoformat() + "Z",
                     "end_time": end_time.isoformat() + "Z"
@@ -345,4 +313,107 @@ async def get_ticker_tape_item(
             status_code=500  # Internal Server Error - unexpected error
         )
 
+def _parse_symbols(raw: Optional[str]) -> List[str]:
+    if not raw:
+        return DEFAULT_TICKER_SYMBOLS[: settings.TICKER_TAPE.default_limit]
+    parsed = [s.strip().upper() for s in raw.split(",") if s.strip()]
+    return list(dict.fromkeys(parsed))[: settings.TICKER_TAPE.max_symbols]
+
+
+@router.get("/stream", summary="Stream ticker-tape diffs (SSE)")
+async def stream_ticker_tape(
+    request: Request,
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+    symbols: Annotated[Optional[str], Query(description="Comma-separated symbols (default list if omitted)")] = None,
+) -> EventSourceResponse:
+    """
+    Server-Sent Events stream: one `snapshot` event with the current quotes,
+    then `diff` events containing only the symbols whose quote changed.
+    """
+    hub = get_ticker_tape_hub()
+    wanted = _parse_symbols(symbols)
+    subscriber = hub.subscribe(wanted, client=http_client)
+    heartbeat = settings.TICKER_TAPE.stream_heartbeat_seconds
+
+    async def event_generator():
+        try:
+            # Subscribing queued the known quotes; refreshing stale ones queues
+            # the rest – together they form the snapshot
+            await hub.get_quotes(wanted, http_client)
+            snapshot = await subscriber.next_batch(timeout=0)
+            yield {"event": "snapshot", "data": json.dumps(snapshot)}
+            while not subscriber.closed:
+                if await request.is_disconnected():
+                    break
+                batch = await subscriber.next_batch(timeout=heartbeat)
+                if batch:
+                    yield {"event": "diff", "data": json.dumps(batch)}
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return EventSourceResponse(event_generator(), ping=heartbeat)
+
+
+@router.websocket("/ws")
+async def ticker_tape_websocket(websocket: WebSocket):
+    """
+    WebSocket stream with client-driven subscriptions.
+
+    Client → server: `{"action": "subscribe" | "unsubscribe", "symbols": [...]}`
+    Server → client: `{"type": "snapshot" | "diff", "data": [...]}`
+    """
+    await websocket.accept()
+    hub = get_ticker_tape_hub()
+    http_client = getattr(websocket.app.state, "http_client", None)
+    subscriber = hub.subscribe(
+        _parse_symbols(websocket.query_params.get("symbols")), client=http_client
+    )
+
+    async def push():
+        if http_client is not None:
+            await hub.get_quotes(sorted(subscriber.symbols), http_client)
+        snapshot = await subscriber.next_batch(timeout=0)
+        await websocket.send_json({"type": "snapshot", "data": snapshot})
+        while not subscriber.closed:
+            batch = await subscriber.next_batch()
+            if batch:
+                await websocket.send_json({"type": "diff", "data": batch})
+
+    pusher = asyncio.create_task(push())
+    try:
+        while True:
+            message = await websocket.receive_json()
+            action = message.get("action")
+            requested = [
+                str(s).strip().upper() for s in message.get("symbols") or [] if str(s).strip()
+            ]
+            if action == "subscribe":
+                # The hub keeps the total within TICKER_TAPE.max_symbols
+                hub.update_symbols(subscriber, add=requested)
+                dropped = [s for s in dict.fromkeys(requested) if s not in subscriber.symbols]
+                if dropped:
+                    await websocket.send_json({
+                        "type": "error",
+                        "data": (
+                            f"Subscription limited to {settings.TICKER_TAPE.max_symbols} symbols; "
+                            f"not subscribed: {', '.join(dropped)}"
+                        ),
+                    })
+            elif action == "unsubscribe":
+                hub.update_symbols(subscriber, remove=requested)
+            else:
+                await websocket.send_json({"type": "error", "data": f"Unknown action: {action}"})
+    except (WebSocketDisconnect, json.JSONDecodeError, RuntimeError):
+        pass
+    except Exception as e:
+        logger.error(f"Ticker tape websocket error: {e}")
+    finally:
+        hub.unsubscribe(subscriber)
+        pusher.cancel()
+        try:
+            await pusher
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
 __all__ = ["router"]
\ No newline at end of file
@@ -0,0 +1,508 @@
+"""
+TradingView UDF Datafeed
+========================
+
+One engine behind every TradingView `/bars` request. Symbols are routed by
+prefix to a bar loader (ECB / MNB fixings, EODHD OHLCV), and the loaded
+bars are kept in a per-(symbol, resolution) bar cache:
+
+- Bars are stored as sorted NumPy `t/o/h/l/c/v` arrays together with the
+  time ranges already fetched. A request only fetches the uncovered gaps of
+  its `[from, to]` range, and the result is merged into the cache (a
+  re-fetched bar replaces the stored one).
+- With `countback`, the request is answered from the cache tail when the
+  covered range ending at `to` already holds that many bars; `from` is
+  then ignored, as the UDF protocol allows.
+- The live edge (the last bar of a range ending within one bar of "now")
+  is re-fetched at most once per LIVE_TTL_SECONDS.
+- An empty range returns `noData` with `nextTime` (the closest earlier bar)
+  when the cache knows one.
+
+Resolutions a loader does not serve natively (weekly / monthly / quarterly
+bars of daily fixings, 15- or 240-minute bars of 5- or 60-minute data) are
+resampled from the coarsest native resolution that divides them, with
+vectorized OHLC aggregation, and cached in blocks of BLOCK_PERIODS bars.
+
+An empty loader result is only recorded as covered when cached bars follow
+it (a holiday, or the time before the series starts); otherwise it may be
+a transient upstream failure and is retried on the next request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from backend.utils.logger_config import get_logger
+
+from .resolutions import (
+    normalize_resolution,
+    period_index,
+    period_start,
+    resample_source,
+    resolution_seconds,
+)
+
+logger = get_logger(__name__)
+
+MAX_CACHED_SERIES = 512
+LIVE_TTL_SECONDS = 60.0
+# Periods per cached block of a resampled resolution
+BLOCK_PERIODS = 256
+
+_FIELDS = ("t", "o", "h", "l", "c", "v")
+
+
+@dataclass(frozen=True)
+class Bars:
+    """Time-sorted OHLCV bars as parallel arrays (t = Unix seconds)."""
+
+    t: np.ndarray  # int64
+    o: np.ndarray  # float64
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "Bars":
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0) for _ in range(5)))
+
+    @classmethod
+    def from_columns(
+        cls,
+        t,
+        c,
+        o=None,
+        h=None,
+        l=None,
+        v=None,
+    ) -> "Bars":
+        """Bars from column sequences; missing o/h/l repeat the close (fixings), v defaults to 0."""
+        times = np.asarray(t, dtype=np.int64)
+        close = np.asarray(c, dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+
+        def column(values, default):
+            return (default if values is None else np.asarray(values, dtype=np.float64))[order]
+
+        return cls(
+            times[order],
+            column(o, close),
+            column(h, close),
+            column(l, close),
+            close[order],
+            column(v, np.zeros(len(times))),
+        )
+
+    @classmethod
+    def from_udf(cls, data: Dict[str, Any]) -> "Bars":
+        """Bars from a UDF-style {"s", "t", "c", …} dict (`no_data` → empty)."""
+        if data.get("s") != "ok" or not data.get("t"):
+            return cls.empty()
+        return cls.from_columns(
+            data["t"], data["c"], data.get("o"), data.get("h"), data.get("l"), data.get("v")
+        )
+
+    @classmethod
+    def concat(cls, parts: List["Bars"]) -> "Bars":
+        """Concatenation of time-ordered, non-overlapping parts."""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(part, name) for part in parts]) for name in _FIELDS))
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def _take(self, index) -> "Bars":
+        return Bars(*(getattr(self, name)[index] for name in _FIELDS))
+
+    def window(self, start: Optional[int] = None, end: Optional[int] = None) -> "Bars":
+        """Bars with start <= t <= end."""
+        lo = np.searchsorted(self.t, start, side="left") if start is not None else 0
+        hi = np.searchsorted(self.t, end, side="right") if end is not None else len(self.t)
+        return self._take(slice(lo, hi))
+
+    def tail(self, count: int) -> "Bars":
+        return self._take(slice(max(len(self.t) - count, 0), None))
+
+    def merge(self, newer: "Bars") -> "Bars":
+        """Union by time; on equal t the bar from `newer` wins."""
+        if not len(self):
+            return newer
+        if not len(newer):
+            return self
+        times = np.concatenate((newer.t, self.t))
+        # np.unique keeps the first occurrence (newer) and sorts by t
+        _, index = np.unique(times, return_index=True)
+        return Bars(
+            *(
+                np.concatenate((getattr(newer, name), getattr(self, name)))[index]
+                for name in _FIELDS
+            )
+        )
+
+    def resample(self, resolution: str) -> "Bars":
+        """OHLCV bars of a coarser resolution, labelled with their period start."""
+        if not len(self):
+            return self
+        periods = period_index(self.t, resolution)
+        starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        ends = np.r_[starts[1:], len(periods)] - 1
+        return Bars(
+            period_start(periods[starts], resolution),
+            self.o[starts],
+            np.maximum.reduceat(self.h, starts),
+            np.minimum.reduceat(self.l, starts),
+            self.c[ends],
+            np.add.reduceat(self.v, starts),
+        )
+
+    def to_udf(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"s": "ok"}
+        for name in _FIELDS:
+            payload[name] = getattr(self, name).tolist()
+        return payload
+
+
+# (symbol, from_ts, to_ts, resolution, http_client) → bars in [from_ts, to_ts]
+BarLoader = Callable[[str, int, int, str, Optional[httpx.AsyncClient]], Awaitable[Bars]]
+
+
+@dataclass
+class _Entry:
+    bars: Bars = field(default_factory=Bars.empty)
+    # Disjoint, sorted closed [start, end] ranges already fetched
+    ranges: List[Tuple[int, int]] = field(default_factory=list)
+    # First bar time of the live edge and when it was last fetched
+    live_from: Optional[int] = None
+    live_checked: float = 0.0
+    # Resampled resolutions: complete blocks of BLOCK_PERIODS bars by block number
+    blocks: Dict[int, Bars] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def gaps(self, start: int, end: int, now: float, live_ttl: float) -> List[Tuple[int, int]]:
+        """Parts of [start, end] that have to be fetched."""
+        missing: List[Tuple[int, int]] = []
+        cursor = start
+        for lo, hi in self.ranges:
+            if hi < cursor:
+                continue
+            if lo > end:
+                break
+            if lo > cursor:
+                missing.append((cursor, lo - 1))
+            cursor = max(cursor, hi + 1)
+            if cursor > end:
+                break
+        if cursor <= end:
+            missing.append((cursor, end))
+        if self.live_from is not None and now - self.live_checked < live_ttl:
+            # The live edge was fetched recently enough
+            missing = [
+                (lo, min(hi, self.live_from - 1)) for lo, hi in missing if lo < self.live_from
+            ]
+        return missing
+
+    def covered_from(self, end: int) -> Optional[int]:
+        """Start of the fetched run that reaches `end` (None if `end` is not covered)."""
+        for lo, hi in self.ranges:
+            if lo <= end <= hi:
+                return lo
+        if self.live_from is not None and end >= self.live_from:
+            # The live edge itself is served from the cache until its TTL expires
+            for lo, hi in self.ranges:
+                if hi == self.live_from - 1:
+                    return lo
+            return self.live_from
+        return None
+
+    def add_range(self, start: int, end: int) -> None:
+        if end < start:
+            return
+        merged: List[Tuple[int, int]] = []
+        for lo, hi in sorted(self.ranges + [(start, end)]):
+            if merged and lo <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        self.ranges = merged
+
+
+class BarCache:
+    """LRU of per-(symbol, resolution) bar entries."""
+
+    def __init__(self, max_series: int = MAX_CACHED_SERIES):
+        self.max_series = max_series
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+    def entry(self, symbol: str, resolution: str) -> _Entry:
+        key = (symbol, resolution)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry()
+            while len(self._entries) > self.max_series:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        for key in [k for k in self._entries if symbol is None or k[0] == symbol]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "series": len(self._entries),
+            "bars": sum(len(entry.bars) for entry in self._entries.values()),
+            "blocks": sum(len(entry.blocks) for entry in self._entries.values()),
+        }
+
+
+class UDFDatafeed:
+    """Routes symbols to bar loaders and serves bars through the bar cache."""
+
+    def __init__(
+        self,
+        cache: Optional[BarCache] = None,
+        live_ttl: float = LIVE_TTL_SECONDS,
+    ):
+        self.cache = cache or BarCache()
+        self.live_ttl = live_ttl
+        self._routes: List[Tuple[str, BarLoader, Tuple[str, ...]]] = []
+        self._default: Optional[Tuple[BarLoader, Tuple[str, ...]]] = None
+
+    def register(
+        self,
+        prefix: str,
+        loader: BarLoader,
+        resolutions: Tuple[str, ...] = ("1D",),
+    ) -> None:
+        """Route symbols equal to or starting with `prefix` to `loader`."""
+        self._routes.append((prefix, loader, resolutions))
+        # Longest prefix wins
+        self._routes.sort(key=lambda route: len(route[0]), reverse=True)
+
+    def set_default(self, loader: BarLoader, resolutions: Tuple[str, ...]) -> None:
+        """Loader of every symbol no prefix matches."""
+        self._default = (loader, resolutions)
+
+    def has_prefix_route(self, symbol: str) -> bool:
+        """Whether a registered prefix (not the default loader) serves `symbol`."""
+        return any(symbol.startswith(prefix) for prefix, _, _ in self._routes)
+
+    def route(self, symbol: str) -> Optional[Tuple[BarLoader, Tuple[str, ...]]]:
+        for prefix, loader, resolutions in self._routes:
+            if symbol.startswith(prefix):
+                return loader, resolutions
+        return self._default
+
+    async def _fill(
+        self,
+        entry: _Entry,
+        loader: BarLoader,
+        symbol: str,
+        resolution: str,
+        gaps: List[Tuple[int, int]],
+        client: Optional[httpx.AsyncClient],
+    ) -> None:
+        results = await asyncio.gather(
+            *(loader(symbol, lo, hi, resolution, client) for lo, hi in gaps),
+            return_exceptions=True,
+        )
+        now = time.time()
+        live_after = now - resolution_seconds(resolution)
+        for (lo, hi), bars in zip(gaps, results):
+            if isinstance(bars, Exception):
+                logger.warning(f"[UDF] {symbol} {resolution} load failed for [{lo}, {hi}]: {bars}")
+                continue
+            bars = bars.window(lo, hi)
+            if not len(bars):
+                if len(entry.bars) and entry.bars.t[-1] > hi:
+                    entry.add_range(lo, hi)
+                continue
+            entry.bars = entry.bars.merge(bars)
+            if hi >= live_after:
+                # The last bar may still change: keep it out of the covered ranges
+                entry.live_from = int(bars.t[-1])
+                entry.live_checked = now
+                entry.add_range(lo, entry.live_from - 1)
+            else:
+                entry.add_range(lo, hi)
+
+    async def _ensure(
+        self,
+        entry: _Entry,
+        loader: BarLoader,
+        symbol: str,
+        resolution: str,
+        start: int,
+        end: int,
+        client: Optional[httpx.AsyncClient],
+        countback: Optional[int] = None,
+    ) -> None:
+        """Fetch the parts of [start, end] the entry does not hold yet (caller holds the lock)."""
+        gaps = entry.gaps(start, end, time.time(), self.live_ttl)
+        if countback and gaps:
+            covered = entry.covered_from(end)
+            if covered is not None and len(entry.bars.window(covered, end)) >= countback:
+                # Served from the cache tail; only refresh a stale live edge
+                gaps = [gap for gap in gaps if gap[1] >= end and gap[0] > covered]
+        if gaps:
+            logger.debug(f"[UDF] {symbol} {resolution}: fetching {len(gaps)} gap(s)")
+            await self._fill(entry, loader, symbol, resolution, gaps, client)
+
+    async def _native_bars(
+        self,
+        loader: BarLoader,
+        symbol: str,
+        resolution: str,
+        from_ts: int,
+        to_ts: int,
+        countback: Optional[int],
+        client: Optional[httpx.AsyncClient],
+    ) -> Tuple[Bars, Bars]:
+        """(bars to return, all cached bars) of a resolution the loader serves."""
+        entry = self.cache.entry(symbol, resolution)
+        async with entry.lock:
+            await self._ensure(
+                entry, loader, symbol, resolution, from_ts, to_ts, client, countback
+            )
+            if countback:
+                start = entry.covered_from(to_ts)
+                window = entry.bars.window(
+                    min(from_ts, start) if start is not None else from_ts, to_ts
+                )
+                return window.tail(countback), entry.bars
+            return entry.bars.window(from_ts, to_ts), entry.bars
+
+    async def _resampled_bars(
+        self,
+        loader: BarLoader,
+        source: str,
+        symbol: str,
+        resolution: str,
+        from_ts: int,
+        to_ts: int,
+        countback: Optional[int],
+        client: Optional[httpx.AsyncClient],
+    ) -> Tuple[Bars, Bars]:
+        """
+        (bars to return, earlier source bars) of a resolution resampled from `source`.
+
+        Resampled bars are cached in blocks of BLOCK_PERIODS periods. A block
+        is kept once it lies entirely before the live edge and its source
+        range is fully fetched; the live block is rebuilt on every request
+        (from cached source bars within LIVE_TTL_SECONDS).
+        """
+        first, last = (int(i) for i in period_index(np.array([from_ts, to_ts]), resolution))
+        if countback:
+            first = min(first, last - countback + 1)
+        numbers = range(first // BLOCK_PERIODS, last // BLOCK_PERIODS + 1)
+
+        def block_range(number: int) -> Tuple[int, int]:
+            lo, hi = period_start(
+                np.array([number, number + 1]) * BLOCK_PERIODS, resolution
+            )
+            return int(lo), int(hi) - 1
+
+        entry = self.cache.entry(symbol, resolution)
+        source_entry = self.cache.entry(symbol, source)
+        async with entry.lock:
+            built: Dict[int, Bars] = {}
+            missing = [number for number in numbers if number not in entry.blocks]
+            if missing:
+                start, end = block_range(missing[0])[0], block_range(missing[-1])[1]
+                async with source_entry.lock:
+                    # Source bars never reach past now; no need to ask beyond it
+                    end = min(end, max(int(time.time()), start))
+                    await self._ensure(source_entry, loader, symbol, source, start, end, client)
+                    live_after = time.time() - resolution_seconds(source)
+                    for number in missing:
+                        lo, hi = block_range(number)
+                        built[number] = source_entry.bars.window(lo, hi).resample(resolution)
+                        if hi < live_after and not source_entry.gaps(lo, hi, 0.0, 0.0):
+                            entry.blocks[number] = built[number]
+            bars = Bars.concat(
+                [entry.blocks[number] if number in entry.blocks else built[number] for number in numbers]
+            )
+
+        window = bars.window(int(period_start(np.array([first]), resolution)[0]), to_ts)
+        if countback:
+            window = window.tail(countback)
+        return window, source_entry.bars
+
+    async def get_bars(
+        self,
+        symbol: str,
+        resolution: str,
+        from_ts: int,
+        to_ts: int,
+        countback: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> Dict[str, Any]:
+        """UDF `/history` response for [from_ts, to_ts] (or the `countback` bars up to to_ts)."""
+        resolution = normalize_resolution(resolution)
+        route = self.route(symbol)
+        if route is None:
+            return {"s": "error", "errmsg": f"Symbol {symbol} not supported"}
+        loader, resolutions = route
+        source = None if resolution in resolutions else resample_source(resolution, resolutions)
+        if resolution not in resolutions and source is None:
+            return {
+                "s": "error",
+                "errmsg": f"Resolution {resolution} not supported for {symbol}",
+            }
+        if from_ts > to_ts:
+            return {"s": "error", "errmsg": "from must not be after to"}
+
+        if source is None:
+            bars, known = await self._native_bars(
+                loader, symbol, resolution, from_ts, to_ts, countback, client
+            )
+        else:
+            bars, known = await self._resampled_bars(
+                loader, source, symbol, resolution, from_ts, to_ts, countback, client
+            )
+
+        if len(bars):
+            return bars.to_udf()
+        earlier = known.window(None, from_ts - 1)
+        if len(earlier):
+            next_time = earlier.t[-1]
+            if source is not None:
+                next_time = period_start(period_index(earlier.t[-1:], resolution), resolution)[0]
+            return {"s": "no_data", "nextTime": int(next_time)}
+        return {"s": "no_data"}
+
+
+_datafeed: Optional[UDFDatafeed] = None
+
+
+def get_udf_datafeed() -> UDFDatafeed:
+    """Process-wide datafeed with the ECB / MNB and EODHD loaders registered."""
+    global _datafeed
+    if _datafeed is None:
+        from .handlers.history_handler import register_macro_loaders
+        from .tradingview_logic import EODHD_RESOLUTIONS, load_eodhd_bars
+
+        _datafeed = UDFDatafeed()
+        register_macro_loaders(_datafeed)
+        _datafeed.set_default(load_eodhd_bars, EODHD_RESOLUTIONS)
+    return _datafeed
+
+
+__all__ = [
+    "BarCache",
+    "BarLoader",
+    "Bars",
+    "UDFDatafeed",
+    "get_udf_datafeed",
+]
@@ -3,13 +3,11 @@ TradingView UDF bars endpoint for official ECB/MNB financial data.
 Returns OHLC data compatible with TradingView Advanced Chart widget.
 """
 
-from datetime import date, datetime, timedelta
-from typing import Dict, Any, List, Optional
+import calendar
+from datetime import date, datetime, timezone
+from typing import Dict, Any, List, Optional, Awaitable, Callable, Tuple
 from fastapi import APIRouter, Query, HTTPException, Request
 from backend.utils.logger_config import get_logger
-# from backend.core.fetchers.macro.ecb_client.specials.euribor_client import (
-#     fetch_ecb_estr_rate,  # Function not implemented
-# )
 from backend.core.fetchers.macro.ecb_client.specials.yc_fetcher import (
     fetch_yield_curve_rates,
 )
@@ -22,8 +20,23 @@ from backend.core.fetchers.macro.ecb_client.specials.fx_rates_fetcher import (
 from backend.core.fetchers.macro.ecb_client.specials.euribor_client import (
     fetch_official_euribor_rates,
 )
-from backend.core.fetchers.macro.ecb_client.specials.bubor_client import (
-    fetch_bubor_curve,
+from backend.core.warehouse import ECB, get_macro_warehouse, get_warehouse_sync
+from backend.core.warehouse.bubor import (
+    BUBOR_TENORS,
+    BuborUnavailableError,
+    get_bubor_pipeline,
+)
+from backend.core.warehouse.snapshot import ECB_INDICATORS
+
+from backend.api.endpoints.tradingview.datafeed import (
+    BarLoader,
+    Bars,
+    UDFDatafeed,
+    get_udf_datafeed,
+)
+from backend.api.endpoints.tradingview.resolutions import (
+    normalize_resolution,
+    resolution_seconds,
 )
 
 logger = get_logger(__name__)
@@ -32,8 +45,34 @@ router = APIRouter()
 
 
 def unix_timestamp(dt: date) -> int:
-    """Convert date to Unix timestamp (seconds)."""
-    return int(datetime.combine(dt, datetime.min.time()).timestamp())
+    """Convert date to Unix timestamp (seconds, midnight UTC as TradingView expects)."""
+    return calendar.timegm(dt.timetuple())
+
+
+def _utc_date(ts: int) -> date:
+    return datetime.fromtimestamp(max(ts, 0), tz=timezone.utc).date()
+
+
+def clamp_to_plan(
+    request: Request,
+    resolution: str,
+    from_ts: int,
+    to_ts: int,
+    countback: Optional[int],
+) -> Tuple[int, Optional[int]]:
+    """Soft paywall: clamp `from` to the plan's history window (7 days free,
+    365 otherwise) and cap `countback`, which overrides `from`, to the bars
+    of `resolution` that fit in the same window."""
+    plan = request.session.get("plan", "free") if "session" in request.scope else "free"
+    max_seconds = (7 if plan == "free" else 365) * 86400
+    from_ts = max(from_ts, to_ts - max_seconds)
+    if countback:
+        try:
+            bar_seconds = resolution_seconds(normalize_resolution(resolution))
+        except ValueError:
+            bar_seconds = 86400
+        countback = min(countback, max_seconds // bar_seconds + 1)
+    return from_ts, countback
 
 
 def parse_date_param(date_str: str) -> date:
@@ -56,7 +95,9 @@ async def get_bars(
     symbol: str = Query(
         ..., description="Symbol (e.g., EURIBOR_3M, BUBOR_3M, YC_SR_10Y)"
     ),
-    period: str = Query("1D", description="Time period (1D only supported)"),
+    period: str = Query(
+        "1D", description="Resolution (1D, or 1W / 1M / 3M / 12M resampled from daily fixings)"
+    ),
     from_date: str = Query(
         ..., alias="from", description="Start date (YYYY-MM-DD or Unix timestamp)"
     ),
@@ -86,10 +127,6 @@ async def get_bars(
         f"Fetching TradingView bars for {symbol}, period={period}, from={from_date}, to={to_date}"
     )
 
-    # Validate period
-    if period != "1D":
-        raise HTTPException(status_code=400, detail="Only 1D period is supported")
-
     # Parse date parameters
     start_date = parse_date_param(from_date)
     end_date = parse_date_param(to_date)
@@ -100,79 +137,70 @@ async def get_bars(
         )
 
     # Soft paywall – limit history window by plan
-    plan = (
-        request.session.get("plan", "free") if hasattr(request, "session") else "free"
+    from_ts, countback = clamp_to_plan(
+        request, period, unix_timestamp(start_date), unix_timestamp(end_date), countback
     )
-    max_days = 7 if plan == "free" else 365
-    if (end_date - start_date).days > max_days:
-        # Clamp start_date to allowed window
-        start_date = end_date - timedelta(days=max_days)
 
-    # Route to appropriate data fetcher based on symbol
-    try:
-        if symbol == "ESTR_ON":
-            data = await fetch_estr_data(start_date, end_date)
-        elif symbol.startswith("EURIBOR_"):
-            # Use ECB SDMX FM dataflow for Euribor HSTA data
-            data = await fetch_euribor_hsta_data(symbol, start_date, end_date)
-        elif symbol.startswith("BUBOR_"):
-            data = await fetch_bubor_data(symbol, start_date, end_date)
-        elif symbol.startswith("YC_SR_"):
-            # Implemented: ECB SDMX YC dataflow for yield curve
-            data = await fetch_yield_curve_data(symbol, start_date, end_date)
-        elif symbol.startswith("ECB_"):
-            # Implemented: ECB SDMX FM dataflow for policy rates
-            data = await fetch_policy_rate_data(symbol, start_date, end_date)
-        elif symbol.startswith("EUR_"):
-            # Implemented: ECB SDMX EXR dataflow for FX rates
-            data = await fetch_fx_rate_data(symbol, start_date, end_date)
-        else:
-            raise HTTPException(
-                status_code=404, detail=f"Symbol {symbol} not supported"
-            )
+    # Served through the UDF datafeed (bar cache + countback from the cache tail)
+    return await get_udf_datafeed().get_bars(
+        symbol, period, from_ts, unix_timestamp(end_date), countback=countback
+    )
 
-        # Apply countback if specified
-        if countback and len(data["t"]) > countback:
-            for key in ["t", "c", "o", "h", "l", "v"]:
-                data[key] = data[key][-countback:]
 
-        logger.info(f"Returning {len(data['t'])} bars for {symbol}")
-        return data
+def _macro_loader(fetch: Callable[[str, date, date], Awaitable[Dict[str, List]]]) -> BarLoader:
+    """Datafeed loader over one of the date-range fetchers below.
 
-    except Exception as e:
-        logger.error(f"Failed to fetch bars for {symbol}: {e}")
-        return {"s": "no_data", "nextTime": int(datetime.now().timestamp())}
+    The fetchers raise on upstream failures and return `no_data` only for a
+    genuinely empty answer: the datafeed records empty ranges as covered.
+    """
 
+    async def load(symbol: str, from_ts: int, to_ts: int, resolution: str, client=None) -> Bars:
+        return Bars.from_udf(
+            await fetch(symbol, _utc_date(from_ts), _utc_date(to_ts))
+        )
 
-async def fetch_estr_data(start_date: date, end_date: date) -> Dict[str, List]:
-    """Fetch ECB €STR data via official SDMX."""
-    try:
-        estr_data = await fetch_ecb_estr_rate(None, start_date, end_date)
+    return load
 
-        times = []
-        values = []
 
-        for date_str, data in sorted(estr_data.items()):
-            if "ESTR_Rate" in data:
-                times.append(
-                    unix_timestamp(datetime.strptime(date_str, "%Y-%m-%d").date())
-                )
-                values.append(data["ESTR_Rate"])
+def register_macro_loaders(datafeed: UDFDatafeed) -> None:
+    """Route the official ECB / MNB symbols of this module to their fetchers."""
+    datafeed.register(
+        "ESTR_ON", _macro_loader(lambda symbol, start, end: fetch_estr_data(start, end))
+    )
+    datafeed.register("EURIBOR_", _macro_loader(fetch_euribor_hsta_data))
+    datafeed.register("BUBOR_", _macro_loader(fetch_bubor_data))
+    datafeed.register("YC_SR_", _macro_loader(fetch_yield_curve_data))
+    datafeed.register("ECB_", _macro_loader(fetch_policy_rate_data))
+    datafeed.register("EUR_", _macro_loader(fetch_fx_rate_data))
 
-        return {
-            "t": times,
-            "c": values,  # Close
-            "o": values,  # Open (same as close for rates)
-            "h": values,  # High (same as close for rates)
-            "l": values,  # Low (same as close for rates)
-            "v": [0] * len(values),  # Volume (N/A for rates)
-            "s": "ok",
-        }
 
+async def fetch_estr_data(start_date: date, end_date: date) -> Dict[str, List]:
+    """ECB €STR bars from the macro warehouse copy of EST/B.EU000A2X2A25.WT."""
+    spec = ECB_INDICATORS["estr"]
+    try:
+        state, _ = await get_warehouse_sync().ecb(
+            spec["flow"], spec["key"], title=spec["label"], units=spec["units"]
+        )
+        series = (
+            (await get_macro_warehouse().series(ECB, state.series_id, state))
+            .window(start_date.isoformat(), end_date.isoformat())
+            .dropna()
+        )
     except Exception as e:
         logger.error(f"Failed to fetch ECB €STR data: {e}")
         raise HTTPException(status_code=503, detail="ECB €STR data unavailable")
 
+    values = series.values.tolist()
+    return {
+        "t": [unix_timestamp(day) for day in series.dates.tolist()],
+        "c": values,
+        "o": values,
+        "h": values,
+        "l": values,
+        "v": [0] * len(values),
+        "s": "ok",
+    }
+
 
 async def fetch_euribor_hsta_data(
     symbol: str, start_date: date, end_date: date
@@ -229,59 +257,45 @@ async def fetch_euribor_hsta_data(
         }
     except Exception as e:
         logger.error(f"Failed to fetch Euribor data for {symbol}: {e}")
-        return {"s": "no_data"}
+        raise HTTPException(status_code=503, detail="Euribor data unavailable")
 
 
 async def fetch_bubor_data(
     symbol: str, start_date: date, end_date: date
 ) -> Dict[str, List]:
-    """Fetch BUBOR data via MNB source."""
-    try:
-        bubor_data = await fetch_bubor_curve(start_date, end_date, None)
-
-        # Extract tenor from symbol (e.g., BUBOR_3M -> 3M)
-        tenor = symbol.split("_", 1)[1]
-
-        # Map symbol tenor to BUBOR data key
-        tenor_mapping = {
-            "ON": "O/N",
-            "1W": "1W",
-            "1M": "1M",
-            "3M": "3M",
-            "6M": "6M",
-            "12M": "12M",
-        }
-
-        bubor_key = tenor_mapping.get(tenor)
-        if not bubor_key:
-            raise HTTPException(
-                status_code=404, detail=f"BUBOR tenor {tenor} not supported"
-            )
-
-        times = []
-        values = []
-
-        for date_str, data in sorted(bubor_data.items()):
-            if bubor_key in data and data[bubor_key] is not None:
-                times.append(
-                    unix_timestamp(datetime.strptime(date_str, "%Y-%m-%d").date())
-                )
-                values.append(data[bubor_key])
-
-        return {
-            "t": times,
-            "c": values,
-            "o": values,
-            "h": values,
-            "l": values,
-            "v": [0] * len(values),
-            "s": "ok",
-        }
+    """BUBOR bars from the stored MNB fixings (shared BUBOR ingestion pipeline)."""
+    # Extract tenor from symbol (e.g., BUBOR_3M -> 3M, BUBOR_ON -> O/N)
+    tenor = symbol.split("_", 1)[1]
+    if tenor == "ON":
+        tenor = "O/N"
+    if tenor not in BUBOR_TENORS:
+        raise HTTPException(
+            status_code=404, detail=f"BUBOR tenor {tenor} not supported"
+        )
 
-    except Exception as e:
+    try:
+        pipeline = get_bubor_pipeline()
+        await pipeline.refresh()
+        series = (
+            (await pipeline.series(tenor))
+            .window(start_date.isoformat(), end_date.isoformat())
+            .dropna()
+        )
+    except BuborUnavailableError as e:
         logger.error(f"Failed to fetch BUBOR data for {symbol}: {e}")
         raise HTTPException(status_code=503, detail="BUBOR data unavailable")
 
+    values = series.values.tolist()
+    return {
+        "t": [unix_timestamp(day) for day in series.dates.tolist()],
+        "c": values,
+        "o": values,
+        "h": values,
+        "l": values,
+        "v": [0] * len(values),
+        "s": "ok",
+    }
+
 
 async def fetch_yield_curve_data(
     symbol: str, start_date: date, end_date: date
@@ -334,7 +348,7 @@ async def fetch_yield_curve_data(
         }
     except Exception as e:
         logger.error(f"Failed to fetch yield curve data for {symbol}: {e}")
-        return {"s": "no_data"}
+        raise HTTPException(status_code=503, detail="Yield curve data unavailable")
 
 
 async def fetch_policy_rate_data(
@@ -394,7 +408,7 @@ async def fetch_policy_rate_data(
         }
     except Exception as e:
         logger.error(f"Failed to fetch policy rate data for {symbol}: {e}")
-        return {"s": "no_data"}
+        raise HTTPException(status_code=503, detail="ECB policy rate data unavailable")
 
 
 async def fetch_fx_rate_data(
@@ -467,4 +481,4 @@ async def fetch_fx_rate_data(
         }
     except Exception as e:
         logger.error(f"Failed to fetch FX rate data for {symbol}: {e}")
-        return {"s": "no_data"}
+        raise HTTPException(status_code=503, detail="ECB FX rate data unavailable")
@@ -11,6 +11,9 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Daily fixings; the datafeed resamples them to weekly / monthly / quarterly / yearly bars
+MACRO_RESOLUTIONS = ["1D", "1W", "1M", "3M", "12M"]
+
 # Official ECB/MNB symbol definitions for TradingView
 OFFICIAL_SYMBOLS = {
     # =========== FIXING RATES ===========
@@ -25,7 +28,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,  # 3 decimal places
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX EST/B.EU000A2X2A25.WT",
         "license": "CC BY 4.0",
     },
@@ -40,7 +44,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.M.U2.EUR.RT.MM.EURIBOR1WD_.HSTA",
         "license": "CC BY 4.0",
     },
@@ -54,7 +59,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.M.U2.EUR.RT.MM.EURIBOR1MD_.HSTA",
         "license": "CC BY 4.0",
     },
@@ -68,7 +74,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.M.U2.EUR.RT.MM.EURIBOR3MD_.HSTA",
         "license": "CC BY 4.0",
     },
@@ -82,7 +89,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.M.U2.EUR.RT.MM.EURIBOR6MD_.HSTA",
         "license": "CC BY 4.0",
     },
@@ -96,7 +104,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.M.U2.EUR.RT.MM.EURIBOR12MD_.HSTA",
         "license": "CC BY 4.0",
     },
@@ -111,7 +120,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100,  # 2 decimal places
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "MNB XLS https://www.mnb.hu/arfolyamok/bubor",
         "license": "CC BY 4.0",
     },
@@ -125,7 +135,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "MNB XLS https://www.mnb.hu/arfolyamok/bubor",
         "license": "CC BY 4.0",
     },
@@ -139,7 +150,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "MNB XLS https://www.mnb.hu/arfolyamok/bubor",
         "license": "CC BY 4.0",
     },
@@ -153,7 +165,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "MNB XLS https://www.mnb.hu/arfolyamok/bubor",
         "license": "CC BY 4.0",
     },
@@ -167,7 +180,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "MNB XLS https://www.mnb.hu/arfolyamok/bubor",
         "license": "CC BY 4.0",
     },
@@ -181,7 +195,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "MNB XLS https://www.mnb.hu/arfolyamok/bubor",
         "license": "CC BY 4.0",
     },
@@ -196,7 +211,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX YC/B.U2.EUR.4F.G_N_A.SV_C_YM.SR_1Y",
         "license": "CC BY 4.0",
     },
@@ -210,7 +226,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX YC/B.U2.EUR.4F.G_N_A.SV_C_YM.SR_2Y",
         "license": "CC BY 4.0",
     },
@@ -224,7 +241,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX YC/B.U2.EUR.4F.G_N_A.SV_C_YM.SR_5Y",
         "license": "CC BY 4.0",
     },
@@ -238,7 +256,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX YC/B.U2.EUR.4F.G_N_A.SV_C_YM.SR_10Y",
         "license": "CC BY 4.0",
     },
@@ -252,7 +271,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX YC/B.U2.EUR.4F.G_N_A.SV_C_YM.SR_30Y",
         "license": "CC BY 4.0",
     },
@@ -267,7 +287,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.D.EZB.DFR.LEV",
         "license": "CC BY 4.0",
     },
@@ -281,7 +302,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.D.EZB.MRO.LEV",
         "license": "CC BY 4.0",
     },
@@ -295,7 +317,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX FM.D.EZB.MSF.LEV",
         "license": "CC BY 4.0",
     },
@@ -310,7 +333,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 10000,  # 4 decimal places
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX EXR.D.USD.EUR.SP00.A",
         "license": "CC BY 4.0",
     },
@@ -324,7 +348,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 1000,  # 3 decimal places
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX EXR.D.HUF.EUR.SP00.A",
         "license": "CC BY 4.0",
     },
@@ -338,7 +363,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 10000,  # 4 decimal places
         "has_intraday": False,
-        "supported_resolutions": ["1D"],
+        "supported_resolutions": MACRO_RESOLUTIONS,
+        "has_weekly_and_monthly": True,
         "data_source": "ECB SDMX EXR.D.GBP.EUR.SP00.A",
         "license": "CC BY 4.0",
     },
@@ -369,6 +395,7 @@ async def get_symbols() -> List[Dict[str, Any]]:
                 "pricescale": config["pricescale"],
                 "has_intraday": config["has_intraday"],
                 "supported_resolutions": config["supported_resolutions"],
+                "has_weekly_and_monthly": config["has_weekly_and_monthly"],
                 "data_source": config["data_source"],
                 "license": config["license"],
             }
@@ -402,6 +429,7 @@ async def get_symbol_config(symbol: str) -> Dict[str, Any]:
         "pricescale": config["pricescale"],
         "has_intraday": config["has_intraday"],
         "supported_resolutions": config["supported_resolutions"],
+        "has_weekly_and_monthly": config["has_weekly_and_monthly"],
         "data_source": config["data_source"],
         "license": config["license"],
     }
@@ -0,0 +1,117 @@
+"""
+TradingView Resolutions
+=======================
+
+Period arithmetic of the UDF resolutions, vectorized over Unix-second
+arrays. The datafeed uses it to resample the finest stored resolution of
+a symbol into coarser bars.
+
+- Intraday resolutions are minutes ('1', '5', '60', '240', …) and bucket on
+  multiples of their length since the epoch.
+- 'nD' buckets whole days, 'nW' buckets ISO weeks (Monday start), 'nM'
+  buckets calendar months ('3M' = quarter, '12M' = year). Bars are
+  labelled with the start of their period, at midnight UTC.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+_DAY = 86400
+# 1970-01-01 was a Thursday: shifting by 3 days puts week starts on Mondays
+_WEEK_SHIFT = 3
+
+_ALIASES = {
+    "D": "1D",
+    "W": "1W",
+    "M": "1M",
+    "Q": "3M",
+    "1Q": "3M",
+    "Y": "12M",
+    "1Y": "12M",
+}
+
+
+def normalize_resolution(resolution: str) -> str:
+    """TradingView resolution aliases ('D' → '1D', 'Q' → '3M', 'Y' → '12M', …)."""
+    resolution = resolution.strip().upper()
+    return _ALIASES.get(resolution, resolution)
+
+
+def parse_resolution(resolution: str) -> Tuple[str, int]:
+    """('min' | 'D' | 'W' | 'M', count) of a normalized resolution; ValueError if invalid."""
+    unit = resolution[-1:]
+    if unit in ("D", "W", "M"):
+        count = int(resolution[:-1] or 1)
+    else:
+        unit, count = "min", int(resolution)
+    if count < 1:
+        raise ValueError(f"Invalid resolution: {resolution}")
+    return unit, count
+
+
+def resolution_seconds(resolution: str) -> int:
+    """Nominal bar length ('60' → 3600, '1D' → 86400, '1M' → 31 days, …)."""
+    unit, count = parse_resolution(resolution)
+    return count * {"min": 60, "D": _DAY, "W": 7 * _DAY, "M": 31 * _DAY}[unit]
+
+
+def can_resample(base: str, target: str) -> bool:
+    """Whether `target` bars can be built from `base` bars."""
+    try:
+        base_unit, base_count = parse_resolution(base)
+        unit, count = parse_resolution(target)
+    except ValueError:
+        return False
+    if base_unit == "min":
+        # Daily and coarser bars follow exchange sessions, not minute buckets
+        return unit == "min" and count > base_count and count % base_count == 0
+    if base_unit == "D" and base_count == 1:
+        return unit in ("W", "M") or (unit == "D" and count > 1)
+    return unit == base_unit and count > base_count and count % base_count == 0
+
+
+def period_index(t: np.ndarray, resolution: str) -> np.ndarray:
+    """Period number (int64) of each timestamp."""
+    unit, count = parse_resolution(resolution)
+    t = np.asarray(t, dtype=np.int64)
+    if unit == "min":
+        return t // (count * 60)
+    if unit == "D":
+        return t // (count * _DAY)
+    if unit == "W":
+        return (t // _DAY + _WEEK_SHIFT) // (7 * count)
+    months = t.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+    return months // count
+
+
+def period_start(index: np.ndarray, resolution: str) -> np.ndarray:
+    """Start timestamp (int64 seconds) of each period number."""
+    unit, count = parse_resolution(resolution)
+    index = np.asarray(index, dtype=np.int64)
+    if unit == "min":
+        return index * (count * 60)
+    if unit == "D":
+        return index * (count * _DAY)
+    if unit == "W":
+        return (index * 7 * count - _WEEK_SHIFT) * _DAY
+    return (index * count).astype("datetime64[M]").astype("datetime64[s]").astype(np.int64)
+
+
+def resample_source(resolution: str, natives) -> Optional[str]:
+    """Coarsest native resolution `resolution` can be resampled from (fewest bars to read)."""
+    sources = [native for native in natives if can_resample(native, resolution)]
+    return max(sources, key=resolution_seconds) if sources else None
+
+
+__all__ = [
+    "can_resample",
+    "normalize_resolution",
+    "parse_resolution",
+    "period_index",
+    "period_start",
+    "resample_source",
+    "resolution_seconds",
+]
@@ -2,6 +2,13 @@
 
 import datetime
 from typing import Optional, Tuple, List, Dict, Any
+
+import httpx
+import numpy as np
+
+from backend.api.endpoints.tradingview.datafeed import Bars, get_udf_datafeed
+from backend.api.endpoints.tradingview.resolutions import normalize_resolution
+from backend.config.eodhd import settings as eodhd_settings
 from backend.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -41,108 +48,109 @@ def parse_symbol(symbol: str) -> Tuple[str, str]:
     return "BINANCE", symbol
 
 
-# TODO: Implement EODHD fetcher
-# from backend.core.fetchers.eodhd.eodhd_fetcher import EODHDFetcher
+# TradingView resolution → EODHD intraday interval ("1D" uses the EOD endpoint).
+# Other resolutions (15, 30, 240, 1W, 1M, …) are resampled by the datafeed.
+EODHD_INTERVALS = {
+    "1": "1m",      # 1 minute
+    "5": "5m",      # 5 minutes
+    "60": "1h",     # 1 hour
+}
+EODHD_RESOLUTIONS = (*EODHD_INTERVALS, "1D")
+
+_client: Optional[httpx.AsyncClient] = None
+
 
-async def fetch_ohlcv(symbol: str, from_ts: int, to_ts: int, resolution: str) -> List[Dict[str, Any]]:
+def _shared_client() -> httpx.AsyncClient:
+    """Module client for callers without the app-wide `app.state.http_client`."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+def _float_column(items: List[Dict[str, Any]], key: str) -> np.ndarray:
+    return np.array([item.get(key) for item in items], dtype=np.float64)
+
+
+async def fetch_ohlcv(
+    symbol: str,
+    from_ts: int,
+    to_ts: int,
+    resolution: str,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Bars:
     """
-    Fetch OHLCV data from EODHD API and return as a list of dictionaries.
+    Fetch OHLCV bars from the EODHD API (EOD endpoint for 1D, intraday otherwise).
+
+    Raises on transport / HTTP errors so the datafeed does not cache the range.
     """
-    import httpx
-    from datetime import datetime
-    
+    resolution = normalize_resolution(resolution)
     logger.info(f"Fetching OHLCV data for {symbol}, resolution: {resolution}, from: {from_ts}, to: {to_ts}")
-    
-    # Convert timestamps to date strings for EODHD API
-    from_date = datetime.fromtimestamp(from_ts).strftime('%Y-%m-%d')
-    to_date = datetime.fromtimestamp(to_ts).strftime('%Y-%m-%d')
-    
-    logger.info(f"Date range: {from_date} to {to_date}")
-    
-    # Map TradingView resolution to EODHD interval
-    interval_map = {
-        "1": "1m",      # 1 minute
-        "5": "5m",      # 5 minutes
-        "15": "15m",    # 15 minutes
-        "30": "30m",    # 30 minutes
-        "60": "1h",     # 1 hour
-        "1D": "1d",     # 1 day
-    }
-    
-    interval = interval_map.get(resolution)
-    if not interval:
-        logger.error(f"Unsupported resolution: {resolution}")
-        return []
-    
-    # Determine which EODHD endpoint to use
+
     if resolution == "1D":
         # Use end-of-day data for daily resolution
-        url = f"https://eodhd.com/api/eod/{symbol}"
+        url = f"{eodhd_settings.BASE_URL}/eod/{symbol}"
         params = {
-            "api_token": "6819f415c58868.65742188",
-            "from": from_date,
-            "to": to_date,
-            "fmt": "json"
+            "api_token": eodhd_settings.API_KEY,
+            "from": datetime.datetime.utcfromtimestamp(max(from_ts, 0)).strftime("%Y-%m-%d"),
+            "to": datetime.datetime.utcfromtimestamp(max(to_ts, 0)).strftime("%Y-%m-%d"),
+            "fmt": "json",
         }
-        logger.info(f"Using EOD endpoint for daily data")
-    else:
-        # Use intraday data for intraday resolutions
-        url = f"https://eodhd.com/api/intraday/{symbol}"
+    elif resolution in EODHD_INTERVALS:
+        # Use intraday data for intraday resolutions (expects timestamps)
+        url = f"{eodhd_settings.BASE_URL}/intraday/{symbol}"
         params = {
-            "api_token": "6819f415c58868.65742188",
-            "interval": interval,
-            "from": from_ts,  # Intraday API expects timestamps
+            "api_token": eodhd_settings.API_KEY,
+            "interval": EODHD_INTERVALS[resolution],
+            "from": from_ts,
             "to": to_ts,
-            "fmt": "json"
+            "fmt": "json",
         }
-        logger.info(f"Using intraday endpoint for {interval} data")
-    
-    logger.info(f"EODHD URL: {url}")
-    logger.info(f"EODHD params: {params}")
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
-            logger.info(f"EODHD response status: {response.status_code}")
-            response.raise_for_status()
-            data = response.json()
-            logger.info(f"EODHD response data type: {type(data)}")
-            logger.info(f"EODHD response data length: {len(data) if isinstance(data, list) else 'not a list'}")
-            
-            # EODHD EOD API returns a list directly
-            if isinstance(data, list):
-                ohlcv_list = data
-            else:
-                logger.error(f"Unexpected data format: {data}")
-                return []
-            
-            # Transform EODHD data to our format
-            ohlcv_data = []
-            for item in ohlcv_list:
-                # Convert date to timestamp
-                if 'date' in item:
-                    date_str = item['date']
-                    dt = datetime.strptime(date_str, '%Y-%m-%d')
-                    timestamp = int(dt.timestamp())
-                else:
-                    logger.warning(f"No date field in item: {item}")
-                    continue
-                
-                ohlcv_data.append({
-                    "time": timestamp,
-                    "open": float(item.get('open', 0)),
-                    "high": float(item.get('high', 0)),
-                    "low": float(item.get('low', 0)),
-                    "close": float(item.get('close', 0)),
-                    "volume": int(item.get('volume', 0))
-                })
-            
-            logger.info(f"Transformed {len(ohlcv_data)} OHLCV data points")
-            return ohlcv_data
-            
-    except Exception as e:
-        logger.error(f"Error fetching OHLCV data from EODHD for {symbol}: {e}")
-        return []
+    else:
+        raise ValueError(f"Unsupported resolution: {resolution}")
+
+    response = await (client or _shared_client()).get(url, params=params)
+    response.raise_for_status()
+    items = response.json()
+    if not isinstance(items, list):
+        raise ValueError(f"Unexpected EODHD response format for {symbol}")
+
+    items = [item for item in items if item.get("timestamp") or item.get("date")]
+    if not items:
+        return Bars.empty()
+    if "timestamp" in items[0]:
+        times = np.array([item["timestamp"] for item in items], dtype=np.int64)
+    else:
+        # EOD bars: 'YYYY-MM-DD' → midnight UTC
+        times = (
+            np.array([item["date"][:10] for item in items], dtype="datetime64[D]")
+            .astype("datetime64[s]")
+            .astype(np.int64)
+        )
+    bars = Bars.from_columns(
+        times,
+        _float_column(items, "close"),
+        _float_column(items, "open"),
+        _float_column(items, "high"),
+        _float_column(items, "low"),
+        np.nan_to_num(_float_column(items, "volume")),
+    )
+    logger.info(f"Fetched {len(bars)} OHLCV bars for {symbol}")
+    return bars
+
+
+async def load_eodhd_bars(
+    symbol: str,
+    from_ts: int,
+    to_ts: int,
+    resolution: str,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Bars:
+    """Datafeed loader of every symbol without an ECB / MNB prefix."""
+    return await fetch_ohlcv(symbol, from_ts, to_ts, resolution, client)
 
 # Main TradingView UDF bars endpoint logic
 async def get_tradingview_bars(
@@ -151,6 +159,7 @@ async def get_tradingview_bars(
     from_ts: int,
     to_ts: int,
     countback: Optional[int] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -165,29 +174,14 @@ async def get_tradingview_bars(
         "v": [...],  # Volumes
         "nextTime": <int> (optional)
     }
+
+    Bars come from the UDF datafeed: ECB / MNB symbols (ESTR_ON, EURIBOR_*,
+    BUBOR_*, YC_SR_*, ECB_*, EUR_*) from the official sources, everything
+    else from EODHD, with already fetched ranges served from the bar cache.
     """
-    exchange, base = parse_symbol(symbol)
-    ohlcv_data = await fetch_ohlcv(symbol, from_ts, to_ts, resolution)
-    if not ohlcv_data:
-        return {"s": "no_data"}
-    
-    # Filter by time range
-    filtered_data = [item for item in ohlcv_data if from_ts <= item['time'] <= to_ts]
-    if countback is not None:
-        filtered_data = filtered_data[-countback:]
-    if not filtered_data:
-        return {"s": "no_data"}
-    
-    result = {
-        "s": "ok",
-        "t": [item['time'] for item in filtered_data],
-        "o": [item['open'] for item in filtered_data],
-        "h": [item['high'] for item in filtered_data],
-        "l": [item['low'] for item in filtered_data],
-        "c": [item['close'] for item in filtered_data],
-        "v": [item['volume'] for item in filtered_data],
-    }
-    return result
+    return await get_udf_datafeed().get_bars(
+        symbol, resolution, from_ts, to_ts, countback=countback, client=http_client
+    )
 
 
 # TradingView symbols configuration
@@ -203,7 +197,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100,
         "has_intraday": True,
-        "supported_resolutions": ["1", "5", "15", "30", "60", "1D"],
+        "supported_resolutions": ["1", "5", "15", "30", "60", "240", "1D", "1W", "1M"],
+        "has_weekly_and_monthly": True,
         "data_source": "EODHD",
         "license": "Commercial",
     },
@@ -217,7 +212,8 @@ OFFICIAL_SYMBOLS = {
         "minmov": 1,
         "pricescale": 100000,
         "has_intraday": True,
-        "supported_resolutions": ["1", "5", "15", "30", "60", "1D"],
+        "supported_resolutions": ["1", "5", "15", "30", "60", "240", "1D", "1W", "1M"],
+        "has_weekly_and_monthly": True,
         "data_source": "EODHD",
         "license": "Commercial",
     },
@@ -246,6 +242,7 @@ async def get_symbols() -> List[Dict[str, Any]]:
                 "pricescale": config["pricescale"],
                 "has_intraday": config["has_intraday"],
                 "supported_resolutions": config["supported_resolutions"],
+                "has_weekly_and_monthly": config["has_weekly_and_monthly"],
                 "data_source": config["data_source"],
                 "license": config["license"],
             }
@@ -276,6 +273,7 @@ async def get_symbol_config(symbol: str) -> Dict[str, Any]:
         "pricescale": config["pricescale"],
         "has_intraday": config["has_intraday"],
         "supported_resolutions": config["supported_resolutions"],
+        "has_weekly_and_monthly": config["has_weekly_and_monthly"],
         "data_source": config["data_source"],
         "license": config["license"],
     }
\ No newline at end of file
@@ -1,5 +1,9 @@
  
-from fastapi import APIRouter, Query
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request
+from backend.api.endpoints.tradingview.datafeed import get_udf_datafeed
+from backend.api.endpoints.tradingview.handlers.history_handler import clamp_to_plan
 from backend.api.endpoints.tradingview.tradingview_logic import (
     get_symbols,
     get_symbol_config,
@@ -18,9 +22,23 @@ async def symbol_config(symbol: str):
 
 @router.get("/bars")
 async def bars(
+    request: Request,
     symbol: str = Query(...),
     resolution: str = Query(...),
     from_: int = Query(..., alias="from"),
     to: int = Query(...),
+    countback: Optional[int] = Query(None, ge=1),
 ):
-    return await get_tradingview_bars(symbol=symbol, resolution=resolution, from_ts=from_, to_ts=to)
\ No newline at end of file
+    if get_udf_datafeed().has_prefix_route(symbol):
+        # ECB / MNB symbols: same plan window and countback cap as history_handler.get_bars
+        from_, countback = clamp_to_plan(
+            request, resolution, from_, to, countback
+        )
+    return await get_tradingview_bars(
+        symbol=symbol,
+        resolution=resolution,
+        from_ts=from_,
+        to_ts=to,
+        countback=countback,
+        http_client=getattr(request.app.state, "http_client", None),
+    )
@@ -216,11 +216,10 @@ logger.info("✅ Market data router loaded successfully.")
 # ---------------------------------------------------------------------------
 
 # NOTE: This uses the lightweight yfinance library that is already a dependency
-# elsewhere in FinanceHub. For three symbols the blocking cost is negligible,
-# but we still run it in a thread-pool so the event-loop remains responsive.
+# elsewhere in FinanceHub. The calls block, so they run on the managed yfinance
+# executor (bounded, with a timeout) and the event-loop remains responsive.
 
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from backend.core.performance.executors import YFINANCE, run_blocking
 
 try:
     import yfinance as yf  # Lazy import – only needed for this endpoint
@@ -272,9 +271,7 @@ async def get_market_indices(
             )
         return result
 
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as pool:
-        indices_data = await loop.run_in_executor(pool, _fetch)
+    indices_data = await run_blocking(YFINANCE, _fetch)
 
     if not indices_data:
         raise HTTPException(
@@ -22,10 +22,14 @@ from fastapi.responses import RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from backend.middleware.deprecated_monitor import DeprecatedRouteMonitorMiddleware
 from backend.api import api_router
 from backend.config import settings
-from backend.core.metrics import METRICS_EXPORTER, get_metrics_router
+from backend.core.metrics import (
+    METRICS_EXPORTER,
+    SERVICE_METRICS,
+    LoopLagMonitor,
+    get_metrics_router,
+)
 from backend.core.openapi import custom_openapi
 from backend.utils.cache_service import CacheService
 from backend.utils.logger_config import get_logger
@@ -115,6 +119,66 @@ async def lifespan(app: FastAPI):
         )
         app.state.cache = None
 
+    # ------------------------------------------------------------------
+    # Pool gauges (read at /metrics scrape time) and event-loop lag sampling
+    # ------------------------------------------------------------------
+    from backend.core.metrics.service_metrics import (
+        database_pool_source,
+        httpx_pool_source,
+        redis_pool_source,
+    )
+
+    try:
+        from backend.core.performance.database_pool import main_db_pool
+
+        SERVICE_METRICS.register_pool("postgres", database_pool_source(main_db_pool))
+        for replica in main_db_pool.replicas:
+            SERVICE_METRICS.register_pool(
+                f"postgres_replica:{replica.name}", database_pool_source(replica)
+            )
+    except Exception as e:
+        lifespan_logger.warning(f"Database pool metrics unavailable: {e}")
+    if getattr(app.state, "http_client", None):
+        SERVICE_METRICS.register_pool("httpx", httpx_pool_source(app.state.http_client))
+    if getattr(app.state, "cache", None) is not None:
+        SERVICE_METRICS.register_pool(
+            "redis_cache",
+            redis_pool_source(
+                lambda: getattr(getattr(app.state, "cache", None), "_connection_pool", None)
+            ),
+        )
+    app.state.loop_lag_monitor = LoopLagMonitor(SERVICE_METRICS)
+    app.state.loop_lag_monitor.start()
+    if settings.DIAGNOSTICS.STALL_DETECTION_ENABLED:
+        from backend.core.metrics.loop_diagnostics import get_loop_stall_detector
+
+        get_loop_stall_detector().start()
+
+    # Replicate token revocations from Redis (the pipeline registered its
+    # client when the middleware stack was built, before startup)
+    from backend.middleware.jwt_auth.revocation import start_revocation_listeners
+
+    await start_revocation_listeners()
+
+    # Keep the local FRED series catalog harvested
+    app.state.catalog_refresher = None
+    fred_api_key = os.getenv("FINBOT_API_KEYS__FRED")
+    if settings.MACRO_WAREHOUSE.CATALOG_ENABLED and fred_api_key:
+        from backend.core.warehouse import CatalogRefresher, get_series_catalog
+
+        app.state.catalog_refresher = CatalogRefresher(get_series_catalog(), fred_api_key)
+        app.state.catalog_refresher.start()
+        lifespan_logger.info("✅ FRED series catalog refresher started.")
+
+    # Keep the macro dashboard snapshot materialized
+    app.state.macro_snapshot_job = None
+    if settings.MACRO_WAREHOUSE.ENABLED and settings.MACRO_WAREHOUSE.SNAPSHOT_ENABLED:
+        from backend.core.warehouse import MacroSnapshotJob, get_macro_snapshot_service
+
+        app.state.macro_snapshot_job = MacroSnapshotJob(get_macro_snapshot_service())
+        app.state.macro_snapshot_job.start()
+        lifespan_logger.info("✅ Macro snapshot job started.")
+
     # ------------------------------------------------------------------
     # Initialise StockOrchestrator so chat / premium endpoints get a live instance
     # ------------------------------------------------------------------
@@ -165,6 +229,18 @@ async def lifespan(app: FastAPI):
     # Shutdown sequence
     lifespan_logger.info("Application shutdown sequence initiated...")
 
+    await app.state.loop_lag_monitor.stop()
+    from backend.core.metrics.loop_diagnostics import get_loop_stall_detector
+
+    await get_loop_stall_detector().stop()
+    from backend.middleware.jwt_auth.revocation import stop_revocation_listeners
+
+    await stop_revocation_listeners()
+    if app.state.catalog_refresher is not None:
+        await app.state.catalog_refresher.stop()
+    if app.state.macro_snapshot_job is not None:
+        await app.state.macro_snapshot_job.stop()
+
     # Close Database Pool
     try:
         from backend.core.performance.database_pool import main_db_pool
@@ -184,6 +260,26 @@ async def lifespan(app: FastAPI):
         await app.state.cache.close()
         lifespan_logger.info("✅ CacheService connection closed.")
 
+    # Flush pending trace spans
+    try:
+        from backend.core.metrics.tracing import get_span_exporter
+
+        await get_span_exporter().close()
+    except Exception as e:
+        lifespan_logger.error(f"Error flushing trace spans: {e}")
+
+    # Close the macro warehouse and series catalog files
+    from backend.core.warehouse import close_macro_warehouse, close_series_catalog
+
+    close_macro_warehouse()
+    close_series_catalog()
+
+    # Stop managed executor pools (queued calls are cancelled)
+    from backend.core.performance.executors import shutdown_executors
+
+    shutdown_executors()
+    lifespan_logger.info("✅ Executor pools shut down.")
+
     lifespan_logger.info("Shutdown complete.")
 
 
@@ -240,6 +336,26 @@ def create_app(lite: bool = False) -> FastAPI:
 
     # --- Full Application Setup ---
     # --- Middleware Setup ---
+    # Starlette wraps in reverse order of registration: the request pipeline
+    # (auth + rate limit + timing, pure ASGI) is innermost, CORS outermost so
+    # preflight requests are answered before authentication.
+    from backend.middleware.pipeline import create_request_pipeline
+
+    # Get JWT secret key from environment
+    jwt_secret_key = os.getenv("GOOGLE_AUTH_SECRET_KEY", "default-secret-key-change-in-production")
+
+    # Redis makes the rate limits and token revocations hold across workers
+    from backend.utils.cache_service import REDIS_MODE
+
+    app.add_middleware(
+        create_request_pipeline,
+        secret_key=jwt_secret_key,
+        redis_url=settings.REDIS.CACHE_URL,
+        algorithm="HS256",
+        enable_redis=settings.CACHE.ENABLED and REDIS_MODE,
+        enable_rate_limit=settings.RATE_LIMIT_ENABLED,
+    )
+
     # Session Middleware for Google OAuth
     if settings.GOOGLE_AUTH.ENABLED:
         # Decide cookie flags based on redirect URI host/scheme to guarantee
@@ -297,28 +413,10 @@ def create_app(lite: bool = False) -> FastAPI:
         max_age=3600,
     )
 
-    # Deprecated route monitor – counts alias usage
-    async def _get_cache(request: Request):  # noqa: D401
-        return getattr(request.app.state, "cache", None)
-
-    app.add_middleware(
-        DeprecatedRouteMonitorMiddleware, cache_service_factory=_get_cache
-    )
+    # Request metrics wrap everything (incl. CORS preflight and auth rejects)
+    from backend.middleware.request_metrics import RequestMetricsMiddleware
 
-    # --- JWT Authentication Middleware ---
-    from backend.middleware.jwt_auth.factory import create_jwt_middleware
-    
-    # Get JWT secret key from environment
-    jwt_secret_key = os.getenv("GOOGLE_AUTH_SECRET_KEY", "default-secret-key-change-in-production")
-    
-    # Add JWT middleware
-    app.add_middleware(
-        create_jwt_middleware,
-        secret_key=jwt_secret_key,
-        algorithm="HS256",
-        token_expiration=900,  # 15 minutes
-        enable_redis=True
-    )
+    app.add_middleware(RequestMetricsMiddleware)
 
     # --- API Router Registration ---
     # The routers are imported here, inside the factory, to prevent
@@ -28,6 +28,19 @@ class AISettings(BaseModel):
     TIMEOUT_SECONDS: float = 180.0
     RETRY_ON_NO_DATA_WITH_SUCCESS_STATUS: bool = Field(default=True)
     AI_PRICE_DAYS_FOR_PROMPT: int = Field(default=60)
+    ADAPTIVE_MODEL_SELECTION: bool = Field(default=True)
+    STREAM_FLUSH_INTERVAL_MS: int = Field(default=30, ge=0)
+    STREAM_MAX_FRAME_CHARS: int = Field(default=256, ge=1)
+    STREAM_MAX_QUEUE: int = Field(default=256, ge=1)
+    TRAFFIC_LOG_PATH: str | None = Field(
+        default=None,
+        description="JSONL fájl a gateway kérés-mintáinak rögzítéséhez (replay harness).",
+    )
+    MODEL_STATS_MAX_AGE_SECONDS: float | None = Field(
+        default=900.0,
+        gt=0,
+        description="Ennyi ideig minta nélküli modell statisztikája elavul; a választó a priorokat használja, így a kizárt modell újra forgalmat kap.",
+    )
 
     @field_validator("PROVIDER")
     @classmethod
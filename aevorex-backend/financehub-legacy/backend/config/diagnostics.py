@@ -0,0 +1,28 @@
+"""
+Event-loop diagnostics settings.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class DiagnosticsSettings(BaseModel):
+    """Loop stall detection and the admin sampling profiler (backend.core.metrics.loop_diagnostics)."""
+
+    STALL_DETECTION_ENABLED: bool = Field(
+        default=True, description="Run the event-loop watchdog thread"
+    )
+    STALL_THRESHOLD_MS: float = Field(
+        default=100.0, gt=0, description="Loop blocked longer than this is a stall"
+    )
+    WATCHDOG_INTERVAL_MS: float = Field(
+        default=20.0, gt=0, description="Heartbeat / watchdog check interval"
+    )
+    STALL_HISTORY: int = Field(
+        default=50, ge=1, description="Recent stalls (with stacks) kept in memory"
+    )
+    PROFILER_MAX_SECONDS: float = Field(
+        default=30.0, gt=0, description="Upper bound for one profiling run"
+    )
+    PROFILER_INTERVAL_MS: float = Field(
+        default=5.0, gt=0, description="Default sampling interval of the profiler"
+    )
@@ -0,0 +1,30 @@
+"""
+Managed executor pool settings.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class ExecutorSettings(BaseModel):
+    """Pools for blocking SDK calls and CPU-heavy parsing (backend.core.performance.executors)."""
+
+    YFINANCE_WORKERS: int = Field(default=8, ge=1, description="yfinance threads")
+    YFINANCE_QUEUE: int = Field(
+        default=64, ge=0, description="yfinance calls allowed to wait for a thread"
+    )
+    YFINANCE_TIMEOUT_SECONDS: float = Field(default=20.0, gt=0)
+
+    IO_WORKERS: int = Field(
+        default=8, ge=1, description="Threads for other blocking I/O (scrapers, files)"
+    )
+    IO_QUEUE: int = Field(default=128, ge=0)
+    IO_TIMEOUT_SECONDS: float = Field(default=30.0, gt=0)
+
+    CPU_WORKERS: int = Field(
+        default=2, ge=1, description="Processes for parsing / DataFrame transforms"
+    )
+    CPU_QUEUE: int = Field(default=16, ge=0)
+    CPU_TIMEOUT_SECONDS: float = Field(default=60.0, gt=0)
+    CPU_USE_PROCESSES: bool = Field(
+        default=True, description="False runs the CPU pool on threads (e.g. in tests)"
+    )
@@ -21,6 +21,10 @@ class RedisSettings(BaseModel):
     LOCK_TTL_SECONDS: PositiveInt = Field(default=120)
     LOCK_RETRY_DELAY_SECONDS: PositiveInt = Field(default=1)
 
+    @property
+    def CACHE_URL(self) -> str:
+        return f"redis://{self.HOST}:{self.PORT}/{self.DB_CACHE}"
+
     @property
     def CELERY_BROKER_URL(self) -> str:
         return f"redis://{self.HOST}:{self.PORT}/{self.DB_CELERY_BROKER}"
@@ -45,6 +45,16 @@ class TickerTapeSettings(BaseModel):
     # Update interval (for background tasks if needed)
     update_interval_seconds: PositiveInt = Field(default=60, description="Update interval for background tasks")
 
+    # Streaming hub (WebSocket / SSE fan-out)
+    stream_poll_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="Upstream poll interval of the shared ticker-tape hub; also the max quote age served to HTTP polls",
+    )
+    stream_heartbeat_seconds: PositiveInt = Field(
+        default=20, description="Heartbeat interval for idle ticker-tape streams"
+    )
+
     @field_validator("SYMBOLS", mode="before")
     @classmethod
     def _parse_symbols_list(cls, v: Any) -> list[str]:
@@ -0,0 +1,24 @@
+"""
+Request tracing settings.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class TracingSettings(BaseModel):
+    """Request-level span tracing (see backend.core.metrics.tracing)."""
+
+    ENABLED: bool = Field(default=True, description="Open a trace per API request")
+    SERVER_TIMING: bool = Field(
+        default=True, description="Expose finished phases in the Server-Timing header"
+    )
+    SAMPLE_RATE: float = Field(
+        default=1.0, ge=0.0, le=1.0, description="Share of traces sent to the exporter"
+    )
+    OTLP_ENDPOINT: str | None = Field(
+        default=None,
+        description="OTLP/HTTP collector base URL, e.g. http://localhost:4318",
+    )
+    EXPORT_FILE: str | None = Field(
+        default=None, description="Append finished spans as OTLP JSON lines"
+    )
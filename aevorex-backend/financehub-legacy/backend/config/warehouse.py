@@ -0,0 +1,81 @@
+"""
+Macro time-series warehouse settings.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class MacroWarehouseSettings(BaseModel):
+    """Local store of macro series with incremental provider sync (backend.core.warehouse)."""
+
+    ENABLED: bool = Field(
+        default=True, description="Serve FRED / ECB observations from the local warehouse"
+    )
+    PATH: str | None = Field(
+        default=None,
+        description="SQLite file (default: <PROJECT_ROOT>/data/macro_warehouse.sqlite3)",
+    )
+    SYNC_INTERVAL_MINUTES: float = Field(
+        default=60.0,
+        gt=0,
+        description="How often a series is checked upstream; unchanged series transfer no observations",
+    )
+    REVISION_LOOKBACK_DAYS: int = Field(
+        default=400,
+        ge=0,
+        description="Delta syncs refetch this far back from the last stored observation to pick up revisions",
+    )
+    FULL_RESYNC_DAYS: int = Field(
+        default=30,
+        ge=1,
+        description="Refetch the full history this often (benchmark revisions)",
+    )
+    ARRAY_CACHE_SERIES: int = Field(
+        default=256,
+        ge=1,
+        description="Series kept in memory as NumPy arrays for local transforms",
+    )
+    BATCH_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        description="Series synced in parallel by one multi-series request",
+    )
+    CATALOG_ENABLED: bool = Field(
+        default=True,
+        description="Answer FRED search / related / category requests from the local series catalog",
+    )
+    CATALOG_PATH: str | None = Field(
+        default=None,
+        description="SQLite file of the catalog (default: <PROJECT_ROOT>/data/fred_catalog.sqlite3)",
+    )
+    CATALOG_REFRESH_HOURS: float = Field(
+        default=24.0, gt=0, description="How often the category tree is re-harvested"
+    )
+    CATALOG_MAX_CATEGORIES: int = Field(
+        default=400, ge=1, description="Categories visited per harvest (breadth-first from the root)"
+    )
+    CATALOG_SERIES_PER_CATEGORY: int = Field(
+        default=100, ge=1, le=1000, description="Most popular series stored per category"
+    )
+    CATALOG_REQUESTS_PER_MINUTE: int = Field(
+        default=100, ge=1, description="Harvest request rate (FRED allows 120 per minute per key)"
+    )
+    UST_CURVE_START_YEAR: int = Field(
+        default=1990,
+        ge=1990,
+        description="First year of Treasury par-yield curves read into the curve surface",
+    )
+    SNAPSHOT_ENABLED: bool = Field(
+        default=True,
+        description="Materialize the macro dashboard snapshot in the background",
+    )
+    SNAPSHOT_INTERVAL_MINUTES: float = Field(
+        default=15.0,
+        gt=0,
+        description="How often the snapshot is rebuilt from the warehouse (sources keep their own sync interval)",
+    )
+    SNAPSHOT_HISTORY: int = Field(
+        default=32,
+        ge=1,
+        description="Recent snapshot versions clients can request deltas against",
+    )
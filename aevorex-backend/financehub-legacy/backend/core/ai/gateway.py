@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-import json
+import time
 from typing import AsyncGenerator
 
 import httpx
 
 from backend.config import settings
+from backend.core.ai.stream_relay import StreamDone, extract_delta_content
+from backend.core.ai.token_utils import estimate_tokens
+from backend.core.metrics import METRICS_EXPORTER, MODEL_STATS, RequestSample
+from backend.core.metrics.tracing import span
 
 
 class OpenRouterGateway:
@@ -21,6 +25,8 @@ class OpenRouterGateway:
         messages: list[dict],
         temperature: float,
         max_output_tokens: int,
+        query_type: str | None = None,
+        plan: str | None = None,
     ) -> AsyncGenerator[str, None]:
         api_key = (
             settings.API_KEYS.OPENROUTER.get_secret_value()
@@ -51,31 +57,56 @@ class OpenRouterGateway:
         }
         url = "https://openrouter.ai/api/v1/chat/completions"
 
-        async with self.client.stream(
-            "POST",
-            url,
-            headers=headers,
-            json=payload,
-            timeout=settings.AI.TIMEOUT_SECONDS,
-        ) as resp:
-            resp.raise_for_status()
-            async for line in resp.aiter_lines():
-                if not line:
-                    continue
-                if line.startswith("data: "):
-                    data = line[len("data: ") :]
-                    if data.strip() == "[DONE]":
-                        break
-                    try:
-                        obj = json.loads(data)
-                        delta = (
-                            obj.get("choices", [{}])[0].get("delta", {}).get("content")
-                        )
-                        if delta:
-                            yield delta
-                    except Exception:
-                        # best‑effort: ignore malformed chunks
-                        continue
+        sample = RequestSample(
+            model_id=model,
+            query_type=query_type,
+            plan=plan,
+            context_tokens=sum(estimate_tokens(m.get("content", "")) for m in messages),
+        )
+        t0 = time.perf_counter()
+        out_chars = 0
+        # Not activated: this generator's body interleaves with the consumer
+        with span("llm.stream", activate=False, model=model) as stream_span:
+            try:
+                async with self.client.stream(
+                    "POST",
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=settings.AI.TIMEOUT_SECONDS,
+                ) as resp:
+                    resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        if not line:
+                            continue
+                        try:
+                            delta = extract_delta_content(line)
+                        except StreamDone:
+                            break
+                        if not delta:
+                            # best‑effort: ignore keep-alives and malformed chunks
+                            continue
+                        if sample.first_token_ms is None:
+                            sample.first_token_ms = (time.perf_counter() - t0) * 1000.0
+                            METRICS_EXPORTER.observe_first_token(
+                                "gateway", model, sample.first_token_ms
+                            )
+                        out_chars += len(delta)
+                        yield delta
+            except Exception:
+                sample.error = True
+                raise
+            finally:
+                sample.duration_s = time.perf_counter() - t0
+                sample.output_tokens = max(1, out_chars // 4) if out_chars else 0
+                if stream_span is not None:
+                    stream_span.set(
+                        first_token_ms=sample.first_token_ms or 0.0,
+                        output_tokens=sample.output_tokens,
+                    )
+                MODEL_STATS.record(sample)
+                if not sample.error:
+                    METRICS_EXPORTER.observe_response("gateway", model, sample.duration_s)
 
     async def completion(
         self,
@@ -84,6 +115,8 @@ class OpenRouterGateway:
         messages: list[dict],
         temperature: float,
         max_output_tokens: int,
+        query_type: str | None = None,
+        plan: str | None = None,
     ) -> str:
         """Non-streaming completion for single response generation."""
         api_key = (
@@ -115,10 +148,34 @@ class OpenRouterGateway:
         }
         url = "https://openrouter.ai/api/v1/chat/completions"
 
-        response = await self.client.post(
-            url, headers=headers, json=payload, timeout=settings.AI.TIMEOUT_SECONDS
+        sample = RequestSample(
+            model_id=model,
+            query_type=query_type,
+            plan=plan,
+            context_tokens=sum(estimate_tokens(m.get("content", "")) for m in messages),
+            streamed=False,
         )
-        response.raise_for_status()
+        t0 = time.perf_counter()
+        try:
+            with span("llm.completion", model=model):
+                response = await self.client.post(
+                    url, headers=headers, json=payload, timeout=settings.AI.TIMEOUT_SECONDS
+                )
+                response.raise_for_status()
+                data = response.json()
+        except Exception:
+            sample.error = True
+            sample.duration_s = time.perf_counter() - t0
+            MODEL_STATS.record(sample)
+            raise
 
-        data = response.json()
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        usage = data.get("usage") or {}
+        # Non-streaming: no first-token signal, so no throughput sample either
+        sample.duration_s = time.perf_counter() - t0
+        sample.output_tokens = int(
+            usage.get("completion_tokens") or estimate_tokens(content or "")
+        )
+        MODEL_STATS.record(sample)
+        METRICS_EXPORTER.observe_response("gateway", model, sample.duration_s)
+        return content
@@ -0,0 +1,155 @@
+"""
+Offline replay harness for model-selection policies.
+
+Reads the JSONL traffic log written by `ModelStatsTracker` (enable via
+`FINBOT_AI__TRAFFIC_LOG_PATH`) and evaluates how a selection policy would have
+performed on the recorded requests:
+
+    python -m backend.core.ai.model_replay traffic.jsonl
+
+Each recorded request is replayed in order. The policy only sees statistics
+built from samples *before* the request (no look-ahead); the outcome of its
+choice is estimated from the per-model aggregate over the whole log.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import mean
+from typing import Callable, Iterable
+
+from backend.core.ai.model_selector import (
+    MODEL_PROFILES,
+    PLAN_LATENCY_SLO_MS,
+    AdaptiveModelSelector,
+    SelectedModel,
+    static_select_model,
+)
+from backend.core.metrics.model_stats import DEFAULT_MAX_AGE_S, ModelStatsTracker, RequestSample
+
+Policy = Callable[[RequestSample, ModelStatsTracker], SelectedModel]
+
+
+@dataclass
+class ReplayReport:
+    policy: str
+    requests: int = 0
+    total_cost_usd: float = 0.0
+    mean_latency_ms: float = 0.0
+    slo_violation_rate: float = 0.0
+    expected_error_rate: float = 0.0
+    model_mix: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "policy": self.policy,
+            "requests": self.requests,
+            "total_cost_usd": round(self.total_cost_usd, 6),
+            "mean_latency_ms": round(self.mean_latency_ms, 1),
+            "slo_violation_rate": round(self.slo_violation_rate, 4),
+            "expected_error_rate": round(self.expected_error_rate, 4),
+            "model_mix": self.model_mix,
+        }
+
+
+def load_samples(path: str | Path) -> list[RequestSample]:
+    """Load recorded traffic, skipping malformed lines."""
+    samples: list[RequestSample] = []
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                samples.append(RequestSample(**json.loads(line)))
+            except (TypeError, ValueError):
+                continue
+    samples.sort(key=lambda s: s.ts)
+    return samples
+
+
+def static_policy(sample: RequestSample, _stats: ModelStatsTracker) -> SelectedModel:
+    return static_select_model(
+        query_type=sample.query_type or "summary",  # type: ignore[arg-type]
+        expected_context_tokens=sample.context_tokens,
+        plan=sample.plan or "free",  # type: ignore[arg-type]
+    )
+
+
+def adaptive_policy(sample: RequestSample, stats: ModelStatsTracker) -> SelectedModel:
+    return AdaptiveModelSelector(stats=stats).select(
+        query_type=sample.query_type or "summary",  # type: ignore[arg-type]
+        expected_context_tokens=sample.context_tokens,
+        plan=sample.plan or "free",  # type: ignore[arg-type]
+    )
+
+
+POLICIES: dict[str, Policy] = {"static": static_policy, "adaptive": adaptive_policy}
+
+
+def _oracle(samples: Iterable[RequestSample]) -> AdaptiveModelSelector:
+    """Whole-log per-model aggregate used to score a policy's choices."""
+    oracle_stats = ModelStatsTracker(alpha=0.05)
+    for s in samples:
+        oracle_stats.record(s)
+    return AdaptiveModelSelector(stats=oracle_stats, min_samples=1)
+
+
+def replay(samples: list[RequestSample], policy: Policy, name: str = "policy") -> ReplayReport:
+    """Replay `samples` through `policy` and estimate cost / latency / SLO misses."""
+    oracle = _oracle(samples)
+    online = ModelStatsTracker(max_age_s=DEFAULT_MAX_AGE_S)
+    report = ReplayReport(policy=name)
+    latencies: list[float] = []
+    errors: list[float] = []
+    violations = 0
+    mix: Counter[str] = Counter()
+
+    for sample in samples:
+        choice = policy(sample, online)
+        mix[choice.model_id] += 1
+        if choice.model_id in MODEL_PROFILES:
+            lat = oracle.expected_latency_ms(choice.model_id, choice.max_output_tokens)
+            report.total_cost_usd += oracle.expected_cost(
+                choice.model_id, sample.context_tokens, choice.max_output_tokens
+            )
+            errors.append(oracle.error_rate(choice.model_id))
+        else:
+            lat = sample.duration_s * 1000.0
+            errors.append(1.0 if sample.error else 0.0)
+        latencies.append(lat)
+        slo = PLAN_LATENCY_SLO_MS.get(sample.plan or "free", PLAN_LATENCY_SLO_MS["free"])
+        violations += lat > slo
+        # Feed the real observation so the policy learns as production would
+        online.record(sample)
+
+    report.requests = len(samples)
+    report.mean_latency_ms = mean(latencies) if latencies else 0.0
+    report.slo_violation_rate = violations / len(samples) if samples else 0.0
+    report.expected_error_rate = mean(errors) if errors else 0.0
+    report.model_mix = dict(mix)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded LLM traffic")
+    parser.add_argument("traffic", help="JSONL traffic log")
+    parser.add_argument(
+        "--policy",
+        action="append",
+        choices=sorted(POLICIES),
+        help="Policy to evaluate (repeatable, default: all)",
+    )
+    args = parser.parse_args(argv)
+
+    samples = load_samples(args.traffic)
+    for name in args.policy or sorted(POLICIES):
+        print(json.dumps(replay(samples, POLICIES[name], name).as_dict()))
+
+
+if __name__ == "__main__":
+    main()
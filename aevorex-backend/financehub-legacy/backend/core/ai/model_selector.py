@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Protocol
+
+from backend.config.model_catalogue import MODEL_CATALOGUE
+from backend.core.metrics.model_stats import ModelStats
 
 
 ModelChoice = dataclass
 
+QueryType = Literal["summary", "indicator", "news", "hybrid", "sentiment"]
+Plan = Literal["free", "pro", "team", "enterprise"]
+
 
 @dataclass
 class SelectedModel:
@@ -13,49 +19,261 @@ class SelectedModel:
     model_id: str
     temperature: float
     max_output_tokens: int
+    reason: str = "static"
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Static facts about a model plus latency priors used before live data exists."""
+
+    model_id: str
+    context_window: int
+    cost_per_1k_input: float
+    cost_per_1k_output: float
+    prior_first_token_ms: float
+    prior_tokens_per_sec: float
+
+
+def _catalogue_cost_per_1k(model_id: str) -> tuple[float, float]:
+    """Catalogue prices are USD / 1M tokens – convert to USD / 1K (free → 0)."""
+    info = MODEL_CATALOGUE.get(model_id)
+    if info is None:
+        return 0.0, 0.0
+    try:
+        return (
+            float(info.price_input or 0.0) / 1000.0,
+            float(info.price_output or 0.0) / 1000.0,
+        )
+    except (TypeError, ValueError):
+        return 0.0, 0.0
+
+
+def _profile(model_id: str, context_window: int, ft_ms: float, tps: float) -> ModelProfile:
+    cin, cout = _catalogue_cost_per_1k(model_id)
+    return ModelProfile(model_id, context_window, cin, cout, ft_ms, tps)
+
+
+# Priors are deliberately conservative for the free-tier routes (queued on
+# OpenRouter), so without live data the selector reproduces the old static map.
+MODEL_PROFILES: dict[str, ModelProfile] = {
+    p.model_id: p
+    for p in (
+        _profile("meta-llama/llama-3.3-8b-instruct:free", 128_000, 600.0, 80.0),
+        _profile("mistralai/mistral-7b-instruct:free", 32_000, 700.0, 70.0),
+        _profile("google/gemini-2.0-flash-001", 1_000_000, 450.0, 150.0),
+        _profile("deepseek/deepseek-chat-v3.1:free", 64_000, 2500.0, 20.0),
+    )
+}
+
+# Candidate models per query type – first entry is the legacy static choice
+TASK_CANDIDATES: dict[str, tuple[str, ...]] = {
+    "sentiment": (
+        "meta-llama/llama-3.3-8b-instruct:free",
+        "mistralai/mistral-7b-instruct:free",
+        "google/gemini-2.0-flash-001",
+    ),
+    "indicator": (
+        "mistralai/mistral-7b-instruct:free",
+        "meta-llama/llama-3.3-8b-instruct:free",
+        "google/gemini-2.0-flash-001",
+    ),
+    "news": (
+        "mistralai/mistral-7b-instruct:free",
+        "meta-llama/llama-3.3-8b-instruct:free",
+        "google/gemini-2.0-flash-001",
+    ),
+    "default": (
+        "google/gemini-2.0-flash-001",
+        "deepseek/deepseek-chat-v3.1:free",
+    ),
+}
+
+# (temperature, max_output_tokens) per query type
+TASK_PARAMS: dict[str, tuple[float, int]] = {
+    "sentiment": (0.0, 200),  # Deterministic, short sentiment responses
+    "indicator": (0.2, 500),  # Slightly creative, medium-length analysis
+    "news": (0.2, 500),
+    "default": (0.35, 1500),  # Balanced creativity for summaries
+}
+
+PLAN_MAX_OUTPUT: dict[str, int] = {"free": 700, "pro": 1500}
+PLAN_MAX_OUTPUT_DEFAULT = 2500
+
+# Expected end-to-end completion latency budget per plan (ms)
+PLAN_LATENCY_SLO_MS: dict[str, float] = {
+    "free": 30_000.0,
+    "pro": 20_000.0,
+    "team": 15_000.0,
+    "enterprise": 12_000.0,
+}
+
+# Models whose recent error rate exceeds this are skipped while alternatives exist
+MAX_ERROR_RATE = 0.25
+
+
+class StatsSource(Protocol):
+    def get(self, model_id: str) -> ModelStats | None: ...
+
+
+def _task_key(query_type: str, table: dict) -> str:
+    return query_type if query_type in table else "default"
+
+
+def _plan_max_output(plan: str, max_out: int) -> int:
+    return min(max_out, PLAN_MAX_OUTPUT.get(plan, PLAN_MAX_OUTPUT_DEFAULT))
+
+
+def static_select_model(
+    *,
+    query_type: QueryType,
+    expected_context_tokens: int,
+    plan: Plan,
+    max_output_tokens: int | None = None,
+) -> SelectedModel:
+    """Legacy static mapping (kept as replay baseline and kill-switch path)."""
+    model_id = TASK_CANDIDATES[_task_key(query_type, TASK_CANDIDATES)][0]
+    temp, max_out = TASK_PARAMS[_task_key(query_type, TASK_PARAMS)]
+    return SelectedModel(
+        provider="openrouter",
+        model_id=model_id,
+        temperature=temp,
+        max_output_tokens=max_output_tokens or _plan_max_output(plan, max_out),
+    )
+
+
+class AdaptiveModelSelector:
+    """Pick the cheapest candidate that fits the context and meets the plan SLO.
+
+    Live metrics (first-token ms, tokens/sec, error rate) come from a
+    `StatsSource` – normally `backend.core.metrics.MODEL_STATS`; profiles
+    supply cost per 1K tokens, context window and latency priors.
+    """
+
+    def __init__(
+        self,
+        stats: StatsSource | None = None,
+        profiles: dict[str, ModelProfile] | None = None,
+        min_samples: int = 5,
+    ):
+        self.stats = stats
+        self.profiles = profiles or MODEL_PROFILES
+        self.min_samples = min_samples
+
+    def _live(self, model_id: str) -> ModelStats | None:
+        if self.stats is None:
+            return None
+        st = self.stats.get(model_id)
+        if st is None or st.samples < self.min_samples:
+            return None
+        return st
+
+    def expected_latency_ms(self, model_id: str, max_out: int) -> float:
+        prof = self.profiles[model_id]
+        live = self._live(model_id)
+        ft = (live.first_token_ms if live and live.first_token_ms else None) or prof.prior_first_token_ms
+        tps = (live.tokens_per_sec if live and live.tokens_per_sec else None) or prof.prior_tokens_per_sec
+        return ft + max_out / max(tps, 1e-3) * 1000.0
+
+    def expected_cost(self, model_id: str, ctx_tokens: int, max_out: int) -> float:
+        prof = self.profiles[model_id]
+        return (ctx_tokens * prof.cost_per_1k_input + max_out * prof.cost_per_1k_output) / 1000.0
+
+    def error_rate(self, model_id: str) -> float:
+        live = self._live(model_id)
+        return live.error_rate if live else 0.0
+
+    def select(
+        self,
+        *,
+        query_type: QueryType,
+        expected_context_tokens: int,
+        plan: Plan,
+        max_output_tokens: int | None = None,
+    ) -> SelectedModel:
+        """`max_output_tokens` replaces the task/plan output budget (batch
+        callers); it counts towards context fit, latency and cost."""
+        temp, max_out = TASK_PARAMS[_task_key(query_type, TASK_PARAMS)]
+        max_out = max_output_tokens or _plan_max_output(plan, max_out)
+        candidates = [
+            m
+            for m in TASK_CANDIDATES[_task_key(query_type, TASK_CANDIDATES)]
+            if m in self.profiles
+        ]
+        fitting = [
+            m
+            for m in candidates
+            if expected_context_tokens + max_out <= self.profiles[m].context_window
+        ]
+        if not fitting:
+            # Nothing fits – take the largest window and let the caller truncate
+            best = max(candidates, key=lambda m: self.profiles[m].context_window)
+            return SelectedModel("openrouter", best, temp, max_out, reason="context_overflow")
+
+        healthy = [m for m in fitting if self.error_rate(m) <= MAX_ERROR_RATE] or fitting
+        slo = PLAN_LATENCY_SLO_MS.get(plan, PLAN_LATENCY_SLO_MS["free"])
+        latency = {m: self.expected_latency_ms(m, max_out) for m in healthy}
+        within_slo = [m for m in healthy if latency[m] <= slo]
+
+        if within_slo:
+            # Cheapest first; candidate order breaks cost ties (free models)
+            best = min(
+                within_slo,
+                key=lambda m: (
+                    self.expected_cost(m, expected_context_tokens, max_out),
+                    candidates.index(m),
+                ),
+            )
+            reason = "cheapest_within_slo"
+        else:
+            best = min(healthy, key=lambda m: latency[m])
+            reason = "fastest_slo_miss"
+
+        return SelectedModel(
+            provider="openrouter",
+            model_id=best,
+            temperature=temp,
+            max_output_tokens=max_out,
+            reason=reason,
+        )
+
+
+def _default_selector() -> AdaptiveModelSelector:
+    from backend.core.metrics import MODEL_STATS
+
+    return AdaptiveModelSelector(stats=MODEL_STATS)
 
 
 def select_model(
     *,
-    query_type: Literal["summary", "indicator", "news", "hybrid", "sentiment"],
+    query_type: QueryType,
     expected_context_tokens: int,
-    plan: Literal["free", "pro", "team", "enterprise"],
+    plan: Plan,
+    max_output_tokens: int | None = None,
 ) -> SelectedModel:
-    """Pick a cost‑efficient model based on query type and context size.
+    """Pick a cost‑efficient model based on query type, context size and live metrics.
 
-    P0 heuristic - specialized models for different tasks:
-    - sentiment → meta-llama/llama-3.3-8b-instruct:free (fast, focused)
-    - indicator/news → mistralai/mistral-7b-instruct:free (balanced)
-    - default → google/gemini-2.0-flash-001 (general purpose)
+    Delegates to `AdaptiveModelSelector` fed by `MODEL_STATS`; with
+    `settings.AI.ADAPTIVE_MODEL_SELECTION` disabled the legacy static map
+    (sentiment → llama-3.3-8b, indicator/news → mistral-7b, default →
+    gemini-2.0-flash) is used.
     """
-    provider = "openrouter"
-
-    # Specialized model selection by query type
-    if query_type == "sentiment":
-        model_id = "meta-llama/llama-3.3-8b-instruct:free"
-        temp = 0.0  # Deterministic for sentiment analysis
-        max_out = 200  # Short sentiment responses
-    elif query_type in ["indicator", "news"]:
-        model_id = "mistralai/mistral-7b-instruct:free"
-        temp = 0.2  # Slightly creative for analysis
-        max_out = 500  # Medium-length analysis
-    else:
-        # Default for summary, hybrid, and other types
-        model_id = "google/gemini-2.0-flash-001"
-        temp = 0.35  # Balanced creativity
-        max_out = 1500  # Longer responses for summaries
-
-    # Override with plan-based limits if more restrictive
-    if plan == "free":
-        max_out = min(max_out, 700)
-    elif plan == "pro":
-        max_out = min(max_out, 1500)
-    else:
-        max_out = min(max_out, 2500)
+    try:
+        from backend.config import settings
 
-    return SelectedModel(
-        provider=provider,
-        model_id=model_id,
-        temperature=temp,
-        max_output_tokens=max_out,
+        adaptive = settings.AI.ADAPTIVE_MODEL_SELECTION
+    except Exception:
+        adaptive = True
+
+    if not adaptive:
+        return static_select_model(
+            query_type=query_type,
+            expected_context_tokens=expected_context_tokens,
+            plan=plan,
+            max_output_tokens=max_output_tokens,
+        )
+    return _default_selector().select(
+        query_type=query_type,
+        expected_context_tokens=expected_context_tokens,
+        plan=plan,
+        max_output_tokens=max_output_tokens,
     )
@@ -33,10 +33,13 @@ from .constants import (
 # Imports with proper error handling
 from ....models.stock import FinBotStockResponse
 
+from ...metrics.tracing import span, traced
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+@traced("prompt.build")
 async def generate_ai_prompt_premium(
     symbol: str,
     stock_data: FinBotStockResponse,
@@ -103,7 +106,8 @@ async def generate_ai_prompt_premium(
     logger.debug(
         f"[{symbol}] {func_name}: Executing {len(tasks)} formatting tasks concurrently.."
     )
-    results = await asyncio.gather(*tasks.values())
+    with span("prompt.format"):
+        results = await asyncio.gather(*tasks.values())
     logger.debug(f"[{symbol}] {func_name}: All formatting tasks completed.")
 
     # 3. Create a dictionary from the results
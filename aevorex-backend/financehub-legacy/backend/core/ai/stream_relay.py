@@ -0,0 +1,190 @@
+"""
+Low-overhead SSE relay for LLM token streams.
+
+Two pieces:
+
+* `extract_delta_content` – incremental extractor for `choices[0].delta.content`
+  in an OpenAI-style `data: {...}` line. It scans for the `"content"` key and
+  slices the string literal directly; only literals containing escapes are
+  decoded (string-only `json.loads`), and only unusual shapes fall back to
+  a full parse.
+* `relay_sse` – coalesces tiny deltas into SSE frames on a flush interval
+  (or buffer size) and hands pre-encoded `bytes` frames to the response.
+  A bounded queue between the upstream reader and the client writer gives
+  backpressure: when a slow client stops draining, the reader stops pulling
+  from upstream instead of buffering without limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import AsyncIterator
+
+_DATA_PREFIX = "data: "
+_DONE = "[DONE]"
+_CONTENT_KEY = '"content"'
+_DELTA_KEY = '"delta"'
+
+_encode_str = json.JSONEncoder(ensure_ascii=False).encode
+
+DONE_FRAME = b"data: [DONE]\n\n"
+
+
+class StreamDone(Exception):
+    """Raised by `extract_delta_content` when the upstream sent `[DONE]`."""
+
+
+def _full_parse(payload: str) -> str | None:
+    try:
+        obj = json.loads(payload)
+    except ValueError:
+        return None
+    try:
+        return obj.get("choices", [{}])[0].get("delta", {}).get("content") or None
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+def extract_delta_content(line: str) -> str | None:
+    """Return the delta text from one upstream SSE line (None if no content).
+
+    Raises `StreamDone` on the `[DONE]` sentinel.
+    """
+    if not line.startswith(_DATA_PREFIX):
+        return None
+    payload = line[len(_DATA_PREFIX) :]
+    if payload.startswith(_DONE) or payload.strip() == _DONE:
+        raise StreamDone()
+
+    delta_at = payload.find(_DELTA_KEY)
+    if delta_at < 0:
+        return None
+    key_at = payload.find(_CONTENT_KEY, delta_at)
+    if key_at < 0:
+        return None
+    # A second "content" key (e.g. message + delta) → be safe, parse it all
+    if payload.find(_CONTENT_KEY, key_at + 1) >= 0:
+        return _full_parse(payload)
+
+    i = key_at + len(_CONTENT_KEY)
+    n = len(payload)
+    while i < n and payload[i] in " \t":
+        i += 1
+    if i >= n or payload[i] != ":":
+        return _full_parse(payload)
+    i += 1
+    while i < n and payload[i] in " \t":
+        i += 1
+    if i >= n or payload[i] != '"':
+        # null / non-string content
+        return None
+
+    start = i + 1
+    end = payload.find('"', start)
+    escaped = False
+    while end >= 0:
+        # Count preceding backslashes to tell `\"` from `\\"`
+        bs = 0
+        j = end - 1
+        while j >= start and payload[j] == "\\":
+            bs += 1
+            j -= 1
+        if bs % 2 == 0:
+            break
+        escaped = True
+        end = payload.find('"', end + 1)
+    if end < 0:
+        return _full_parse(payload)
+
+    raw = payload[start:end]
+    if not escaped and "\\" not in raw:
+        return raw or None
+    try:
+        return json.loads(payload[start - 1 : end + 1]) or None
+    except ValueError:
+        return _full_parse(payload)
+
+
+def encode_frame(content: str, prefix: bytes = b'data: {"content": ') -> bytes:
+    """Encode one SSE frame – a single JSON string encode per frame."""
+    return prefix + _encode_str(content).encode("utf-8") + b"}\n\n"
+
+
+async def relay_sse(
+    deltas: AsyncIterator[str],
+    *,
+    frame_prefix: bytes = b'data: {"content": ',
+    flush_interval: float = 0.03,
+    max_buffer_chars: int = 256,
+    max_queue: int = 256,
+    done_frame: bytes | None = DONE_FRAME,
+    error_frame_prefix: bytes = b'data: {"error": ',
+) -> AsyncIterator[bytes]:
+    """Coalesce `deltas` into pre-encoded SSE frames with bounded buffering.
+
+    The upstream reader pushes raw deltas into a bounded queue; the writer
+    side takes the first pending delta, waits at most one `flush_interval`
+    for more (capped at `max_buffer_chars`) and emits them as one frame. While the client is slow the queue fills up and the reader
+    blocks, which pauses the upstream HTTP stream.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+    end = object()
+
+    async def pump() -> None:
+        try:
+            async for delta in deltas:
+                if delta:
+                    await queue.put(delta)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await queue.put(exc)
+        await queue.put(end)
+
+    producer = asyncio.create_task(pump())
+    finished = False
+    try:
+        while not finished:
+            item = await queue.get()
+            if item is end:
+                break
+            if isinstance(item, Exception):
+                yield encode_frame(f"Stream failed: {item}", error_frame_prefix)
+                break
+
+            parts = [item]
+            size = len(item)
+            error: Exception | None = None
+            waited = False
+            while size < max_buffer_chars:
+                try:
+                    nxt = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    if waited or flush_interval <= 0:
+                        break
+                    # Give the upstream one flush interval to add more tokens
+                    waited = True
+                    await asyncio.sleep(flush_interval)
+                    continue
+                if nxt is end:
+                    finished = True
+                    break
+                if isinstance(nxt, Exception):
+                    error, finished = nxt, True
+                    break
+                parts.append(nxt)
+                size += len(nxt)
+
+            yield encode_frame("".join(parts), frame_prefix)
+            if error is not None:
+                yield encode_frame(f"Stream failed: {error}", error_frame_prefix)
+        if done_frame is not None:
+            yield done_frame
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except (asyncio.CancelledError, Exception):
+                pass
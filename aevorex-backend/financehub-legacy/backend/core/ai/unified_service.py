@@ -73,6 +73,8 @@ class UnifiedAIService:
                 messages=messages,
                 temperature=sel.temperature,
                 max_output_tokens=sel.max_output_tokens,
+                query_type="summary",
+                plan="pro",
             )
 
             logger.info("Successfully generated daily market summary")
@@ -93,7 +95,10 @@ class UnifiedAIService:
         context_messages: Iterable[dict] | None = None,
         query_type: str = "summary",
         data_block: dict | None = None,
+        max_output_tokens: int | None = None,
     ) -> AsyncGenerator[str, None]:
+        """Stream a chat completion; `max_output_tokens` overrides the
+        per-task output budget (e.g. batch jobs sized by item count)."""
         persona = get_system_persona(locale)
         system_message = {"role": "system", "content": persona}
 
@@ -101,7 +106,10 @@ class UnifiedAIService:
         ctx_msgs = list(context_messages or [])
         total_ctx_est = sum(estimate_tokens(m.get("content", "")) for m in ctx_msgs)
         sel = select_model(
-            query_type=query_type, expected_context_tokens=total_ctx_est, plan=plan
+            query_type=query_type,
+            expected_context_tokens=total_ctx_est,
+            plan=plan,
+            max_output_tokens=max_output_tokens,
         )  # type: ignore[arg-type]
 
         # budget: fit last messages into simple budget (input side)
@@ -137,6 +145,8 @@ class UnifiedAIService:
             messages=messages,
             temperature=sel.temperature,
             max_output_tokens=sel.max_output_tokens,
+            query_type=query_type,
+            plan=plan,
         ):
             yield chunk
 
@@ -4,26 +4,166 @@
 Sentiment Analyzer (OpenRouter-backed)
 ======================================
 
-This module replaces the previous dummy sentiment analyzer with a real
-LLM-powered implementation, using the UnifiedAIService + OpenRouter.
+LLM-powered headline sentiment using the UnifiedAIService + OpenRouter.
+
+Scoring pipeline (`score_headlines`):
+1. stored scores (`SentimentStore`, keyed by headline hash) are reused,
+2. obvious headlines are scored locally by the lexicon prefilter,
+3. the remaining unseen headlines go to the LLM in large batches
+   (one prompt per batch, JSON array out, output budget sized to the batch),
+and every new score is persisted for the next user / ticker. Headlines the
+LLM failed to score are remembered briefly so they are not re-sent at once.
 """
 
+import json
 import logging
+import re
 from typing import List, Dict
 
+import httpx
+
 from backend.core.ai.unified_service import get_unified_ai_service
+from backend.core.ai_analyzers.sentiment_lexicon import lexicon_score
+from backend.core.ai_analyzers.sentiment_store import (
+    SentimentStore,
+    get_sentiment_store,
+    headline_hash,
+    label_from_score,
+)
 
 logger = logging.getLogger(__name__)
 
+LLM_BATCH_SIZE = 40
+# Output budget: ~15 tokens per `{"i": 12, "s": -0.35}` item plus brackets
+# (40 items stay under the free plan's 700-token cap)
+LLM_TOKENS_PER_ITEM = 15
+LLM_TOKENS_OVERHEAD = 40
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
 
 class SentimentAnalyzer:
     """
-    Uses UnifiedAIService (OpenRouter LLM gateway) to classify sentiment
-    of news items or free text as Positive / Negative / Neutral.
+    Scores news headlines / free text in [-1, 1] and classifies them as
+    Positive / Negative / Neutral, reusing stored per-headline scores.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        store: SentimentStore | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         self.ai_service = get_unified_ai_service()
+        self.store = store or get_sentiment_store()
+        self.http_client = http_client
+
+    async def score_headlines(
+        self, titles: List[str], http_client: httpx.AsyncClient | None = None
+    ) -> Dict[str, float]:
+        """
+        Return {title: score} for all non-empty titles, scoring only unseen ones.
+        """
+        unique = list(dict.fromkeys(t.strip() for t in titles if t and t.strip()))
+        if not unique:
+            return {}
+
+        by_hash = {headline_hash(t): t for t in unique}
+        stored = await self.store.get_many(unique)
+
+        new_scores: Dict[str, float] = {}
+        failed: List[str] = []
+        pending: List[str] = []
+        for h, title in by_hash.items():
+            if h in stored:
+                continue  # scored, or failed recently
+            local = lexicon_score(title)
+            if local is not None:
+                new_scores[h] = local
+            else:
+                pending.append(title)
+
+        for start in range(0, len(pending), LLM_BATCH_SIZE):
+            batch = pending[start : start + LLM_BATCH_SIZE]
+            llm_scores = await self._score_batch_llm(batch, http_client)
+            for title, score in zip(batch, llm_scores):
+                if score is not None:
+                    new_scores[headline_hash(title)] = score
+                else:
+                    failed.append(headline_hash(title))
+
+        if new_scores:
+            await self.store.set_many(new_scores)
+            logger.info(
+                f"Sentiment scored {len(new_scores)} new headlines "
+                f"({len(pending)} via LLM, {len(stored)} reused)"
+            )
+        if failed:
+            await self.store.mark_failed(failed)
+            logger.warning(f"Sentiment LLM left {len(failed)} headlines unscored")
+
+        merged = {**stored, **new_scores}
+        return {t: merged[h] for h, t in by_hash.items() if merged.get(h) is not None}
+
+    async def _score_batch_llm(
+        self, titles: List[str], http_client: httpx.AsyncClient | None = None
+    ) -> List[float | None]:
+        """One LLM call for the whole batch; returns scores aligned with `titles`."""
+        http_client = http_client or self.http_client
+        user_prompt = (
+            "Score the sentiment of each numbered financial news headline from -1 "
+            "(very negative) to 1 (very positive).\n\n"
+            + "\n".join(f"{i}. {t}" for i, t in enumerate(titles))
+            + '\n\nRespond ONLY with a JSON array like [{"i": 0, "s": 0.4}, ...] '
+            "containing one object per headline."
+        )
+        try:
+            if http_client is not None:
+                text = await self._collect(http_client, user_prompt, len(titles))
+            else:
+                async with httpx.AsyncClient() as client:
+                    text = await self._collect(client, user_prompt, len(titles))
+        except Exception as e:
+            logger.error(f"Sentiment batch scoring failed ({len(titles)} items): {e}")
+            return [None] * len(titles)
+        return self._parse_scores(text, len(titles))
+
+    async def _collect(
+        self, client: httpx.AsyncClient, user_prompt: str, count: int
+    ) -> str:
+        # We don’t care about streaming here → collect final output
+        result_text = ""
+        async for chunk in self.ai_service.stream_chat(
+            http_client=client,
+            ticker="N/A",
+            user_message=user_prompt,
+            locale="en",
+            plan="free",
+            query_type="sentiment",
+            max_output_tokens=count * LLM_TOKENS_PER_ITEM + LLM_TOKENS_OVERHEAD,
+        ):
+            result_text += chunk
+        return result_text
+
+    @staticmethod
+    def _parse_scores(text: str, count: int) -> List[float | None]:
+        scores: List[float | None] = [None] * count
+        match = _JSON_ARRAY_RE.search(text or "")
+        if not match:
+            return scores
+        try:
+            items = json.loads(match.group(0))
+        except ValueError:
+            return scores
+        for pos, item in enumerate(items if isinstance(items, list) else []):
+            try:
+                if isinstance(item, dict):
+                    idx, value = int(item.get("i", pos)), float(item["s"])
+                else:
+                    idx, value = pos, float(item)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= idx < count:
+                scores[idx] = max(-1.0, min(1.0, value))
+        return scores
 
     async def analyze(self, news_data: List[Dict[str, str]]) -> str:
         """
@@ -42,35 +182,14 @@ class SentimentAnalyzer:
         if not headlines:
             return "Neutral (empty headlines)"
 
-        user_prompt = (
-            "Classify the overall sentiment of the following news headlines about a company.\n\n"
-            + "\n".join(f"- {h}" for h in headlines[:5])  # cap at 5 to save tokens
-            + "\n\nRespond with exactly one word: Positive, Negative, or Neutral."
-        )
-
         try:
-            # We don’t care about streaming here → collect final output
-            result_text = ""
-            async for chunk in self.ai_service.stream_chat(
-                http_client=None,  # will be injected by gateway
-                ticker="N/A",
-                user_message=user_prompt,
-                locale="en",
-                plan="free",
-                query_type="sentiment",
-            ):
-                result_text += chunk
-
-            cleaned = result_text.strip().lower()
-            if "positive" in cleaned:
-                return "Positive"
-            if "negative" in cleaned:
-                return "Negative"
-            return "Neutral"
-
+            scores = await self.score_headlines(headlines)
         except Exception as e:
             logger.error(f"Sentiment analysis failed: {e}")
             return "Neutral (error)"
+        if not scores:
+            return "Neutral (error)"
+        return label_from_score(sum(scores.values()) / len(scores)).capitalize()
 
     async def analyze_text(self, text: str) -> str:
         """
@@ -79,27 +198,11 @@ class SentimentAnalyzer:
         if not text:
             return "Neutral"
 
-        user_prompt = f"Classify the sentiment of the following text as Positive, Negative, or Neutral:\n\n{text}"
-
         try:
-            result_text = ""
-            async for chunk in self.ai_service.stream_chat(
-                http_client=None,
-                ticker="N/A",
-                user_message=user_prompt,
-                locale="en",
-                plan="free",
-                query_type="sentiment",
-            ):
-                result_text += chunk
-
-            cleaned = result_text.strip().lower()
-            if "positive" in cleaned:
-                return "Positive"
-            if "negative" in cleaned:
-                return "Negative"
-            return "Neutral"
-
+            scores = await self.score_headlines([text])
         except Exception as e:
             logger.error(f"Sentiment text analysis failed: {e}")
             return "Neutral (error)"
+        if not scores:
+            return "Neutral (error)"
+        return label_from_score(next(iter(scores.values()))).capitalize()
@@ -0,0 +1,58 @@
+# core/ai_analyzers/sentiment_lexicon.py
+
+"""
+Lexicon-based Sentiment Prefilter
+=================================
+
+Cheap, local headline scoring used before the LLM batch. Only *obvious*
+headlines get a score (one polarity, no negation); everything ambiguous
+returns None and is sent to the LLM.
+"""
+
+import re
+
+_TOKEN_RE = re.compile(r"[a-z][a-z'\-]+")
+
+# Strong terms count double – a single one is enough to be "obvious"
+_POSITIVE_STRONG = frozenset(
+    {"soars", "soar", "surges", "surge", "skyrockets", "record-high", "blowout"}
+)
+_NEGATIVE_STRONG = frozenset(
+    {"plunges", "plunge", "plummets", "crashes", "bankruptcy", "collapses", "fraud"}
+)
+_POSITIVE = frozenset(
+    {
+        "beats", "beat", "jumps", "rallies", "rally", "gains", "climbs", "rises",
+        "upgrade", "upgraded", "outperform", "raises", "boosts", "profit",
+        "growth", "bullish", "tops", "strong", "record", "approval", "approved",
+    }
+)
+_NEGATIVE = frozenset(
+    {
+        "misses", "miss", "falls", "drops", "slides", "sinks", "tumbles", "slumps",
+        "downgrade", "downgraded", "underperform", "cuts", "loss", "losses",
+        "lawsuit", "probe", "recall", "bearish", "weak", "layoffs", "warns",
+        "halts", "delisted", "default",
+    }
+)
+_NEGATIONS = frozenset(
+    {"not", "no", "never", "despite", "fails", "without", "but", "yet", "amid"}
+)
+
+
+def lexicon_score(text: str) -> float | None:
+    """Return a score in [-1, 1] for clear-cut headlines, otherwise None."""
+    if not text:
+        return None
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens or any(t in _NEGATIONS or t.endswith("n't") for t in tokens):
+        return None
+
+    pos = sum(2 if t in _POSITIVE_STRONG else 1 if t in _POSITIVE else 0 for t in tokens)
+    neg = sum(2 if t in _NEGATIVE_STRONG else 1 if t in _NEGATIVE else 0 for t in tokens)
+
+    # Mixed or weak signal → let the LLM decide
+    if (pos and neg) or max(pos, neg) < 2:
+        return None
+    magnitude = min(1.0, 0.4 + 0.15 * max(pos, neg))
+    return magnitude if pos else -magnitude
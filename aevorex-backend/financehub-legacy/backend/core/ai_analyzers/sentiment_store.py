@@ -0,0 +1,141 @@
+# core/ai_analyzers/sentiment_store.py
+
+"""
+Headline Sentiment Store
+========================
+
+Per-headline sentiment scores keyed by a normalized headline hash, so a
+headline is scored once and reused across users and tickers.
+
+Two tiers:
+- a bounded in-process dict (sync `peek` for mappers / summaries; async
+  callers warm it from the shared tier with `get_many` first),
+- the shared CacheService (Redis in prod) read with a single MGET and
+  written with one pipelined SETEX.
+
+Headlines the LLM could not score are stored as a short-lived `null`
+marker, so a failing batch is not re-sent on every request.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "sentiment:h:"
+SCORE_TTL_SECONDS = 30 * 24 * 3600  # headlines do not change – keep a month
+FAILED_TTL_SECONDS = 15 * 60  # retry unscorable headlines after 15 minutes
+FAILED_MARKER = "null"
+LOCAL_MAX_ENTRIES = 20_000
+
+POSITIVE_THRESHOLD = 0.15
+NEGATIVE_THRESHOLD = -0.15
+
+
+def headline_hash(title: str) -> str:
+    """Stable hash of a whitespace/case-normalized headline."""
+    normalized = " ".join((title or "").lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def label_from_score(score: float | None) -> str:
+    """Map a [-1, 1] score to the lowercase labels used by the news services."""
+    if score is None:
+        return "neutral"
+    if score >= POSITIVE_THRESHOLD:
+        return "positive"
+    if score <= NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+
+class SentimentStore:
+    """Two-tier (local LRU + CacheService) store of headline scores."""
+
+    def __init__(self, cache=None, max_local: int = LOCAL_MAX_ENTRIES):
+        self.cache = cache
+        self.max_local = max_local
+        self._local: OrderedDict[str, float] = OrderedDict()
+
+    def _remember(self, h: str, score: float) -> None:
+        self._local[h] = score
+        self._local.move_to_end(h)
+        while len(self._local) > self.max_local:
+            self._local.popitem(last=False)
+
+    def peek(self, title: str) -> float | None:
+        """Sync local-tier lookup (no I/O); `get_many` the titles first to
+        pull scores stored by other workers into the local tier."""
+        return self._local.get(headline_hash(title))
+
+    async def get_many(self, titles: list[str]) -> dict[str, float | None]:
+        """Return {headline_hash: score} for every already-scored title.
+
+        Titles whose scoring failed recently map to None (do not retry yet).
+        """
+        found: dict[str, float | None] = {}
+        missing: list[str] = []
+        for t in titles:
+            h = headline_hash(t)
+            if h in self._local:
+                found[h] = self._local[h]
+            elif h not in missing:
+                missing.append(h)
+
+        if missing and self.cache is not None:
+            try:
+                raw = await self.cache.get_many([KEY_PREFIX + h for h in missing])
+            except Exception as e:
+                logger.warning(f"Sentiment store lookup failed: {e}")
+                raw = [None] * len(missing)
+            for h, value in zip(missing, raw):
+                if value is None:
+                    continue
+                if value == FAILED_MARKER:
+                    found[h] = None
+                    continue
+                try:
+                    score = float(json.loads(value) if isinstance(value, str) else value)
+                except (TypeError, ValueError):
+                    continue
+                found[h] = score
+                self._remember(h, score)
+        return found
+
+    async def set_many(self, scores: dict[str, float]) -> None:
+        """Persist {headline_hash: score} to both tiers."""
+        for h, score in scores.items():
+            self._remember(h, score)
+        await self._write(
+            {KEY_PREFIX + h: json.dumps(round(score, 4)) for h, score in scores.items()},
+            SCORE_TTL_SECONDS,
+        )
+
+    async def mark_failed(self, hashes: list[str]) -> None:
+        """Remember for `FAILED_TTL_SECONDS` that these headlines could not be scored."""
+        await self._write({KEY_PREFIX + h: FAILED_MARKER for h in hashes}, FAILED_TTL_SECONDS)
+
+    async def _write(self, mapping: dict[str, str], ttl: int) -> None:
+        if not mapping or self.cache is None:
+            return
+        try:
+            await self.cache.set_many(mapping, ttl=ttl)
+        except Exception as e:
+            logger.warning(f"Sentiment store write failed ({len(mapping)} keys): {e}")
+
+
+_store_instance: SentimentStore | None = None
+
+
+def get_sentiment_store() -> SentimentStore:
+    """Singleton store backed by the global CacheService."""
+    global _store_instance
+    if _store_instance is None:
+        try:
+            from backend.utils.cache_service import cache_service
+        except Exception:  # pragma: no cover – cache layer unavailable
+            cache_service = None
+        _store_instance = SentimentStore(cache=cache_service)
+    return _store_instance
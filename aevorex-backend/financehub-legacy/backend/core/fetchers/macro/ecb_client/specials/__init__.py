@@ -35,6 +35,8 @@ __all__ = [
     # From fx_rates_fetcher
     "fetch_fx_rates",
     "fetch_single_fx_rate",
+    "convert_currency",
+    "convert_currencies",
     # "get_fx_rates",  # Function not defined
     # From policy_rates_fetcher
     "fetch_policy_rates",
@@ -1,12 +1,16 @@
 """
 ECB FX Rates fetcher for EUR reference exchange rates.
-Fetches official ECB reference exchange rates vs EUR from EXR dataflow.
+Serves official ECB reference exchange rates vs EUR from the FX matrix
+(backend.core.warehouse.fx): every currency is loaded with one EXR request
+and conversions are in-memory lookups.
 """
 
+import math
 from datetime import date, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Sequence
+
+from backend.core.warehouse.fx import FxBlock, FxUnavailableError, get_fx_matrix_service
 from backend.utils.logger_config import get_logger
-from ..client import ECBSDMXClient
 from ..exceptions import ECBAPIError
 
 logger = get_logger(__name__)
@@ -31,6 +35,15 @@ FX_RATES_SERIES_KEYS = {
 PRIORITY_CURRENCIES = ["USD", "HUF", "GBP", "CHF", "JPY"]
 
 
+
+async def _fx_block() -> FxBlock:
+    """Current reference-rate block (checks the ECB at most once per sync interval)."""
+    try:
+        return await get_fx_matrix_service().current()
+    except FxUnavailableError as e:
+        raise ECBAPIError(str(e)) from e
+
+
 async def fetch_fx_rates(
     cache_service=None,
     start_date: Optional[date] = None,
@@ -66,51 +79,16 @@ async def fetch_fx_rates(
 
     logger.info(f"Fetching FX rates for {currencies} from {start_date} to {end_date}")
 
-    try:
-        client = ECBSDMXClient()
-
-        # Validate requested currencies
-        for currency in currencies:
-            if currency not in FX_RATES_SERIES_KEYS:
-                logger.warning(f"Unknown currency: {currency}")
-
-        # Fetch data from ECB SDMX API
-        fx_data = await client.get_fx_rates(start_date, end_date)
-
-        if not fx_data:
-            logger.warning("No FX rates data received from ECB")
-            return {}
-
-        # Filter for requested currencies (fx_data already in correct format)
-        result = {}
-        for date_str, currency_data in fx_data.items():
-            filtered_data = {}
-            for currency in currencies:
-                if currency in currency_data:
-                    filtered_data[currency] = currency_data[currency]
+    for currency in currencies:
+        if currency not in FX_RATES_SERIES_KEYS:
+            logger.warning(f"Unknown currency: {currency}")
 
-            if filtered_data:
-                result[date_str] = filtered_data
-
-        logger.info(f"Successfully fetched FX rates data for {len(result)} dates")
-
-        # Cache the result if cache service is available
-        if cache_service and result:
-            cache_key = f"ecb_fx_rates_{start_date}_{end_date}_{'_'.join(currencies)}"
-            try:
-                await cache_service.set(cache_key, result, ttl=1800)  # 30 min TTL
-                logger.debug(f"Cached FX rates data with key: {cache_key}")
-            except Exception as e:
-                logger.warning(f"Failed to cache FX rates data: {e}")
-
-        return result
-
-    except ECBAPIError as e:
-        logger.error(f"ECB API error fetching FX rates data: {e}")
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error fetching FX rates data: {e}")
-        raise ECBAPIError(f"Failed to fetch FX rates data: {str(e)}")
+    # cache_service is kept for the signature; the rates live in the FX matrix
+    block = await _fx_block()
+    result = block.history(start_date.isoformat(), end_date.isoformat(), currencies)
+    if not result:
+        logger.warning("No FX rates data available from ECB")
+    return result
 
 
 async def fetch_single_fx_rate(
@@ -132,46 +110,9 @@ async def fetch_single_fx_rate(
     if not target_date:
         target_date = date.today()
 
-    # Check if we have recent data in cache first
-    if cache_service:
-        cache_key = f"ecb_fx_{currency}_{target_date}"
-        try:
-            cached_rate = await cache_service.get(cache_key)
-            if cached_rate is not None:
-                logger.debug(f"Retrieved cached FX rate for {currency}: {cached_rate}")
-                return float(cached_rate)
-        except Exception as e:
-            logger.debug(f"Cache lookup failed: {e}")
-
-    # Fetch from API with small date range
-    start_date = target_date - timedelta(days=7)  # Last week
-    rates_data = await fetch_fx_rates(
-        cache_service=cache_service,
-        start_date=start_date,
-        end_date=target_date,
-        currencies=[currency],
-    )
-
-    if not rates_data:
-        return None
-
-    # Find the most recent rate
-    sorted_dates = sorted(rates_data.keys(), reverse=True)
-    for obs_date in sorted_dates:
-        if currency in rates_data[obs_date]:
-            rate = rates_data[obs_date][currency]
-
-            # Cache individual rate
-            if cache_service:
-                cache_key = f"ecb_fx_{currency}_{obs_date}"
-                try:
-                    await cache_service.set(cache_key, rate, ttl=1800)
-                except Exception as e:
-                    logger.debug(f"Failed to cache individual rate: {e}")
-
-            return rate
-
-    return None
+    block = await _fx_block()
+    rate = float(block.convert([1.0], ["EUR"], [currency], [target_date.isoformat()])[0])
+    return None if math.isnan(rate) else rate
 
 
 async def fetch_major_fx_rates(
@@ -242,25 +183,33 @@ async def convert_currency(
     if not target_date:
         target_date = date.today()
 
-    # Handle EUR as base currency
-    if from_currency == "EUR":
-        # EUR to other currency
-        rate = await fetch_single_fx_rate(to_currency, cache_service, target_date)
-        if rate:
-            return amount * rate
-    elif to_currency == "EUR":
-        # Other currency to EUR
-        rate = await fetch_single_fx_rate(from_currency, cache_service, target_date)
-        if rate:
-            return amount / rate
-    else:
-        # Cross-currency conversion via EUR
-        from_rate = await fetch_single_fx_rate(
-            from_currency, cache_service, target_date
-        )
-        to_rate = await fetch_single_fx_rate(to_currency, cache_service, target_date)
-        if from_rate and to_rate:
-            eur_amount = amount / from_rate  # Convert to EUR first
-            return eur_amount * to_rate  # Then to target currency
+    converted = await convert_currencies([amount], [from_currency], [to_currency], [target_date])
+    return converted[0]
 
-    return None
+
+async def convert_currencies(
+    amounts: Sequence[float],
+    from_currencies: Sequence[str],
+    to_currencies: Sequence[str],
+    target_dates: Optional[Sequence[Optional[date]]] = None,
+) -> List[Optional[float]]:
+    """
+    Convert many amounts at once using ECB reference rates (cross rates via EUR).
+
+    Args:
+        amounts: Amounts to convert
+        from_currencies: Source currency of each amount
+        to_currencies: Target currency of each amount
+        target_dates: Rate date of each amount (default: latest fixing)
+
+    Returns:
+        Converted amounts, None where a rate is not available
+    """
+    days = (
+        [d.isoformat() if d else None for d in target_dates]
+        if target_dates is not None
+        else None
+    )
+    block = await _fx_block()
+    converted = block.convert(amounts, from_currencies, to_currencies, days)
+    return [None if math.isnan(value) else float(value) for value in converted]
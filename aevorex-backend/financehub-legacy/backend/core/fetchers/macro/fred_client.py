@@ -25,6 +25,7 @@ async def _fetch_series_observations(
     end: date,
     frequency: str | None = None,
     units: str | None = None,
+    aggregation_method: str | None = None,
 ) -> Dict[str, Optional[float]]:
     """Fetch a single FRED series and return {date_str: value|None} mapping.
 
@@ -39,6 +40,8 @@ async def _fetch_series_observations(
     }
     if frequency:
         params["frequency"] = frequency
+        if aggregation_method:
+            params["aggregation_method"] = aggregation_method
     if units:
         params["units"] = units
     url = "https://api.stlouisfed.org/fred/series/observations"
@@ -66,16 +69,24 @@ async def fetch_fred_series_matrix(
     end: date,
     frequency: str | None = None,
     units: str | None = None,
+    aggregation_method: str | None = None,
+    max_concurrency: int | None = None,
 ) -> Dict[str, Dict[str, Optional[float]]]:
     """Fetch multiple series in parallel and merge by date.
 
+    `max_concurrency` caps the requests in flight (FRED rate-limits per key).
+
     Returns: {date_str: {series_id: value|None}}
     """
-    tasks = [
-        _fetch_series_observations(client, api_key, s, start, end, frequency, units)
-        for s in series_ids
-    ]
-    results = await asyncio.gather(*tasks)
+    semaphore = asyncio.Semaphore(max_concurrency or len(series_ids) or 1)
+
+    async def fetch(series_id: str) -> Dict[str, Optional[float]]:
+        async with semaphore:
+            return await _fetch_series_observations(
+                client, api_key, series_id, start, end, frequency, units, aggregation_method
+            )
+
+    results = await asyncio.gather(*(fetch(s) for s in series_ids))
     merged: Dict[str, Dict[str, Optional[float]]] = {}
     for s_id, series_map in zip(series_ids, results):
         for d, val in series_map.items():
@@ -4,6 +4,8 @@ import pandas as pd
 from typing import Any, Dict, List, Optional
 
 import yfinance as yf
+from backend.core.metrics import SERVICE_METRICS
+from backend.core.performance.executors import YFINANCE, run_blocking
 from backend.utils.logger_config import get_logger
 from backend.utils.cache_service import CacheService
 from backend.core.fetchers.common.base_fetcher import BaseFetcher
@@ -18,6 +20,15 @@ YFINANCE_OHLCV_TTL = 900  # 15 minutes
 YFINANCE_NEWS_TTL = 1800  # 30 minutes
 
 
+# Blocking yfinance calls – run on the managed YFINANCE executor, never on the loop
+def _history(ticker: str, period: str, interval: str) -> pd.DataFrame:
+    return yf.Ticker(ticker).history(period=period, interval=interval)
+
+
+def _ticker_attr(ticker: str, attr: str) -> Any:
+    return getattr(yf.Ticker(ticker), attr)
+
+
 class YFinanceFetcher(BaseFetcher):
     """
     Data fetcher for yfinance.
@@ -43,8 +54,10 @@ class YFinanceFetcher(BaseFetcher):
 
         logger.info(f"{log_prefix} Cache MISS. Fetching live data.")
         try:
-            yf_ticker = yf.Ticker(ticker)
-            history = yf_ticker.history(period=period, interval=interval)
+            with SERVICE_METRICS.track_upstream("yfinance"):
+                history = await run_blocking(
+                    YFINANCE, _history, ticker, period=period, interval=interval
+                )
             if not history.empty:
                 await self.cache.set(cache_key, history, ttl=YFINANCE_OHLCV_TTL)
                 logger.info(
@@ -82,8 +95,8 @@ class YFinanceFetcher(BaseFetcher):
 
         logger.info(f"{log_prefix} Cache MISS. Fetching live data.")
         try:
-            yf_ticker = yf.Ticker(ticker)
-            news = yf_ticker.news
+            with SERVICE_METRICS.track_upstream("yfinance"):
+                news = await run_blocking(YFINANCE, _ticker_attr, ticker, "news")
             if news:
                 await self.cache.set(cache_key, news, ttl=YFINANCE_NEWS_TTL)
                 logger.info(
@@ -111,8 +124,8 @@ class YFinanceFetcher(BaseFetcher):
 
         logger.info(f"{log_prefix} Cache MISS. Fetching live data.")
         try:
-            yf_ticker = yf.Ticker(ticker)
-            info = yf_ticker.info
+            with SERVICE_METRICS.track_upstream("yfinance"):
+                info = await run_blocking(YFINANCE, _ticker_attr, ticker, "info")
             if info:
                 await self.cache.set(cache_key, info, ttl=YFINANCE_INFO_TTL)
                 logger.info(f"{log_prefix} Successfully fetched and cached data.")
@@ -13,6 +13,13 @@ from pathlib import Path
 import threading
 import time
 
+from backend.core.performance.executors import (
+    IO,
+    ExecutorSaturatedError,
+    ExecutorTimeoutError,
+    run_blocking,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,6 +48,37 @@ class FileCacheService:
             f"FileCacheService initialized with cache_dir={cache_dir}, max_size={max_size_mb}MB"
         )
 
+    # --- async API: file I/O runs on the managed IO executor ----------------
+
+    async def _offload(self, fn, *args, default: Any = None) -> Any:
+        try:
+            return await run_blocking(IO, fn, *args)
+        except (ExecutorSaturatedError, ExecutorTimeoutError) as e:
+            logger.error(f"[FileCacheService] {fn.__name__} not run: {e}")
+            return default
+
+    async def get(self, key: str) -> Any | None:
+        """Get value from cache"""
+        return await self._offload(self._get_sync, key)
+
+    async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """Set value in cache with TTL"""
+        return await self._offload(self._set_sync, key, value, ttl, default=False)
+
+    async def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        return await self._offload(self._delete_sync, key, default=False)
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists in cache"""
+        return await self._offload(self._exists_sync, key, default=False)
+
+    async def clear(self) -> bool:
+        """Clear the entire cache"""
+        return await self._offload(self._clear_sync, default=False)
+
+    # --- blocking implementations --------------------------------------------
+
     def _get_cache_path(self, key: str) -> Path:
         """Get cache file path for a key"""
         # Create a safe filename from the key
@@ -52,7 +90,7 @@ class FileCacheService:
         key_hash = hashlib.md5(key.encode()).hexdigest()
         return self.cache_dir / f"{key_hash}.meta"
 
-    async def get(self, key: str) -> Any | None:
+    def _get_sync(self, key: str) -> Any | None:
         """Get value from cache"""
         try:
             with self._lock:
@@ -88,7 +126,7 @@ class FileCacheService:
             logger.error(f"[FileCacheService] [GET:{key}] Error: {e}")
             return None
 
-    async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
+    def _set_sync(self, key: str, value: Any, ttl: int = 3600) -> bool:
         """Set value in cache with TTL"""
         try:
             with self._lock:
@@ -125,7 +163,7 @@ class FileCacheService:
             logger.error(f"[FileCacheService] [SET:{key}] Error: {e}")
             return False
 
-    async def delete(self, key: str) -> bool:
+    def _delete_sync(self, key: str) -> bool:
         """Delete key from cache"""
         try:
             with self._lock:
@@ -144,7 +182,7 @@ class FileCacheService:
             logger.error(f"[FileCacheService] [DELETE:{key}] Error: {e}")
             return False
 
-    async def exists(self, key: str) -> bool:
+    def _exists_sync(self, key: str) -> bool:
         """Check if key exists in cache"""
         try:
             with self._lock:
@@ -293,7 +331,7 @@ class FileCacheService:
             logger.error(f"Error getting cache stats: {e}")
             return {}
 
-    async def clear(self) -> bool:
+    def _clear_sync(self) -> bool:
         """Clear the entire cache"""
         try:
             with self._lock:
@@ -7,12 +7,15 @@ Consolidated from network_ops and network_utils modules.
 """
 
 import logging
+import time
 from typing import Any
 import uuid
 
 import httpx
 from fastapi import Request
 
+from backend.core.metrics import SERVICE_METRICS
+
 try:
     from backend.utils.logger_config import get_logger
     from backend.core.cache_init import CacheService
@@ -53,6 +56,8 @@ async def make_api_request(
     Általános API kérés végrehajtása cache támogatással.
     """
     log_prefix = f"[{source_name_for_log}]"
+    provider = SERVICE_METRICS.provider_label(source_name_for_log, url)
+    started = time.perf_counter()
 
     try:
         package_logger.info(f"{log_prefix} Making {method} request to {url}")
@@ -67,6 +72,7 @@ async def make_api_request(
 
         response.raise_for_status()
         data = response.json()
+        SERVICE_METRICS.observe_upstream(provider, time.perf_counter() - started)
 
         package_logger.info(
             f"{log_prefix} Request successful, got {len(str(data))} chars"
@@ -74,6 +80,9 @@ async def make_api_request(
         return data
 
     except httpx.HTTPStatusError as e:
+        SERVICE_METRICS.observe_upstream(
+            provider, time.perf_counter() - started, f"http_{e.response.status_code}"
+        )
         package_logger.error(f"{log_prefix} HTTP error {e.response.status_code}: {e}")
 
         # Cache failure marker if cache service available
@@ -90,10 +99,16 @@ async def make_api_request(
         return None
 
     except httpx.TimeoutException:
+        SERVICE_METRICS.observe_upstream(
+            provider, time.perf_counter() - started, "timeout"
+        )
         package_logger.error(f"{log_prefix} Request timeout after {http_timeout}s")
         return None
 
     except Exception as e:
+        SERVICE_METRICS.observe_upstream(
+            provider, time.perf_counter() - started, type(e).__name__
+        )
         package_logger.error(f"{log_prefix} Unexpected error: {e}")
         return None
 
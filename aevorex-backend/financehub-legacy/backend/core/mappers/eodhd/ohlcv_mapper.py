@@ -7,6 +7,7 @@ from typing import Any, TYPE_CHECKING
 import time
 
 from ....core.helpers import parse_optional_float, parse_optional_int
+from ....core.metrics.tracing import traced
 from .helpers import preprocess_ohlcv_dataframe
 
 # --- Base Mapper Imports ---
@@ -20,6 +21,7 @@ if TYPE_CHECKING:
 
 
 # MAPPER 1: Pydantic Models (CompanyPriceHistoryEntry) - Uses 'time' (seconds), 'adj_close'
+@traced("map.ohlcv.history")
 def map_eodhd_ohlcv_to_price_history_entries(
     ohlcv_df: pd.DataFrame | None, request_id: str, interval: str
 ) -> list["CompanyPriceHistoryEntry"] | None:
@@ -119,6 +121,7 @@ def map_eodhd_ohlcv_to_price_history_entries(
 
 
 # MAPPER 2: Frontend/Chart List (t, o, h, l, c, v) - Uses 't' (milliseconds)
+@traced("map.ohlcv.frontend")
 def map_eodhd_ohlcv_df_to_frontend_list(
     ohlcv_df: pd.DataFrame | None, request_id: str, interval: str
 ) -> list[dict[str, Any]] | None:
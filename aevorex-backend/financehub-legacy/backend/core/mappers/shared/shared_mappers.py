@@ -25,6 +25,12 @@ from ....core.helpers import _clean_value
 from .._dynamic_validator import _dynamic_import_and_validate
 from .. import yfinance, marketaux, fmp, newsapi, alphavantage
 
+# --- 4. Stored headline sentiment (filled by the batched SentimentAnalyzer) ---
+from ....core.ai_analyzers.sentiment_store import get_sentiment_store, label_from_score
+
+# --- 5. Request tracing ---
+from ....core.metrics.tracing import traced
+
 # --- Constants Specific to this Shared Logic ---
 SERVICE_NAME: Final[str] = "MappersSharedLogic"
 __version__: Final[str] = "1.1.1"  # Version bump
@@ -61,6 +67,7 @@ _INTERNAL_MAPPERS: dict[str, InternalMapperFunc | InternalMapperFuncWithSource]
 
 
 # --- Stage 1: Raw API Dicts -> List[StandardNewsDict] ---
+@traced("map.news.standardize")
 def map_raw_news_to_standard_dicts(
     raw_news_list: list[dict[str, Any]] | None, source_api_name: str
 ) -> list[StandardNewsDict]:
@@ -110,6 +117,7 @@ def map_raw_news_to_standard_dicts(
 
 
 # --- Stage 2: List[StandardNewsDict] -> List[Validated NewsItem Models] ---
+@traced("map.news.validate")
 def map_standard_dicts_to_newsitems(
     standard_news_dicts: list[
         StandardNewsDict
@@ -143,6 +151,7 @@ def map_standard_dicts_to_newsitems(
     mapped_items: list[BaseModel] = []
     item_validation_errors = 0
     skipped_ticker_sentiments = 0
+    sentiment_store = get_sentiment_store()
 
     for i, std_dict in enumerate(standard_news_dicts):
         item_log_prefix = f"{log_prefix}[StdItem #{i + 1}]"
@@ -181,6 +190,13 @@ def map_standard_dicts_to_newsitems(
             processed_tickers: set[str] = set()
             sentiment_score = std_dict.get("sentiment_score")
             sentiment_label = std_dict.get("sentiment_label")
+            if sentiment_score is None:
+                # Provider gave no score – reuse the stored per-headline score
+                # (`NewsService.get_news_data` warms the local tier via
+                # `SentimentStore.get_many`; other async callers must do the same)
+                sentiment_score = sentiment_store.peek(title_value)
+                if sentiment_score is not None and not sentiment_label:
+                    sentiment_label = label_from_score(sentiment_score)
 
             # Add target symbol sentiment
             ts_data_target = {
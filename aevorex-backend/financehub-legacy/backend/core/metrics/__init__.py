@@ -1,8 +1,38 @@
 # Import the prometheus exporter components
 from .prometheus_exporter import get_metrics_router, PrometheusExporter
+from .model_stats import DEFAULT_MAX_AGE_S, ModelStats, ModelStatsTracker, RequestSample
+from .service_metrics import LoopLagMonitor, ServiceMetrics
 
 # Global instance of the exporter to be used across the application
 METRICS_EXPORTER = PrometheusExporter()
 
+# Request / upstream / cache / pool metrics on the same registry (/metrics)
+SERVICE_METRICS = ServiceMetrics(METRICS_EXPORTER.registry)
+
+
+def _model_stats_settings() -> tuple[str | None, float | None]:
+    try:
+        from backend.config import settings
+
+        return settings.AI.TRAFFIC_LOG_PATH, settings.AI.MODEL_STATS_MAX_AGE_SECONDS
+    except Exception:  # pragma: no cover – config not loadable (scripts)
+        return None, DEFAULT_MAX_AGE_S
+
+
+# Live per-model LLM statistics consumed by the adaptive model selector
+_sink_path, _max_age_s = _model_stats_settings()
+MODEL_STATS = ModelStatsTracker(sink_path=_sink_path, max_age_s=_max_age_s)
+
 # Export the main components
-__all__ = ["METRICS_EXPORTER", "get_metrics_router", "PrometheusExporter"]
+__all__ = [
+    "METRICS_EXPORTER",
+    "MODEL_STATS",
+    "SERVICE_METRICS",
+    "get_metrics_router",
+    "PrometheusExporter",
+    "ModelStats",
+    "ModelStatsTracker",
+    "RequestSample",
+    "ServiceMetrics",
+    "LoopLagMonitor",
+]
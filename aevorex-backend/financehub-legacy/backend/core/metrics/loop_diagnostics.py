@@ -0,0 +1,358 @@
+"""loop_diagnostics.py – Event-loop stall detector and sampling profiler.
+
+Blocking work inside `async def` (sync SDK calls, file I/O, pandas parsing)
+freezes every request on the worker. Two tools find it under real load:
+
+- `LoopStallDetector`: a heartbeat task on the loop plus a watchdog thread.
+  When the heartbeat is late by more than the threshold, the watchdog grabs
+  the loop thread's stack *while it is still blocked* (so the culprit frame
+  is on top), attributes it to the route of the running task and counts it
+  in `fh_event_loop_stalls_total{route}`. The stall's duration is recorded
+  in `fh_event_loop_stall_seconds` once the loop wakes up again.
+- `sample_stacks` / `LoopStallDetector.profile`: an on-demand sampling
+  profiler (a plain thread reading `sys._current_frames()`) whose output is
+  the folded-stack format understood by flamegraph.pl, speedscope and
+  Pyroscope.
+
+Route attribution: the request metrics middleware binds the ASGI scope to
+the request task, and a task factory propagates it to child tasks (gather,
+create_task), so a stall inside a fan-out still shows its route.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_ROUTE = "<background>"
+UNROUTED = "<unrouted>"
+
+# Leaf frames of an idle loop (waiting in select / epoll / uvloop)
+_IDLE_LEAVES = (
+    ("selectors.py", None),
+    ("runners.py", "run"),
+    ("base_events.py", "run_forever"),
+    ("base_events.py", "run_until_complete"),
+)
+
+
+@dataclass
+class StallEvent:
+    """One detected stall (duration is filled in when the loop recovers)."""
+
+    detected_at: float
+    route: str
+    task: Optional[str]
+    stack: List[str] = field(default_factory=list)
+    duration_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# ---------------------------------------------------------------------------
+# Stack helpers
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    for root in sorted({p for p in sys.path if p}, key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1 :]
+    return filename
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    filename = frame.f_code.co_filename
+    for suffix, name in _IDLE_LEAVES:
+        if filename.endswith(suffix) and (name is None or frame.f_code.co_name == name):
+            return True
+    return False
+
+
+def _folded(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def sample_stacks(
+    thread_ids: Optional[Iterable[int]],
+    seconds: float,
+    interval: float,
+    include_idle: bool = False,
+) -> Counter:
+    """
+    Sample thread stacks for `seconds` (blocking – run it in its own thread).
+
+    `thread_ids=None` samples every thread except the sampler. Returns
+    folded stack → sample count.
+    """
+    me = threading.get_ident()
+    wanted = None if thread_ids is None else set(thread_ids)
+    names = {t.ident: t.name for t in threading.enumerate()}
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me or (wanted is not None and ident not in wanted):
+                continue
+            if not include_idle and _is_idle(frame):
+                continue
+            stack = _folded(frame)
+            if wanted is None or len(wanted) > 1:
+                stack = f"{names.get(ident, ident)};{stack}"
+            counts[stack] += 1
+        time.sleep(interval)
+    return counts
+
+
+def render_folded(counts: Counter) -> str:
+    """`frame;frame;frame count` lines, heaviest first."""
+    return "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
+
+
+class ProfilerBusyError(RuntimeError):
+    """A profiling run is already in progress."""
+
+
+# ---------------------------------------------------------------------------
+# Stall detector
+# ---------------------------------------------------------------------------
+
+
+class LoopStallDetector:
+    """Heartbeat + watchdog thread that captures the stack of a blocked loop."""
+
+    def __init__(
+        self,
+        metrics=None,
+        threshold: float = 0.1,
+        interval: float = 0.02,
+        history: int = 50,
+    ):
+        self.metrics = metrics
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls: Deque[StallEvent] = deque(maxlen=history)
+        self.stall_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._beat = 0.0
+        self._open: Optional[StallEvent] = None
+        self._open_beat = 0.0
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._scopes: "weakref.WeakKeyDictionary[asyncio.Task, dict]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._previous_factory = None
+        self._profiling = False
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None and not self._heartbeat.done()
+
+    # --- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        self._heartbeat = asyncio.create_task(self._run_heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"[LoopDiagnostics] Stall detector started "
+            f"(threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None and not self._heartbeat.done():
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+        self._heartbeat = None
+        if self._loop is not None and self._loop.get_task_factory() == self._task_factory:
+            self._loop.set_task_factory(self._previous_factory)
+
+    # --- request attribution ---------------------------------------------
+
+    def bind_request(self, scope: dict) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._scopes[task] = scope
+
+    def unbind_request(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._scopes.pop(task, None)
+
+    def _task_factory(self, loop, coro, **kwargs):
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        parent = asyncio.current_task(loop)
+        scope = self._scopes.get(parent) if parent is not None else None
+        if scope is not None:
+            self._scopes[task] = scope
+        return task
+
+    def _route_of(self, task: Optional[asyncio.Task]) -> str:
+        scope = self._scopes.get(task) if task is not None else None
+        if scope is None:
+            return BACKGROUND_ROUTE
+        route = scope.get("route")
+        return (
+            getattr(route, "path_format", None)
+            or getattr(route, "path", None)
+            or UNROUTED
+        )
+
+    # --- detection ---------------------------------------------------------
+
+    async def _run_heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            event = self._open
+            if event is not None:
+                stalled = max(0.0, now - self._open_beat - self.interval)
+                event.duration_ms = round(stalled * 1000, 1)
+                self._open = None
+                if self.metrics is not None:
+                    self.metrics.observe_loop_stall(stalled)
+                logger.warning(
+                    f"[LoopDiagnostics] Loop blocked {event.duration_ms}ms "
+                    f"in {event.route}"
+                )
+            self._beat = now
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if self._open is not None:
+                continue
+            beat = self._beat
+            if time.monotonic() - beat - self.interval > self.threshold:
+                self._capture(beat)
+
+    def _capture(self, beat: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        event = StallEvent(
+            detected_at=time.time(),
+            route=self._route_of(task),
+            task=task.get_name() if task is not None else None,
+            stack=(
+                [line.rstrip() for line in traceback.format_stack(frame)]
+                if frame is not None
+                else []
+            ),
+        )
+        self._open_beat = beat
+        self._open = event
+        self.stalls.append(event)
+        self.stall_count += 1
+        if self.metrics is not None:
+            self.metrics.inc_loop_stall(event.route)
+        logger.warning(
+            f"[LoopDiagnostics] Event loop stall in {event.route} "
+            f"(task {event.task}):\n" + "\n".join(event.stack[-12:])
+        )
+
+    # --- profiling ---------------------------------------------------------
+
+    async def profile(
+        self,
+        seconds: float,
+        interval: float,
+        all_threads: bool = False,
+        include_idle: bool = False,
+    ) -> Counter:
+        """
+        Sample the loop thread (or every thread) for `seconds`.
+
+        Runs on a dedicated thread rather than the default executor, so a
+        saturated executor – often the reason for profiling – cannot delay it.
+        """
+        if self._profiling:
+            raise ProfilerBusyError("A profiling run is already in progress")
+        self._profiling = True
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future = loop.create_future()
+        threads = None if all_threads else [threading.get_ident()]
+
+        def run() -> None:
+            try:
+                result = sample_stacks(threads, seconds, interval, include_idle)
+            except BaseException as exc:  # pragma: no cover – surfaced to caller
+                loop.call_soon_threadsafe(done.set_exception, exc)
+            else:
+                loop.call_soon_threadsafe(done.set_result, result)
+
+        try:
+            threading.Thread(target=run, name="loop-profiler", daemon=True).start()
+            return await done
+        finally:
+            self._profiling = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "threshold_ms": self.threshold * 1000,
+            "stall_count": self.stall_count,
+            "stalls": [event.to_dict() for event in reversed(self.stalls)],
+        }
+
+
+_detector: Optional[LoopStallDetector] = None
+
+
+def get_loop_stall_detector() -> LoopStallDetector:
+    """Process-wide stall detector configured from `settings.DIAGNOSTICS`."""
+    global _detector
+    if _detector is None:
+        from backend.config import settings
+
+        from . import SERVICE_METRICS
+
+        cfg = settings.DIAGNOSTICS
+        _detector = LoopStallDetector(
+            metrics=SERVICE_METRICS,
+            threshold=cfg.STALL_THRESHOLD_MS / 1000,
+            interval=cfg.WATCHDOG_INTERVAL_MS / 1000,
+            history=cfg.STALL_HISTORY,
+        )
+    return _detector
@@ -0,0 +1,169 @@
+"""model_stats.py – Live per-model LLM performance statistics.
+
+A Prometheus histogramok csak kifelé exportálnak; a modellválasztónak
+(`core/ai/model_selector.py`) viszont folyamaton belül, olcsón lekérdezhető
+mutatók kellenek. Ez a modul modellenként exponenciálisan simított átlagot
+(EWMA) tart az első token késleltetéséről, a token/sec áteresztésről és a
+hibarátáról.
+
+Egy modell statisztikája elavul, ha `max_age_s` ideje (a forgalom saját
+órája szerint) nem érkezett rá minta: ilyenkor `get()` None-t ad, a választó
+a priorokra esik vissza, így a kizárt modell újra forgalmat kap, és az első
+új minta tiszta lappal indul.
+
+Opcionálisan minden lezárt kérés `RequestSample`-ként JSONL fájlba is
+kiírható (`settings.AI.TRAFFIC_LOG_PATH`), ezt használja az offline replay
+harness (`core/ai/model_replay.py`). Az írás háttérszálon, kötegelten
+történik, nem az event loopon.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Default statistics lifetime without new samples (settings.AI.MODEL_STATS_MAX_AGE_SECONDS)
+DEFAULT_MAX_AGE_S = 900.0
+
+
+@dataclass
+class RequestSample:
+    """One completed (or failed) LLM request as seen by the gateway."""
+
+    model_id: str
+    query_type: str | None = None
+    plan: str | None = None
+    context_tokens: int = 0
+    first_token_ms: float | None = None
+    output_tokens: int = 0
+    duration_s: float = 0.0
+    error: bool = False
+    # Non-streamed durations include queueing and first token: no throughput sample
+    streamed: bool = True
+    ts: float = field(default_factory=time.time)
+
+    @property
+    def tokens_per_sec(self) -> float | None:
+        if (
+            not self.streamed
+            or self.error
+            or self.output_tokens <= 0
+            or self.duration_s <= 0
+        ):
+            return None
+        gen_s = self.duration_s - (self.first_token_ms or 0.0) / 1000.0
+        return self.output_tokens / max(gen_s, 1e-3)
+
+
+@dataclass
+class ModelStats:
+    """Smoothed view of a single model's recent behaviour."""
+
+    first_token_ms: float | None = None
+    tokens_per_sec: float | None = None
+    error_rate: float = 0.0
+    samples: int = 0
+    updated_at: float = 0.0
+
+
+class ModelStatsTracker:
+    """EWMA-based per-model statistics with optional JSONL traffic sink.
+
+    `max_age_s` expires a model's statistics once no sample has arrived for
+    it within that many seconds of the newest sample seen (None = never).
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        sink_path: str | Path | None = None,
+        max_age_s: float | None = None,
+    ):
+        self.alpha = alpha
+        self.sink_path = Path(sink_path) if sink_path else None
+        self.max_age_s = max_age_s
+        self._stats: dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+        # Newest sample timestamp: replayed logs age by their own clock
+        self._clock = 0.0
+        self._pending: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+
+    def _expired(self, st: ModelStats) -> bool:
+        return self.max_age_s is not None and self._clock - st.updated_at > self.max_age_s
+
+    def _ewma(self, prev: float | None, value: float) -> float:
+        return value if prev is None else prev + self.alpha * (value - prev)
+
+    def record(self, sample: RequestSample) -> None:
+        """Fold a request sample into the model's running statistics."""
+        with self._lock:
+            self._clock = max(self._clock, sample.ts)
+            st = self._stats.get(sample.model_id)
+            if st is None or self._expired(st):
+                st = self._stats[sample.model_id] = ModelStats()
+            st.updated_at = max(st.updated_at, sample.ts)
+            st.samples += 1
+            st.error_rate = self._ewma(
+                st.error_rate if st.samples > 1 else None, 1.0 if sample.error else 0.0
+            )
+            if not sample.error:
+                if sample.first_token_ms is not None:
+                    st.first_token_ms = self._ewma(
+                        st.first_token_ms, sample.first_token_ms
+                    )
+                tps = sample.tokens_per_sec
+                if tps is not None:
+                    st.tokens_per_sec = self._ewma(st.tokens_per_sec, tps)
+        if self.sink_path is not None:
+            self._write_sample(sample)
+
+    def _write_sample(self, sample: RequestSample) -> None:
+        """Queue the sample for the background writer (no file I/O on the caller)."""
+        self._pending.put(json.dumps(asdict(sample)) + "\n")
+        if self._writer is None or not self._writer.is_alive():
+            with self._lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(
+                        target=self._drain, name="model-stats-sink", daemon=True
+                    )
+                    self._writer.start()
+
+    def _drain(self) -> None:
+        while True:
+            lines = [self._pending.get()]
+            while True:
+                try:
+                    lines.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self.sink_path.open("a", encoding="utf-8") as fh:
+                    fh.writelines(lines)
+            except OSError as exc:  # pragma: no cover – best effort
+                logger.debug("Traffic sample write failed: %s", exc)
+
+    def get(self, model_id: str) -> ModelStats | None:
+        with self._lock:
+            st = self._stats.get(model_id)
+            if st is None or self._expired(st):
+                return None
+            return ModelStats(**asdict(st))
+
+    def snapshot(self) -> dict[str, ModelStats]:
+        with self._lock:
+            return {
+                k: ModelStats(**asdict(v)) for k, v in self._stats.items() if not self._expired(v)
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._clock = 0.0
@@ -126,6 +126,13 @@ class PrometheusExporter:
                 ["env", "component"],
                 registry=self.registry,
             )
+            self.phase_duration_seconds = Histogram(
+                "fh_phase_duration_seconds",
+                "Duration of traced request phases (see core.metrics.tracing)",
+                ["phase"],
+                registry=self.registry,
+                buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+            )
         else:
             # Dummy placeholders so calling code won't break
             self.registry = None
@@ -137,7 +144,7 @@ class PrometheusExporter:
                 self.macro_bubor_errors_total
             ) = self.macro_fred_errors_total = self.macro_ust_errors_total = (
                 self.fallback_total
-            ) = _NoOpMetric()
+            ) = self.phase_duration_seconds = _NoOpMetric()
             logger.warning("prometheus_client not installed – metrics disabled")
 
     # ---------------------------------------------------------------------
@@ -183,6 +190,9 @@ class PrometheusExporter:
     def inc_fallback(self, env: str, component: str):
         self.fallback_total.labels(env=env, component=component).inc()
 
+    def observe_phase(self, phase: str, seconds: float):
+        self.phase_duration_seconds.labels(phase=phase).observe(seconds)
+
     # ------------------------------------------------------------------
     # FastAPI router
     # ------------------------------------------------------------------
@@ -203,6 +213,12 @@ class _NoOpMetric:  # pylint: disable=too-few-public-methods
     def inc(self, *_args, **_kwargs):
         return None
 
+    def dec(self, *_args, **_kwargs):
+        return None
+
+    def set(self, *_args, **_kwargs):
+        return None
+
 
 # -------------------------------------------------------------------------
 # FastAPI router factory
@@ -0,0 +1,476 @@
+"""service_metrics.py – Request, upstream, cache and pool metrics.
+
+Split out of `prometheus_exporter.py` (which stays focused on the LLM
+pipeline). Everything here registers on the same `CollectorRegistry`, so the
+existing `/metrics` endpoint exports both. Without `prometheus_client` every
+helper degrades to a no-op, like the exporter.
+
+Metrics:
+
+- `fh_http_requests_total` / `fh_http_request_duration_seconds`
+  (method, route template, status) and `fh_http_requests_in_flight`
+- `fh_upstream_request_seconds` / `fh_upstream_errors_total` per provider
+  (EODHD, yfinance, FMP, ...)
+- `fh_cache_requests_total` (namespace, result), `fh_cache_operation_seconds`
+  (op, backend), `fh_cache_payload_bytes` (namespace, op) and the derived
+  `fh_cache_hit_ratio` gauge
+- `fh_pool_connections` (pool, state), `fh_pool_max_connections`,
+  `fh_pool_waiting`, `fh_pool_utilization_ratio` – read at scrape time from
+  registered httpx / asyncpg / Redis pools
+- `fh_event_loop_lag_seconds` (histogram) and `fh_event_loop_lag_last_seconds`
+- `fh_executor_tasks_total` (executor, outcome), `fh_executor_queue_wait_seconds`
+  and `fh_executor_run_seconds` for `core.performance.executors`
+- `fh_event_loop_stalls_total` (route) / `fh_event_loop_stall_seconds`, fed
+  by `loop_diagnostics.LoopStallDetector`
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram  # type: ignore
+    from prometheus_client.core import GaugeMetricFamily  # type: ignore
+
+    _PROM_AVAILABLE = True
+except ImportError:  # pragma: no cover – optional dep
+    _PROM_AVAILABLE = False
+
+from .prometheus_exporter import _NoOpMetric
+
+logger = logging.getLogger(__name__)
+
+# Hostname fragment → provider label (anything else falls back to the log name)
+_PROVIDER_HOSTS: Tuple[Tuple[str, str], ...] = (
+    ("eodhd.com", "eodhd"),
+    ("eodhistoricaldata.com", "eodhd"),
+    ("financialmodelingprep.com", "fmp"),
+    ("alphavantage.co", "alphavantage"),
+    ("marketaux.com", "marketaux"),
+    ("newsapi.org", "newsapi"),
+    ("finance.yahoo.com", "yfinance"),
+    ("stlouisfed.org", "fred"),
+    ("ecb.europa.eu", "ecb"),
+    ("mnb.hu", "mnb"),
+    ("openrouter.ai", "openrouter"),
+)
+
+# Label cardinality guards
+MAX_CACHE_NAMESPACES = 64
+MAX_PROVIDERS = 32
+UNMATCHED_ROUTE = "<unmatched>"
+REJECTED_ROUTE = "<rejected>"
+
+_BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+PoolSource = Callable[[], Optional[Dict[str, int]]]
+
+
+class ServiceMetrics:
+    """HTTP / upstream / cache / pool / event-loop metrics with graceful degrade."""
+
+    def __init__(self, registry=None):
+        self._pool_sources: Dict[str, PoolSource] = {}
+        self._cache_counts: Dict[str, list] = {}  # namespace → [hits, misses]
+        self._providers: set = set()
+        self.registry = registry if _PROM_AVAILABLE else None
+
+        if self.registry is None:
+            self.http_requests = self.http_duration = self.http_in_flight = (
+                self.upstream_seconds
+            ) = self.upstream_errors = self.cache_requests = self.cache_seconds = (
+                self.cache_bytes
+            ) = self.loop_lag = self.loop_lag_last = self.loop_stalls = (
+                self.loop_stall_seconds
+            ) = self.executor_tasks = self.executor_wait = self.executor_run = (
+                _NoOpMetric()
+            )
+            return
+
+        self.http_requests = Counter(
+            "fh_http_requests_total",
+            "HTTP requests by route template and status",
+            ["method", "route", "status"],
+            registry=registry,
+        )
+        self.http_duration = Histogram(
+            "fh_http_request_duration_seconds",
+            "HTTP request duration (until the response body is sent)",
+            ["method", "route", "status"],
+            registry=registry,
+            buckets=_LATENCY_BUCKETS,
+        )
+        self.http_in_flight = Gauge(
+            "fh_http_requests_in_flight",
+            "HTTP requests currently being served",
+            registry=registry,
+        )
+        self.upstream_seconds = Histogram(
+            "fh_upstream_request_seconds",
+            "Outbound data-provider request duration",
+            ["provider", "outcome"],
+            registry=registry,
+            buckets=_LATENCY_BUCKETS,
+        )
+        self.upstream_errors = Counter(
+            "fh_upstream_errors_total",
+            "Outbound data-provider request errors",
+            ["provider", "error_type"],
+            registry=registry,
+        )
+        self.cache_requests = Counter(
+            "fh_cache_requests_total",
+            "Cache lookups by key namespace",
+            ["namespace", "result"],
+            registry=registry,
+        )
+        self.cache_seconds = Histogram(
+            "fh_cache_operation_seconds",
+            "Cache operation latency",
+            ["op", "backend"],
+            registry=registry,
+            buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+        )
+        self.cache_bytes = Histogram(
+            "fh_cache_payload_bytes",
+            "Cached payload size by key namespace",
+            ["namespace", "op"],
+            registry=registry,
+            buckets=_BYTES_BUCKETS,
+        )
+        self.loop_lag = Histogram(
+            "fh_event_loop_lag_seconds",
+            "Event loop scheduling lag",
+            registry=registry,
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+        )
+        self.loop_lag_last = Gauge(
+            "fh_event_loop_lag_last_seconds",
+            "Most recent event loop lag sample",
+            registry=registry,
+        )
+        self.loop_stalls = Counter(
+            "fh_event_loop_stalls_total",
+            "Event loop stalls over the threshold by route of the blocking task",
+            ["route"],
+            registry=registry,
+        )
+        self.loop_stall_seconds = Histogram(
+            "fh_event_loop_stall_seconds",
+            "Duration of detected event loop stalls",
+            registry=registry,
+            buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+        )
+        self.executor_tasks = Counter(
+            "fh_executor_tasks_total",
+            "Managed executor calls by outcome",
+            ["executor", "outcome"],
+            registry=registry,
+        )
+        self.executor_wait = Histogram(
+            "fh_executor_queue_wait_seconds",
+            "Time a managed executor call waited for a worker",
+            ["executor"],
+            registry=registry,
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+        )
+        self.executor_run = Histogram(
+            "fh_executor_run_seconds",
+            "Managed executor call run time",
+            ["executor"],
+            registry=registry,
+            buckets=_LATENCY_BUCKETS,
+        )
+        registry.register(_ScrapeTimeCollector(self))
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def observe_http_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        labels = {"method": method, "route": route, "status": str(status)}
+        self.http_requests.labels(**labels).inc()
+        self.http_duration.labels(**labels).observe(seconds)
+
+    # ------------------------------------------------------------------
+    # Upstream providers
+    # ------------------------------------------------------------------
+
+    def provider_label(self, source: str, url: Optional[str] = None) -> str:
+        """Stable provider label from the URL host, else the log source name."""
+        host = (urlsplit(url).hostname or "") if url else ""
+        for fragment, provider in _PROVIDER_HOSTS:
+            if host.endswith(fragment):
+                return provider
+        name = source.replace(" ", "_").split("_", 1)[0].lower() or "unknown"
+        if name not in self._providers:
+            if len(self._providers) >= MAX_PROVIDERS:
+                return "other"
+            self._providers.add(name)
+        return name
+
+    def observe_upstream(
+        self, provider: str, seconds: float, error_type: Optional[str] = None
+    ) -> None:
+        outcome = "error" if error_type else "ok"
+        self.upstream_seconds.labels(provider=provider, outcome=outcome).observe(seconds)
+        if error_type:
+            self.upstream_errors.labels(provider=provider, error_type=error_type).inc()
+
+    @contextmanager
+    def track_upstream(self, provider: str) -> Iterator[None]:
+        """Time a provider call that does not go through `make_api_request`."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            self.observe_upstream(
+                provider, time.perf_counter() - started, type(exc).__name__
+            )
+            raise
+        self.observe_upstream(provider, time.perf_counter() - started)
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def cache_namespace(self, key: str) -> str:
+        """First `:`-segment of the key (bounded number of distinct values)."""
+        namespace = key.split(":", 1)[0][:32] or "default"
+        if namespace not in self._cache_counts:
+            if len(self._cache_counts) >= MAX_CACHE_NAMESPACES:
+                return "other"
+            self._cache_counts[namespace] = [0, 0]
+        return namespace
+
+    def observe_cache_get(
+        self, key: str, value: Any, seconds: Optional[float], backend: str
+    ) -> None:
+        """Hit/miss + payload size; `seconds=None` for keys of a batch (MGET)."""
+        namespace = self.cache_namespace(key)
+        hit = value is not None
+        counts = self._cache_counts.get(namespace)
+        if counts is not None:
+            counts[0 if hit else 1] += 1
+        self.cache_requests.labels(
+            namespace=namespace, result="hit" if hit else "miss"
+        ).inc()
+        if seconds is not None:
+            self.cache_seconds.labels(op="get", backend=backend).observe(seconds)
+        if hit and isinstance(value, (str, bytes)):
+            self.cache_bytes.labels(namespace=namespace, op="get").observe(len(value))
+
+    def observe_cache_set(
+        self, key: str, size: Optional[int], seconds: float, backend: str
+    ) -> None:
+        self.cache_seconds.labels(op="set", backend=backend).observe(seconds)
+        if size is not None:
+            self.cache_bytes.labels(
+                namespace=self.cache_namespace(key), op="set"
+            ).observe(size)
+
+    def observe_cache_op(self, op: str, seconds: float, backend: str) -> None:
+        self.cache_seconds.labels(op=op, backend=backend).observe(seconds)
+
+    def cache_hit_ratios(self) -> Dict[str, float]:
+        return {
+            namespace: hits / (hits + misses)
+            for namespace, (hits, misses) in self._cache_counts.items()
+            if hits + misses
+        }
+
+    # ------------------------------------------------------------------
+    # Connection pools
+    # ------------------------------------------------------------------
+
+    def register_pool(self, name: str, source: PoolSource) -> None:
+        """
+        Register a pool read at scrape time.
+
+        `source()` returns ``{"in_use", "idle", "max", "waiting"}`` (missing
+        keys count as 0) or None when the pool is not open.
+        """
+        self._pool_sources[name] = source
+
+    def unregister_pool(self, name: str) -> None:
+        self._pool_sources.pop(name, None)
+
+    def pool_usage(self) -> Dict[str, Dict[str, int]]:
+        usage = {}
+        for name, source in list(self._pool_sources.items()):
+            try:
+                stats = source()
+            except Exception as e:  # a broken source must not break /metrics
+                logger.debug(f"Pool source {name} failed: {e}")
+                continue
+            if stats is not None:
+                usage[name] = stats
+        return usage
+
+    # ------------------------------------------------------------------
+    # Event loop
+    # ------------------------------------------------------------------
+
+    def observe_loop_lag(self, seconds: float) -> None:
+        self.loop_lag.observe(seconds)
+        self.loop_lag_last.set(seconds)
+
+    # ------------------------------------------------------------------
+    # Managed executors
+    # ------------------------------------------------------------------
+
+    def observe_executor_task(
+        self,
+        executor: str,
+        outcome: str,
+        wait_seconds: Optional[float] = None,
+        run_seconds: Optional[float] = None,
+    ) -> None:
+        self.executor_tasks.labels(executor=executor, outcome=outcome).inc()
+        if wait_seconds is not None:
+            self.executor_wait.labels(executor=executor).observe(wait_seconds)
+        if run_seconds is not None:
+            self.executor_run.labels(executor=executor).observe(run_seconds)
+
+    def inc_loop_stall(self, route: str) -> None:
+        self.loop_stalls.labels(route=route).inc()
+
+    def observe_loop_stall(self, seconds: float) -> None:
+        self.loop_stall_seconds.observe(seconds)
+
+
+class _ScrapeTimeCollector:
+    """Pool gauges and cache hit ratios, computed when /metrics is scraped."""
+
+    def __init__(self, metrics: ServiceMetrics):
+        self._metrics = metrics
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        connections = GaugeMetricFamily(
+            "fh_pool_connections", "Pool connections by state", labels=["pool", "state"]
+        )
+        maximum = GaugeMetricFamily(
+            "fh_pool_max_connections", "Pool connection limit", labels=["pool"]
+        )
+        waiting = GaugeMetricFamily(
+            "fh_pool_waiting", "Callers waiting for a pool connection", labels=["pool"]
+        )
+        utilization = GaugeMetricFamily(
+            "fh_pool_utilization_ratio", "In-use / max connections", labels=["pool"]
+        )
+        for name, stats in self._metrics.pool_usage().items():
+            in_use = stats.get("in_use", 0)
+            limit = stats.get("max", 0)
+            connections.add_metric([name, "in_use"], in_use)
+            connections.add_metric([name, "idle"], stats.get("idle", 0))
+            maximum.add_metric([name], limit)
+            waiting.add_metric([name], stats.get("waiting", 0))
+            utilization.add_metric([name], in_use / limit if limit else 0.0)
+        hit_ratio = GaugeMetricFamily(
+            "fh_cache_hit_ratio",
+            "Cache hit ratio since start by key namespace",
+            labels=["namespace"],
+        )
+        for namespace, ratio in self._metrics.cache_hit_ratios().items():
+            hit_ratio.add_metric([namespace], ratio)
+        return [connections, maximum, waiting, utilization, hit_ratio]
+
+
+# -------------------------------------------------------------------------
+# Pool sources
+# -------------------------------------------------------------------------
+
+
+def httpx_pool_source(client) -> PoolSource:
+    """Usage of an `httpx.AsyncClient` default transport pool."""
+
+    def source() -> Optional[Dict[str, int]]:
+        if client.is_closed:
+            return None
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        if pool is None:
+            return None
+        connections = list(pool.connections)
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "max": getattr(pool, "_max_connections", 0) or 0,
+            "waiting": len(getattr(pool, "_requests", ())),
+        }
+
+    return source
+
+
+def redis_pool_source(get_pool: Callable[[], Any]) -> PoolSource:
+    """Usage of a `redis.asyncio.ConnectionPool`.
+
+    `get_pool` is called at every scrape: CacheService builds a new pool on
+    reconnect, so a pool captured once would go stale.
+    """
+
+    def source() -> Optional[Dict[str, int]]:
+        pool = get_pool()
+        if pool is None:
+            return None
+        return {
+            "in_use": len(getattr(pool, "_in_use_connections", ())),
+            "idle": len(getattr(pool, "_available_connections", ())),
+            "max": pool.max_connections,
+        }
+
+    return source
+
+
+def database_pool_source(db_pool) -> PoolSource:
+    """Usage of a `DatabasePool` (asyncpg)."""
+
+    def source() -> Optional[Dict[str, int]]:
+        return db_pool.usage() if db_pool.pool is not None else None
+
+    return source
+
+
+# -------------------------------------------------------------------------
+# Event loop lag
+# -------------------------------------------------------------------------
+
+
+class LoopLagMonitor:
+    """Samples how late a fixed-interval sleep wakes up."""
+
+    def __init__(self, metrics: ServiceMetrics, interval: float = 0.5):
+        self.metrics = metrics
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.metrics.observe_loop_lag(max(0.0, loop.time() - expected))
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -0,0 +1,415 @@
+"""tracing.py – Lightweight request tracing for FinanceHub.
+
+A trace is opened per HTTP request by the request pipeline middleware; code
+inside the request records phases with::
+
+    from backend.core.metrics.tracing import span, traced
+
+    with span("fetch.ohlcv", ticker=ticker):
+        ...
+
+    @traced("map.news")
+    def map_news(...): ...
+
+Finished spans feed three sinks:
+
+- the `fh_phase_duration_seconds` Prometheus histogram (label `phase`),
+- the `Server-Timing` response header (phases finished before the
+  response headers are sent, summed per name),
+- an optional exporter: OTLP/HTTP JSON to a local collector
+  (`TRACING.OTLP_ENDPOINT`, e.g. ``http://localhost:4318``) and/or one
+  OTLP-JSON span per line to `TRACING.EXPORT_FILE`.
+
+Span/trace ids and the incoming W3C `traceparent` header follow the
+OpenTelemetry conventions, so exported spans join traces started upstream.
+Nothing here needs the OpenTelemetry SDK.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "fh_current_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "fh_current_span", default=None
+)
+
+SERVICE_NAME = "financehub-backend"
+_MAX_SPANS_PER_TRACE = 512
+_EXPORT_QUEUE_SIZE = 10_000
+_EXPORT_INTERVAL_SECONDS = 2.0
+
+
+def _new_id(nbytes: int) -> str:
+    return f"{random.getrandbits(nbytes * 8):0{nbytes * 2}x}"
+
+
+class Span:
+    """One timed phase of a trace."""
+
+    __slots__ = (
+        "trace",
+        "name",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "_token",
+    )
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.error: Optional[str] = None
+        self._token = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self.trace._finish(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            **({"parentSpanId": self.parent_id} if self.parent_id else {}),
+            "name": self.name,
+            "kind": 1,  # INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+
+
+class Trace:
+    """All spans of one request."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        sampled: bool = True,
+    ):
+        self.trace_id = trace_id or _new_id(16)
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.root = Span(self, name, parent_id, {})
+
+    def _finish(self, span: Span) -> None:
+        if span is self.root:
+            if self.sampled:
+                get_span_exporter().submit(self.root, self.spans)
+            return
+        _observe_phase(span.name, (span.end_ns - span.start_ns) / 1e9)
+        if len(self.spans) < _MAX_SPANS_PER_TRACE:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+    def phase_totals(self) -> List[Tuple[str, float]]:
+        """(phase, total ms) of finished spans, in first-seen order."""
+        totals: Dict[str, float] = {}
+        for s in self.spans:
+            if s.end_ns is not None:
+                totals[s.name] = totals.get(s.name, 0.0) + (s.end_ns - s.start_ns) / 1e6
+        return list(totals.items())
+
+    def server_timing(self) -> str:
+        parts = [f"{_token(name)};dur={ms:.1f}" for name, ms in self.phase_totals()]
+        parts.append(f"total;dur={self.root.duration_ms:.1f}")
+        return ", ".join(parts)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.root.span_id}-{'01' if self.sampled else '00'}"
+
+
+class span:  # noqa: N801 – used like a function
+    """
+    Context manager (sync and async) recording one phase of the current trace.
+
+    Outside a trace it is a no-op. ``activate=False`` records the span without
+    making it the parent of nested spans – use it in async generators, whose
+    body runs interleaved with the consumer.
+    """
+
+    __slots__ = ("name", "attributes", "activate", "span")
+
+    def __init__(self, name: str, activate: bool = True, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self.activate = activate
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Optional[Span]:
+        trace = _current_trace.get()
+        if trace is None:
+            return None
+        parent = _current_span.get() or trace.root
+        self.span = Span(trace, self.name, parent.span_id, self.attributes)
+        if self.activate:
+            self.span._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        s = self.span
+        if s is None:
+            return False
+        if exc is not None and not isinstance(exc, (asyncio.CancelledError, GeneratorExit)):
+            s.error = f"{exc_type.__name__}: {exc}"
+        if s._token is not None:
+            try:
+                _current_span.reset(s._token)
+            except ValueError:  # exited in another context – just drop it
+                pass
+            s._token = None
+        s.end()
+        return False
+
+    async def __aenter__(self) -> Optional[Span]:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """Decorator form of `span` for sync and async functions."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def start_trace(name: str, traceparent: Optional[str] = None) -> Tuple[Trace, Any]:
+    """Open a trace for the current context. Returns (trace, reset token)."""
+    trace_id = parent_id = None
+    sampled = random.random() < _sample_rate()
+    if traceparent:
+        parsed = _parse_traceparent(traceparent)
+        if parsed:
+            trace_id, parent_id, upstream_sampled = parsed
+            sampled = sampled or upstream_sampled
+    trace = Trace(name, trace_id=trace_id, parent_id=parent_id, sampled=sampled)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(trace: Trace, token: Any) -> None:
+    trace.root.end()
+    try:
+        _current_trace.reset(token)
+    except ValueError:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Sinks
+# ---------------------------------------------------------------------------
+
+
+def _observe_phase(phase: str, seconds: float) -> None:
+    try:
+        from backend.core.metrics import METRICS_EXPORTER
+
+        METRICS_EXPORTER.observe_phase(phase, seconds)
+    except Exception:  # pragma: no cover – metrics must never break a request
+        pass
+
+
+class SpanExporter:
+    """Buffers finished traces and flushes them in the background."""
+
+    def __init__(self, otlp_endpoint: Optional[str] = None, file_path: Optional[str] = None):
+        self.otlp_endpoint = otlp_endpoint.rstrip("/") if otlp_endpoint else None
+        self.file_path = file_path
+        self._queue: Deque[Dict[str, Any]] = deque(maxlen=_EXPORT_QUEUE_SIZE)
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self.exported = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.otlp_endpoint or self.file_path)
+
+    def submit(self, root: Span, spans: List[Span]) -> None:
+        if not self.enabled:
+            return
+        self._queue.append(root.to_otlp())
+        self._queue.extend(s.to_otlp() for s in spans)
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                pass  # no loop – flushed on the next submit / close
+
+    async def _flush_loop(self) -> None:
+        while self._queue:
+            await asyncio.sleep(_EXPORT_INTERVAL_SECONDS)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Span export failed: {e}")
+
+    async def flush(self) -> None:
+        batch = list(self._queue)
+        self._queue.clear()
+        if not batch:
+            return
+        if self.file_path:
+            await asyncio.to_thread(self._write_file, batch)
+        if self.otlp_endpoint:
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=5.0)
+            payload = {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                        },
+                        "scopeSpans": [
+                            {"scope": {"name": "backend.core.metrics.tracing"}, "spans": batch}
+                        ],
+                    }
+                ]
+            }
+            resp = await self._client.post(f"{self.otlp_endpoint}/v1/traces", json=payload)
+            resp.raise_for_status()
+        self.exported += len(batch)
+
+    def _write_file(self, batch: List[Dict[str, Any]]) -> None:
+        with open(self.file_path, "a", encoding="utf-8") as fh:
+            for item in batch:
+                fh.write(json.dumps(item, separators=(",", ":")) + "\n")
+
+    async def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Final span export failed: {e}")
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def get_span_exporter() -> SpanExporter:
+    global _exporter
+    if _exporter is None:
+        cfg = _tracing_settings()
+        _exporter = SpanExporter(
+            otlp_endpoint=getattr(cfg, "OTLP_ENDPOINT", None)
+            or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"),
+            file_path=getattr(cfg, "EXPORT_FILE", None),
+        )
+    return _exporter
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _tracing_settings():
+    try:
+        from backend.config import settings
+
+        return settings.TRACING
+    except Exception:  # pragma: no cover – config not loadable (scripts)
+        return None
+
+
+def _sample_rate() -> float:
+    cfg = _tracing_settings()
+    return float(getattr(cfg, "SAMPLE_RATE", 1.0)) if cfg is not None else 1.0
+
+
+def _parse_traceparent(value: str) -> Optional[Tuple[str, str, bool]]:
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3][:2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 0x01)
+
+
+def _token(name: str) -> str:
+    """Server-Timing metric names must be HTTP tokens."""
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    out = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            v = {"boolValue": value}
+        elif isinstance(value, int):
+            v = {"intValue": str(value)}
+        elif isinstance(value, float):
+            v = {"doubleValue": value}
+        else:
+            v = {"stringValue": str(value)}
+        out.append({"key": key, "value": v})
+    return out
@@ -14,6 +14,7 @@ from datetime import datetime
 import httpx
 
 from backend.utils.logger_config import get_logger
+from backend.core.metrics.tracing import span, traced
 from backend.utils.cache_service import CacheService
 from backend.core.fetchers import get_fetcher
 from backend.core.ai.unified_service import UnifiedAIService
@@ -58,6 +59,7 @@ class StockOrchestrator:
             self._http_client = httpx.AsyncClient(timeout=30.0)
         return self._http_client
 
+    @traced("orchestrator.run")
     async def run(
         self,
         ticker: str,
@@ -155,6 +157,7 @@ class StockOrchestrator:
                 await self._http_client.aclose()
                 self._http_client = None
 
+    @traced("cache.lookup")
     async def _check_cache(self, ticker: str, request_id: str) -> dict[str, Any] | None:
         """Check cache for existing data."""
         cache_key = f"stock_data:{ticker}"
@@ -167,6 +170,7 @@ class StockOrchestrator:
             logger.warning(f"[{request_id}] Cache check failed: {cache_error}")
         return None
 
+    @traced("fetch.fundamentals")
     async def _fetch_fundamentals(
         self, ticker: str, client: httpx.AsyncClient, request_id: str
     ) -> dict[str, Any] | None:
@@ -178,6 +182,7 @@ class StockOrchestrator:
             logger.error(f"[{request_id}] Fundamentals fetch failed: {error}")
             return None
 
+    @traced("fetch.ohlcv")
     async def _fetch_ohlcv(
         self, ticker: str, client: httpx.AsyncClient, request_id: str
     ) -> dict[str, Any] | None:
@@ -191,6 +196,7 @@ class StockOrchestrator:
             logger.error(f"[{request_id}] OHLCV fetch failed: {error}")
         return None
 
+    @traced("fetch.news")
     async def _fetch_news(
         self, ticker: str, client: httpx.AsyncClient, request_id: str
     ) -> dict[str, Any] | None:
@@ -202,6 +208,7 @@ class StockOrchestrator:
             logger.error(f"[{request_id}] News fetch failed: {error}")
         return None
 
+    @traced("map.response")
     async def _build_response(
         self,
         ticker: str,
@@ -222,6 +229,7 @@ class StockOrchestrator:
         logger.debug(f"[{request_id}] Built response for {ticker}")
         return response
 
+    @traced("ai.summary")
     async def _generate_ai_summary(
         self, data: dict[str, Any], request_id: str
     ) -> str | None:
@@ -341,6 +349,7 @@ class StockOrchestrator:
 
         return "\n".join(prompt_parts)
 
+    @traced("cache.write")
     async def _cache_response(
         self, ticker: str, data: dict[str, Any], request_id: str
     ) -> None:
@@ -384,7 +393,8 @@ class StockOrchestrator:
         )
 
         try:
-            ticker_info = await self.fetcher.fetch_company_info(symbol, request_id)
+            with span("fetch.company_info", symbol=symbol):
+                ticker_info = await self.fetcher.fetch_company_info(symbol, request_id)
             if not ticker_info:
                 logger.warning(
                     f"[{request_id}] Primary fetcher failed – falling back to direct yfinance lookup for {symbol}."
@@ -398,9 +408,10 @@ class StockOrchestrator:
                     logger.error(f"[{request_id}] yfinance fallback failed: {yf_error}")
                     return None
 
-            price_metrics = self.processor.calculate_price_metrics(
-                ticker_info, request_id
-            )
+            with span("map.price_metrics"):
+                price_metrics = self.processor.calculate_price_metrics(
+                    ticker_info, request_id
+                )
 
             basic_data = {
                 "symbol": symbol,
@@ -445,23 +456,25 @@ class StockOrchestrator:
 
         try:
             # Fetch OHLCV data
-            ohlcv_df = await self.fetcher.fetch_ohlcv_data(
-                symbol, client, period, interval, request_id
-            )
+            with span("fetch.ohlcv", symbol=symbol, period=period, interval=interval):
+                ohlcv_df = await self.fetcher.fetch_ohlcv_data(
+                    symbol, client, period, interval, request_id
+                )
 
             if ohlcv_df is None or ohlcv_df.empty:
                 logger.warning(f"[{request_id}] No chart data available for {symbol}")
                 return None
 
-            # Process OHLCV data
-            latest_ohlcv = self.processor.process_ohlcv_dataframe(
-                ohlcv_df, symbol, request_id
-            )
+            with span("map.chart", rows=len(ohlcv_df)):
+                # Process OHLCV data
+                latest_ohlcv = self.processor.process_ohlcv_dataframe(
+                    ohlcv_df, symbol, request_id
+                )
 
-            # Build chart response
-            chart_data = self.response_builder.build_chart_response(
-                symbol, ohlcv_df, latest_ohlcv, request_id
-            )
+                # Build chart response
+                chart_data = self.response_builder.build_chart_response(
+                    symbol, ohlcv_df, latest_ohlcv, request_id
+                )
 
             duration = round((time.monotonic() - start_time) * 1000, 2)
             logger.info(
@@ -487,7 +500,8 @@ class StockOrchestrator:
 
         try:
             # Fetch company information
-            ticker_info = await self.fetcher.fetch_company_info(symbol, request_id)
+            with span("fetch.company_info", symbol=symbol):
+                ticker_info = await self.fetcher.fetch_company_info(symbol, request_id)
 
             if not ticker_info:
                 logger.warning(
@@ -495,18 +509,19 @@ class StockOrchestrator:
                 )
                 return None
 
-            # Process company information
-            company_overview = self.processor.process_company_info(
-                ticker_info, symbol, request_id
-            )
-            price_metrics = self.processor.calculate_price_metrics(
-                ticker_info, request_id
-            )
+            with span("map.fundamentals"):
+                # Process company information
+                company_overview = self.processor.process_company_info(
+                    ticker_info, symbol, request_id
+                )
+                price_metrics = self.processor.calculate_price_metrics(
+                    ticker_info, request_id
+                )
 
-            # Build fundamentals response
-            fundamentals_data = self.response_builder.build_fundamentals_response(
-                symbol, company_overview, price_metrics, ticker_info, request_id
-            )
+                # Build fundamentals response
+                fundamentals_data = self.response_builder.build_fundamentals_response(
+                    symbol, company_overview, price_metrics, ticker_info, request_id
+                )
 
             duration = round((time.monotonic() - start_time) * 1000, 2)
             logger.info(
@@ -543,9 +558,10 @@ class StockOrchestrator:
             logger.info(f"[{request_id}] Starting parallel data fetch for {symbol}")
 
             # Fetch OHLCV data
-            ohlcv_df = await self.fetcher.fetch_ohlcv_data(
-                symbol, client, period, interval, request_id
-            )
+            with span("fetch.ohlcv", symbol=symbol, period=period, interval=interval):
+                ohlcv_df = await self.fetcher.fetch_ohlcv_data(
+                    symbol, client, period, interval, request_id
+                )
 
             if ohlcv_df is None or ohlcv_df.empty:
                 logger.warning(f"[{request_id}] No OHLCV data available for {symbol}")
@@ -558,7 +574,8 @@ class StockOrchestrator:
                     calculate_and_format_indicators,
                 )
 
-                indicator_history = calculate_and_format_indicators(ohlcv_df, symbol)
+                with span("indicators", rows=len(ohlcv_df)):
+                    indicator_history = calculate_and_format_indicators(ohlcv_df, symbol)
                 if indicator_history:
                     # Convert to dict format for compatibility
                     technical_indicators = {
@@ -613,14 +630,16 @@ class StockOrchestrator:
             # Fetch fundamentals data
             fundamentals_data = None
             try:
-                ticker_info = await self.fetcher.fetch_company_info(symbol, request_id)
+                with span("fetch.company_info", symbol=symbol):
+                    ticker_info = await self.fetcher.fetch_company_info(symbol, request_id)
                 if ticker_info:
-                    company_overview = self.processor.process_company_info(
-                        ticker_info, symbol, request_id
-                    )
-                    price_metrics = self.processor.calculate_price_metrics(
-                        ticker_info, request_id
-                    )
+                    with span("map.fundamentals"):
+                        company_overview = self.processor.process_company_info(
+                            ticker_info, symbol, request_id
+                        )
+                        price_metrics = self.processor.calculate_price_metrics(
+                            ticker_info, request_id
+                        )
                     fundamentals_data = {
                         "company_overview": company_overview,
                         "price_metrics": price_metrics,
@@ -643,7 +662,8 @@ class StockOrchestrator:
             # Fetch news data
             news_data = None
             try:
-                news_data = await self.fetcher.fetch_news(symbol, request_id)
+                with span("fetch.news", symbol=symbol):
+                    news_data = await self.fetcher.fetch_news(symbol, request_id)
                 if news_data:
                     logger.info(
                         f"[{request_id}] Successfully fetched {len(news_data)} news items for {symbol}"
@@ -1,21 +1,135 @@
 """
 Database Connection Pool Manager for FinanceHub
 Provides efficient database connections with automatic scaling
+
+Queries can be plain SQL strings or named `Query` objects (see `queries.py`).
+With `prepared_statements` on, asyncpg keeps every statement prepared per
+connection (parse/plan once). It is off by default for pgBouncer / pooler
+DSNs (transaction pooling mode) and can be forced with
+`DATABASE_PREPARED_STATEMENTS`. Every query is timed into a per-name latency
+histogram.
+
+Auto-scaling: the asyncpg pool is created with `max_size` as a hard ceiling,
+but checkouts pass a capacity limiter whose limit moves between `min_size`
+and `max_size` every `scale_interval` seconds – up when the p95 acquire wait
+exceeds `target_wait_ms` or utilisation is high, down when the pool sits
+mostly idle or the server refuses connections. Connections above the live
+capacity idle out (`max_inactive_connection_lifetime`).
+
+Read replicas: `fetch*(..., readonly=True)` goes to the least-loaded replica
+whose measured replay lag is within `max_replica_lag`; otherwise (no replica,
+all lagging or down) it falls back to the primary.
 """
 
+import asyncio
 import time
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional, Dict, Any
+from typing import (
+    AsyncGenerator,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Dict,
+    Any,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlparse
 import asyncpg
 from backend.config import settings
+from backend.config._core import _parse_env_list_str_utility
 from backend.utils.logger_config import get_logger
+from .queries import Query, QueryLatencyHistogram, as_query
 
 logger = get_logger(__name__)
 
+QueryLike = Union[Query, str]
+
+# Bulk writes switch from executemany to COPY above this many rows
+COPY_THRESHOLD = 200
+
+# Autoscaling thresholds (utilisation = peak connections in use / capacity)
+SCALE_UP_UTILISATION = 0.9
+SCALE_DOWN_UTILISATION = 0.3
+SCALE_DOWN_AFTER_TICKS = 3
+IDLE_CONNECTION_LIFETIME = 60.0
+REPLICA_RECONNECT_SECONDS = 30.0
+
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def _is_transaction_pooler(dsn: str) -> bool:
+    """pgBouncer / Supabase pooler in transaction mode cannot keep prepared statements."""
+    parsed = urlparse(dsn)
+    host = (parsed.hostname or "").lower()
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    return port == 6543 or "pgbouncer" in host or "pooler" in host
+
+
+class _CapacityLimiter:
+    """FIFO semaphore whose limit can be changed while in use."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # slot was handed over just before cancellation
+            else:
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
 
 class DatabasePool:
     """Enhanced database connection pool with monitoring and auto-scaling"""
 
+    # Replicas are maintained by their primary's loop
+    _owns_maintenance = True
+
     def __init__(
         self,
         dsn: str,
@@ -23,13 +137,45 @@ class DatabasePool:
         max_size: int = 50,
         command_timeout: int = 30,
         server_settings: Optional[Dict[str, str]] = None,
+        prepared_statements: Optional[bool] = None,
+        statement_cache_size: Optional[int] = None,
+        autoscale: Optional[bool] = None,
+        target_wait_ms: Optional[float] = None,
+        scale_interval: float = 5.0,
+        replicas: Optional[Sequence["ReplicaPool"]] = None,
+        max_replica_lag: Optional[float] = None,
     ):
         self.dsn = dsn
         self.min_size = min_size
         self.max_size = max_size
         self.command_timeout = command_timeout
+        self.autoscale = (
+            settings.DATABASE_POOL_AUTOSCALE if autoscale is None else autoscale
+        )
+        self.target_wait = (
+            settings.DATABASE_POOL_TARGET_WAIT_MS if target_wait_ms is None else target_wait_ms
+        ) / 1000
+        self.scale_interval = scale_interval
+        self.replicas: List["ReplicaPool"] = list(replicas or ())
+        self.max_replica_lag = (
+            settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+            if max_replica_lag is None
+            else max_replica_lag
+        )
+        if prepared_statements is None:
+            prepared_statements = settings.DATABASE_PREPARED_STATEMENTS
+        if prepared_statements is None:
+            prepared_statements = not _is_transaction_pooler(dsn)
+        self.prepared_statements = prepared_statements
+        self.statement_cache_size = (
+            settings.DATABASE_STATEMENT_CACHE_SIZE
+            if statement_cache_size is None
+            else statement_cache_size
+        )
+        # Sent in the startup packet – no per-connection SET round trips
         self.server_settings = server_settings or {
             "application_name": "financehub_backend",
+            "timezone": "UTC",
             "tcp_keepalives_idle": "600",
             "tcp_keepalives_interval": "30",
             "tcp_keepalives_count": "3",
@@ -45,7 +191,19 @@ class DatabasePool:
             "total_query_time": 0.0,
             "failed_queries": 0,
             "pool_exhausted_count": 0,
+            "scale_ups": 0,
+            "scale_downs": 0,
+            "replica_reads": 0,
+            "replica_fallbacks": 0,
         }
+        self.latency = QueryLatencyHistogram()
+        self._capacity = _CapacityLimiter(
+            max(min_size, max_size // 2) if self.autoscale else max_size
+        )
+        self._waits: Deque[float] = deque(maxlen=4096)
+        self._peak_in_use = 0
+        self._idle_ticks = 0
+        self._maintenance_task: Optional[asyncio.Task] = None
 
     async def initialize(self) -> None:
         """Initialize the database connection pool"""
@@ -58,47 +216,155 @@ class DatabasePool:
                 self.dsn,
                 min_size=self.min_size,
                 max_size=self.max_size,
+                max_inactive_connection_lifetime=IDLE_CONNECTION_LIFETIME,
                 command_timeout=self.command_timeout,
                 server_settings=self.server_settings,
                 init=self._init_connection,
-                statement_cache_size=0,  # Disable statement cache for pgBouncer compatibility
+                # 0 = no server-side prepared statements (pgBouncer transaction mode)
+                statement_cache_size=(
+                    self.statement_cache_size if self.prepared_statements else 0
+                ),
             )
 
-            logger.info("[DatabasePool] Pool initialized successfully")
+            logger.info(
+                f"[DatabasePool] Pool initialized successfully "
+                f"(prepared statements: {'on' if self.prepared_statements else 'off'}, "
+                f"capacity: {self._capacity.limit}, replicas: {len(self.replicas)})"
+            )
 
         except Exception as e:
             logger.error(f"[DatabasePool] Failed to initialize: {e}")
             raise
 
-    async def _init_connection(self, connection: asyncpg.Connection) -> None:
-        """Initialize new database connections"""
-        try:
-            # Set up connection-specific settings
-            await connection.execute("SET timezone = 'UTC'")
-            await connection.execute("SET statement_timeout = '30s'")
+        for replica in self.replicas:
+            try:
+                await replica.initialize()
+            except Exception:
+                # Reads fall back to the primary until the replica comes up
+                replica.healthy = False
+        if self._owns_maintenance and (self.autoscale or self.replicas):
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def _maintenance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.scale_interval)
+            try:
+                await self._maintain()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[DatabasePool] Maintenance tick failed: {e}")
+
+    async def _maintain(self) -> None:
+        if self.autoscale:
+            self._autoscale_tick()
+        for replica in self.replicas:
+            await replica._maintain()
+
+    def _autoscale_tick(self) -> None:
+        """Resize the capacity limiter from the last interval's waits and peak usage."""
+        capacity = self._capacity.limit
+        waits = sorted(self._waits)
+        self._waits.clear()
+        p95_wait = waits[int(len(waits) * 0.95)] if waits else 0.0
+        utilisation = self._peak_in_use / capacity if capacity else 0.0
+        self._peak_in_use = self._capacity.in_use
+
+        new_capacity = capacity
+        if p95_wait > self.target_wait or utilisation >= SCALE_UP_UTILISATION:
+            self._idle_ticks = 0
+            new_capacity = min(self.max_size, capacity + max(1, capacity // 2))
+        elif utilisation < SCALE_DOWN_UTILISATION:
+            self._idle_ticks += 1
+            if self._idle_ticks >= SCALE_DOWN_AFTER_TICKS:
+                self._idle_ticks = 0
+                new_capacity = max(self.min_size, capacity - max(1, capacity // 4))
+        else:
+            self._idle_ticks = 0
+
+        if new_capacity != capacity:
+            self._resize(new_capacity)
+            logger.info(
+                f"[DatabasePool] Capacity {capacity} → {new_capacity} "
+                f"(p95 wait {p95_wait * 1000:.1f}ms, utilisation {utilisation:.0%})"
+            )
 
-            self._stats["connections_created"] += 1
-            logger.debug("[DatabasePool] New connection initialized")
+    def _resize(self, capacity: int) -> None:
+        if capacity > self._capacity.limit:
+            self._stats["scale_ups"] += 1
+        elif capacity < self._capacity.limit:
+            self._stats["scale_downs"] += 1
+        self._capacity.set_limit(capacity)
+
+    def _read_target(self, max_lag: Optional[float] = None) -> "DatabasePool":
+        """Least-loaded replica within the lag bound, else the primary."""
+        if not self.replicas:
+            return self
+        bound = self.max_replica_lag if max_lag is None else max_lag
+        candidates = [r for r in self.replicas if r.usable(bound)]
+        if not candidates:
+            self._stats["replica_fallbacks"] += 1
+            return self
+        self._stats["replica_reads"] += 1
+        return min(candidates, key=lambda r: r.load)
+
+    @property
+    def load(self) -> float:
+        capacity = self._capacity
+        return (capacity.in_use + capacity.waiting) / max(1, capacity.limit)
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self.replicas)
+
+    def usage(self) -> Dict[str, int]:
+        """Synchronous capacity snapshot (used by the metrics collector)."""
+        capacity = self._capacity
+        return {
+            "in_use": capacity.in_use,
+            "idle": self.pool.get_idle_size() if self.pool else 0,
+            "max": capacity.limit,
+            "waiting": capacity.waiting,
+        }
 
-        except Exception as e:
-            logger.error(f"[DatabasePool] Failed to initialize connection: {e}")
-            raise
+    async def _init_connection(self, connection: asyncpg.Connection) -> None:
+        """Initialize new database connections"""
+        # timezone / statement_timeout arrive via server_settings
+        self._stats["connections_created"] += 1
+        logger.debug("[DatabasePool] New connection initialized")
 
     @asynccontextmanager
-    async def get_connection(self) -> AsyncGenerator[asyncpg.Connection, None]:
+    async def get_connection(
+        self, readonly: bool = False, max_lag: Optional[float] = None
+    ) -> AsyncGenerator[asyncpg.Connection, None]:
         """Get a connection from the pool with automatic cleanup"""
+        if readonly:
+            target = self._read_target(max_lag)
+            if target is not self:
+                async with target.get_connection() as connection:
+                    yield connection
+                return
+
         if not self.pool:
             raise RuntimeError("Database pool not initialized")
 
         start_time = time.time()
         connection = None
+        admitted = False
 
         try:
+            await self._capacity.acquire()
+            admitted = True
             connection = await self.pool.acquire()
+            self._waits.append(time.time() - start_time)
+            self._peak_in_use = max(self._peak_in_use, self._capacity.in_use)
             yield connection
 
         except asyncpg.exceptions.TooManyConnectionsError:
             self._stats["pool_exhausted_count"] += 1
+            # The server is out of slots – stop asking for more
+            if self.autoscale:
+                self._resize(max(self.min_size, self._capacity.in_use - 1))
             logger.warning(
                 "[DatabasePool] Pool exhausted, waiting for available connection"
             )
@@ -114,59 +380,220 @@ class DatabasePool:
                     await self.pool.release(connection)
                 except Exception as e:
                     logger.error(f"[DatabasePool] Failed to release connection: {e}")
+            if admitted:
+                self._capacity.release()
 
             elapsed = time.time() - start_time
             self._stats["total_query_time"] += elapsed
 
-    async def execute_query(
-        self, query: str, *args, timeout: Optional[int] = None
-    ) -> Any:
-        """Execute a query with connection pooling and error handling"""
-        start_time = time.time()
+    def _record(self, name: str, sql: str, started: float, failed: bool = False) -> None:
+        elapsed = time.perf_counter() - started
+        self.latency.observe(name, elapsed, failed)
+        if failed:
+            self._stats["failed_queries"] += 1
+            return
+        self._stats["queries_executed"] += 1
+        if elapsed > 1.0:  # Log slow queries
+            logger.warning(
+                f"[DatabasePool] Slow query {name} ({elapsed:.2f}s): {sql[:100]}..."
+            )
 
+    async def _run(
+        self,
+        method: str,
+        query: QueryLike,
+        args: Sequence[Any],
+        timeout: Optional[float] = None,
+        conn: Optional[asyncpg.Connection] = None,
+        readonly: bool = False,
+        max_lag: Optional[float] = None,
+    ) -> Any:
+        if readonly and conn is None:
+            target = self._read_target(max_lag)
+            if target is not self:
+                return await target._run(method, query, args, timeout)
+        q = as_query(query)
+        started = time.perf_counter()
         try:
-            async with self.get_connection() as conn:
-                result = await conn.fetch(query, *args, timeout=timeout)
+            if conn is not None:
+                result = await getattr(conn, method)(q.sql, *args, timeout=timeout)
+            else:
+                async with self.get_connection() as own_conn:
+                    result = await getattr(own_conn, method)(
+                        q.sql, *args, timeout=timeout
+                    )
+        except Exception as e:
+            self._record(q.name, q.sql, started, failed=True)
+            logger.error(f"[DatabasePool] Query {q.name} failed: {e}")
+            raise
+        self._record(q.name, q.sql, started)
+        return result
 
-            self._stats["queries_executed"] += 1
-            elapsed = time.time() - start_time
+    async def fetch(
+        self, query: QueryLike, *args, timeout=None, conn=None, readonly=False, max_lag=None
+    ) -> list:
+        return await self._run("fetch", query, args, timeout, conn, readonly, max_lag)
+
+    async def fetchrow(
+        self, query: QueryLike, *args, timeout=None, conn=None, readonly=False, max_lag=None
+    ):
+        return await self._run("fetchrow", query, args, timeout, conn, readonly, max_lag)
+
+    async def fetchval(
+        self, query: QueryLike, *args, timeout=None, conn=None, readonly=False, max_lag=None
+    ) -> Any:
+        return await self._run("fetchval", query, args, timeout, conn, readonly, max_lag)
 
-            if elapsed > 1.0:  # Log slow queries
-                logger.warning(
-                    f"[DatabasePool] Slow query ({elapsed:.2f}s): {query[:100]}..."
-                )
+    async def execute(self, query: QueryLike, *args, timeout=None, conn=None) -> str:
+        return await self._run("execute", query, args, timeout, conn)
 
-            return result
+    async def execute_query(
+        self, query: QueryLike, *args, timeout: Optional[int] = None
+    ) -> Any:
+        """Execute a query with connection pooling and error handling"""
+        return await self.fetch(query, *args, timeout=timeout)
 
+    async def executemany(
+        self,
+        query: QueryLike,
+        args: Iterable[Sequence[Any]],
+        timeout: Optional[float] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> int:
+        """
+        Run one statement for many argument tuples.
+
+        asyncpg prepares the statement once and pipelines every Bind/Execute
+        before a single Sync, so N rows cost one round trip, not N.
+        """
+        rows = [tuple(a) for a in args]
+        if not rows:
+            return 0
+        q = as_query(query)
+        started = time.perf_counter()
+        try:
+            if conn is not None:
+                await conn.executemany(q.sql, rows, timeout=timeout)
+            else:
+                async with self.get_connection() as own_conn:
+                    await own_conn.executemany(q.sql, rows, timeout=timeout)
         except Exception as e:
-            self._stats["failed_queries"] += 1
-            logger.error(f"[DatabasePool] Query failed: {e}")
+            self._record(q.name, q.sql, started, failed=True)
+            logger.error(f"[DatabasePool] Batch {q.name} ({len(rows)} rows) failed: {e}")
+            raise
+        self._record(q.name, q.sql, started)
+        return len(rows)
+
+    async def copy_records(
+        self,
+        table: str,
+        columns: Sequence[str],
+        records: Iterable[Sequence[Any]],
+        on_conflict: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Bulk insert with the binary COPY protocol.
+
+        COPY cannot resolve conflicts, so with `on_conflict` (e.g.
+        ``"(id) DO NOTHING"``) the rows are copied into a transaction-scoped
+        staging table and moved over with one ``INSERT ... SELECT``.
+        """
+        rows = [tuple(r) for r in records]
+        if not rows:
+            return 0
+        column_list = ", ".join(columns)
+        name = f"copy:{table}"
+        started = time.perf_counter()
+        try:
+            async with self.get_connection() as conn:
+                if on_conflict is None:
+                    await conn.copy_records_to_table(
+                        table, records=rows, columns=list(columns), timeout=timeout
+                    )
+                else:
+                    stage = f"_stage_{table.replace('.', '_')}"
+                    async with conn.transaction():
+                        await conn.execute(
+                            f"CREATE TEMP TABLE {stage} "
+                            f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                        )
+                        await conn.copy_records_to_table(
+                            stage, records=rows, columns=list(columns), timeout=timeout
+                        )
+                        await conn.execute(
+                            f"INSERT INTO {table} ({column_list}) "
+                            f"SELECT {column_list} FROM {stage} "
+                            f"ON CONFLICT {on_conflict}"
+                        )
+        except Exception as e:
+            self._record(name, table, started, failed=True)
+            logger.error(f"[DatabasePool] COPY into {table} ({len(rows)} rows) failed: {e}")
             raise
+        self._record(name, table, started)
+        return len(rows)
+
+    async def bulk_write(
+        self,
+        query: Query,
+        table: str,
+        columns: Sequence[str],
+        records: Iterable[Sequence[Any]],
+        on_conflict: Optional[str] = None,
+    ) -> int:
+        """`executemany(query)` for small batches, `copy_records` for large ones."""
+        rows = [tuple(r) for r in records]
+        if len(rows) > COPY_THRESHOLD:
+            return await self.copy_records(table, columns, rows, on_conflict=on_conflict)
+        return await self.executemany(query, rows)
 
     async def execute_transaction(
-        self, queries: list, timeout: Optional[int] = None
+        self,
+        queries: Sequence[Tuple[QueryLike, Sequence[Any]]],
+        timeout: Optional[int] = None,
+        fetch_results: bool = True,
     ) -> list:
-        """Execute multiple queries in a transaction"""
+        """
+        Execute multiple queries in a transaction
+
+        With `fetch_results=False`, consecutive runs of the same statement are
+        sent as one pipelined `executemany` and the result slots are None.
+        """
         start_time = time.time()
-        results = []
+        results: list = []
 
         try:
             async with self.get_connection() as conn:
                 async with conn.transaction():
-                    for query, args in queries:
-                        result = await conn.fetch(query, *args, timeout=timeout)
-                        results.append(result)
+                    i = 0
+                    while i < len(queries):
+                        query, args = queries[i]
+                        if fetch_results:
+                            results.append(
+                                await self.fetch(query, *args, timeout=timeout, conn=conn)
+                            )
+                            i += 1
+                            continue
+                        sql = as_query(query).sql
+                        j = i + 1
+                        while j < len(queries) and as_query(queries[j][0]).sql == sql:
+                            j += 1
+                        if j - i > 1:
+                            await self.executemany(
+                                query, [a for _, a in queries[i:j]], timeout, conn
+                            )
+                        else:
+                            await self.execute(query, *args, timeout=timeout, conn=conn)
+                        results.extend([None] * (j - i))
+                        i = j
 
-            self._stats["queries_executed"] += len(queries)
             elapsed = time.time() - start_time
-
             logger.debug(
                 f"[DatabasePool] Transaction completed ({elapsed:.2f}s, {len(queries)} queries)"
             )
             return results
 
         except Exception as e:
-            self._stats["failed_queries"] += len(queries)
             logger.error(f"[DatabasePool] Transaction failed: {e}")
             raise
 
@@ -185,6 +612,24 @@ class DatabasePool:
 
         # Add custom stats
         pool_stats.update(self._stats)
+        pool_stats["prepared_statements"] = self.prepared_statements
+        pool_stats["query_latency"] = self.latency.snapshot()
+        pool_stats["capacity"] = self._capacity.limit
+        pool_stats["waiting"] = self._capacity.waiting
+        if self.replicas:
+            pool_stats["replicas"] = [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag_seconds,
+                    **{
+                        k: v
+                        for k, v in (await replica.get_pool_stats()).items()
+                        if k != "query_latency"
+                    },
+                }
+                for replica in self.replicas
+            ]
 
         # Calculate averages
         if self._stats["queries_executed"] > 0:
@@ -214,6 +659,14 @@ class DatabasePool:
 
     async def close(self) -> None:
         """Close all connections in the pool"""
+        if self._maintenance_task and not self._maintenance_task.done():
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+        for replica in self.replicas:
+            await replica.close()
         try:
             if self.pool:
                 await self.pool.close()
@@ -224,6 +677,62 @@ class DatabasePool:
             logger.error(f"[DatabasePool] Error closing pool: {e}")
 
 
+class ReplicaPool(DatabasePool):
+    """Read replica pool with replay-lag tracking (maintained by its primary)."""
+
+    _owns_maintenance = False
+
+    def __init__(self, dsn: str, name: Optional[str] = None, **kwargs):
+        super().__init__(dsn, **kwargs)
+        self.name = name or urlparse(dsn).hostname or "replica"
+        self.server_settings = {
+            **self.server_settings,
+            "application_name": "financehub_backend_replica",
+            "default_transaction_read_only": "on",
+        }
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self._next_reconnect = 0.0
+
+    async def initialize(self) -> None:
+        await super().initialize()
+        await self.refresh_lag()
+
+    def usable(self, max_lag: float) -> bool:
+        return (
+            self.healthy
+            and self.pool is not None
+            and self.lag_seconds is not None
+            and self.lag_seconds <= max_lag
+        )
+
+    async def refresh_lag(self) -> None:
+        try:
+            async with self.get_connection() as conn:
+                lag = await conn.fetchval(REPLICA_LAG_QUERY, timeout=2)
+            self.lag_seconds = float(lag) if lag is not None else None
+            self.healthy = True
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"[DatabasePool] Replica {self.name} unavailable: {e}")
+            self.healthy = False
+            self.lag_seconds = None
+
+    async def _maintain(self) -> None:
+        if self.pool is None:
+            now = time.monotonic()
+            if now < self._next_reconnect:
+                return
+            self._next_reconnect = now + REPLICA_RECONNECT_SECONDS
+            try:
+                await super().initialize()
+            except Exception:
+                return
+        if self.autoscale:
+            self._autoscale_tick()
+        await self.refresh_lag()
+
+
 class TimescaleDBPool(DatabasePool):
     """Specialized pool for TimescaleDB with time-series optimizations"""
 
@@ -234,22 +743,17 @@ class TimescaleDBPool(DatabasePool):
             "tcp_keepalives_idle": "600",
             "tcp_keepalives_interval": "30",
             "tcp_keepalives_count": "3",
+            "timezone": "UTC",
             "statement_timeout": "60000",  # Longer timeout for analytical queries
             "work_mem": "256MB",  # More memory for complex queries
             "effective_cache_size": "1GB",
+            "max_parallel_workers_per_gather": "4",
+            "timescaledb.telemetry_level": "off",
         }
 
         kwargs["server_settings"] = timescale_settings
         super().__init__(dsn, **kwargs)
 
-    async def _init_connection(self, connection: asyncpg.Connection) -> None:
-        """Initialize TimescaleDB connection with optimizations"""
-        await super()._init_connection(connection)
-
-        # Enable TimescaleDB specific optimizations
-        await connection.execute("SET timescaledb.telemetry_level = 'off'")
-        await connection.execute("SET max_parallel_workers_per_gather = 4")
-
     async def insert_time_series_data(
         self, table: str, data: list, batch_size: int = 1000
     ) -> int:
@@ -279,7 +783,15 @@ class TimescaleDBPool(DatabasePool):
 
 
 # Global pool instances
-main_db_pool = DatabasePool(dsn=settings.DATABASE_URL, min_size=10, max_size=50)
+main_db_pool = DatabasePool(
+    dsn=settings.DATABASE_URL,
+    min_size=10,
+    max_size=50,
+    replicas=[
+        ReplicaPool(dsn=url, min_size=2, max_size=50)
+        for url in _parse_env_list_str_utility(settings.DATABASE_REPLICA_URLS)
+    ],
+)
 
 # TimescaleDB pool for time-series data
 timescale_pool = (
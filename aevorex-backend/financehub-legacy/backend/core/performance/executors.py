@@ -0,0 +1,277 @@
+"""
+Managed Executor Pools for FinanceHub
+=====================================
+
+Blocking provider SDKs (yfinance, scrapers) and CPU-heavy parsing (BUBOR XLS,
+large DataFrame transforms) must never run on the event loop, and must not
+share the loop's default executor either: one slow provider would then
+starve every other `run_in_executor(None, ...)` caller.
+
+Each `ManagedExecutor` is a named, size-limited pool:
+
+- `max_workers` threads (or processes for the `cpu` pool),
+- at most `max_queue` calls waiting for a worker; beyond that `run()` fails
+  fast with `ExecutorSaturatedError` instead of queueing without bound,
+- a per-call timeout (`ExecutorTimeoutError`); a call that has not started
+  yet is cancelled, one that has started is abandoned (threads cannot be
+  killed) and counted,
+- cancelling the awaiting task cancels a queued call.
+
+Usage:
+
+    from backend.core.performance.executors import YFINANCE, run_blocking, run_cpu
+
+    info = await run_blocking(YFINANCE, lambda: yf.Ticker(symbol).info)
+    rows = await run_cpu(parse_bubor_workbook, content, since)
+
+Functions sent to the `cpu` pool run in another process, so they and their
+arguments must be picklable (module-level functions, plain data).
+
+Queue depth, busy workers and limits are exported at scrape time as
+`fh_pool_*{pool="executor:<name>"}`; outcomes and wait / run time as
+`fh_executor_tasks_total` / `fh_executor_queue_wait_seconds` /
+`fh_executor_run_seconds`.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+YFINANCE = "yfinance"
+IO = "io"
+CPU = "cpu"
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """The pool's queue is full; the call was rejected without running."""
+
+
+class ExecutorTimeoutError(asyncio.TimeoutError):
+    """The call did not finish within its timeout."""
+
+
+def _timed_call(fn: Callable[..., T], args, kwargs) -> tuple:
+    """Runs in the worker: returns (start time, run seconds, result)."""
+    started = time.time()
+    perf = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return started, time.perf_counter() - perf, result
+
+
+class ManagedExecutor:
+    """Named, bounded thread or process pool with timeouts and metrics."""
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        timeout: float,
+        processes: bool = False,
+        metrics=None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.processes = processes
+        self.metrics = metrics
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._stats = {
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "cancelled": 0,
+            "abandoned": 0,
+        }
+        if metrics is not None:
+            metrics.register_pool(f"executor:{name}", self.usage)
+
+    # --- pool --------------------------------------------------------------
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.processes:
+                # spawn: forking a process that runs the loop, the watchdog and
+                # driver threads can deadlock the child on inherited locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"exec-{self.name}"
+                )
+            logger.info(
+                f"[Executors] {self.name}: {self.max_workers} "
+                f"{'processes' if self.processes else 'threads'}, queue {self.max_queue}"
+            )
+        return self._executor
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    def usage(self) -> Dict[str, int]:
+        busy = min(self._in_flight, self.max_workers)
+        return {
+            "in_use": busy,
+            "idle": self.max_workers - busy,
+            "max": self.max_workers,
+            "waiting": self.queued,
+        }
+
+    # --- calls ---------------------------------------------------------------
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run `fn(*args, **kwargs)` on the pool and await its result."""
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self._stats["rejected"] += 1
+            self._observe("rejected")
+            raise ExecutorSaturatedError(
+                f"Executor '{self.name}' saturated "
+                f"({self._in_flight} in flight, queue {self.max_queue})"
+            )
+
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        submitted = time.time()
+        self._in_flight += 1
+        future = self._get_executor().submit(_timed_call, fn, args, kwargs)
+        try:
+            started, run_seconds, result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout
+            )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            if not future.cancel():
+                self._stats["abandoned"] += 1
+            self._observe("timeout")
+            raise ExecutorTimeoutError(
+                f"{getattr(fn, '__name__', fn)} on '{self.name}' exceeded {timeout}s"
+            ) from None
+        except asyncio.CancelledError:
+            self._stats["cancelled"] += 1
+            self._observe("cancelled")
+            raise
+        except Exception:
+            self._stats["failed"] += 1
+            self._observe("error")
+            raise
+        finally:
+            if future.done():
+                self._in_flight -= 1
+            else:
+                # Abandoned but still occupying a worker until it returns
+                future.add_done_callback(
+                    functools.partial(self._release_threadsafe, loop)
+                )
+        self._stats["completed"] += 1
+        self._observe("ok", max(0.0, started - submitted), run_seconds)
+        return result
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+    def _release_threadsafe(self, loop, _future) -> None:
+        # Runs on the worker thread / the process pool's management thread
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:  # loop already closed (shutdown)
+            pass
+
+    def _observe(
+        self,
+        outcome: str,
+        wait_seconds: Optional[float] = None,
+        run_seconds: Optional[float] = None,
+    ) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_executor_task(
+                self.name, outcome, wait_seconds, run_seconds
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": "process" if self.processes else "thread",
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "in_flight": self._in_flight,
+            "queued": self.queued,
+            **self._stats,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+_executors: Dict[str, ManagedExecutor] = {}
+
+
+def _build(name: str) -> ManagedExecutor:
+    from backend.config import settings
+    from backend.core.metrics import SERVICE_METRICS
+
+    cfg = settings.EXECUTORS
+    specs = {
+        YFINANCE: (cfg.YFINANCE_WORKERS, cfg.YFINANCE_QUEUE, cfg.YFINANCE_TIMEOUT_SECONDS, False),
+        IO: (cfg.IO_WORKERS, cfg.IO_QUEUE, cfg.IO_TIMEOUT_SECONDS, False),
+        CPU: (cfg.CPU_WORKERS, cfg.CPU_QUEUE, cfg.CPU_TIMEOUT_SECONDS, cfg.CPU_USE_PROCESSES),
+    }
+    if name not in specs:
+        raise KeyError(f"Unknown executor '{name}' (expected one of {sorted(specs)})")
+    workers, queue, timeout, processes = specs[name]
+    return ManagedExecutor(
+        name, workers, queue, timeout, processes=processes, metrics=SERVICE_METRICS
+    )
+
+
+def get_executor(name: str) -> ManagedExecutor:
+    """Process-wide executor by name (`YFINANCE`, `IO`, `CPU`)."""
+    executor = _executors.get(name)
+    if executor is None:
+        executor = _executors[name] = _build(name)
+    return executor
+
+
+async def run_blocking(
+    name: str, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any
+) -> T:
+    """Run a blocking call on the named thread pool."""
+    return await get_executor(name).run(fn, *args, timeout=timeout, **kwargs)
+
+
+async def run_cpu(
+    fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any
+) -> T:
+    """Run a CPU-heavy, picklable function on the process pool."""
+    return await get_executor(CPU).run(fn, *args, timeout=timeout, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    for executor in _executors.values():
+        executor.shutdown(wait=wait)
+    _executors.clear()
@@ -0,0 +1,150 @@
+"""
+Query Layer for FinanceHub
+==========================
+
+Building blocks used by `DatabasePool`:
+
+- `Query`: a named SQL statement with an explicit column list. The name is
+  the key for latency metrics; the SQL text is the key for asyncpg's
+  per-connection prepared statement cache.
+- `QueryLatencyHistogram`: fixed-bucket latency histogram per query name.
+- `row_decoder`: builds typed models from records without re-running
+  pydantic validation on data Postgres has already typed.
+"""
+
+import bisect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Type
+
+# Upper bounds in seconds (Prometheus-style, last bucket is +Inf)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+ADHOC_QUERY_NAME = "adhoc"
+
+
+@dataclass(frozen=True)
+class Query:
+    """Named SQL statement. `{columns}` in `sql` expands to `columns`."""
+
+    name: str
+    sql: str
+    columns: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.columns and "{columns}" in self.sql:
+            object.__setattr__(
+                self, "sql", self.sql.replace("{columns}", ", ".join(self.columns))
+            )
+
+
+def as_query(query: "Query | str") -> Query:
+    return query if isinstance(query, Query) else Query(ADHOC_QUERY_NAME, query)
+
+
+class _Series:
+    __slots__ = ("counts", "count", "total", "errors")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+
+class QueryLatencyHistogram:
+    """Per-query-name latency histogram (cumulative since start)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series: Dict[str, _Series] = {}
+
+    def observe(self, name: str, seconds: float, failed: bool = False) -> None:
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = _Series(len(self.buckets))
+        series.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        series.count += 1
+        series.total += seconds
+        if failed:
+            series.errors += 1
+
+    def quantile(self, name: str, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile (None if no data)."""
+        series = self._series.get(name)
+        if series is None or not series.count:
+            return None
+        rank = q * series.count
+        seen = 0
+        for bound, count in zip(self.buckets, series.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "count": s.count,
+                "errors": s.errors,
+                "avg_ms": round(s.total / s.count * 1000, 3) if s.count else 0.0,
+                "p50_ms": _ms(self.quantile(name, 0.5)),
+                "p95_ms": _ms(self.quantile(name, 0.95)),
+                "p99_ms": _ms(self.quantile(name, 0.99)),
+                "buckets": dict(
+                    zip([*map(str, self.buckets), "+Inf"], s.counts)
+                ),
+            }
+            for name, s in self._series.items()
+        }
+
+    def reset(self) -> None:
+        self._series.clear()
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    if seconds is None or seconds == float("inf"):
+        return seconds
+    return seconds * 1000
+
+
+def row_decoder(
+    model: Type[Any],
+    columns: Sequence[str],
+    converters: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    prefix: str = "",
+) -> Callable[[Mapping[str, Any]], Any]:
+    """
+    Record → `model` for a column-explicit query.
+
+    asyncpg already returns typed values (UUID, datetime, bool), so only the
+    columns listed in `converters` (e.g. str → Enum) are converted and the
+    model is built with `model_construct` (no second validation pass).
+    `prefix` reads aliased columns of a joined query (``s.plan AS sub_plan``).
+    """
+    columns = tuple(columns)
+    converters = dict(converters or {})
+
+    def decode(record: Mapping[str, Any]) -> Any:
+        values = {}
+        for column in columns:
+            value = record[prefix + column]
+            convert = converters.get(column)
+            if convert is not None and value is not None:
+                value = convert(value)
+            values[column] = value
+        return model.model_construct(**values)
+
+    return decode
@@ -6,14 +6,18 @@ import time
 from typing import Optional, Tuple
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
+from backend.middleware.rate_limiter.limiter import HybridRateLimiter
 from backend.utils.cache_service import cache_service
 from backend.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# One local limiter shared by all RateLimiter instances (keys carry the window)
+_limiter = HybridRateLimiter()
+
 
 class RateLimiter:
-    """Redis-based rate limiter with sliding window"""
+    """Multi-window rate limiter (local GCRA, usage synced to Redis counters)"""
 
     def __init__(
         self,
@@ -42,51 +46,21 @@ class RateLimiter:
 
         return f"ip:{client_ip}"
 
-    def _get_rate_limit_key(self, client_id: str, window: str) -> str:
-        """Generate rate limit key for Redis"""
-        return f"rate_limit:{client_id}:{window}"
-
     async def _check_rate_limit(
         self, client_id: str, window: str, limit: int, window_seconds: int
     ) -> Tuple[bool, int, int]:
-        """Check rate limit for a specific window"""
-        key = self._get_rate_limit_key(client_id, window)
-        current_time = int(time.time())
-        window_start = current_time - window_seconds
-
-        try:
-            if not cache_service.redis_client:
-                # If Redis is not available, allow the request
-                logger.warning(
-                    "Redis not available for rate limiting, allowing request"
-                )
-                return True, limit, limit
-
-            # Use Redis pipeline for atomic operations
-            pipe = cache_service.redis_client.pipeline()
-
-            # Remove old entries
-            pipe.zremrangebyscore(key, 0, window_start)
-
-            # Count current requests
-            pipe.zcard(key)
-
-            # Add current request
-            pipe.zadd(key, {str(current_time): current_time})
-
-            # Set expiration
-            pipe.expire(key, window_seconds + 60)  # Add buffer
-
-            results = await pipe.execute()
-            current_requests = results[1] + 1  # +1 for the current request
-
-            remaining = max(0, limit - current_requests)
-            return current_requests <= limit, current_requests, remaining
-
-        except Exception as e:
-            logger.error(f"Rate limit check failed: {e}")
-            # If rate limiting fails, allow the request
-            return True, 0, limit
+        """Check rate limit for a specific window (local GCRA, Redis-synced)"""
+        if _limiter.redis_client is None:
+            # Reconcile across workers once the shared Redis client exists (the
+            # in-memory cache exposes itself as `redis_client`: not a client)
+            client = getattr(cache_service, "redis_client", None)
+            if hasattr(client, "pipeline"):
+                _limiter.redis_client = client
+
+        allowed, remaining, _reset = _limiter.consume(
+            f"{client_id}:{window}", limit, window_seconds
+        )
+        return allowed, limit - remaining, remaining
 
     async def check_limits(self, request: Request) -> Optional[JSONResponse]:
         """Check all rate limits for the request"""
@@ -6,16 +6,75 @@ Handles checkout session tracking and webhook correlation.
 """
 
 import logging
-from typing import Optional, Dict, Any
-from asyncpg import Pool
+from typing import Iterable, Optional, Dict, Any, Tuple
+
+from backend.core.performance.database_pool import DatabasePool
+from backend.core.performance.queries import Query
 
 logger = logging.getLogger(__name__)
 
+CHECKOUT_COLUMNS = (
+    "id",
+    "checkout_id",
+    "user_id",
+    "variant_id",
+    "status",
+    "created_at",
+    "updated_at",
+    "webhook_processed_at",
+    "webhook_event_id",
+)
+CHECKOUT_INSERT_COLUMNS = ("checkout_id", "user_id", "variant_id", "status")
+
+CREATE_CHECKOUT = Query(
+    "checkout_tracking.create",
+    """
+        INSERT INTO checkout_tracking (checkout_id, user_id, variant_id, status)
+        VALUES ($1, $2, $3, $4)
+        RETURNING id, checkout_id, user_id, variant_id, status, created_at
+    """,
+)
+CHECKOUT_BY_ID = Query(
+    "checkout_tracking.by_checkout_id",
+    "SELECT {columns} FROM checkout_tracking WHERE checkout_id = $1",
+    CHECKOUT_COLUMNS,
+)
+UPDATE_CHECKOUT_STATUS = Query(
+    "checkout_tracking.update_status",
+    """
+        UPDATE checkout_tracking 
+        SET status = $2, 
+            webhook_processed_at = NOW(),
+            webhook_event_id = COALESCE($3, webhook_event_id)
+        WHERE checkout_id = $1
+        RETURNING id
+    """,
+)
+PENDING_CHECKOUTS_BY_USER = Query(
+    "checkout_tracking.pending_by_user",
+    """
+        SELECT id, checkout_id, user_id, variant_id, status, created_at
+        FROM checkout_tracking 
+        WHERE user_id = $1 AND status = 'pending'
+        ORDER BY created_at DESC
+    """,
+)
+CANCEL_STALE_CHECKOUTS = Query(
+    "checkout_tracking.cancel_stale",
+    """
+        UPDATE checkout_tracking 
+        SET status = 'cancelled'
+        WHERE status = 'pending' 
+        AND created_at < NOW() - make_interval(hours => $1)
+        RETURNING id
+    """,
+)
+
 
 class CheckoutTrackingService:
     """Service for tracking checkout sessions and correlating webhook events."""
 
-    def __init__(self, db_pool: Pool):
+    def __init__(self, db_pool: DatabasePool):
         self.db_pool = db_pool
 
     async def create_checkout_session(
@@ -23,35 +82,38 @@ class CheckoutTrackingService:
     ) -> Dict[str, Any]:
         """Create a new checkout tracking session."""
         try:
-            async with self.db_pool.acquire() as conn:
-                query = """
-                    INSERT INTO checkout_tracking (checkout_id, user_id, variant_id, status)
-                    VALUES ($1, $2, $3, 'pending')
-                    RETURNING id, checkout_id, user_id, variant_id, status, created_at
-                """
-                row = await conn.fetchrow(query, checkout_id, user_id, variant_id)
-
-                logger.info(
-                    f"Created checkout session: {checkout_id} for user {user_id}"
-                )
-                return dict(row)
+            row = await self.db_pool.fetchrow(
+                CREATE_CHECKOUT, checkout_id, user_id, variant_id, "pending"
+            )
+
+            logger.info(f"Created checkout session: {checkout_id} for user {user_id}")
+            return dict(row)
 
         except Exception as e:
             logger.error(f"Error creating checkout session: {e}")
             raise
 
+    async def create_checkout_sessions(
+        self, sessions: Iterable[Tuple[str, str, str]]
+    ) -> int:
+        """Bulk-create pending sessions from (checkout_id, user_id, variant_id)."""
+        rows = [(c, u, v, "pending") for c, u, v in sessions]
+        try:
+            count = await self.db_pool.bulk_write(
+                CREATE_CHECKOUT, "checkout_tracking", CHECKOUT_INSERT_COLUMNS, rows
+            )
+            logger.info(f"Created {count} checkout sessions")
+            return count
+
+        except Exception as e:
+            logger.error(f"Error creating checkout sessions: {e}")
+            raise
+
     async def get_checkout_by_id(self, checkout_id: str) -> Optional[Dict[str, Any]]:
         """Get checkout session by checkout ID."""
         try:
-            async with self.db_pool.acquire() as conn:
-                query = """
-                    SELECT id, checkout_id, user_id, variant_id, status, 
-                           created_at, updated_at, webhook_processed_at, webhook_event_id
-                    FROM checkout_tracking 
-                    WHERE checkout_id = $1
-                """
-                row = await conn.fetchrow(query, checkout_id)
-                return dict(row) if row else None
+            row = await self.db_pool.fetchrow(CHECKOUT_BY_ID, checkout_id)
+            return dict(row) if row else None
 
         except Exception as e:
             logger.error(f"Error getting checkout by ID: {e}")
@@ -62,42 +124,41 @@ class CheckoutTrackingService:
     ) -> bool:
         """Update checkout status (for webhook processing)."""
         try:
-            async with self.db_pool.acquire() as conn:
-                query = """
-                    UPDATE checkout_tracking 
-                    SET status = $2, 
-                        webhook_processed_at = NOW(),
-                        webhook_event_id = COALESCE($3, webhook_event_id)
-                    WHERE checkout_id = $1
-                    RETURNING id
-                """
-                row = await conn.fetchrow(query, checkout_id, status, webhook_event_id)
-
-                if row:
-                    logger.info(f"Updated checkout {checkout_id} status to {status}")
-                    return True
-                else:
-                    logger.warning(
-                        f"Checkout {checkout_id} not found for status update"
-                    )
-                    return False
+            row = await self.db_pool.fetchrow(
+                UPDATE_CHECKOUT_STATUS, checkout_id, status, webhook_event_id
+            )
+
+            if row:
+                logger.info(f"Updated checkout {checkout_id} status to {status}")
+                return True
+            else:
+                logger.warning(f"Checkout {checkout_id} not found for status update")
+                return False
 
         except Exception as e:
             logger.error(f"Error updating checkout status: {e}")
             raise
 
+    async def update_checkout_statuses(
+        self, updates: Iterable[Tuple[str, str, Optional[str]]]
+    ) -> int:
+        """Bulk status update from (checkout_id, status, webhook_event_id)."""
+        try:
+            count = await self.db_pool.executemany(UPDATE_CHECKOUT_STATUS, updates)
+            logger.info(f"Updated status of {count} checkouts")
+            return count
+
+        except Exception as e:
+            logger.error(f"Error updating checkout statuses: {e}")
+            raise
+
     async def get_pending_checkouts_by_user(self, user_id: str) -> list[Dict[str, Any]]:
         """Get all pending checkouts for a user."""
         try:
-            async with self.db_pool.acquire() as conn:
-                query = """
-                    SELECT id, checkout_id, user_id, variant_id, status, created_at
-                    FROM checkout_tracking 
-                    WHERE user_id = $1 AND status = 'pending'
-                    ORDER BY created_at DESC
-                """
-                rows = await conn.fetch(query, user_id)
-                return [dict(row) for row in rows]
+            rows = await self.db_pool.fetch(
+                PENDING_CHECKOUTS_BY_USER, user_id, readonly=True
+            )
+            return [dict(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Error getting pending checkouts for user: {e}")
@@ -106,21 +167,13 @@ class CheckoutTrackingService:
     async def cleanup_old_pending_checkouts(self, hours: int = 24) -> int:
         """Clean up old pending checkouts (for maintenance)."""
         try:
-            async with self.db_pool.acquire() as conn:
-                query = """
-                    UPDATE checkout_tracking 
-                    SET status = 'cancelled'
-                    WHERE status = 'pending' 
-                    AND created_at < NOW() - INTERVAL '$1 hours'
-                    RETURNING id
-                """
-                rows = await conn.fetch(query, hours)
-                count = len(rows)
-
-                if count > 0:
-                    logger.info(f"Cleaned up {count} old pending checkouts")
-
-                return count
+            rows = await self.db_pool.fetch(CANCEL_STALE_CHECKOUTS, hours)
+            count = len(rows)
+
+            if count > 0:
+                logger.info(f"Cleaned up {count} old pending checkouts")
+
+            return count
 
         except Exception as e:
             logger.error(f"Error cleaning up old checkouts: {e}")
@@ -135,7 +188,7 @@ def get_checkout_tracking_service() -> CheckoutTrackingService:
     """Get global checkout tracking service instance."""
     global _checkout_tracking_service
     if _checkout_tracking_service is None:
-        from ....app_factory import main_db_pool
+        from backend.core.performance.database_pool import main_db_pool
 
         _checkout_tracking_service = CheckoutTrackingService(main_db_pool)
     return _checkout_tracking_service
@@ -0,0 +1,263 @@
+"""
+Entitlement Cache for FinanceHub
+================================
+
+Caches `UserWithSubscription` (plan, status, period end) per user so that
+subscription-gated endpoints do not hit Postgres on every request.
+
+Two tiers:
+- a bounded in-process LRU with a short TTL,
+- the shared CacheService (Redis in prod) with a longer TTL.
+
+Every entry's TTL is additionally capped by the subscription's
+`current_period_end` (and `trial_end` while trialing), so an entitlement
+never outlives the period it was granted for. Every `SubscriptionService`
+write (i.e. each billing webhook) calls `invalidate(user_id)` right away.
+
+Invalidation across workers:
+- `invalidate` INCRs the user's generation key and publishes the user id on
+  `entitlement:invalidations`; every worker drops its local copy on receipt.
+  If the listener is down, `LOCAL_TTL_SECONDS` bounds the staleness.
+- Shared entries carry the generation seen before the load and are ignored
+  once it moved on, so a load that overlapped an invalidation cannot write
+  the old entitlement back (locally, such a load is simply not cached).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, Tuple
+
+from backend.models.subscription import SubscriptionStatus, UserWithSubscription
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "entitlement:user:"
+GEN_KEY_PREFIX = "entitlement:gen:"
+INVALIDATION_CHANNEL = "entitlement:invalidations"
+SHARED_TTL_SECONDS = 600
+LOCAL_TTL_SECONDS = 30
+LOCAL_MAX_ENTRIES = 10_000
+
+
+def _seconds_until(moment: Optional[datetime]) -> Optional[float]:
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp() - time.time()
+
+
+def entitlement_ttl(
+    user_with_sub: UserWithSubscription, max_ttl: float = SHARED_TTL_SECONDS
+) -> float:
+    """TTL for a cached entitlement, bounded by the subscription period."""
+    sub = user_with_sub.subscription
+    if sub is None:
+        return max_ttl
+    bounds = [max_ttl, _seconds_until(sub.current_period_end)]
+    if sub.status == SubscriptionStatus.TRIALING:
+        bounds.append(_seconds_until(sub.trial_end))
+    return max(0.0, min(b for b in bounds if b is not None))
+
+
+class EntitlementCache:
+    """Two-tier (local LRU + CacheService) cache of user entitlements."""
+
+    def __init__(
+        self,
+        cache=None,
+        shared_ttl: int = SHARED_TTL_SECONDS,
+        local_ttl: int = LOCAL_TTL_SECONDS,
+        max_local: int = LOCAL_MAX_ENTRIES,
+    ):
+        self.cache = cache
+        self.shared_ttl = shared_ttl
+        self.local_ttl = local_ttl
+        self.max_local = max_local
+        self._local: "OrderedDict[str, tuple[float, UserWithSubscription]]" = (
+            OrderedDict()
+        )
+        self._invalidations = 0  # local invalidations so far (load/invalidate races)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def _redis(self):
+        """Raw Redis client for INCR / pub-sub; None for the in-memory dev cache."""
+        client = getattr(self.cache, "redis_client", None)
+        return client if hasattr(client, "pubsub") else None
+
+    def ensure_started(self) -> None:
+        """Start the invalidation listener (idempotent, no-op without Redis)."""
+        if self._redis is None or (self._task and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before (re)subscribing may have missed a message
+                self._drop_local()
+                backoff = 1.0
+                while True:
+                    msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if msg and msg.get("type") == "message":
+                        data = msg.get("data")
+                        self._drop_local(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Entitlement invalidation listener error, retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _drop_local(self, user_id: Optional[str] = None) -> None:
+        self._invalidations += 1
+        if user_id is None:
+            self._local.clear()
+        else:
+            self._local.pop(user_id, None)
+
+    def _remember(self, user_id: str, value: UserWithSubscription, ttl: float) -> None:
+        self._local[user_id] = (time.monotonic() + min(ttl, self.local_ttl), value)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self.max_local:
+            self._local.popitem(last=False)
+
+    def _local_get(self, user_id: str) -> Optional[UserWithSubscription]:
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._local.pop(user_id, None)
+            return None
+        self._local.move_to_end(user_id)
+        return value
+
+    async def _shared_get(
+        self, user_id: str
+    ) -> Tuple[Optional[UserWithSubscription], int]:
+        """(entry, current generation) from the shared tier in one MGET."""
+        try:
+            raw, gen = await self.cache.get_many(
+                [KEY_PREFIX + user_id, GEN_KEY_PREFIX + user_id]
+            )
+            gen = int(gen or 0)
+        except Exception as e:
+            logger.warning(f"Entitlement cache lookup failed: {e}")
+            return None, -1
+        if raw is None:
+            return None, gen
+        try:
+            entry = json.loads(raw)
+            if entry.get("gen") != gen:
+                return None, gen  # written before the latest invalidation
+            return UserWithSubscription.model_validate(entry["value"]), gen
+        except Exception:
+            return None, gen
+
+    async def get(self, user_id: str) -> Optional[UserWithSubscription]:
+        """Return the cached entitlement, or None on a miss."""
+        return (await self._get(user_id))[0]
+
+    async def _get(self, user_id: str) -> Tuple[Optional[UserWithSubscription], int]:
+        self.ensure_started()
+        value = self._local_get(user_id)
+        if value is not None or self.cache is None:
+            return value, 0
+        seen = self._invalidations
+        value, gen = await self._shared_get(user_id)
+        if value is None:
+            return None, gen
+        ttl = entitlement_ttl(value, self.shared_ttl)
+        if ttl <= 0:
+            return None, gen
+        if seen == self._invalidations:
+            self._remember(user_id, value, ttl)
+        return value, gen
+
+    async def set(self, user_id: str, value: UserWithSubscription, gen: int = 0) -> None:
+        """Store `value`, loaded while the user's generation was `gen`."""
+        ttl = entitlement_ttl(value, self.shared_ttl)
+        if ttl <= 0:
+            return  # period already over – always re-read
+        self._remember(user_id, value, ttl)
+        if self.cache is not None and gen >= 0:
+            try:
+                await self.cache.set(
+                    KEY_PREFIX + user_id,
+                    json.dumps({"gen": gen, "value": value.model_dump(mode="json")}),
+                    ttl=max(1, int(ttl)),
+                )
+            except Exception as e:
+                logger.warning(f"Entitlement cache write failed: {e}")
+
+    async def get_or_load(
+        self,
+        user_id: str,
+        loader: Callable[[str], Awaitable[Optional[UserWithSubscription]]],
+    ) -> Optional[UserWithSubscription]:
+        """Read-through lookup; unknown users are not cached."""
+        value, gen = await self._get(user_id)
+        if value is not None:
+            return value
+        seen = self._invalidations
+        value = await loader(user_id)
+        if value is not None and seen == self._invalidations:
+            await self.set(user_id, value, gen)
+        return value
+
+    async def invalidate(self, user_id) -> None:
+        """Drop a user's entitlement from every worker and the shared tier."""
+        if not user_id:
+            return
+        user_id = str(user_id)
+        self._drop_local(user_id)
+        if self.cache is not None:
+            try:
+                await self.cache.delete(KEY_PREFIX + user_id)
+                if self._redis is not None:
+                    pipe = self._redis.pipeline(transaction=False)
+                    pipe.incr(GEN_KEY_PREFIX + user_id)
+                    # Outlives every entry written under the previous generation
+                    pipe.expire(GEN_KEY_PREFIX + user_id, 2 * self.shared_ttl)
+                    pipe.publish(INVALIDATION_CHANNEL, user_id)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Entitlement cache invalidation failed: {e}")
+        logger.info(f"Entitlement cache invalidated for user {user_id}")
+
+
+_cache_instance: Optional[EntitlementCache] = None
+
+
+def get_entitlement_cache() -> EntitlementCache:
+    """Singleton cache backed by the global CacheService."""
+    global _cache_instance
+    if _cache_instance is None:
+        try:
+            from backend.utils.cache_service import cache_service
+        except Exception:  # pragma: no cover – cache layer unavailable
+            cache_service = None
+        _cache_instance = EntitlementCache(cache=cache_service)
+    return _cache_instance
@@ -5,6 +5,10 @@ Split from news_service.py to maintain 160 LOC limit.
 
 from typing import Any
 import httpx
+from backend.core.ai_analyzers.sentiment_store import (
+    get_sentiment_store,
+    label_from_score,
+)
 from backend.utils.logger_config import get_logger
 
 logger = get_logger("aevorex_finbot.NewsFetcher")
@@ -57,16 +61,28 @@ class NewsFetcher:
     def calculate_sentiment_summary(
         self, news_data: list[dict[str, Any]]
     ) -> dict[str, Any]:
-        """Calculate sentiment summary from news data."""
+        """Calculate sentiment summary from news data.
+
+        Stored per-headline scores (see `SentimentStore`) take precedence over
+        the provider-supplied `sentiment` label.
+        """
         if not news_data:
             return {}
 
+        store = get_sentiment_store()
+
         # Calculate sentiment distribution
         sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
         total_relevance = 0
+        scores: list[float] = []
 
         for item in news_data:
-            sentiment = item.get("sentiment", "neutral")
+            score = store.peek(item.get("title", ""))
+            if score is not None:
+                scores.append(score)
+                sentiment = label_from_score(score)
+            else:
+                sentiment = item.get("sentiment", "neutral")
             if sentiment in sentiment_counts:
                 sentiment_counts[sentiment] += 1
 
@@ -80,6 +96,8 @@ class NewsFetcher:
             "sentiment_distribution": sentiment_counts,
             "total_articles": total_items,
             "average_relevance": avg_relevance,
+            "average_score": sum(scores) / len(scores) if scores else None,
+            "scored_articles": len(scores),
             "dominant_sentiment": max(sentiment_counts, key=sentiment_counts.get),
         }
 
@@ -87,12 +105,16 @@ class NewsFetcher:
         self, news_data: list[dict[str, Any]], count: int
     ) -> list[dict[str, Any]]:
         """Extract headline information from news data."""
+        store = get_sentiment_store()
         headlines = []
         for item in news_data[:count]:
+            score = store.peek(item.get("title", ""))
             headline = {
                 "title": item.get("title", ""),
                 "published_at": item.get("published_at", ""),
-                "sentiment": item.get("sentiment", "neutral"),
+                "sentiment": label_from_score(score)
+                if score is not None
+                else item.get("sentiment", "neutral"),
                 "source": item.get("source", ""),
                 "url": item.get("url", ""),
             }
@@ -7,6 +7,7 @@ Extracted from stock_service.py to follow 160 LOC rule.
 
 from typing import Any
 import httpx
+from backend.core.ai_analyzers.sentiment_store import get_sentiment_store
 from backend.utils.cache_service import CacheService
 from backend.utils.logger_config import get_logger
 from backend.core.services.news_fetcher import NewsFetcher
@@ -20,6 +21,31 @@ class NewsService:
     def __init__(self):
         self.cache_ttl = 1800  # 30 minutes for news data
         self.fetcher = NewsFetcher()
+        self._sentiment = None
+
+    async def _score_headlines(
+        self, news_data: list[dict[str, Any]], client: httpx.AsyncClient
+    ) -> None:
+        """Score unseen headlines in one batch; results land in the sentiment store."""
+        from backend.core.ai_analyzers.sentiment_analyzer import SentimentAnalyzer
+
+        if self._sentiment is None:
+            self._sentiment = SentimentAnalyzer()
+        try:
+            await self._sentiment.score_headlines(
+                [item.get("title", "") for item in news_data], http_client=client
+            )
+        except Exception as e:
+            logger.warning(f"Headline sentiment scoring failed: {e}")
+
+    @staticmethod
+    async def _warm_sentiment(news_data: list[dict[str, Any]]) -> None:
+        """Pull stored headline scores (other workers', persisted ones) into the
+        local tier, so the sync readers (`extract_headlines`, the news mappers)
+        see them."""
+        await get_sentiment_store().get_many(
+            [item.get("title", "") for item in news_data]
+        )
 
     async def get_news_data(
         self,
@@ -36,6 +62,7 @@ class NewsService:
             cached_data = await cache.get(cache_key)
             if cached_data:
                 logger.debug(f"News data cache hit for {symbol}")
+                await self._warm_sentiment(cached_data)
                 return cached_data
 
         try:
@@ -48,6 +75,7 @@ class NewsService:
                 # Cache the results
                 await cache.set(cache_key, news_data, ttl=self.cache_ttl)
                 logger.info(f"News data cached for {symbol} ({len(news_data)} items)")
+                await self._warm_sentiment(news_data)
 
             return news_data
 
@@ -76,7 +104,6 @@ class NewsService:
             if not news_data:
                 return None
 
-            # Extract headline information using fetcher
             headlines = self.fetcher.extract_headlines(news_data, count)
 
             if headlines:
@@ -98,7 +125,8 @@ class NewsService:
             if not news_data:
                 return None
 
-            # Calculate sentiment using fetcher
+            # Score unseen headlines, then summarize from stored scores
+            await self._score_headlines(news_data, client)
             return self.fetcher.calculate_sentiment_summary(news_data)
 
         except Exception as e:
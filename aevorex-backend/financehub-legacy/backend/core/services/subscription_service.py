@@ -5,10 +5,10 @@ Subscription Service for FinanceHub Backend
 Handles all database operations related to users, subscriptions, and webhook events.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Iterable, Optional, Set, Tuple
 from datetime import datetime
-import asyncpg
 
 from backend.models.subscription import (
     User,
@@ -20,94 +20,201 @@ from backend.models.subscription import (
     SubscriptionStatus,
     SubscriptionPlan,
 )
-from backend.core.performance.database_pool import main_db_pool
+from backend.core.performance.database_pool import DatabasePool, main_db_pool
+from backend.core.performance.queries import Query, row_decoder
+from backend.core.services.entitlement_cache import get_entitlement_cache
 
 logger = logging.getLogger(__name__)
 
+USER_COLUMNS = ("id", "email", "auth_provider_id", "created_at", "updated_at", "is_active")
+SUBSCRIPTION_COLUMNS = (
+    "id",
+    "user_id",
+    "external_id",
+    "provider",
+    "plan",
+    "status",
+    "current_period_start",
+    "current_period_end",
+    "trial_start",
+    "trial_end",
+    "created_at",
+    "updated_at",
+)
+_SUBSCRIPTION_ENUMS = {
+    "provider": PaymentProvider,
+    "plan": SubscriptionPlan,
+    "status": SubscriptionStatus,
+}
+
+_decode_user = row_decoder(User, USER_COLUMNS)
+_decode_subscription = row_decoder(Subscription, SUBSCRIPTION_COLUMNS, _SUBSCRIPTION_ENUMS)
+_decode_joined_subscription = row_decoder(
+    Subscription, SUBSCRIPTION_COLUMNS, _SUBSCRIPTION_ENUMS, prefix="sub_"
+)
+
+USER_BY_EMAIL = Query(
+    "users.by_email", "SELECT {columns} FROM users WHERE email = $1;", USER_COLUMNS
+)
+USER_BY_ID = Query("users.by_id", "SELECT {columns} FROM users WHERE id = $1;", USER_COLUMNS)
+USER_BY_AUTH_PROVIDER_ID = Query(
+    "users.by_auth_provider_id",
+    "SELECT {columns} FROM users WHERE auth_provider_id = $1;",
+    USER_COLUMNS,
+)
+CREATE_USER = Query(
+    "users.create",
+    """
+        INSERT INTO users (email, auth_provider_id) 
+        VALUES ($1, $2) 
+        ON CONFLICT (email) DO UPDATE SET
+            auth_provider_id = EXCLUDED.auth_provider_id,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING {columns};
+    """,
+    USER_COLUMNS,
+)
+SUBSCRIPTION_BY_USER_ID = Query(
+    "subscriptions.by_user_id",
+    "SELECT {columns} FROM subscriptions WHERE user_id = $1 ORDER BY current_period_end DESC LIMIT 1;",
+    SUBSCRIPTION_COLUMNS,
+)
+SUBSCRIPTION_BY_EXTERNAL_ID = Query(
+    "subscriptions.by_external_id",
+    "SELECT {columns} FROM subscriptions WHERE provider = $1 AND external_id = $2;",
+    SUBSCRIPTION_COLUMNS,
+)
+# User + latest subscription in one round trip (entitlement cache misses)
+USER_WITH_SUBSCRIPTION = Query(
+    "users.with_subscription",
+    "SELECT "
+    + ", ".join(f"u.{c}" for c in USER_COLUMNS)
+    + ", "
+    + ", ".join(f"s.{c} AS sub_{c}" for c in SUBSCRIPTION_COLUMNS)
+    + """
+        FROM users u
+        LEFT JOIN LATERAL (
+            SELECT """
+    + ", ".join(SUBSCRIPTION_COLUMNS)
+    + """ FROM subscriptions
+            WHERE user_id = u.id
+            ORDER BY current_period_end DESC
+            LIMIT 1
+        ) s ON TRUE
+        WHERE u.id = $1;
+    """,
+)
+CREATE_SUBSCRIPTION = Query(
+    "subscriptions.create",
+    """INSERT INTO subscriptions (
+        user_id, external_id, provider, plan, status,
+        current_period_start, current_period_end, trial_start, trial_end
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9) RETURNING {columns};""",
+    SUBSCRIPTION_COLUMNS,
+)
+UPSERT_SUBSCRIPTION = Query(
+    "subscriptions.upsert",
+    """
+        INSERT INTO subscriptions (
+            user_id, external_id, provider, plan, status,
+            current_period_start, current_period_end, trial_start, trial_end
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+        ON CONFLICT (provider, external_id) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            plan = EXCLUDED.plan,
+            status = EXCLUDED.status,
+            current_period_start = EXCLUDED.current_period_start,
+            current_period_end = EXCLUDED.current_period_end,
+            trial_start = EXCLUDED.trial_start,
+            trial_end = EXCLUDED.trial_end,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING {columns};
+    """,
+    SUBSCRIPTION_COLUMNS,
+)
+UPDATE_SUBSCRIPTION_STATUS = Query(
+    "subscriptions.update_status",
+    "UPDATE subscriptions SET status = $1, updated_at = $2 WHERE external_id = $3 RETURNING {columns};",
+    SUBSCRIPTION_COLUMNS,
+)
+UPDATE_SUBSCRIPTION_PLAN = Query(
+    "subscriptions.update_plan",
+    "UPDATE subscriptions SET plan = $1, updated_at = $2 WHERE external_id = $3 RETURNING {columns};",
+    SUBSCRIPTION_COLUMNS,
+)
+WEBHOOK_EVENT_COLUMNS = ("id", "provider", "event_type")
+MARK_WEBHOOK_EVENT = Query(
+    "webhook_events.mark",
+    "INSERT INTO webhook_events ({columns}) VALUES ($1, $2, $3) ON CONFLICT (id) DO NOTHING;",
+    WEBHOOK_EVENT_COLUMNS,
+)
+WEBHOOK_EVENT_EXISTS = Query(
+    "webhook_events.exists", "SELECT id FROM webhook_events WHERE id = $1;"
+)
+
 
 class SubscriptionService:
     """Manages user and subscription data in the database."""
 
-    def __init__(self, db_pool: asyncpg.Pool = None):
+    def __init__(self, db_pool: Optional[DatabasePool] = None):
         self.db_pool = db_pool or main_db_pool
+        self._pending_invalidations: Set[asyncio.Task] = set()
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Retrieve a user by their email address."""
-        query = "SELECT * FROM users WHERE email = $1;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, email)
-        return User(**record) if record else None
+        record = await self.db_pool.fetchrow(USER_BY_EMAIL, email)
+        return _decode_user(record) if record else None
 
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Retrieve a user by their ID."""
-        query = "SELECT * FROM users WHERE id = $1;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, user_id)
-        return User(**record) if record else None
+        record = await self.db_pool.fetchrow(USER_BY_ID, user_id)
+        return _decode_user(record) if record else None
 
     async def get_user_by_auth_provider_id(
         self, auth_provider_id: str
     ) -> Optional[User]:
         """Retrieve a user by their authentication provider ID."""
-        query = "SELECT * FROM users WHERE auth_provider_id = $1;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, auth_provider_id)
-        return User(**record) if record else None
+        record = await self.db_pool.fetchrow(USER_BY_AUTH_PROVIDER_ID, auth_provider_id)
+        return _decode_user(record) if record else None
 
     async def create_user(
         self, email: str, auth_provider_id: Optional[str] = None
     ) -> User:
         """Create a new user in the database or return existing user."""
-        query = """
-            INSERT INTO users (email, auth_provider_id) 
-            VALUES ($1, $2) 
-            ON CONFLICT (email) DO UPDATE SET
-                auth_provider_id = EXCLUDED.auth_provider_id,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING *;
-        """
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, email, auth_provider_id)
-        return User(**record)
+        record = await self.db_pool.fetchrow(CREATE_USER, email, auth_provider_id)
+        return _decode_user(record)
 
     async def get_subscription_by_user_id(self, user_id: str) -> Optional[Subscription]:
         """Retrieve a user's active subscription."""
-        query = "SELECT * FROM subscriptions WHERE user_id = $1 ORDER BY current_period_end DESC LIMIT 1;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, user_id)
-        return Subscription(**record) if record else None
+        record = await self.db_pool.fetchrow(SUBSCRIPTION_BY_USER_ID, user_id, readonly=True)
+        return _decode_subscription(record) if record else None
 
     async def get_subscription_by_external_id(
         self, provider: PaymentProvider, external_id: str
     ) -> Optional[Subscription]:
         """Retrieve a subscription by its external provider ID."""
-        query = "SELECT * FROM subscriptions WHERE provider = $1 AND external_id = $2;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, provider.value, external_id)
-        return Subscription(**record) if record else None
+        record = await self.db_pool.fetchrow(
+            SUBSCRIPTION_BY_EXTERNAL_ID, provider.value, external_id
+        )
+        return _decode_subscription(record) if record else None
 
     async def create_subscription(self, sub_data: SubscriptionCreate) -> Subscription:
         """Create a new subscription (user should already exist)."""
         user_id = str(sub_data.user_id)
-        
-        query = """INSERT INTO subscriptions (
-            user_id, external_id, provider, plan, status,
-            current_period_start, current_period_end, trial_start, trial_end
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9) RETURNING *;"""
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(
-                query,
-                user_id,
-                sub_data.external_id,
-                sub_data.provider.value,
-                sub_data.plan,
-                sub_data.status.value,
-                sub_data.current_period_start,
-                sub_data.current_period_end,
-                sub_data.trial_start,
-                sub_data.trial_end,
-            )
-        return Subscription(**record)
+        record = await self.db_pool.fetchrow(
+            CREATE_SUBSCRIPTION,
+            user_id,
+            sub_data.external_id,
+            sub_data.provider.value,
+            sub_data.plan.value,
+            sub_data.status.value,
+            sub_data.current_period_start,
+            sub_data.current_period_end,
+            sub_data.trial_start,
+            sub_data.trial_end,
+        )
+        await self._after_write(user_id)
+        return _decode_subscription(record)
 
     async def update_subscription(
         self, sub_id: str, sub_data: SubscriptionUpdate
@@ -147,12 +254,15 @@ class SubscriptionService:
         values.append(datetime.utcnow())
         i += 1
 
-        query = f"UPDATE subscriptions SET {', '.join(updates)} WHERE id = ${i} RETURNING *;"
+        query = Query(
+            "subscriptions.update",
+            f"UPDATE subscriptions SET {', '.join(updates)} WHERE id = ${i} RETURNING {{columns}};",
+            SUBSCRIPTION_COLUMNS,
+        )
         values.append(sub_id)
 
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, *values)
-        return Subscription(**record) if record else None
+        record = await self.db_pool.fetchrow(query, *values)
+        return await self._invalidated(record)
 
     async def upsert_subscription(
         self,
@@ -167,86 +277,109 @@ class SubscriptionService:
         trial_end: Optional[datetime] = None,
     ) -> Subscription:
         """Create or update a subscription atomically."""
-        query = """
-            INSERT INTO subscriptions (
-                user_id, external_id, provider, plan, status,
-                current_period_start, current_period_end, trial_start, trial_end
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            ON CONFLICT (provider, external_id) DO UPDATE SET
-                user_id = EXCLUDED.user_id,
-                plan = EXCLUDED.plan,
-                status = EXCLUDED.status,
-                current_period_start = EXCLUDED.current_period_start,
-                current_period_end = EXCLUDED.current_period_end,
-                trial_start = EXCLUDED.trial_start,
-                trial_end = EXCLUDED.trial_end,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING *;
-        """
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(
-                query,
-                user_id,
-                external_id,
-                provider.value,
-                plan.value,
-                status.value,
-                period_start,
-                period_end,
-                trial_start,
-                trial_end,
-            )
+        record = await self.db_pool.fetchrow(
+            UPSERT_SUBSCRIPTION,
+            user_id,
+            external_id,
+            provider.value,
+            plan.value,
+            status.value,
+            period_start,
+            period_end,
+            trial_start,
+            trial_end,
+        )
         logger.info(f"Upserted subscription {external_id} for user {user_id}")
-        return Subscription(**record)
+        await self._after_write(user_id)
+        return _decode_subscription(record)
 
     async def get_user_with_subscription(
         self, user_id: str
     ) -> Optional[UserWithSubscription]:
         """Get a user and their latest subscription information."""
-        user = await self.get_user_by_id(user_id)
-        if not user:
+        # Entitlement checks may read a replica (bounded lag, see _after_write)
+        record = await self.db_pool.fetchrow(USER_WITH_SUBSCRIPTION, user_id, readonly=True)
+        if not record:
             return None
 
-        subscription = await self.get_subscription_by_user_id(user_id)
-        return UserWithSubscription(user=user, subscription=subscription)
+        subscription = (
+            _decode_joined_subscription(record) if record["sub_id"] is not None else None
+        )
+        return UserWithSubscription(user=_decode_user(record), subscription=subscription)
 
     async def mark_webhook_event_processed(
         self, event_id: str, provider: PaymentProvider, event_type: str
     ) -> None:
         """Mark a webhook event as processed for idempotency."""
-        query = "INSERT INTO webhook_events (id, provider, event_type) VALUES ($1, $2, $3) ON CONFLICT (id) DO NOTHING;"
-        async with self.db_pool.get_connection() as conn:
-            await conn.execute(query, event_id, provider.value, event_type)
+        await self.db_pool.execute(MARK_WEBHOOK_EVENT, event_id, provider.value, event_type)
         logger.info(
             f"Webhook event {event_id} ({event_type}) from {provider.value} marked as processed."
         )
 
+    async def mark_webhook_events_processed(
+        self, events: Iterable[Tuple[str, PaymentProvider, str]]
+    ) -> int:
+        """Bulk version of `mark_webhook_event_processed` (backfills / replays)."""
+        rows = [(event_id, provider.value, event_type) for event_id, provider, event_type in events]
+        count = await self.db_pool.bulk_write(
+            MARK_WEBHOOK_EVENT,
+            "webhook_events",
+            WEBHOOK_EVENT_COLUMNS,
+            rows,
+            on_conflict="(id) DO NOTHING",
+        )
+        logger.info(f"{count} webhook events marked as processed.")
+        return count
+
     async def is_webhook_event_processed(self, event_id: str) -> bool:
         """Check if a webhook event has already been processed."""
-        query = "SELECT id FROM webhook_events WHERE id = $1;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, event_id)
+        record = await self.db_pool.fetchrow(WEBHOOK_EVENT_EXISTS, event_id)
         return record is not None
 
     async def update_subscription_status(
         self, external_id: str, status: SubscriptionStatus
     ) -> Optional[Subscription]:
         """Update subscription status by external ID."""
-        query = "UPDATE subscriptions SET status = $1, updated_at = $2 WHERE external_id = $3 RETURNING *;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(
-                query, status.value, datetime.utcnow(), external_id
-            )
-        return Subscription(**record) if record else None
+        record = await self.db_pool.fetchrow(
+            UPDATE_SUBSCRIPTION_STATUS, status.value, datetime.utcnow(), external_id
+        )
+        return await self._invalidated(record)
 
     async def update_subscription_plan(
         self, external_id: str, plan: SubscriptionPlan
     ) -> Optional[Subscription]:
         """Update subscription plan by external ID."""
-        query = "UPDATE subscriptions SET plan = $1, updated_at = $2 WHERE external_id = $3 RETURNING *;"
-        async with self.db_pool.get_connection() as conn:
-            record = await conn.fetchrow(query, plan.value, datetime.utcnow(), external_id)
-        return Subscription(**record) if record else None
+        record = await self.db_pool.fetchrow(
+            UPDATE_SUBSCRIPTION_PLAN, plan.value, datetime.utcnow(), external_id
+        )
+        return await self._invalidated(record)
+
+    async def _invalidated(self, record) -> Optional[Subscription]:
+        """Build the updated subscription and drop its owner's cached entitlement."""
+        if not record:
+            return None
+        subscription = _decode_subscription(record)
+        await self._after_write(str(subscription.user_id))
+        return subscription
+
+    async def _after_write(self, user_id: str) -> None:
+        """
+        Drop the user's cached entitlement now and, with replicas, once more
+        after the replica lag bound – a read that raced the write on a lagging
+        replica cannot keep a stale entitlement cached.
+        """
+        cache = get_entitlement_cache()
+        await cache.invalidate(user_id)
+        if not self.db_pool.has_replicas:
+            return
+
+        async def invalidate_later() -> None:
+            await asyncio.sleep(self.db_pool.max_replica_lag + 1)
+            await cache.invalidate(user_id)
+
+        task = asyncio.create_task(invalidate_later())
+        self._pending_invalidations.add(task)
+        task.add_done_callback(self._pending_invalidations.discard)
 
 
 # Global service instance
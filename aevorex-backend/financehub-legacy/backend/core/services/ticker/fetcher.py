@@ -6,7 +6,6 @@ from various external API providers.
 import httpx
 from typing import Any
 import os
-import asyncio
 
 # Optional import of yfinance – only used if YF fallback is selected.
 try:
@@ -15,6 +14,12 @@ except ModuleNotFoundError:
     yf = None  # Will check at runtime
 
 from backend.config import settings
+from backend.core.performance.executors import (
+    YFINANCE,
+    ExecutorSaturatedError,
+    ExecutorTimeoutError,
+    run_blocking,
+)
 from backend.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -189,6 +194,15 @@ def _fetch_yf_quote_sync(symbol: str) -> dict[str, Any] | None:
         return None
 
 
+async def _fetch_yf_quote(symbol: str) -> dict[str, Any] | None:
+    """Run `_fetch_yf_quote_sync` on the bounded yfinance executor."""
+    try:
+        return await run_blocking(YFINANCE, _fetch_yf_quote_sync, symbol)
+    except (ExecutorSaturatedError, ExecutorTimeoutError) as exc:
+        logger.warning(f"{MODULE_PREFIX} YF fetch skipped for {symbol}: {exc}")
+        return None
+
+
 # --- Utility Functions ---
 def normalize_symbol_for_provider(symbol: str, provider: str) -> str:
     """
@@ -242,7 +256,7 @@ async def fetch_single_ticker_quote(
 
     # Local YF provider – handled without HTTP request
     if provider_config is API_CONFIG.get("YF"):
-        return await asyncio.to_thread(_fetch_yf_quote_sync, symbol)
+        return await _fetch_yf_quote(symbol)
 
     # HTTP-based providers (FMP, AV, EODHD)
     api_key_getter = provider_config.get("api_key_getter")
@@ -271,7 +285,7 @@ async def fetch_single_ticker_quote(
                 # Symbol-level graceful degradation: Attempt Yahoo Finance as secondary source.
                 if API_CONFIG.get("YF")["response_parser"] is None:
                     # yfinance path
-                    return await asyncio.to_thread(_fetch_yf_quote_sync, symbol)
+                    return await _fetch_yf_quote(symbol)
                 return None
             return parsed
     except httpx.RequestError as req_err:
@@ -281,4 +295,4 @@ async def fetch_single_ticker_quote(
         logger.error(
             f"{log_prefix} An unexpected error occurred. Error: {exc}. Attempting YF fallback…"
         )
-        return await asyncio.to_thread(_fetch_yf_quote_sync, symbol)
+        return await _fetch_yf_quote(symbol)
@@ -0,0 +1,275 @@
+"""
+Ticker Tape Hub - Push-Based Fan-Out
+====================================
+
+One process-wide hub serves every ticker-tape viewer:
+
+- an in-memory latest-quote table (symbol → ticker item + fetch time),
+- a single background poller over the union of all subscribed symbols,
+  fetched in EODHD real-time batches (`s=` parameter),
+- per-subscriber mailboxes that coalesce diffs by symbol, so a slow
+  viewer only ever holds the newest quote per symbol (bounded memory).
+
+Upstream load therefore scales with the number of distinct symbols, not
+with the number of open tabs. HTTP polling (`get_quotes`) reads the same
+table and only fetches symbols that are stale.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from backend.config import settings
+from backend.utils.logger_config import get_logger
+from .ticker_tape_service import EODHD_REALTIME_BATCH_SIZE, fetch_ticker_batch_from_eodhd
+
+logger = get_logger(__name__)
+MODULE_PREFIX = "[TickerTape Hub]"
+
+# Fields whose change makes a quote worth pushing
+_DIFF_FIELDS = ("price", "change", "change_percent", "volume", "timestamp")
+
+
+class TickerSubscriber:
+    """One viewer: its symbol set and a coalescing mailbox of pending quotes."""
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        self.symbols: Set[str] = set(symbols)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+        self.closed = False
+
+    def offer(self, quotes: Dict[str, Dict[str, Any]]) -> None:
+        wanted = {s: q for s, q in quotes.items() if s in self.symbols}
+        if wanted:
+            self._pending.update(wanted)  # newer quote replaces the unsent one
+            self._ready.set()
+
+    async def next_batch(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Wait for pending quotes and take them all ([] on timeout / close)."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        batch, self._pending = list(self._pending.values()), {}
+        return batch
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+
+class TickerTapeHub:
+    """Latest-quote table + shared poller + subscriber fan-out."""
+
+    def __init__(
+        self,
+        poll_interval: Optional[float] = None,
+        batch_size: int = EODHD_REALTIME_BATCH_SIZE,
+    ):
+        self.poll_interval = poll_interval or float(
+            settings.TICKER_TAPE.stream_poll_seconds
+        )
+        self.batch_size = batch_size
+        self._quotes: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._invalid: Dict[str, float] = {}  # symbol → time it was found invalid
+        self._subscribers: Set[TickerSubscriber] = set()
+        self._refs: Counter = Counter()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._poller: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.upstream_requests = 0
+
+    # --- quote table -----------------------------------------------------
+
+    def latest(self, symbols: Iterable[str]) -> List[Dict[str, Any]]:
+        return [self._quotes[s][1] for s in symbols if s in self._quotes]
+
+    def _is_fresh(self, symbol: str, max_age: float, now: float) -> bool:
+        entry = self._quotes.get(symbol)
+        if entry is not None and now - entry[0] <= max_age:
+            return True
+        invalid_at = self._invalid.get(symbol)
+        return invalid_at is not None and now - invalid_at <= max_age
+
+    def _store(self, results: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Update the table; return only the quotes that changed."""
+        now = time.monotonic()
+        changed: Dict[str, Dict[str, Any]] = {}
+        for symbol, quote in results.items():
+            if quote is None:
+                self._invalid[symbol] = now
+                continue
+            self._invalid.pop(symbol, None)
+            previous = self._quotes.get(symbol)
+            self._quotes[symbol] = (now, quote)
+            if previous is None or any(
+                previous[1].get(f) != quote.get(f) for f in _DIFF_FIELDS
+            ):
+                changed[symbol] = quote
+        return changed
+
+    async def _fetch(self, symbols: List[str], client: httpx.AsyncClient) -> None:
+        """Fetch `symbols` in batches (single-flight per symbol) and fan out diffs."""
+        waiting = [self._inflight[s] for s in symbols if s in self._inflight]
+        todo = [s for s in symbols if s not in self._inflight]
+        if todo:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            for s in todo:
+                self._inflight[s] = future
+            try:
+                batches = [
+                    todo[i : i + self.batch_size]
+                    for i in range(0, len(todo), self.batch_size)
+                ]
+                self.upstream_requests += len(batches)
+                responses = await asyncio.gather(
+                    *(fetch_ticker_batch_from_eodhd(b, client) for b in batches),
+                    return_exceptions=True,
+                )
+                results: Dict[str, Optional[Dict[str, Any]]] = {}
+                for batch, response in zip(batches, responses):
+                    if isinstance(response, Exception):
+                        logger.error(f"{MODULE_PREFIX} Batch {batch} failed: {response}")
+                        continue
+                    results.update(response)
+                self._broadcast(self._store(results))
+            finally:
+                for s in todo:
+                    self._inflight.pop(s, None)
+                future.set_result(None)
+        if waiting:
+            await asyncio.gather(*waiting)
+
+    async def get_quotes(
+        self,
+        symbols: List[str],
+        client: httpx.AsyncClient,
+        max_age: Optional[float] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Quotes for `symbols` in request order, refreshing only stale ones.
+
+        Returns (quotes, number of symbols that had to be fetched).
+        """
+        max_age = self.poll_interval if max_age is None else max_age
+        now = time.monotonic()
+        stale = [s for s in dict.fromkeys(symbols) if not self._is_fresh(s, max_age, now)]
+        if stale:
+            await self._fetch(stale, client)
+        return self.latest(symbols), len(stale)
+
+    # --- subscriptions -----------------------------------------------------
+
+    def subscribe(
+        self, symbols: Iterable[str], client: Optional[httpx.AsyncClient] = None
+    ) -> TickerSubscriber:
+        subscriber = TickerSubscriber()
+        self._subscribers.add(subscriber)
+        if client is not None:
+            self._client = client
+        self.update_symbols(subscriber, add=symbols)
+        return subscriber
+
+    def update_symbols(
+        self,
+        subscriber: TickerSubscriber,
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+    ) -> None:
+        """Change a subscription, keeping its total within `TICKER_TAPE.max_symbols`."""
+        for s in remove:
+            if s in subscriber.symbols:
+                subscriber.symbols.discard(s)
+                self._refs[s] -= 1
+                if self._refs[s] <= 0:
+                    del self._refs[s]
+        added = [s for s in dict.fromkeys(add) if s not in subscriber.symbols]
+        limit = settings.TICKER_TAPE.max_symbols
+        added = added[: max(0, limit - len(subscriber.symbols))]
+        for s in added:
+            subscriber.symbols.add(s)
+            self._refs[s] += 1
+        # New symbols get whatever the table already has right away
+        subscriber.offer({s: self._quotes[s][1] for s in added if s in self._quotes})
+        self._ensure_poller()
+
+    def unsubscribe(self, subscriber: TickerSubscriber) -> None:
+        self.update_symbols(subscriber, remove=list(subscriber.symbols))
+        self._subscribers.discard(subscriber)
+        subscriber.close()
+
+    def _broadcast(self, changed: Dict[str, Dict[str, Any]]) -> None:
+        if not changed:
+            return
+        for subscriber in self._subscribers:
+            subscriber.offer(changed)
+
+    # --- poller --------------------------------------------------------------
+
+    def _ensure_poller(self) -> None:
+        if not self._refs or self._client is None:
+            return
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        logger.info(f"{MODULE_PREFIX} Poller started")
+        try:
+            while self._refs and self._client is not None:
+                started = time.monotonic()
+                symbols = list(self._refs)
+                try:
+                    # Slightly below the interval so every tick refreshes
+                    await self._fetch(
+                        [
+                            s
+                            for s in symbols
+                            if not self._is_fresh(s, self.poll_interval * 0.5, started)
+                        ],
+                        self._client,
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"{MODULE_PREFIX} Poll failed: {e}")
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, self.poll_interval - elapsed))
+        finally:
+            logger.info(f"{MODULE_PREFIX} Poller stopped (no subscribers)")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "symbols": len(self._refs),
+            "quotes_cached": len(self._quotes),
+            "upstream_requests": self.upstream_requests,
+            "poll_interval": self.poll_interval,
+        }
+
+    async def close(self) -> None:
+        for subscriber in list(self._subscribers):
+            self.unsubscribe(subscriber)
+        if self._poller and not self._poller.done():
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+
+
+_hub: Optional[TickerTapeHub] = None
+
+
+def get_ticker_tape_hub() -> TickerTapeHub:
+    """Process-wide ticker tape hub."""
+    global _hub
+    if _hub is None:
+        _hub = TickerTapeHub()
+    return _hub
@@ -12,6 +12,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 from backend.config.eodhd import settings as eodhd_settings
+from backend.core.metrics import SERVICE_METRICS
 from backend.utils.logger_config import get_logger
 from .services.trading_hours_service import TradingHoursService
 
@@ -126,6 +127,80 @@ async def fetch_single_ticker_from_eodhd(
         logger.error(f"{MODULE_PREFIX} Failed to fetch {symbol} from EODHD: {e}")
         return None
 
+# EODHD real-time accepts extra symbols via `s=` – one request per batch
+EODHD_REALTIME_BATCH_SIZE = 20
+_CRITICAL_FIELDS = ("close", "change", "volume", "high", "low", "open")
+
+
+def _parse_realtime_quote(symbol: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map one EODHD real-time object to a ticker item (None if invalid)."""
+    if not isinstance(data, dict):
+        return None
+    # All critical fields "NA"/null → unknown symbol
+    if all(data.get(f) in ("NA", None) for f in _CRITICAL_FIELDS):
+        return None
+    return _enhance_ticker_with_trading_hours(
+        {
+            "symbol": symbol,
+            "price": data.get("close"),
+            "change": data.get("change"),
+            "change_percent": data.get("change_percent"),
+            "volume": data.get("volume"),
+            "high": data.get("high"),
+            "low": data.get("low"),
+            "open": data.get("open"),
+            "previous_close": data.get("previous_close"),
+            "timestamp": data.get("timestamp"),
+            "currency": data.get("currency", "USD"),
+        }
+    )
+
+
+async def fetch_ticker_batch_from_eodhd(
+    symbols: List[str], client: httpx.AsyncClient
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fetch up to EODHD_REALTIME_BATCH_SIZE symbols in one real-time request.
+
+    Returns {symbol: ticker item or None (invalid / missing)}.
+    """
+    if not symbols:
+        return {}
+    params = {"api_token": eodhd_settings.API_KEY, "fmt": "json"}
+    if len(symbols) > 1:
+        params["s"] = ",".join(symbols[1:])
+    with SERVICE_METRICS.track_upstream("eodhd"):
+        response = await client.get(
+            f"https://eodhd.com/api/real-time/{symbols[0]}", params=params
+        )
+        response.raise_for_status()
+        payload = response.json()
+    rows = payload if isinstance(payload, list) else [payload]
+
+    # Match by code only – EODHD may omit or reorder symbols. Codes can come
+    # back with or without the exchange suffix, so fall back to the bare code
+    # when that is unambiguous; anything unmatched is a miss.
+    by_code: Dict[str, Dict[str, Any]] = {}
+    by_base: Dict[str, Optional[Dict[str, Any]]] = {}
+    for row in rows:
+        if not isinstance(row, dict) or not row.get("code"):
+            continue
+        code = str(row["code"]).upper()
+        by_code[code] = row
+        base = _bare_code(code)
+        by_base[base] = None if base in by_base and by_base[base] is not row else row
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    for symbol in symbols:
+        row = by_code.get(symbol.upper()) or by_base.get(_bare_code(symbol))
+        results[symbol] = _parse_realtime_quote(symbol, row) if row else None
+    return results
+
+
+def _bare_code(symbol: str) -> str:
+    """Symbol without its exchange suffix (`AAPL.US` → `AAPL`)."""
+    return symbol.upper().rsplit(".", 1)[0].lstrip("^")
+
+
 async def get_ticker_tape_data(
     symbols: List[str],
     client: httpx.AsyncClient
@@ -0,0 +1,64 @@
+"""Macro time-series warehouse: local store, incremental sync, transforms, series catalog, BUBOR ingestion, the FX matrix, yield-curve surfaces and the macro dashboard snapshot."""
+
+from .bubor import MNB, BuborPipeline, BuborUnavailableError, get_bubor_pipeline
+from .catalog import (
+    CatalogHarvester,
+    CatalogRefresher,
+    SeriesCatalog,
+    close_series_catalog,
+    get_series_catalog,
+)
+from .curves import (
+    UST,
+    CurveSurface,
+    CurveSurfaceService,
+    CurveUnavailableError,
+    get_curve_surface_service,
+)
+from .fx import FxBlock, FxMatrixService, FxUnavailableError, get_fx_matrix_service
+from .groups import EcbSeriesGroup, SeriesGroup, SeriesGroupUnavailableError
+from .snapshot import (
+    MacroSnapshot,
+    MacroSnapshotJob,
+    MacroSnapshotService,
+    get_macro_snapshot_service,
+)
+from .store import MacroWarehouse, SeriesState, close_macro_warehouse, get_macro_warehouse
+from .sync import ECB, FRED, SeriesNotFoundError, WarehouseSync, get_warehouse_sync
+
+__all__ = [
+    "BuborPipeline",
+    "BuborUnavailableError",
+    "CatalogHarvester",
+    "CatalogRefresher",
+    "CurveSurface",
+    "CurveSurfaceService",
+    "CurveUnavailableError",
+    "ECB",
+    "EcbSeriesGroup",
+    "FRED",
+    "FxBlock",
+    "FxMatrixService",
+    "FxUnavailableError",
+    "MNB",
+    "MacroSnapshot",
+    "MacroSnapshotJob",
+    "MacroSnapshotService",
+    "MacroWarehouse",
+    "SeriesCatalog",
+    "SeriesGroup",
+    "SeriesGroupUnavailableError",
+    "SeriesNotFoundError",
+    "SeriesState",
+    "UST",
+    "WarehouseSync",
+    "close_macro_warehouse",
+    "close_series_catalog",
+    "get_bubor_pipeline",
+    "get_curve_surface_service",
+    "get_fx_matrix_service",
+    "get_macro_snapshot_service",
+    "get_macro_warehouse",
+    "get_series_catalog",
+    "get_warehouse_sync",
+]
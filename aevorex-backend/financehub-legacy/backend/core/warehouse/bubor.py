@@ -0,0 +1,329 @@
+"""
+BUBOR Ingestion Pipeline
+========================
+
+The one place that downloads and parses the MNB BUBOR workbook
+(https://www.mnb.hu/letoltes/bubor2.xls). Every BUBOR consumer (the
+/macro/bubor routes, `BUBORClient` history and the TradingView `BUBOR_*`
+bars) reads the stored fixings instead of the file.
+
+- Each tenor is stored as one daily warehouse series (`mnb` / `BUBOR.<tenor>`),
+  so reads are windows of the in-memory NumPy arrays.
+- The download is a conditional GET (If-None-Match / If-Modified-Since
+  from the previous response). A 304 response, or a body whose SHA-256 is
+  unchanged, is neither parsed nor written.
+- Parsing runs on the `cpu` process pool with xlrd directly. Year sheets
+  older than the last stored fixing are skipped, and only fixings after it
+  are appended. The whole history is re-read every FULL_RESYNC_DAYS.
+- Checks happen at most once per SYNC_INTERVAL_MINUTES and are
+  single-flight. If MNB is unreachable, the stored fixings are served.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from backend.core.metrics import SERVICE_METRICS
+from backend.core.performance.executors import run_cpu
+from backend.utils.logger_config import get_logger
+
+from .store import MacroWarehouse, Row, SeriesState, get_macro_warehouse
+from .transforms import SeriesArrays
+
+logger = get_logger(__name__)
+
+MNB = "mnb"
+BUBOR_XLS_URL = "https://www.mnb.hu/letoltes/bubor2.xls"
+
+BUBOR_TENORS = [
+    "O/N",
+    "1W",
+    "2W",
+    "1M",
+    "2M",
+    "3M",
+    "4M",
+    "5M",
+    "6M",
+    "7M",
+    "8M",
+    "9M",
+    "10M",
+    "11M",
+    "12M",
+]
+
+_PREFIX = "BUBOR."
+_OVERNIGHT = {"O/N", "ON", "O/NAP", "OVERNIGHT"}
+# "1 hét", "2hét", "3 hónap", "3H", "6 months" … (accents already stripped)
+_TENOR = re.compile(r"^(\d{1,2})(HETES|HET|WEEKS|WEEK|WK|W|HONAPOS|HONAP|MONTHS|MONTH|MO|M|H)$")
+_DATE_FORMATS = ("%Y.%m.%d.", "%Y.%m.%d", "%Y-%m-%d", "%Y/%m/%d", "%d.%m.%Y")
+
+
+class BuborUnavailableError(RuntimeError):
+    """No stored fixings and MNB could not be read."""
+
+
+def normalize_tenor(label: object) -> Optional[str]:
+    """MNB column header ('O/N', '1hét', '3 hónap', '6 months', …) → 'O/N', '1W', '3M' …"""
+    if label is None:
+        return None
+    clean = (
+        unicodedata.normalize("NFKD", str(label))
+        .encode("ascii", "ignore")
+        .decode()
+        .upper()
+        .replace(" ", "")
+    )
+    if clean in _OVERNIGHT:
+        return "O/N"
+    match = _TENOR.match(clean)
+    if not match:
+        return None
+    count, unit = int(match.group(1)), match.group(2)
+    tenor = f"{count}W" if unit.startswith(("HET", "W")) else f"{count}M"
+    return tenor if tenor in BUBOR_TENORS else None
+
+
+def _cell_date(cell, datemode: int) -> Optional[str]:
+    import xlrd
+
+    if cell.ctype in (xlrd.XL_CELL_DATE, xlrd.XL_CELL_NUMBER):
+        try:
+            return xlrd.xldate_as_datetime(cell.value, datemode).date().isoformat()
+        except (ValueError, OverflowError, xlrd.xldate.XLDateError):
+            return None
+    if cell.ctype == xlrd.XL_CELL_TEXT:
+        text = cell.value.strip()
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt).date().isoformat()
+            except ValueError:
+                continue
+    return None
+
+
+def _cell_float(cell) -> Optional[float]:
+    import xlrd
+
+    if cell.ctype == xlrd.XL_CELL_NUMBER:
+        return float(cell.value)
+    if cell.ctype == xlrd.XL_CELL_TEXT:
+        try:
+            return float(cell.value.strip().replace(",", ".").rstrip("%"))
+        except ValueError:
+            return None
+    return None
+
+
+def parse_bubor_workbook(content: bytes, since: Optional[str] = None) -> Dict[str, List[Row]]:
+    """
+    {tenor: [(date, rate), …]} of every fixing after `since` (all if None).
+
+    Module-level (picklable) so it can run on the `cpu` process pool; only the
+    yearly sheets that can hold newer fixings are loaded.
+    """
+    import xlrd
+
+    book = xlrd.open_workbook(file_contents=content, on_demand=True)
+    first_year = int(since[:4]) if since else 0
+    rows: Dict[str, List[Row]] = defaultdict(list)
+    try:
+        for name in book.sheet_names():
+            if not (name.isdigit() and len(name) == 4) or int(name) < first_year:
+                continue
+            sheet = book.sheet_by_name(name)
+            columns: Optional[List[Optional[str]]] = None
+            for r in range(sheet.nrows):
+                cells = sheet.row(r)
+                if columns is None:
+                    # Header: the first row naming at least three tenors
+                    labels = [normalize_tenor(cell.value) for cell in cells[1:]]
+                    if sum(1 for label in labels if label) >= 3:
+                        columns = labels
+                    continue
+                day = _cell_date(cells[0], book.datemode) if cells else None
+                if day is None or (since and day <= since):
+                    continue
+                for tenor, cell in zip(columns, cells[1:]):
+                    if tenor:
+                        value = _cell_float(cell)
+                        if value is not None:
+                            rows[tenor].append((day, value))
+            book.unload_sheet(name)
+    finally:
+        book.release_resources()
+    return {tenor: sorted(series) for tenor, series in rows.items()}
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type(httpx.TransportError),
+    reraise=True,
+)
+async def _download(headers: Dict[str, str]) -> httpx.Response:
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        with SERVICE_METRICS.track_upstream(MNB):
+            return await client.get(BUBOR_XLS_URL, headers=headers)
+
+
+class BuborPipeline:
+    """Keeps the stored BUBOR fixings current and serves reads from them."""
+
+    def __init__(self, warehouse: MacroWarehouse, config=None):
+        if config is None:
+            from backend.config import settings
+
+            config = settings.MACRO_WAREHOUSE
+        self.warehouse = warehouse
+        self.config = config
+        self._lock = asyncio.Lock()
+
+    async def _states(self) -> Dict[str, SeriesState]:
+        return {
+            state.series_id[len(_PREFIX):]: state
+            for state in await self.warehouse.list_series(MNB)
+            if state.series_id.startswith(_PREFIX)
+        }
+
+    def _due(self, states: Dict[str, SeriesState]) -> bool:
+        if not states:
+            return True
+        checked = min(state.last_checked for state in states.values())
+        return time.time() - checked >= self.config.SYNC_INTERVAL_MINUTES * 60
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Check MNB for new fixings (at most once per sync interval); True if any were stored."""
+        states = await self._states()
+        if not force and not self._due(states):
+            return False
+        requested = time.time()
+        async with self._lock:
+            # Another request may have checked while we waited
+            states = await self._states()
+            if states and min(s.last_checked for s in states.values()) >= requested:
+                return False
+            try:
+                return await self._sync(states)
+            except Exception as exc:
+                if not states:
+                    raise BuborUnavailableError(f"BUBOR data unavailable: {exc}") from exc
+                logger.warning(f"[BUBOR] MNB check failed, serving stored fixings: {exc}")
+                for tenor in states:
+                    await self.warehouse.touch(MNB, _PREFIX + tenor)
+                return False
+
+    async def _sync(self, states: Dict[str, SeriesState]) -> bool:
+        full = not states or (
+            time.time() - min(s.last_full_sync for s in states.values())
+            >= self.config.FULL_RESYNC_DAYS * 86400
+        )
+        previous = max(states.values(), key=lambda s: s.last_checked).meta if states else {}
+        headers = {}
+        if not full and previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if not full and previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+        resp = await _download(headers)
+        if resp.status_code == 304:
+            for tenor in states:
+                await self.warehouse.touch(MNB, _PREFIX + tenor)
+            logger.info("[BUBOR] Workbook not modified")
+            return False
+        resp.raise_for_status()
+
+        meta = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "sha256": hashlib.sha256(resp.content).hexdigest(),
+        }
+        if not full and meta["sha256"] == previous.get("sha256"):
+            parsed: Dict[str, List[Row]] = {}
+        else:
+            since = None
+            if not full:
+                since = min((s.last_date for s in states.values() if s.last_date), default=None)
+            parsed = await run_cpu(parse_bubor_workbook, resp.content, since)
+            if full and not parsed:
+                raise ValueError("No BUBOR fixings found in the MNB workbook")
+
+        changed = 0
+        for tenor in BUBOR_TENORS:
+            state = states.get(tenor)
+            rows = parsed.get(tenor, [])
+            if state is not None and state.last_date and not full:
+                rows = [row for row in rows if row[0] > state.last_date]
+            if state is None and not rows:
+                continue
+            # An empty write still records the check and the new validators
+            changed += await self.warehouse.write(
+                MNB,
+                _PREFIX + tenor,
+                rows,
+                replace_all=full,
+                frequency="d",
+                units="Percent",
+                title=f"BUBOR {tenor}",
+                provider_updated=meta["last_modified"],
+                meta=meta,
+            )
+        logger.info(
+            f"[BUBOR] {'Full' if full else 'Incremental'} ingest: {changed} fixings stored"
+        )
+        return changed > 0
+
+    # --- reads -------------------------------------------------------------------
+
+    async def tenors(self) -> List[str]:
+        """Stored tenors in curve order."""
+        states = await self._states()
+        return [tenor for tenor in BUBOR_TENORS if tenor in states]
+
+    async def series(self, tenor: str) -> SeriesArrays:
+        """All stored fixings of one tenor as arrays (empty if unknown)."""
+        return await self.warehouse.series(MNB, _PREFIX + tenor)
+
+    async def history(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """{date: {tenor: rate}} of the fixings in [start, end]."""
+        curve: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for tenor in await self.tenors():
+            for day, value in (await self.series(tenor)).window(start, end).dropna().to_rows():
+                curve[day][tenor] = value
+        return dict(sorted(curve.items()))
+
+    async def latest(self) -> Tuple[Optional[str], Dict[str, float]]:
+        """(date, {tenor: rate}) of the most recent fixing."""
+        columns = {tenor: (await self.series(tenor)).dropna() for tenor in await self.tenors()}
+        last = max((str(s.dates[-1]) for s in columns.values() if len(s)), default=None)
+        if last is None:
+            return None, {}
+        return last, {
+            tenor: float(s.values[-1])
+            for tenor, s in columns.items()
+            if len(s) and str(s.dates[-1]) == last
+        }
+
+
+_pipeline: Optional[BuborPipeline] = None
+
+
+def get_bubor_pipeline() -> BuborPipeline:
+    """Process-wide pipeline bound to the process-wide warehouse."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = BuborPipeline(get_macro_warehouse())
+    return _pipeline
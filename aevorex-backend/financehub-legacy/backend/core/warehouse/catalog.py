@@ -0,0 +1,730 @@
+"""
+FRED Series Catalog
+===================
+
+Local, on-disk search index over FRED series metadata, so keyword search,
+related-series lookups and category browsing never spend FRED quota.
+
+- `catalog_series`: one row per series (ID, title, frequency, units,
+  seasonal adjustment, popularity, observation range, last update),
+- `catalog_categories`: the category tree (name, parent, path, series count),
+- `catalog_series_categories`: which categories list which series,
+- `catalog_fts`: SQLite FTS5 inverted index over series ID, title, category
+  path and units, ranked with BM25 (weighted per column) and boosted by
+  FRED popularity.
+
+Queries are tokenized like the index. The last token is also matched as a
+prefix (search as you type). Tokens the index does not know are replaced
+with their nearest indexed terms (edit distance 1, or 2 for long words).
+
+`CatalogHarvester` fills the catalog by walking the category tree
+breadth-first and storing the most popular series of every category, at
+a fixed request rate. `CatalogRefresher` repeats that in the background
+every CATALOG_REFRESH_HOURS; workers sharing the file take a lease in
+`catalog_meta` first, so only one of them harvests (and spends FRED quota)
+at a time. Series seen through live FRED search or metadata calls are
+added as well (`ingest`); their terms are merged into the in-memory typo
+vocabulary, which is only re-read after a harvest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+from backend.core.metrics import SERVICE_METRICS
+from backend.core.performance.executors import IO, run_blocking
+from backend.utils.logger_config import get_logger
+
+from .sync import FRED, FRED_BASE_URL
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_series (
+    series_id                 TEXT PRIMARY KEY,
+    title                     TEXT NOT NULL DEFAULT '',
+    frequency                 TEXT,
+    frequency_short           TEXT,
+    units                     TEXT,
+    units_short               TEXT,
+    seasonal_adjustment_short TEXT,
+    popularity                INTEGER NOT NULL DEFAULT 0,
+    observation_start         TEXT,
+    observation_end           TEXT,
+    last_updated              TEXT,
+    harvested                 REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS catalog_categories (
+    id             INTEGER PRIMARY KEY,
+    name           TEXT NOT NULL,
+    parent_id      INTEGER,
+    path           TEXT NOT NULL DEFAULT '',
+    series_count   INTEGER,
+    children_known INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS catalog_categories_parent ON catalog_categories (parent_id);
+CREATE TABLE IF NOT EXISTS catalog_series_categories (
+    series_id   TEXT NOT NULL,
+    category_id INTEGER NOT NULL,
+    PRIMARY KEY (series_id, category_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS catalog_series_categories_category
+    ON catalog_series_categories (category_id);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS catalog_fts USING fts5(
+    series_id, title, category_path, units,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS catalog_vocab USING fts5vocab(catalog_fts, 'row');
+"""
+
+# BM25 column weights: series_id, title, category_path, units
+_BM25 = "bm25(catalog_fts, 8.0, 4.0, 1.5, 0.5)"
+# Popularity (0-100) multiplies the (negative) BM25 score by up to 3x
+_RANK = f"{_BM25} * (1.0 + s.popularity / 50.0)"
+
+_SERIES_FIELDS = (
+    "series_id",
+    "title",
+    "frequency",
+    "frequency_short",
+    "units",
+    "units_short",
+    "seasonal_adjustment_short",
+    "popularity",
+    "observation_start",
+    "observation_end",
+    "last_updated",
+)
+
+# A harvest holds the lease this long past its last renewal
+LEASE_SECONDS = 600.0
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+# Words that say nothing about which series is related
+_STOPWORDS = frozenset(
+    "a an and as at by for from in of on or per the to with all total "
+    "rate index percent units dollars billions millions thousands "
+    "seasonally adjusted not daily weekly monthly quarterly annual".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, the way the FTS index splits text."""
+    return _TOKEN.findall(text.lower())
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 as soon as it must exceed `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class SeriesCatalog:
+    """Embedded FTS5 index of FRED series metadata."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # term -> document frequency, bucketed by length for typo lookups
+        self._vocab: Optional[Dict[str, int]] = None
+        self._vocab_by_length: Dict[int, List[str]] = {}
+
+    # --- connection ----------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.info(f"[SeriesCatalog] Opened {self.path}")
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- blocking implementations ----------------------------------------------
+
+    def _upsert_sync(
+        self,
+        series: Sequence[Dict[str, Any]],
+        category_id: Optional[int],
+    ) -> int:
+        now = time.time()
+        terms: set = set()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for item in series:
+                    series_id = item.get("id") or item.get("series_id")
+                    if not series_id:
+                        continue
+                    row = [series_id] + [item.get(f) for f in _SERIES_FIELDS[1:]] + [now]
+                    row[1] = row[1] or ""
+                    row[7] = int(row[7] or 0)
+                    conn.execute(
+                        f"INSERT INTO catalog_series ({', '.join(_SERIES_FIELDS)}, harvested) "
+                        f"VALUES ({', '.join('?' * (len(_SERIES_FIELDS) + 1))}) "
+                        "ON CONFLICT (series_id) DO UPDATE SET "
+                        + ", ".join(f"{f} = excluded.{f}" for f in _SERIES_FIELDS[1:])
+                        + ", harvested = excluded.harvested",
+                        row,
+                    )
+                    if category_id is not None:
+                        conn.execute(
+                            "INSERT OR IGNORE INTO catalog_series_categories VALUES (?, ?)",
+                            (series_id, category_id),
+                        )
+                    terms.update(self._reindex(conn, series_id))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._add_vocab(terms)
+        return len(series)
+
+    def _add_vocab(self, terms: Iterable[str]) -> None:
+        """Merge newly indexed terms into the loaded vocabulary (approximate counts)."""
+        vocab = self._vocab
+        if vocab is None:
+            return
+        for term in terms:
+            if term not in vocab:
+                self._vocab_by_length.setdefault(len(term), []).append(term)
+            vocab[term] = vocab.get(term, 0) + 1
+
+    def _reindex(self, conn: sqlite3.Connection, series_id: str) -> List[str]:
+        """Rewrite the FTS row of `series_id`; returns its indexed terms."""
+        rowid, title, units = conn.execute(
+            "SELECT rowid, title, units FROM catalog_series WHERE series_id = ?",
+            (series_id,),
+        ).fetchone()
+        paths = [
+            path
+            for (path,) in conn.execute(
+                "SELECT c.path FROM catalog_series_categories sc "
+                "JOIN catalog_categories c ON c.id = sc.category_id "
+                "WHERE sc.series_id = ?",
+                (series_id,),
+            )
+        ]
+        conn.execute("DELETE FROM catalog_fts WHERE rowid = ?", (rowid,))
+        conn.execute(
+            "INSERT INTO catalog_fts (rowid, series_id, title, category_path, units) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (rowid, series_id, title, " / ".join(paths), units or ""),
+        )
+        return tokenize(" ".join((series_id, title, *paths, units or "")))
+
+    def _categories_sync(
+        self,
+        parent_id: int,
+        children: Sequence[Dict[str, Any]],
+        parent_path: str,
+    ) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for child in children:
+                    path = f"{parent_path} / {child['name']}" if parent_path else child["name"]
+                    conn.execute(
+                        "INSERT INTO catalog_categories (id, name, parent_id, path) "
+                        "VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                        "name = excluded.name, parent_id = excluded.parent_id, path = excluded.path",
+                        (child["id"], child["name"], parent_id, path),
+                    )
+                conn.execute(
+                    "INSERT INTO catalog_categories (id, name, parent_id, children_known) "
+                    "VALUES (?, ?, NULL, 1) ON CONFLICT (id) DO UPDATE SET children_known = 1",
+                    (parent_id, "Categories" if parent_id == 0 else str(parent_id)),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _set_series_count_sync(self, category_id: int, count: int) -> None:
+        with self._lock:
+            self._connection().execute(
+                "UPDATE catalog_categories SET series_count = ? WHERE id = ?",
+                (count, category_id),
+            )
+
+    def _load_vocab(self) -> Dict[str, int]:
+        if self._vocab is None:
+            with self._lock:
+                rows = self._connection().execute(
+                    "SELECT term, doc FROM catalog_vocab"
+                ).fetchall()
+            by_length: Dict[int, List[str]] = defaultdict(list)
+            for term, _ in rows:
+                by_length[len(term)].append(term)
+            self._vocab_by_length = dict(by_length)
+            self._vocab = dict(rows)
+        return self._vocab
+
+    def _corrections(self, token: str, vocab: Dict[str, int]) -> List[str]:
+        """Indexed terms within typo distance of `token`, most frequent first."""
+        if len(token) < 4:
+            return []
+        limit = 1 if len(token) < 8 else 2
+        letters = set(token)
+        found = []
+        for length in range(len(token) - limit, len(token) + limit + 1):
+            for term in self._vocab_by_length.get(length, ()):
+                # One edit changes the letter set by at most two letters
+                if len(letters ^ set(term)) > 2 * limit:
+                    continue
+                if _edit_distance(token, term, limit) <= limit:
+                    found.append(term)
+        found.sort(key=lambda term: -vocab[term])
+        return found[:3]
+
+    def _match_expression(self, query: str) -> Tuple[Optional[str], Optional[str], Dict[str, List[str]]]:
+        """(AND expression, OR expression, corrections) for an FTS MATCH."""
+        tokens = tokenize(query)
+        if not tokens:
+            return None, None, {}
+        vocab = self._load_vocab()
+        groups: List[str] = []
+        corrected: Dict[str, List[str]] = {}
+        for i, token in enumerate(tokens):
+            alternatives = [_quote(token)]
+            if i == len(tokens) - 1 or token not in vocab:
+                alternatives.append(_quote(token) + " *")
+            if token not in vocab:
+                fixes = self._corrections(token, vocab)
+                if fixes:
+                    corrected[token] = fixes
+                    alternatives.extend(_quote(term) for term in fixes)
+            groups.append("(" + " OR ".join(alternatives) + ")")
+        return " AND ".join(groups), " OR ".join(groups), corrected
+
+    def _search_sync(self, query: str, limit: int, offset: int) -> Dict[str, Any]:
+        and_expr, or_expr, corrected = self._match_expression(query)
+        result = {"count": 0, "offset": offset, "limit": limit, "seriess": []}
+        if not and_expr:
+            return result
+        with self._lock:
+            conn = self._connection()
+            for expr in dict.fromkeys((and_expr, or_expr)):
+                count = conn.execute(
+                    "SELECT COUNT(*) FROM catalog_fts WHERE catalog_fts MATCH ?", (expr,)
+                ).fetchone()[0]
+                if count:
+                    rows = conn.execute(
+                        f"SELECT {', '.join('s.' + f for f in _SERIES_FIELDS)} "
+                        "FROM catalog_fts JOIN catalog_series s ON s.rowid = catalog_fts.rowid "
+                        f"WHERE catalog_fts MATCH ? ORDER BY {_RANK} LIMIT ? OFFSET ?",
+                        (expr, limit, offset),
+                    ).fetchall()
+                    result.update(count=count, seriess=[self._series_dict(r) for r in rows])
+                    break
+        if corrected:
+            result["corrections"] = corrected
+        return result
+
+    def _related_sync(self, series_id: str, limit: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT title FROM catalog_series WHERE series_id = ?", (series_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            categories = [
+                c for (c,) in conn.execute(
+                    "SELECT category_id FROM catalog_series_categories WHERE series_id = ?",
+                    (series_id,),
+                )
+            ]
+            terms = [t for t in dict.fromkeys(tokenize(row[0])) if t not in _STOPWORDS and len(t) > 1]
+            seriess: List[Dict[str, Any]] = []
+            if terms:
+                # Title overlap ranked by BM25, series in the same category first
+                same_category = (
+                    "EXISTS (SELECT 1 FROM catalog_series_categories sc "
+                    "WHERE sc.series_id = s.series_id AND sc.category_id IN "
+                    f"({', '.join('?' * len(categories))}))"
+                    if categories
+                    else "0"
+                )
+                rows = conn.execute(
+                    f"SELECT {', '.join('s.' + f for f in _SERIES_FIELDS)} "
+                    "FROM catalog_fts JOIN catalog_series s ON s.rowid = catalog_fts.rowid "
+                    "WHERE catalog_fts MATCH ? AND s.series_id != ? "
+                    f"ORDER BY {_RANK} * (CASE WHEN {same_category} THEN 2.0 ELSE 1.0 END) "
+                    "LIMIT ?",
+                    (
+                        "title : (" + " OR ".join(_quote(t) for t in terms) + ")",
+                        series_id,
+                        *categories,
+                        limit,
+                    ),
+                ).fetchall()
+                seriess = [self._series_dict(r) for r in rows]
+            if len(seriess) < limit and categories:
+                seen = {s["id"] for s in seriess} | {series_id}
+                rows = conn.execute(
+                    f"SELECT DISTINCT {', '.join('s.' + f for f in _SERIES_FIELDS)} "
+                    "FROM catalog_series_categories sc "
+                    "JOIN catalog_series s ON s.series_id = sc.series_id "
+                    f"WHERE sc.category_id IN ({', '.join('?' * len(categories))}) "
+                    "ORDER BY s.popularity DESC LIMIT ?",
+                    (*categories, limit + len(seen)),
+                ).fetchall()
+                for r in rows:
+                    if len(seriess) >= limit:
+                        break
+                    if r[0] not in seen:
+                        seen.add(r[0])
+                        seriess.append(self._series_dict(r))
+        return {"seriess": seriess, "count": len(seriess)}
+
+    def _category_sync(self, category_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT id, name, parent_id, series_count, children_known "
+                "FROM catalog_categories WHERE id = ?",
+                (category_id,),
+            ).fetchone()
+            if row is None or not row[4]:
+                return None
+            children = conn.execute(
+                "SELECT id, name, parent_id FROM catalog_categories "
+                "WHERE parent_id = ? ORDER BY name",
+                (category_id,),
+            ).fetchall()
+        category = {
+            "id": row[0],
+            "name": row[1],
+            "parent_id": row[2] if row[2] is not None else 0,
+            "series_count": row[3] or 0,
+            "children": [
+                {"id": c[0], "name": c[1], "parent_id": c[2]} for c in children
+            ],
+        }
+        return {"categories": [category]}
+
+    def _stats_sync(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connection()
+            series = conn.execute("SELECT COUNT(*) FROM catalog_series").fetchone()[0]
+            categories = conn.execute("SELECT COUNT(*) FROM catalog_categories").fetchone()[0]
+            meta = dict(conn.execute("SELECT key, value FROM catalog_meta"))
+        return {
+            "series": series,
+            "categories": categories,
+            "harvested_at": float(meta["harvested_at"]) if "harvested_at" in meta else None,
+        }
+
+    def _set_meta_sync(self, key: str, value: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO catalog_meta VALUES (?, ?)", (key, value)
+            )
+
+    def _lease_sync(
+        self, owner: str, harvested_after: Optional[float], release: bool = False
+    ) -> bool:
+        """Take, renew or release the harvest lease in one transaction.
+
+        Refused while another owner holds an unexpired lease, or (when
+        `harvested_after` is given) if a harvest finished after that time.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                meta = dict(
+                    conn.execute(
+                        "SELECT key, value FROM catalog_meta "
+                        "WHERE key IN ('harvest_lease', 'harvested_at')"
+                    )
+                )
+                holder, _, expires = (meta.get("harvest_lease") or "").partition("|")
+                if release:
+                    if holder == owner:
+                        conn.execute("DELETE FROM catalog_meta WHERE key = 'harvest_lease'")
+                    taken = True
+                elif holder and holder != owner and float(expires) > now:
+                    taken = False
+                elif (
+                    harvested_after is not None
+                    and float(meta.get("harvested_at") or 0.0) > harvested_after
+                ):
+                    taken = False
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO catalog_meta VALUES ('harvest_lease', ?)",
+                        (f"{owner}|{now + LEASE_SECONDS}",),
+                    )
+                    taken = True
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return taken
+
+    @staticmethod
+    def _series_dict(row: Sequence[Any]) -> Dict[str, Any]:
+        item = dict(zip(_SERIES_FIELDS, row))
+        item["id"] = item.pop("series_id")
+        return item
+
+    # --- async API ---------------------------------------------------------------
+
+    async def ingest(
+        self, series: Iterable[Dict[str, Any]], category_id: Optional[int] = None
+    ) -> int:
+        """Add / update FRED `seriess` entries (optionally listed under `category_id`)."""
+        series = [s for s in series if isinstance(s, dict)]
+        if not series:
+            return 0
+        return await run_blocking(IO, self._upsert_sync, series, category_id)
+
+    async def add_categories(
+        self, parent_id: int, children: Sequence[Dict[str, Any]], parent_path: str = ""
+    ) -> None:
+        """Store the children of `parent_id` (marks its child list as known)."""
+        await run_blocking(IO, self._categories_sync, parent_id, children, parent_path)
+
+    async def set_series_count(self, category_id: int, count: int) -> None:
+        await run_blocking(IO, self._set_series_count_sync, category_id, count)
+
+    async def search(self, query: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """BM25-ranked series matching `query`, in FRED's series/search shape."""
+        return await run_blocking(IO, self._search_sync, query, limit, offset)
+
+    async def related(self, series_id: str, limit: int = 15) -> Optional[Dict[str, Any]]:
+        """Series related by title terms and category; None if `series_id` is not indexed."""
+        return await run_blocking(IO, self._related_sync, series_id, limit)
+
+    async def category(self, category_id: int) -> Optional[Dict[str, Any]]:
+        """A category with its children; None until the harvester has listed them."""
+        return await run_blocking(IO, self._category_sync, category_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        return await run_blocking(IO, self._stats_sync)
+
+    async def mark_harvested(self) -> None:
+        await run_blocking(IO, self._set_meta_sync, "harvested_at", str(time.time()))
+        self.refresh_vocab()
+
+    def refresh_vocab(self) -> None:
+        """Re-read the typo vocabulary on next use (after a harvest)."""
+        self._vocab = None
+
+    async def acquire_lease(
+        self, owner: str, harvested_after: Optional[float] = None
+    ) -> bool:
+        """Conditionally take (or renew) the harvest lease for `owner`."""
+        return await run_blocking(IO, self._lease_sync, owner, harvested_after)
+
+    async def release_lease(self, owner: str) -> None:
+        await run_blocking(IO, self._lease_sync, owner, None, True)
+
+
+class CatalogHarvester:
+    """Breadth-first crawl of the FRED category tree into a `SeriesCatalog`."""
+
+    def __init__(self, catalog: SeriesCatalog, api_key: str, config=None):
+        if config is None:
+            from backend.config import settings
+
+            config = settings.MACRO_WAREHOUSE
+        self.catalog = catalog
+        self.api_key = api_key
+        self.config = config
+        self._pace = asyncio.Lock()
+        self._next_request = 0.0
+
+    async def _get(self, client: httpx.AsyncClient, endpoint: str, **params) -> Dict[str, Any]:
+        # Stay under FRED's per-key rate limit
+        async with self._pace:
+            delay = self._next_request - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_request = (
+                max(time.monotonic(), self._next_request)
+                + 60.0 / self.config.CATALOG_REQUESTS_PER_MINUTE
+            )
+        with SERVICE_METRICS.track_upstream(FRED):
+            resp = await client.get(
+                f"{FRED_BASE_URL}/{endpoint}",
+                params={**params, "api_key": self.api_key, "file_type": "json"},
+            )
+        resp.raise_for_status()
+        return resp.json()
+
+    async def harvest(self, renew=None) -> Dict[str, int]:
+        """Walk up to CATALOG_MAX_CATEGORIES categories; returns crawl counts.
+
+        `renew` (async, returns False once the lease is lost) is awaited
+        between categories.
+        """
+        visited = series_count = 0
+        queue: List[Tuple[int, str]] = [(0, "")]
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            while queue and visited < self.config.CATALOG_MAX_CATEGORIES:
+                if renew is not None and not await renew():
+                    raise RuntimeError("Harvest lease lost")
+                category_id, path = queue.pop(0)
+                visited += 1
+                try:
+                    children = (
+                        await self._get(client, "category/children", category_id=category_id)
+                    ).get("categories", [])
+                    await self.catalog.add_categories(category_id, children, path)
+                    queue.extend(
+                        (child["id"], f"{path} / {child['name']}" if path else child["name"])
+                        for child in children
+                    )
+                    if category_id == 0:
+                        continue
+                    listing = await self._get(
+                        client,
+                        "category/series",
+                        category_id=category_id,
+                        order_by="popularity",
+                        sort_order="desc",
+                        limit=self.config.CATALOG_SERIES_PER_CATEGORY,
+                    )
+                    await self.catalog.set_series_count(category_id, listing.get("count", 0))
+                    series_count += await self.catalog.ingest(
+                        listing.get("seriess", []), category_id
+                    )
+                except httpx.HTTPError as e:
+                    logger.warning(f"[SeriesCatalog] Category {category_id} skipped: {e}")
+        await self.catalog.mark_harvested()
+        logger.info(
+            f"[SeriesCatalog] Harvest done: {visited} categories, {series_count} series listings"
+        )
+        return {"categories": visited, "series": series_count}
+
+
+class CatalogRefresher:
+    """Re-harvests the catalog in the background once it is older than CATALOG_REFRESH_HOURS."""
+
+    def __init__(self, catalog: SeriesCatalog, api_key: str, config=None):
+        self.harvester = CatalogHarvester(catalog, api_key, config)
+        self.catalog = catalog
+        self.config = self.harvester.config
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._task: Optional[asyncio.Task] = None
+        self._seen_harvest: Optional[float] = None
+        self._renewed = 0.0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _renew(self) -> bool:
+        # One conditional update per third of the lease, not per category
+        if time.monotonic() - self._renewed < LEASE_SECONDS / 3:
+            return True
+        self._renewed = time.monotonic()
+        return await self.catalog.acquire_lease(self.owner)
+
+    async def _run(self) -> None:
+        interval = self.config.CATALOG_REFRESH_HOURS * 3600
+        while True:
+            try:
+                # Other workers share the file: skip if one of them harvested recently
+                harvested_at = (await self.catalog.stats())["harvested_at"] or 0.0
+                if self._seen_harvest is not None and harvested_at != self._seen_harvest:
+                    self.catalog.refresh_vocab()  # another worker harvested
+                self._seen_harvest = harvested_at
+                wait = harvested_at + interval - time.time()
+                if wait <= 0:
+                    if await self.catalog.acquire_lease(self.owner, time.time() - interval):
+                        self._renewed = time.monotonic()
+                        try:
+                            await self.harvester.harvest(self._renew)
+                        finally:
+                            await self.catalog.release_lease(self.owner)
+                        self._seen_harvest = None
+                        wait = interval
+                    else:
+                        # Another worker is harvesting: look again when its lease may have ended
+                        wait = LEASE_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[SeriesCatalog] Harvest failed: {e}", exc_info=True)
+                wait = min(interval, 3600)
+            await asyncio.sleep(wait)
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+_catalog: Optional[SeriesCatalog] = None
+
+
+def get_series_catalog() -> SeriesCatalog:
+    """Process-wide catalog at `settings.MACRO_WAREHOUSE.CATALOG_PATH`."""
+    global _catalog
+    if _catalog is None:
+        from backend.config import settings
+
+        path = settings.MACRO_WAREHOUSE.CATALOG_PATH or str(
+            Path(settings.PATHS.PROJECT_ROOT) / "data" / "fred_catalog.sqlite3"
+        )
+        _catalog = SeriesCatalog(path)
+    return _catalog
+
+
+def close_series_catalog() -> None:
+    global _catalog
+    if _catalog is not None:
+        _catalog.close()
+        _catalog = None
@@ -0,0 +1,392 @@
+"""
+Yield-Curve Surfaces
+====================
+
+ECB and US Treasury yield curves as dense dates × maturities blocks, so
+spreads, PCA factors and inversion history over any window are array
+operations on one matrix instead of per-date dicts.
+
+- ECB: one SDMX request (`YC/B.U2.EUR.4F.G_N_A.SV_C_YM.SR_3M+…+SR_30Y`)
+  returns every maturity of the AAA spot curve. Each maturity is stored as
+  its own warehouse series (`ecb` / `YC.B.U2.EUR.4F.G_N_A.SV_C_YM.SR_<m>`,
+  the id `WarehouseSync.ecb` uses) and checked incrementally
+  (`updatedAfter`).
+- UST: the Treasury's daily par-yield CSV, one file per year. The first
+  sync reads every year since `UST_CURVE_START_YEAR`; later checks only
+  read the files from the year of the last stored date on. Each maturity
+  is stored as `ust` / `UST.CMT.<m>`.
+- `CurveSurface` is the aligned block (NaN where a maturity was not
+  published). It is rebuilt only when a stored maturity changed.
+
+Spreads are long minus short yield in basis points; `SPREADS` names the
+usual ones (2s10s, 3m10y, 5s30s).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+from backend.core.metrics import SERVICE_METRICS
+
+from .groups import EcbSeriesGroup, SeriesGroup, SeriesGroupUnavailableError
+from .store import MacroWarehouse, Row, SeriesState, get_macro_warehouse
+from .sync import ECB
+from .transforms import align, period_labels
+
+UST = "ust"
+
+ECB_CURVE_FLOW = "YC"
+ECB_CURVE_KEY = "B.U2.EUR.4F.G_N_A.SV_C_YM."
+ECB_MATURITIES = (
+    "3M", "4M", "5M", "6M", "7M", "8M", "9M", "10M", "11M",
+    "1Y", "2Y", "3Y", "4Y", "5Y", "6Y", "7Y", "8Y", "9Y", "10Y", "15Y", "20Y", "25Y", "30Y",
+)
+
+UST_CSV_URL = (
+    "https://home.treasury.gov/resource-center/data-chart-center/interest-rates/"
+    "daily-treasury-rates.csv/{year}/all"
+)
+# Treasury CSV column → maturity
+UST_COLUMNS = {
+    "1 Mo": "1M", "1.5 Month": "1.5M", "2 Mo": "2M", "3 Mo": "3M", "4 Mo": "4M", "6 Mo": "6M",
+    "1 Yr": "1Y", "2 Yr": "2Y", "3 Yr": "3Y", "5 Yr": "5Y", "7 Yr": "7Y",
+    "10 Yr": "10Y", "20 Yr": "20Y", "30 Yr": "30Y",
+}
+
+# name → (short, long) maturity
+SPREADS = {"2s10s": ("2Y", "10Y"), "3m10y": ("3M", "10Y"), "5s30s": ("5Y", "30Y")}
+PCA_FACTORS = ("level", "slope", "curvature")
+SAMPLE_FREQUENCIES = ("d", "w", "m")
+
+
+class CurveUnavailableError(SeriesGroupUnavailableError):
+    """No stored curve and the provider could not be read."""
+
+
+def maturity_years(maturity: str) -> float:
+    """'3M' → 0.25, '1.5M' → 0.125, '10Y' → 10.0; ValueError if invalid."""
+    unit = maturity[-1:].upper()
+    if unit not in ("M", "Y"):
+        raise ValueError(f"Invalid maturity: {maturity}")
+    value = float(maturity[:-1])
+    return value / 12.0 if unit == "M" else value
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(start, end) indices (inclusive) of the True runs of a boolean array."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+
+
+@dataclass(frozen=True)
+class CurveSurface:
+    """Dense curve history: yields[i, j] = yield (percent) of maturities[j] on dates[i]."""
+
+    provider: str
+    dates: np.ndarray  # datetime64[D], ascending
+    maturities: Tuple[str, ...]  # ascending maturity
+    yields: np.ndarray  # float64 (len(dates), len(maturities)), NaN = not published
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def years(self) -> np.ndarray:
+        return np.array([maturity_years(m) for m in self.maturities])
+
+    def column(self, maturity: str) -> np.ndarray:
+        """Yields of one maturity (all NaN if the curve does not have it)."""
+        if maturity not in self.maturities:
+            return np.full(len(self), np.nan)
+        return self.yields[:, self.maturities.index(maturity)]
+
+    def window(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        maturities: Optional[Sequence[str]] = None,
+    ) -> "CurveSurface":
+        """Dates in [start, end] and the given maturities (in curve order; unknown ones dropped)."""
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D")) if start else 0
+        hi = (
+            np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+            if end
+            else len(self.dates)
+        )
+        if maturities is None:
+            columns = list(range(len(self.maturities)))
+        else:
+            wanted = {m.upper() for m in maturities}
+            columns = [j for j, m in enumerate(self.maturities) if m in wanted]
+        yields = self.yields[lo:hi][:, columns]
+        # Dates where none of the kept maturities was published carry nothing
+        keep = ~np.isnan(yields).all(axis=1)
+        return replace(
+            self,
+            dates=self.dates[lo:hi][keep],
+            maturities=tuple(self.maturities[j] for j in columns),
+            yields=yields[keep],
+        )
+
+    def sample(self, frequency: str = "d") -> "CurveSurface":
+        """Last curve of each week ('w') or month ('m'); 'd' keeps every date."""
+        if frequency == "d" or not len(self):
+            return self
+        if frequency not in SAMPLE_FREQUENCIES:
+            raise ValueError(f"Unknown sample frequency '{frequency}'")
+        # Same Monday–Friday weeks as the series transforms (NumPy weeks start on Thursday)
+        periods = period_labels(self.dates, frequency)
+        last = np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+        return replace(self, dates=self.dates[last], yields=self.yields[last])
+
+    def latest(self) -> Tuple[Optional[str], Dict[str, float]]:
+        """(date, {maturity: yield}) of the last date."""
+        if not len(self):
+            return None, {}
+        row = self.yields[-1]
+        return str(self.dates[-1]), {
+            m: float(v) for m, v in zip(self.maturities, row) if not np.isnan(v)
+        }
+
+    # --- analytics ---------------------------------------------------------------
+
+    def spread(self, short: str, long: str) -> np.ndarray:
+        """long - short yield in basis points per date (NaN where either is missing)."""
+        return (self.column(long) - self.column(short)) * 100.0
+
+    def spreads(self, names: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Named spreads (`SPREADS`) the curve has both legs of."""
+        out: Dict[str, np.ndarray] = {}
+        for name in names or SPREADS:
+            short, long = SPREADS[name]
+            if short in self.maturities and long in self.maturities:
+                out[name] = self.spread(short, long)
+        return out
+
+    def inversions(self, spreads: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+        """Inverted (negative) stretches of each spread series over the surface's dates."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, values in spreads.items():
+            valid = ~np.isnan(values)
+            dates, values = self.dates[valid], values[valid]
+            inverted = values < 0
+            starts, ends = _runs(inverted)
+            episodes = []
+            if len(starts):
+                depth = np.where(inverted, values, np.inf)
+                trough = np.minimum.reduceat(depth, starts)
+                for start, end, low in zip(starts, ends, trough):
+                    at = start + int(np.argmin(depth[start : end + 1]))
+                    episodes.append(
+                        {
+                            "start": str(dates[start]),
+                            "end": str(dates[end]),
+                            "observations": int(end - start + 1),
+                            "min_bp": round(float(low), 2),
+                            "min_date": str(dates[at]),
+                        }
+                    )
+            out[name] = {
+                "inverted_now": bool(len(values) and inverted[-1]),
+                "observations_inverted": int(inverted.sum()),
+                "share_inverted": round(float(inverted.mean()), 4) if len(values) else None,
+                "episodes": episodes,
+            }
+        return out
+
+    def pca(self, components: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        Principal components of the curve levels (level / slope / curvature).
+
+        Uses the maturities published on at least half of the dates and the
+        dates that have all of them. Signs are fixed so that level loads
+        positively, slope rises with maturity and curvature is humped.
+        None if there are too few complete dates.
+        """
+        coverage = (~np.isnan(self.yields)).mean(axis=0) if len(self) else np.array([])
+        columns = np.flatnonzero(coverage >= 0.5)
+        if len(columns) < components:
+            return None
+        block = self.yields[:, columns]
+        rows = ~np.isnan(block).any(axis=1)
+        block = block[rows]
+        if len(block) <= components:
+            return None
+
+        mean = block.mean(axis=0)
+        centered = block - mean
+        _, singular, vt = np.linalg.svd(centered, full_matrices=False)
+        loadings = vt[:components]
+        n = loadings.shape[1]
+        middle = slice(n // 3, n - n // 3)
+
+        def orientation(k: int, loading: np.ndarray) -> float:
+            if k == 0:
+                return loading.sum()
+            if k == 1:
+                return loading[-1] - loading[0]
+            return loading[middle].mean() - (loading[0] + loading[-1]) / 2
+
+        signs = np.array([-1.0 if orientation(k, l) < 0 else 1.0 for k, l in enumerate(loadings)])
+        loadings = loadings * signs[:, None]
+        scores = centered @ loadings.T
+        variance = singular**2
+        names = [
+            PCA_FACTORS[k] if k < len(PCA_FACTORS) else f"pc{k + 1}" for k in range(components)
+        ]
+        return {
+            "maturities": [self.maturities[j] for j in columns],
+            "mean": mean,
+            "factors": names,
+            "loadings": loadings,
+            "explained_variance": variance[:components] / variance.sum(),
+            "dates": self.dates[rows],
+            "scores": scores,
+        }
+
+
+class EcbCurveGroup(EcbSeriesGroup):
+    """Every maturity of the ECB AAA spot curve from one SDMX request."""
+
+    flow = ECB_CURVE_FLOW
+    key = ECB_CURVE_KEY + "+".join(f"SR_{m}" for m in ECB_MATURITIES)
+    dimension = "DATA_TYPE_FM"
+    prefix = f"{ECB_CURVE_FLOW}.{ECB_CURVE_KEY}SR_"
+    label = "ECB curve"
+    unavailable = CurveUnavailableError
+
+    def code(self, value: str) -> str:
+        return value[3:] if value.startswith("SR_") else value
+
+    def describe(self, code: str) -> Dict[str, Optional[str]]:
+        return {"units": "Percent", "title": f"Euro area AAA spot rate {code}"}
+
+
+def parse_ust_csv(text: str) -> Dict[str, List[Row]]:
+    """{maturity: (date, yield) rows} of one Treasury daily par-yield CSV."""
+    out: Dict[str, List[Row]] = {}
+    for record in csv.DictReader(io.StringIO(text)):
+        try:
+            day = datetime.strptime(record.get("Date", ""), "%m/%d/%Y").date().isoformat()
+        except ValueError:
+            continue
+        for column, maturity in UST_COLUMNS.items():
+            raw = (record.get(column) or "").strip()
+            if not raw or raw.upper() == "N/A":
+                continue
+            try:
+                out.setdefault(maturity, []).append((day, float(raw)))
+            except ValueError:
+                continue
+    for rows in out.values():
+        rows.sort()
+    return out
+
+
+class UstCurveGroup(SeriesGroup):
+    """Every maturity of the Treasury par-yield curve from its yearly CSV files."""
+
+    provider = UST
+    prefix = "UST.CMT."
+    label = "UST curve"
+    unavailable = CurveUnavailableError
+
+    def describe(self, code: str) -> Dict[str, Optional[str]]:
+        return {"units": "Percent", "title": f"US Treasury par yield {code}"}
+
+    async def _fetch(
+        self, states: Dict[str, SeriesState], full: bool
+    ) -> Optional[Dict[str, List[Row]]]:
+        this_year = date.today().year
+        if full:
+            first = min(self.config.UST_CURVE_START_YEAR, this_year)
+        else:
+            last = max((s.last_date for s in states.values() if s.last_date), default=None)
+            first = int(last[:4]) if last else self.config.UST_CURVE_START_YEAR
+        semaphore = asyncio.Semaphore(self.config.BATCH_CONCURRENCY)
+
+        async def year_file(client: httpx.AsyncClient, year: int) -> str:
+            params = {
+                "type": "daily_treasury_yield_curve",
+                "field_tdr_date_value": str(year),
+                "page": "",
+                "_format": "csv",
+            }
+            async with semaphore:
+                with SERVICE_METRICS.track_upstream(UST):
+                    resp = await client.get(UST_CSV_URL.format(year=year), params=params)
+            resp.raise_for_status()
+            return resp.text
+
+        async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+            texts = await asyncio.gather(
+                *(year_file(client, year) for year in range(first, this_year + 1))
+            )
+        out: Dict[str, List[Row]] = {}
+        for text in texts:
+            for maturity, rows in parse_ust_csv(text).items():
+                out.setdefault(maturity, []).extend(rows)
+        for rows in out.values():
+            rows.sort()
+        return out
+
+
+class CurveSurfaceService:
+    """Keeps the stored ECB / UST curves current and serves them as `CurveSurface`s."""
+
+    def __init__(self, warehouse: MacroWarehouse, config=None):
+        self.groups: Dict[str, SeriesGroup] = {
+            ECB: EcbCurveGroup(warehouse, config),
+            UST: UstCurveGroup(warehouse, config),
+        }
+        self._surfaces: Dict[str, Tuple[tuple, CurveSurface]] = {}
+
+    def group(self, provider: str) -> SeriesGroup:
+        try:
+            return self.groups[provider.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown curve provider '{provider}'") from None
+
+    async def refresh(self, provider: str, force: bool = False) -> bool:
+        """Check the provider for new curves (at most once per sync interval)."""
+        return await self.group(provider).refresh(force)
+
+    async def surface(self, provider: str) -> CurveSurface:
+        """The surface of the stored maturities (rebuilt only when one changed)."""
+        group = self.group(provider)
+        versions = await group.versions()
+        cached = self._surfaces.get(group.provider)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        dates, aligned = align(await group.columns(), "outer")
+        maturities = tuple(sorted(aligned, key=maturity_years))
+        yields = np.empty((len(dates), len(maturities)))
+        for j, maturity in enumerate(maturities):
+            yields[:, j] = aligned[maturity]
+        surface = CurveSurface(group.provider, dates, maturities, yields)
+        self._surfaces[group.provider] = (versions, surface)
+        return surface
+
+    async def current(self, provider: str) -> CurveSurface:
+        """`surface()` after a (rate-limited) refresh; serves stored curves if the provider is down."""
+        await self.refresh(provider)
+        return await self.surface(provider)
+
+
+_service: Optional[CurveSurfaceService] = None
+
+
+def get_curve_surface_service() -> CurveSurfaceService:
+    """Process-wide service bound to the process-wide warehouse."""
+    global _service
+    if _service is None:
+        _service = CurveSurfaceService(get_macro_warehouse())
+    return _service
@@ -0,0 +1,201 @@
+"""
+FX Cross-Rate Matrix
+====================
+
+All ECB euro reference rates as one in-memory block, so currency
+conversions are array lookups instead of ECB requests.
+
+- One SDMX request (`EXR/D..EUR.SP00.A`, every currency) keeps the rates
+  current. Each currency is stored as its own warehouse series
+  (`ecb` / `EXR.D.<CCY>.EUR.SP00.A`, the id `WarehouseSync.ecb` uses) of
+  an `EcbSeriesGroup`, so checks are incremental (`updatedAfter`) like the
+  other ECB series.
+- The stored series are aligned into a dense dates × currencies block of
+  units per EUR (EUR itself = 1). The N×N cross-rate matrix of any day is
+  one outer division of its row; the block is the daily matrix history.
+- `FxBlock.convert` converts arrays of (amount, from, to, date) at once.
+  A date uses the latest fixing on or before it, at most MAX_STALE_DAYS
+  old; unknown currencies or dates give NaN.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .groups import EcbSeriesGroup, SeriesGroupUnavailableError
+from .store import MacroWarehouse, get_macro_warehouse
+from .transforms import align
+
+FX_FLOW = "EXR"
+FX_KEY = "D..EUR.SP00.A"
+BASE_CURRENCY = "EUR"
+# Reference rates are published on TARGET business days only
+MAX_STALE_DAYS = 7
+
+_PREFIX = f"{FX_FLOW}.D."
+_SUFFIX = ".EUR.SP00.A"
+
+
+class FxUnavailableError(SeriesGroupUnavailableError):
+    """No stored reference rates and the ECB could not be read."""
+
+
+def fx_series_id(currency: str) -> str:
+    return f"{_PREFIX}{currency}{_SUFFIX}"
+
+
+@dataclass(frozen=True)
+class FxBlock:
+    """Dense reference-rate history: rates[i, j] = units of currencies[j] per EUR on dates[i]."""
+
+    dates: np.ndarray  # datetime64[D], ascending
+    currencies: Tuple[str, ...]
+    rates: np.ndarray  # float64 (len(dates), len(currencies)), NaN = no fixing
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _columns(self, codes: Sequence[str]) -> np.ndarray:
+        """Column of each code (-1 if unknown)."""
+        index = {code: i for i, code in enumerate(self.currencies)}
+        return np.array([index.get(str(code).upper(), -1) for code in codes], dtype=np.int64)
+
+    def _rows(self, days: np.ndarray) -> np.ndarray:
+        """Row of the latest fixing on or before each day (-1 if none within MAX_STALE_DAYS)."""
+        rows = np.searchsorted(self.dates, days, side="right") - 1
+        found = rows >= 0
+        stale = np.ones(len(rows), dtype=bool)
+        stale[found] = (days[found] - self.dates[rows[found]]) > np.timedelta64(MAX_STALE_DAYS, "D")
+        return np.where(stale, -1, rows)
+
+    def _lookup(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        ok = (rows >= 0) & (columns >= 0)
+        out = np.full(len(rows), np.nan)
+        out[ok] = self.rates[rows[ok], columns[ok]]
+        return out
+
+    def as_of(self, day: Optional[str] = None) -> Optional[str]:
+        """Date of the fixing used for `day` (default: the latest), None if unavailable."""
+        if not len(self):
+            return None
+        if day is None:
+            return str(self.dates[-1])
+        row = int(self._rows(np.array([day], dtype="datetime64[D]"))[0])
+        return str(self.dates[row]) if row >= 0 else None
+
+    def matrix(
+        self, day: Optional[str] = None, currencies: Optional[Sequence[str]] = None
+    ) -> Tuple[Optional[str], List[str], np.ndarray]:
+        """
+        (fixing date, currencies, M) with M[i, j] = units of currencies[j] per
+        unit of currencies[i] (NaN where a currency has no fixing that day).
+        """
+        fixing = self.as_of(day)
+        codes = list(self.currencies) if currencies is None else [c.upper() for c in currencies]
+        if fixing is None:
+            return None, codes, np.full((len(codes), len(codes)), np.nan)
+        row = int(np.searchsorted(self.dates, np.datetime64(fixing, "D")))
+        per_eur = self._lookup(np.full(len(codes), row), self._columns(codes))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return fixing, codes, per_eur[None, :] / per_eur[:, None]
+
+    def convert(
+        self,
+        amounts: Sequence[float],
+        from_currencies: Sequence[str],
+        to_currencies: Sequence[str],
+        days: Optional[Sequence[Optional[str]]] = None,
+    ) -> np.ndarray:
+        """Converted amounts (NaN where a rate is missing); `days` default to the latest fixing."""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if days is None or not len(self):
+            rows = np.full(len(amounts), len(self) - 1, dtype=np.int64)
+        else:
+            latest = self.dates[-1]
+            rows = self._rows(
+                np.array([latest if d is None else d for d in days], dtype="datetime64[D]")
+            )
+        source = self._lookup(rows, self._columns(from_currencies))
+        target = self._lookup(rows, self._columns(to_currencies))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return amounts * target / source
+
+    def history(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        currencies: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """{date: {currency: units per EUR}} in [start, end] (EUR itself omitted)."""
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D")) if start else 0
+        hi = (
+            np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+            if end
+            else len(self.dates)
+        )
+        codes = [c.upper() for c in (currencies or self.currencies) if c.upper() != BASE_CURRENCY]
+        columns = self._columns(codes)
+        out: Dict[str, Dict[str, float]] = {}
+        for day, values in zip(self.dates[lo:hi], self.rates[lo:hi]):
+            rates = {
+                code: float(values[col])
+                for code, col in zip(codes, columns)
+                if col >= 0 and not np.isnan(values[col])
+            }
+            if rates:
+                out[str(day)] = rates
+        return out
+
+
+class FxMatrixService(EcbSeriesGroup):
+    """Keeps the stored reference rates current and serves them as an `FxBlock`."""
+
+    flow = FX_FLOW
+    key = FX_KEY
+    dimension = "CURRENCY"
+    prefix = _PREFIX
+    suffix = _SUFFIX
+    label = "FX"
+    unavailable = FxUnavailableError
+
+    def __init__(self, warehouse: MacroWarehouse, config=None):
+        super().__init__(warehouse, config)
+        self._block: Optional[FxBlock] = None
+        self._block_versions: Tuple[Tuple[str, int], ...] = ()
+
+    def describe(self, code: str) -> Dict[str, Optional[str]]:
+        return {"units": f"{code} per EUR", "title": f"ECB reference rate {code}/EUR"}
+
+    async def block(self) -> FxBlock:
+        """The rate block of the stored series (rebuilt only when a series changed)."""
+        versions = await self.versions()
+        if self._block is not None and versions == self._block_versions:
+            return self._block
+        dates, aligned = align(await self.columns(), "outer")
+        currencies = (BASE_CURRENCY, *sorted(aligned))
+        rates = np.empty((len(dates), len(currencies)))
+        rates[:, 0] = 1.0
+        for j, currency in enumerate(currencies[1:], start=1):
+            rates[:, j] = aligned[currency]
+        self._block = FxBlock(dates, currencies, rates)
+        self._block_versions = versions
+        return self._block
+
+    async def current(self) -> FxBlock:
+        """`block()` after a (rate-limited) refresh; serves stored rates if the ECB is down."""
+        await self.refresh()
+        return await self.block()
+
+
+_service: Optional[FxMatrixService] = None
+
+
+def get_fx_matrix_service() -> FxMatrixService:
+    """Process-wide service bound to the process-wide warehouse."""
+    global _service
+    if _service is None:
+        _service = FxMatrixService(get_macro_warehouse())
+    return _service
@@ -0,0 +1,188 @@
+"""
+Series Groups
+=============
+
+Several warehouse series that one upstream request refreshes together:
+every ECB reference rate from one `EXR` wildcard key, every maturity of a
+yield curve from one `YC` key or one Treasury file, …
+
+`SeriesGroup` does the bookkeeping shared by all of them: each member is a
+normal warehouse series (`provider` / `<prefix><code><suffix>`), the group
+is checked at most once per `SYNC_INTERVAL_MINUTES` (single flight), fully
+re-read every `FULL_RESYNC_DAYS`, and a failed check serves the stored copy
+(or raises `unavailable` when nothing is stored). Subclasses only implement
+`_fetch`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from backend.core.metrics import SERVICE_METRICS
+from backend.utils.logger_config import get_logger
+
+from .store import MacroWarehouse, Row, SeriesState
+from .sync import ECB, ECB_BASE_URL, ECB_HEADERS, _iso_lookback, parse_sdmx_dataset
+from .transforms import SeriesArrays
+
+logger = get_logger(__name__)
+
+
+class SeriesGroupUnavailableError(RuntimeError):
+    """No stored copy of the group and the provider could not be read."""
+
+
+class SeriesGroup:
+    """Warehouse series refreshed together by one upstream request."""
+
+    provider: str = ""
+    prefix: str = ""
+    suffix: str = ""
+    label: str = "SeriesGroup"
+    frequency: Optional[str] = "d"
+    unavailable = SeriesGroupUnavailableError
+
+    def __init__(self, warehouse: MacroWarehouse, config=None):
+        if config is None:
+            from backend.config import settings
+
+            config = settings.MACRO_WAREHOUSE
+        self.warehouse = warehouse
+        self.config = config
+        self._lock = asyncio.Lock()
+
+    def series_id(self, code: str) -> str:
+        return f"{self.prefix}{code}{self.suffix}"
+
+    def describe(self, code: str) -> Dict[str, Optional[str]]:
+        """Units / title stored with a member series."""
+        return {"units": None, "title": None}
+
+    async def _fetch(
+        self, states: Dict[str, SeriesState], full: bool
+    ) -> Optional[Dict[str, List[Row]]]:
+        """{code: rows} to store (all history when `full`); None when nothing changed."""
+        raise NotImplementedError
+
+    async def states(self) -> Dict[str, SeriesState]:
+        """Stored members by code."""
+        end = -len(self.suffix) if self.suffix else None
+        return {
+            state.series_id[len(self.prefix) : end]: state
+            for state in await self.warehouse.list_series(self.provider)
+            if state.series_id.startswith(self.prefix) and state.series_id.endswith(self.suffix)
+        }
+
+    def _due(self, states: Dict[str, SeriesState]) -> bool:
+        if not states:
+            return True
+        checked = min(state.last_checked for state in states.values())
+        return time.time() - checked >= self.config.SYNC_INTERVAL_MINUTES * 60
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Check upstream (at most once per sync interval); True if anything was stored."""
+        states = await self.states()
+        if not force and not self._due(states):
+            return False
+        requested = time.time()
+        async with self._lock:
+            # Another request may have checked while we waited
+            states = await self.states()
+            if states and min(s.last_checked for s in states.values()) >= requested:
+                return False
+            try:
+                return await self._sync(states)
+            except Exception as exc:
+                if not states:
+                    raise self.unavailable(f"{self.label} data unavailable: {exc}") from exc
+                logger.warning(f"[{self.label}] Check failed, serving stored series: {exc}")
+                for code in states:
+                    await self.warehouse.touch(self.provider, self.series_id(code))
+                return False
+
+    async def _sync(self, states: Dict[str, SeriesState]) -> bool:
+        full = not states or (
+            time.time() - min(s.last_full_sync for s in states.values())
+            >= self.config.FULL_RESYNC_DAYS * 86400
+        )
+        checked_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        parsed = await self._fetch(states, full)
+        if parsed is None:
+            for code in states:
+                await self.warehouse.touch(self.provider, self.series_id(code), checked_at)
+            return False
+        if full and not parsed:
+            raise ValueError("Upstream returned no observations")
+
+        changed = 0
+        for code in sorted(set(parsed) | set(states)):
+            changed += await self.warehouse.write(
+                self.provider,
+                self.series_id(code),
+                parsed.get(code, []),
+                replace_all=full and code in parsed,
+                frequency=self.frequency,
+                provider_updated=checked_at,
+                **self.describe(code),
+            )
+        logger.info(
+            f"[{self.label}] {'Full' if full else 'Incremental'} sync of {len(parsed)} series: "
+            f"{changed} observations changed"
+        )
+        return changed > 0
+
+    async def columns(
+        self, codes: Optional[Sequence[str]] = None
+    ) -> Dict[str, SeriesArrays]:
+        """Stored members as arrays (cached by the warehouse per data version)."""
+        states = await self.states()
+        return {
+            code: await self.warehouse.series(self.provider, self.series_id(code), state)
+            for code, state in states.items()
+            if codes is None or code in codes
+        }
+
+    async def versions(self) -> tuple:
+        """Data versions of the members; changes whenever any member changed."""
+        return tuple(sorted((code, state.version) for code, state in (await self.states()).items()))
+
+
+class EcbSeriesGroup(SeriesGroup):
+    """ECB series selected by one SDMX key (wildcards / `+`), split by one dimension."""
+
+    provider = ECB
+    flow: str = ""
+    key: str = ""
+    dimension: str = ""
+
+    def code(self, value: str) -> str:
+        """Member code of a `dimension` value."""
+        return value
+
+    async def _fetch(
+        self, states: Dict[str, SeriesState], full: bool
+    ) -> Optional[Dict[str, List[Row]]]:
+        params = {"detail": "dataonly"}
+        if not full:
+            last = min((s.last_date for s in states.values() if s.last_date), default=None)
+            start = _iso_lookback(last, self.config.REVISION_LOOKBACK_DAYS)
+            if start:
+                params["startPeriod"] = start
+            updated = min(
+                (s.provider_updated for s in states.values() if s.provider_updated), default=None
+            )
+            if updated:
+                params["updatedAfter"] = updated
+        async with httpx.AsyncClient(timeout=60.0, headers=ECB_HEADERS) as client:
+            with SERVICE_METRICS.track_upstream(ECB):
+                resp = await client.get(f"{ECB_BASE_URL}/{self.flow}/{self.key}", params=params)
+        if resp.status_code in (304, 404) and not full:
+            return None
+        resp.raise_for_status()
+        parsed = parse_sdmx_dataset(resp.json(), self.dimension) if resp.content else {}
+        return {self.code(value): rows for value, rows in parsed.items()}
@@ -0,0 +1,344 @@
+"""
+Macro Dashboard Snapshot
+========================
+
+The headline macro indicators of the dashboard (€STR, Euribor, HICP,
+unemployment, Fed policy rates, BUBOR, ECB / UST curves, EUR reference
+rates) materialized as one compact, versioned document, so a first paint
+is one request instead of one per endpoint.
+
+- `MacroSnapshotService.build` refreshes every source from the warehouse
+  (each source keeps its own rate-limited incremental sync) and reads the
+  last two observations of each indicator. A source that fails keeps its
+  entries from the previous snapshot and is listed under `stale`.
+- The version is a hash of the indicator and curve entries: it changes only
+  when a value changed, and workers reading the same warehouse agree on it.
+  It doubles as the ETag.
+- Every entry carries its own hash. `changes(since)` answers with only the
+  entries that differ from an earlier version still in the recent history
+  (`SNAPSHOT_HISTORY`), so clients can poll cheaply.
+- `MacroSnapshotJob` rebuilds the snapshot in the background every
+  `SNAPSHOT_INTERVAL_MINUTES`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.utils.logger_config import get_logger
+
+from .bubor import MNB, get_bubor_pipeline
+from .curves import UST, get_curve_surface_service
+from .fx import get_fx_matrix_service
+from .store import MacroWarehouse, get_macro_warehouse
+from .sync import ECB, FRED, get_warehouse_sync
+
+logger = get_logger(__name__)
+
+# id → ECB series (titles / units as stored by the per-series endpoints)
+ECB_INDICATORS: Dict[str, Dict[str, str]] = {
+    "estr": {"flow": "EST", "key": "B.EU000A2X2A25.WT", "label": "€STR", "group": "money_market", "units": "percent"},
+    "euribor_1m": {"flow": "FM", "key": "M.U2.EUR.RT.MM.EURIBOR1MD_.HSTA", "label": "Euribor 1M", "group": "money_market", "units": "percent"},
+    "euribor_3m": {"flow": "FM", "key": "M.U2.EUR.RT.MM.EURIBOR3MD_.HSTA", "label": "Euribor 3M", "group": "money_market", "units": "percent"},
+    "euribor_6m": {"flow": "FM", "key": "M.U2.EUR.RT.MM.EURIBOR6MD_.HSTA", "label": "Euribor 6M", "group": "money_market", "units": "percent"},
+    "euribor_12m": {"flow": "FM", "key": "M.U2.EUR.RT.MM.EURIBOR12MD_.HSTA", "label": "Euribor 12M", "group": "money_market", "units": "percent"},
+    "hicp": {"flow": "ICP", "key": "M.U2.N.000000.4.ANR", "label": "Harmonised Index of Consumer Prices - Euro area", "group": "inflation", "units": "percent"},
+    "unemployment": {"flow": "LFSI", "key": "M.I9.S.UNEHRT.TOTAL0.15_74.T", "label": "Unemployment Rate - Euro area", "group": "labour", "units": "percent"},
+}
+# id → (FRED series, label)
+FRED_INDICATORS: Dict[str, Tuple[str, str]] = {
+    "fed_target_upper": ("DFEDTARU", "Fed funds target range upper bound"),
+    "fed_target_lower": ("DFEDTARL", "Fed funds target range lower bound"),
+    "effr": ("EFFR", "Effective federal funds rate"),
+    "iorb": ("IORB", "Interest on reserve balances"),
+}
+CURVE_POINTS = {ECB: ("3M", "2Y", "10Y"), UST: ("3M", "2Y", "10Y", "30Y")}
+FX_CURRENCIES = ("USD", "GBP", "JPY", "CHF", "HUF")
+
+SOURCES = ("ecb", "fred", "bubor", "curves", "fx")
+
+
+def _digest(value: Any, length: int = 16) -> str:
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest()[:length]
+
+
+def _entry(spec: Dict[str, Any], dates: np.ndarray, values: np.ndarray) -> Optional[Dict[str, Any]]:
+    """`spec` plus the last observation and its change from the one before (None if empty)."""
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return None
+    last = valid[-1]
+    entry = {**spec, "date": str(dates[last]), "value": round(float(values[last]), 4)}
+    if len(valid) > 1:
+        previous = valid[-2]
+        entry["previous_date"] = str(dates[previous])
+        entry["previous_value"] = round(float(values[previous]), 4)
+        entry["change"] = round(float(values[last] - values[previous]), 4)
+    return entry
+
+
+@dataclass(frozen=True)
+class MacroSnapshot:
+    """One materialized snapshot; `body` is the compact JSON of `data`."""
+
+    version: str
+    generated_at: str
+    data: Dict[str, Any]
+    hashes: Dict[str, str]  # "<section>.<id>" → entry hash
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.version}"'
+
+
+class MacroSnapshotService:
+    """Builds the snapshot from the warehouse sources and keeps a short version history."""
+
+    def __init__(self, warehouse: MacroWarehouse, config=None, fred_api_key: Optional[str] = None):
+        if config is None:
+            from backend.config import settings
+
+            config = settings.MACRO_WAREHOUSE
+        self.warehouse = warehouse
+        self.config = config
+        self.fred_api_key = fred_api_key
+        self._lock = asyncio.Lock()
+        self._snapshot: Optional[MacroSnapshot] = None
+        self._built_at = 0.0
+        # Last good result of each source, reused when it fails
+        self._sections: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self._history: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._stale: Set[str] = set()
+
+    # --- sources ---------------------------------------------------------------
+
+    def _fallback(self, source: str, name: str, error: BaseException) -> Optional[Dict[str, Any]]:
+        """Previous entry of an indicator whose series could not be read."""
+        logger.warning(f"[MacroSnapshot] {source}:{name} unavailable, keeping previous entry: {error}")
+        self._stale.add(source)
+        return self._sections.get(source, ({}, {}))[0].get(name)
+
+    async def _ecb(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        sync = get_warehouse_sync()
+
+        async def one(spec: Dict[str, str]):
+            state, _ = await sync.ecb(spec["flow"], spec["key"], title=spec["label"], units=spec["units"])
+            return state, await self.warehouse.series(ECB, state.series_id, state)
+
+        results = await asyncio.gather(
+            *(one(spec) for spec in ECB_INDICATORS.values()), return_exceptions=True
+        )
+        indicators = {}
+        for (name, spec), result in zip(ECB_INDICATORS.items(), results):
+            if isinstance(result, BaseException):
+                indicators[name] = self._fallback("ecb", name, result)
+                continue
+            state, series = result
+            meta = {"label": spec["label"], "group": spec["group"], "provider": ECB,
+                    "units": spec["units"], "frequency": (state.frequency or "").lower() or None}
+            indicators[name] = _entry(meta, series.dates, series.values)
+        return indicators, {}
+
+    async def _fred(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        if not self.fred_api_key:
+            return {}, {}
+        sync = get_warehouse_sync()
+
+        async def one(series_id: str):
+            state, _ = await sync.fred(series_id, self.fred_api_key)
+            return state, await self.warehouse.series(FRED, series_id, state)
+
+        results = await asyncio.gather(
+            *(one(series_id) for series_id, _ in FRED_INDICATORS.values()), return_exceptions=True
+        )
+        indicators = {}
+        for (name, (_, label)), result in zip(FRED_INDICATORS.items(), results):
+            if isinstance(result, BaseException):
+                indicators[name] = self._fallback("fred", name, result)
+                continue
+            state, series = result
+            meta = {"label": label, "group": "policy_rates", "provider": FRED,
+                    "units": "percent", "frequency": (state.frequency or "").lower() or None}
+            indicators[name] = _entry(meta, series.dates, series.values)
+        return indicators, {}
+
+    async def _bubor(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        pipeline = get_bubor_pipeline()
+        await pipeline.refresh()
+        indicators = {}
+        for tenor in await pipeline.tenors():
+            series = await pipeline.series(tenor)
+            meta = {"label": f"BUBOR {tenor}", "group": "money_market", "provider": MNB,
+                    "units": "percent", "frequency": "d"}
+            indicators[f"bubor_{tenor.replace('/', '').lower()}"] = _entry(meta, series.dates, series.values)
+        return indicators, {}
+
+    async def _curves(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        service = get_curve_surface_service()
+        indicators: Dict[str, Any] = {}
+        curves: Dict[str, Any] = {}
+        for provider, points in CURVE_POINTS.items():
+            await service.refresh(provider)
+            surface = await service.surface(provider)
+            for maturity in points:
+                meta = {"label": f"{provider.upper()} {maturity} yield", "group": "curves",
+                        "provider": provider, "units": "percent", "frequency": "d"}
+                indicators[f"{provider}_{maturity.lower()}"] = _entry(meta, surface.dates, surface.column(maturity))
+            for name, values in surface.spreads().items():
+                meta = {"label": f"{provider.upper()} {name} spread", "group": "curves",
+                        "provider": provider, "units": "bp", "frequency": "d"}
+                indicators[f"{provider}_{name}"] = _entry(meta, surface.dates, values)
+            day, latest = surface.latest()
+            curves[provider] = {
+                "date": day,
+                "maturities": list(latest),
+                "yields": [round(value, 4) for value in latest.values()],
+            }
+        return indicators, curves
+
+    async def _fx(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        block = await get_fx_matrix_service().current()
+        indicators = {}
+        for currency in FX_CURRENCIES:
+            if currency not in block.currencies:
+                continue
+            meta = {"label": f"EUR/{currency}", "group": "fx", "provider": ECB,
+                    "units": f"{currency} per EUR", "frequency": "d"}
+            column = block.rates[:, block.currencies.index(currency)]
+            indicators[f"eur{currency.lower()}"] = _entry(meta, block.dates, column)
+        return indicators, {}
+
+    # --- snapshot --------------------------------------------------------------
+
+    async def build(self) -> MacroSnapshot:
+        """Refresh every source and materialize a new snapshot (single flight)."""
+        requested = time.time()
+        async with self._lock:
+            if self._snapshot is not None and self._built_at >= requested:
+                return self._snapshot
+            self._stale = set()
+            loaders = {"ecb": self._ecb, "fred": self._fred, "bubor": self._bubor,
+                       "curves": self._curves, "fx": self._fx}
+            results = await asyncio.gather(
+                *(loader() for loader in loaders.values()), return_exceptions=True
+            )
+            for source, result in zip(loaders, results):
+                if isinstance(result, BaseException):
+                    logger.warning(f"[MacroSnapshot] {source} unavailable, keeping previous entries: {result}")
+                    self._stale.add(source)
+                else:
+                    self._sections[source] = result
+            stale = [source for source in SOURCES if source in self._stale]
+
+            indicators: Dict[str, Any] = {}
+            curves: Dict[str, Any] = {}
+            for source in SOURCES:
+                section_indicators, section_curves = self._sections.get(source, ({}, {}))
+                indicators.update((k, v) for k, v in section_indicators.items() if v is not None)
+                curves.update(section_curves)
+
+            hashes = {f"indicators.{k}": _digest(v, 12) for k, v in indicators.items()}
+            hashes.update({f"curves.{k}": _digest(v, 12) for k, v in curves.items()})
+            version = _digest(sorted(hashes.items()))
+            generated_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+            data = {
+                "version": version,
+                "generated_at": generated_at,
+                "indicators": indicators,
+                "curves": curves,
+                "stale": stale,
+            }
+            body = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+            self._snapshot = MacroSnapshot(version, generated_at, data, hashes, body)
+            self._built_at = time.time()
+
+            self._history[version] = hashes
+            self._history.move_to_end(version)
+            while len(self._history) > self.config.SNAPSHOT_HISTORY:
+                self._history.popitem(last=False)
+            logger.info(
+                f"[MacroSnapshot] Built version {version}: {len(indicators)} indicators, "
+                f"{len(curves)} curves{f', stale: {stale}' if stale else ''}"
+            )
+            return self._snapshot
+
+    async def current(self) -> MacroSnapshot:
+        """The latest snapshot, built now if there is none or it is older than the interval."""
+        age = time.time() - self._built_at
+        if self._snapshot is None or age >= self.config.SNAPSHOT_INTERVAL_MINUTES * 60:
+            return await self.build()
+        return self._snapshot
+
+    def changes(self, snapshot: MacroSnapshot, since: str) -> Optional[Dict[str, Any]]:
+        """Entries of `snapshot` that differ from version `since`; None if `since` is unknown."""
+        previous = self._history.get(since)
+        if previous is None:
+            return None
+        changed: Dict[str, Dict[str, Any]] = {"indicators": {}, "curves": {}}
+        for item, digest in snapshot.hashes.items():
+            if previous.get(item) != digest:
+                section, name = item.split(".", 1)
+                changed[section][name] = snapshot.data[section][name]
+        return {
+            "version": snapshot.version,
+            "since": since,
+            "generated_at": snapshot.generated_at,
+            **changed,
+            "removed": sorted(item for item in previous if item not in snapshot.hashes),
+            "stale": snapshot.data["stale"],
+        }
+
+
+class MacroSnapshotJob:
+    """Rebuilds the snapshot in the background every SNAPSHOT_INTERVAL_MINUTES."""
+
+    def __init__(self, service: MacroSnapshotService):
+        self.service = service
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        interval = self.service.config.SNAPSHOT_INTERVAL_MINUTES * 60
+        while True:
+            try:
+                await self.service.build()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[MacroSnapshot] Build failed: {e}", exc_info=True)
+            await asyncio.sleep(interval)
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+_service: Optional[MacroSnapshotService] = None
+
+
+def get_macro_snapshot_service() -> MacroSnapshotService:
+    """Process-wide service bound to the process-wide warehouse."""
+    global _service
+    if _service is None:
+        _service = MacroSnapshotService(get_macro_warehouse(), fred_api_key=os.getenv("FINBOT_API_KEYS__FRED"))
+    return _service
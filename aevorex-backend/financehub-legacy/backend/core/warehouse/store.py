@@ -0,0 +1,392 @@
+"""
+Macro Series Store
+==================
+
+One canonical copy of every macro series, keyed by (provider, series_id),
+in an embedded SQLite file:
+
+- `series`: sync state per series (native frequency, units, title, first /
+  last stored date, the provider's own "last updated" stamp, when it was
+  last checked and last fully refetched, a data version bumped whenever
+  observations change, free-form metadata JSON),
+- `observations`: (provider, series_id, date) → value, one row per native
+  observation; missing provider values are stored as NULL.
+
+All SQLite work is blocking, so the async API runs it on the managed `io`
+executor. Writes are serialized by a lock; WAL mode lets reads proceed
+while a sync is writing.
+
+`series()` returns the whole stored series as NumPy arrays (see
+`transforms.SeriesArrays`), kept in a small in-process LRU keyed by data
+version, so windows and transforms of a hot series never touch SQLite.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.core.performance.executors import IO, run_blocking
+from backend.utils.logger_config import get_logger
+
+from .transforms import SeriesArrays
+
+logger = get_logger(__name__)
+
+Row = Tuple[str, Optional[float]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    provider         TEXT NOT NULL,
+    series_id        TEXT NOT NULL,
+    frequency        TEXT,
+    units            TEXT,
+    title            TEXT,
+    first_date       TEXT,
+    last_date        TEXT,
+    count            INTEGER NOT NULL DEFAULT 0,
+    provider_updated TEXT,
+    last_checked     REAL NOT NULL DEFAULT 0,
+    last_full_sync   REAL NOT NULL DEFAULT 0,
+    meta             TEXT,
+    version          INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (provider, series_id)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    provider  TEXT NOT NULL,
+    series_id TEXT NOT NULL,
+    date      TEXT NOT NULL,
+    value     REAL,
+    PRIMARY KEY (provider, series_id, date)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class SeriesState:
+    """Sync state of one stored series."""
+
+    provider: str
+    series_id: str
+    frequency: Optional[str] = None
+    units: Optional[str] = None
+    title: Optional[str] = None
+    first_date: Optional[str] = None
+    last_date: Optional[str] = None
+    count: int = 0
+    provider_updated: Optional[str] = None
+    last_checked: float = 0.0
+    last_full_sync: float = 0.0
+    meta: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0
+
+
+class MacroWarehouse:
+    """Embedded store of native-frequency macro series."""
+
+    def __init__(self, path: str, array_cache_size: int = 256):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._arrays: "OrderedDict[Tuple[str, str], Tuple[int, SeriesArrays]]" = OrderedDict()
+        self._array_cache_size = array_cache_size
+
+    # --- connection ----------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(series)")}
+            if "version" not in columns:
+                conn.execute(
+                    "ALTER TABLE series ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+            self._conn = conn
+            logger.info(f"[MacroWarehouse] Opened {self.path}")
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- blocking implementations ----------------------------------------------
+
+    def _state_sync(self, provider: str, series_id: str) -> Optional[SeriesState]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT frequency, units, title, first_date, last_date, count, "
+                "provider_updated, last_checked, last_full_sync, meta, version "
+                "FROM series WHERE provider = ? AND series_id = ?",
+                (provider, series_id),
+            ).fetchone()
+        if row is None:
+            return None
+        return SeriesState(
+            provider,
+            series_id,
+            *row[:9],
+            meta=json.loads(row[9]) if row[9] else {},
+            version=row[10],
+        )
+
+    def _window_sync(
+        self,
+        provider: str,
+        series_id: str,
+        start: Optional[str],
+        end: Optional[str],
+    ) -> List[Row]:
+        sql = "SELECT date, value FROM observations WHERE provider = ? AND series_id = ?"
+        params: List[Any] = [provider, series_id]
+        if start:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end:
+            sql += " AND date <= ?"
+            params.append(end)
+        with self._lock:
+            return self._connection().execute(sql + " ORDER BY date", params).fetchall()
+
+    def _write_sync(
+        self,
+        provider: str,
+        series_id: str,
+        rows: Sequence[Row],
+        replace_from: Optional[str],
+        replace_all: bool,
+        info: Dict[str, Any],
+    ) -> int:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                key = (provider, series_id)
+                old: Dict[str, Optional[float]] = {}
+                if replace_all:
+                    old = dict(
+                        conn.execute(
+                            "SELECT date, value FROM observations "
+                            "WHERE provider = ? AND series_id = ?",
+                            key,
+                        )
+                    )
+                    conn.execute(
+                        "DELETE FROM observations WHERE provider = ? AND series_id = ?",
+                        key,
+                    )
+                elif replace_from:
+                    old = dict(
+                        conn.execute(
+                            "SELECT date, value FROM observations "
+                            "WHERE provider = ? AND series_id = ? AND date >= ?",
+                            (*key, replace_from),
+                        )
+                    )
+                    conn.execute(
+                        "DELETE FROM observations "
+                        "WHERE provider = ? AND series_id = ? AND date >= ?",
+                        (*key, replace_from),
+                    )
+                else:
+                    dates = [d for d, _ in rows]
+                    for i in range(0, len(dates), 500):
+                        chunk = dates[i : i + 500]
+                        old.update(
+                            conn.execute(
+                                "SELECT date, value FROM observations "
+                                "WHERE provider = ? AND series_id = ? "
+                                f"AND date IN ({','.join('?' * len(chunk))})",
+                                (*key, *chunk),
+                            )
+                        )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?)",
+                    [(provider, series_id, d, v) for d, v in rows],
+                )
+                changed = sum(1 for d, v in rows if d not in old or old[d] != v)
+                changed += len(old.keys() - {d for d, _ in rows})
+
+                first, last, count = conn.execute(
+                    "SELECT MIN(date), MAX(date), COUNT(*) FROM observations "
+                    "WHERE provider = ? AND series_id = ?",
+                    key,
+                ).fetchone()
+                conn.execute(
+                    "INSERT INTO series (provider, series_id, last_checked) VALUES (?, ?, ?) "
+                    "ON CONFLICT (provider, series_id) DO NOTHING",
+                    (*key, now),
+                )
+                conn.execute(
+                    "UPDATE series SET first_date = ?, last_date = ?, count = ?, "
+                    "last_checked = ?, "
+                    "last_full_sync = CASE WHEN ? THEN ? ELSE last_full_sync END, "
+                    "frequency = COALESCE(?, frequency), units = COALESCE(?, units), "
+                    "title = COALESCE(?, title), "
+                    "provider_updated = COALESCE(?, provider_updated), "
+                    "meta = COALESCE(?, meta), "
+                    "version = version + (? > 0) "
+                    "WHERE provider = ? AND series_id = ?",
+                    (
+                        first,
+                        last,
+                        count,
+                        now,
+                        replace_all,
+                        now,
+                        info.get("frequency"),
+                        info.get("units"),
+                        info.get("title"),
+                        info.get("provider_updated"),
+                        json.dumps(info["meta"]) if info.get("meta") else None,
+                        changed,
+                        *key,
+                    ),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return changed
+
+    def _touch_sync(
+        self, provider: str, series_id: str, provider_updated: Optional[str]
+    ) -> None:
+        with self._lock:
+            self._connection().execute(
+                "UPDATE series SET last_checked = ?, "
+                "provider_updated = COALESCE(?, provider_updated) "
+                "WHERE provider = ? AND series_id = ?",
+                (time.time(), provider_updated, provider, series_id),
+            )
+
+    def _list_sync(self, provider: Optional[str]) -> List[SeriesState]:
+        with self._lock:
+            keys = self._connection().execute(
+                "SELECT provider, series_id FROM series"
+                + (" WHERE provider = ?" if provider else "")
+                + " ORDER BY provider, series_id",
+                (provider,) if provider else (),
+            ).fetchall()
+        return [state for p, s in keys if (state := self._state_sync(p, s))]
+
+    # --- async API ---------------------------------------------------------------
+
+    async def state(self, provider: str, series_id: str) -> Optional[SeriesState]:
+        return await run_blocking(IO, self._state_sync, provider, series_id)
+
+    async def window(
+        self,
+        provider: str,
+        series_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Row]:
+        """Stored (date, value) rows in [start, end], oldest first."""
+        return await run_blocking(IO, self._window_sync, provider, series_id, start, end)
+
+    async def series(
+        self, provider: str, series_id: str, state: Optional[SeriesState] = None
+    ) -> SeriesArrays:
+        """The full stored series as arrays (cached per data version)."""
+        if state is None:
+            state = await self.state(provider, series_id)
+        version = state.version if state is not None else -1
+        key = (provider, series_id)
+        cached = self._arrays.get(key)
+        if cached is not None and cached[0] == version:
+            self._arrays.move_to_end(key)
+            return cached[1]
+        rows = await self.window(provider, series_id)
+        arrays = SeriesArrays.from_rows(rows)
+        self._arrays[key] = (version, arrays)
+        self._arrays.move_to_end(key)
+        while len(self._arrays) > self._array_cache_size:
+            self._arrays.popitem(last=False)
+        return arrays
+
+    async def write(
+        self,
+        provider: str,
+        series_id: str,
+        rows: Iterable[Row],
+        *,
+        replace_from: Optional[str] = None,
+        replace_all: bool = False,
+        frequency: Optional[str] = None,
+        units: Optional[str] = None,
+        title: Optional[str] = None,
+        provider_updated: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Store observations and mark the series as checked now.
+
+        `replace_all` swaps the whole history (full sync), `replace_from`
+        replaces every row on or after that date (delta with revisions);
+        otherwise rows are upserted. Returns how many dates were added,
+        changed or removed.
+        """
+        info = {
+            "frequency": frequency,
+            "units": units,
+            "title": title,
+            "provider_updated": provider_updated,
+            "meta": meta,
+        }
+        return await run_blocking(
+            IO,
+            self._write_sync,
+            provider,
+            series_id,
+            list(rows),
+            replace_from,
+            replace_all,
+            info,
+        )
+
+    async def touch(
+        self, provider: str, series_id: str, provider_updated: Optional[str] = None
+    ) -> None:
+        """Record a check that found nothing new."""
+        await run_blocking(IO, self._touch_sync, provider, series_id, provider_updated)
+
+    async def list_series(self, provider: Optional[str] = None) -> List[SeriesState]:
+        return await run_blocking(IO, self._list_sync, provider)
+
+
+_warehouse: Optional[MacroWarehouse] = None
+
+
+def get_macro_warehouse() -> MacroWarehouse:
+    """Process-wide warehouse at `settings.MACRO_WAREHOUSE.PATH`."""
+    global _warehouse
+    if _warehouse is None:
+        from backend.config import settings
+
+        path = settings.MACRO_WAREHOUSE.PATH or str(
+            Path(settings.PATHS.PROJECT_ROOT) / "data" / "macro_warehouse.sqlite3"
+        )
+        _warehouse = MacroWarehouse(path, settings.MACRO_WAREHOUSE.ARRAY_CACHE_SERIES)
+    return _warehouse
+
+
+def close_macro_warehouse() -> None:
+    global _warehouse
+    if _warehouse is not None:
+        _warehouse.close()
+        _warehouse = None
@@ -0,0 +1,315 @@
+"""
+Incremental Provider Sync
+=========================
+
+Keeps the warehouse copy of a series current with as little transfer as
+possible. A series is checked upstream at most every
+`SYNC_INTERVAL_MINUTES`; concurrent requests for the same series share one
+sync (single flight).
+
+FRED
+    `fred/series` (one small metadata record) is compared with the stored
+    `last_updated`. Unchanged → nothing else is fetched. Changed → only
+    observations from `last stored date - REVISION_LOOKBACK_DAYS` are
+    refetched and replace that tail, so revisions are picked up too. The
+    whole history is refetched every `FULL_RESYNC_DAYS`.
+
+ECB (SDMX)
+    `updatedAfter=<previous check>` with `startPeriod=<lookback>` returns
+    only observations changed since the last check (an empty / 304 / 404
+    answer means nothing changed); they are upserted.
+
+If a check fails but a stored copy exists, the stored copy is served and
+the failure logged; without a stored copy the error propagates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from backend.core.metrics import SERVICE_METRICS
+from backend.utils.logger_config import get_logger
+
+from .store import MacroWarehouse, Row, SeriesState, get_macro_warehouse
+
+logger = get_logger(__name__)
+
+FRED = "fred"
+ECB = "ecb"
+
+FRED_BASE_URL = "https://api.stlouisfed.org/fred"
+ECB_BASE_URL = "https://data-api.ecb.europa.eu/service/data"
+ECB_HEADERS = {
+    "Accept": "application/vnd.sdmx.data+json;version=1.0.0-wd",
+    "User-Agent": "Aevorex-FinanceHub/1.0 (https://aevorex.com)",
+}
+_FRED_ORIGIN = "1776-07-04"  # FRED's own "all observations" start
+
+_ECB_FREQUENCIES = {"D": "d", "B": "d", "W": "w", "M": "m", "Q": "q", "H": "sa", "A": "a"}
+
+
+class SeriesNotFoundError(LookupError):
+    """The provider does not know the series."""
+
+
+def _iso_lookback(last_date: Optional[str], days: int) -> Optional[str]:
+    if not last_date:
+        return None
+    return (date.fromisoformat(last_date) - timedelta(days=days)).isoformat()
+
+
+def _fred_value(raw: Any) -> Optional[float]:
+    if raw in (None, "", "."):
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_period(period: str) -> str:
+    """SDMX TIME_PERIOD ('2024', '2024-S2', '2024-Q3', '2024-07', '2024-W05', '2024-07-15') → ISO date."""
+    if len(period) == 4:
+        return f"{period}-01-01"
+    year, _, rest = period.partition("-")
+    if rest.startswith("Q"):
+        return f"{year}-{3 * (int(rest[1:]) - 1) + 1:02d}-01"
+    if rest.startswith(("S", "H")):
+        return f"{year}-{'01' if rest[1:] == '1' else '07'}-01"
+    if rest.startswith("W"):
+        return date.fromisocalendar(int(year), int(rest[1:]), 5).isoformat()
+    if len(rest) == 2:
+        return f"{year}-{rest}-01"
+    return period
+
+
+def parse_sdmx_observations(payload: Dict[str, Any]) -> List[Row]:
+    """(date, value) rows of the first series in an SDMX-JSON data message."""
+    try:
+        dimensions = payload["structure"]["dimensions"]["observation"]
+        periods = next(
+            dim["values"] for dim in dimensions if dim.get("id") == "TIME_PERIOD"
+        )
+        series = next(iter(payload["dataSets"][0]["series"].values()))
+    except (KeyError, IndexError, StopIteration):
+        return []
+    rows: List[Row] = []
+    for index, observation in series.get("observations", {}).items():
+        value = observation[0] if observation else None
+        try:
+            value = float(value) if value not in (None, ".", "NaN") else None
+        except (TypeError, ValueError):
+            value = None
+        rows.append((normalize_period(periods[int(index)]["id"]), value))
+    rows.sort()
+    return rows
+
+
+def parse_sdmx_dataset(payload: Dict[str, Any], dimension: str) -> Dict[str, List[Row]]:
+    """{value of `dimension`: (date, value) rows} of every series in an SDMX-JSON data message."""
+    try:
+        structure = payload["structure"]["dimensions"]
+        periods = next(
+            dim["values"] for dim in structure["observation"] if dim.get("id") == "TIME_PERIOD"
+        )
+        position, codes = next(
+            (i, dim["values"])
+            for i, dim in enumerate(structure["series"])
+            if dim.get("id") == dimension
+        )
+        series = payload["dataSets"][0]["series"]
+    except (KeyError, IndexError, StopIteration):
+        return {}
+    dates = [normalize_period(period["id"]) for period in periods]
+    out: Dict[str, List[Row]] = {}
+    for key, data in series.items():
+        code = codes[int(key.split(":")[position])]["id"]
+        rows: List[Row] = []
+        for index, observation in data.get("observations", {}).items():
+            value = observation[0] if observation else None
+            try:
+                value = float(value) if value not in (None, ".", "NaN") else None
+            except (TypeError, ValueError):
+                value = None
+            rows.append((dates[int(index)], value))
+        rows.sort()
+        out[code] = rows
+    return out
+
+
+class WarehouseSync:
+    """Incremental FRED / ECB sync into a `MacroWarehouse`."""
+
+    def __init__(self, warehouse: MacroWarehouse, config=None):
+        if config is None:
+            from backend.config import settings
+
+            config = settings.MACRO_WAREHOUSE
+        self.warehouse = warehouse
+        self.config = config
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def _due(self, state: Optional[SeriesState], force: bool) -> bool:
+        if state is None or force:
+            return True
+        return time.time() - state.last_checked >= self.config.SYNC_INTERVAL_MINUTES * 60
+
+    def _full_due(self, state: Optional[SeriesState]) -> bool:
+        return (
+            state is None
+            or not state.count
+            or time.time() - state.last_full_sync >= self.config.FULL_RESYNC_DAYS * 86400
+        )
+
+    async def _single_flight(self, provider: str, series_id: str, force: bool, sync):
+        """Run `sync(state)` unless a fresh check exists; returns (state, synced)."""
+        state = await self.warehouse.state(provider, series_id)
+        if not self._due(state, force):
+            return state, False
+        requested = time.time()
+        lock = self._locks.setdefault((provider, series_id), asyncio.Lock())
+        async with lock:
+            # Another request may have synced while we waited
+            state = await self.warehouse.state(provider, series_id)
+            if state is not None and state.last_checked >= requested:
+                return state, False
+            if not self._due(state, force):
+                return state, False
+            try:
+                await sync(state)
+            except SeriesNotFoundError:
+                raise
+            except Exception as exc:
+                if state is None or not state.count:
+                    raise
+                logger.warning(
+                    f"[MacroWarehouse] {provider}:{series_id} sync failed, "
+                    f"serving stored copy: {exc}"
+                )
+                await self.warehouse.touch(provider, series_id)
+            return await self.warehouse.state(provider, series_id), True
+
+    # --- FRED ------------------------------------------------------------------
+
+    async def fred(
+        self, series_id: str, api_key: str, force: bool = False
+    ) -> Tuple[SeriesState, bool]:
+        """Ensure the stored FRED series is current; returns (state, synced now)."""
+
+        async def sync(state: Optional[SeriesState]) -> None:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                params = {"series_id": series_id, "api_key": api_key, "file_type": "json"}
+                with SERVICE_METRICS.track_upstream(FRED):
+                    resp = await client.get(f"{FRED_BASE_URL}/series", params=params)
+                if resp.status_code in (400, 404):
+                    raise SeriesNotFoundError(f"FRED series {series_id} not found")
+                resp.raise_for_status()
+                meta = (resp.json().get("seriess") or [{}])[0]
+                updated = meta.get("last_updated")
+                full = self._full_due(state)
+                if not full and updated and updated == state.provider_updated:
+                    await self.warehouse.touch(FRED, series_id)
+                    return
+
+                start = _FRED_ORIGIN if full else _iso_lookback(
+                    state.last_date, self.config.REVISION_LOOKBACK_DAYS
+                )
+                with SERVICE_METRICS.track_upstream(FRED):
+                    resp = await client.get(
+                        f"{FRED_BASE_URL}/series/observations",
+                        params={**params, "observation_start": start},
+                    )
+                if resp.status_code in (400, 404):
+                    raise SeriesNotFoundError(f"FRED series {series_id} not found")
+                resp.raise_for_status()
+                rows = [
+                    (obs["date"], _fred_value(obs.get("value")))
+                    for obs in resp.json().get("observations", [])
+                ]
+            changed = await self.warehouse.write(
+                FRED,
+                series_id,
+                rows,
+                replace_all=full,
+                replace_from=None if full else start,
+                frequency=meta.get("frequency_short"),
+                units=meta.get("units_short") or meta.get("units"),
+                title=meta.get("title"),
+                provider_updated=updated,
+                meta={
+                    k: meta.get(k)
+                    for k in ("frequency", "units", "seasonal_adjustment_short", "popularity", "notes")
+                    if meta.get(k) is not None
+                },
+            )
+            logger.info(
+                f"[MacroWarehouse] fred:{series_id} {'full' if full else 'delta'} sync: "
+                f"{len(rows)} fetched, {changed} changed"
+            )
+
+        return await self._single_flight(FRED, series_id, force, sync)
+
+    # --- ECB -------------------------------------------------------------------
+
+    async def ecb(
+        self,
+        flow: str,
+        key: str,
+        force: bool = False,
+        title: Optional[str] = None,
+        units: Optional[str] = None,
+    ) -> Tuple[SeriesState, bool]:
+        """Ensure the stored ECB series `flow/key` is current; returns (state, synced now)."""
+        series_id = f"{flow}.{key}"
+
+        async def sync(state: Optional[SeriesState]) -> None:
+            full = self._full_due(state)
+            checked_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+            params = {"detail": "dataonly"}
+            if not full:
+                start = _iso_lookback(state.last_date, self.config.REVISION_LOOKBACK_DAYS)
+                params["startPeriod"] = start
+                if state.provider_updated:
+                    params["updatedAfter"] = state.provider_updated
+            async with httpx.AsyncClient(timeout=30.0, headers=ECB_HEADERS) as client:
+                with SERVICE_METRICS.track_upstream(ECB):
+                    resp = await client.get(f"{ECB_BASE_URL}/{flow}/{key}", params=params)
+            if resp.status_code in (304, 404) and not full:
+                await self.warehouse.touch(ECB, series_id, checked_at)
+                return
+            if resp.status_code in (400, 404):
+                raise SeriesNotFoundError(f"ECB series {series_id} not found")
+            resp.raise_for_status()
+            rows = parse_sdmx_observations(resp.json()) if resp.content else []
+            changed = await self.warehouse.write(
+                ECB,
+                series_id,
+                rows,
+                replace_all=full,
+                frequency=_ECB_FREQUENCIES.get(key.split(".", 1)[0]),
+                units=units,
+                title=title,
+                provider_updated=checked_at,
+            )
+            logger.info(
+                f"[MacroWarehouse] ecb:{series_id} {'full' if full else 'delta'} sync: "
+                f"{len(rows)} fetched, {changed} changed"
+            )
+
+        return await self._single_flight(ECB, series_id, force, sync)
+
+
+_sync: Optional[WarehouseSync] = None
+
+
+def get_warehouse_sync() -> WarehouseSync:
+    """Process-wide sync bound to the process-wide warehouse."""
+    global _sync
+    if _sync is None:
+        _sync = WarehouseSync(get_macro_warehouse())
+    return _sync
@@ -0,0 +1,350 @@
+"""
+Local FRED-style Series Transforms
+==================================
+
+Answer `frequency` / `aggregation_method` / `units` requests from the stored
+native-frequency series instead of asking the provider for each variant.
+Everything is vectorized over one `SeriesArrays` (datetime64 dates + float
+values, NaN = missing), so a new variant costs a few array operations.
+
+Semantics follow the FRED API:
+
+- frequencies `d`, `w`, `bw`, `m`, `q`, `sa`, `a` (the `wef`/`weth`/… and
+  `bwew`/`bwem` variants map to `w` / `bw`); monthly and coarser periods are
+  labelled with their first day, weekly ones with the week-ending Friday,
+- aggregation `avg`, `sum`, `eop` (end of period),
+- units `lin`, `chg`, `ch1`, `pch`, `pc1`, `pca`, `cch`, `cca`, `log`.
+
+On top of FRED: rolling mean / standard deviation / z-score
+(`rolling_stats`), the summary analytics attached to observation
+responses (`series_analytics`) and date alignment of several series into
+one columnar matrix (`align`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+Row = Tuple[str, Optional[float]]
+
+# Coarseness rank and periods per year of each canonical frequency
+_RANK = {"d": 0, "w": 1, "bw": 2, "m": 3, "q": 4, "sa": 5, "a": 6}
+PERIODS_PER_YEAR = {"d": 260, "w": 52, "bw": 26, "m": 12, "q": 4, "sa": 2, "a": 1}
+
+_ALIASES = {
+    "daily": "d",
+    "weekly": "w",
+    "biweekly": "bw",
+    "monthly": "m",
+    "quarterly": "q",
+    "semiannual": "sa",
+    "annual": "a",
+    "yearly": "a",
+}
+
+# History needed before a window start: one year for ch1 / pc1, one
+# (annual) period for the period-over-period units
+HISTORY_DAYS = 400
+
+AGGREGATIONS = ("avg", "sum", "eop")
+UNITS = ("lin", "chg", "ch1", "pch", "pc1", "pca", "cch", "cca", "log")
+ALIGNMENTS = ("outer", "inner", "ffill")
+
+_DAY = np.timedelta64(1, "D")
+
+
+@dataclass(frozen=True)
+class SeriesArrays:
+    """Date-sorted observations as parallel arrays."""
+
+    dates: np.ndarray  # datetime64[D]
+    values: np.ndarray  # float64, NaN where the provider has no value
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Row]) -> "SeriesArrays":
+        rows = list(rows)
+        return cls(
+            np.array([d for d, _ in rows], dtype="datetime64[D]"),
+            np.array([np.nan if v is None else v for _, v in rows], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def window(self, start: Optional[str] = None, end: Optional[str] = None) -> "SeriesArrays":
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D")) if start else 0
+        hi = (
+            np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+            if end
+            else len(self.dates)
+        )
+        return SeriesArrays(self.dates[lo:hi], self.values[lo:hi])
+
+    def dropna(self) -> "SeriesArrays":
+        mask = np.isfinite(self.values)
+        if mask.all():
+            return self
+        return SeriesArrays(self.dates[mask], self.values[mask])
+
+    def head(self, n: int) -> "SeriesArrays":
+        return SeriesArrays(self.dates[:n], self.values[:n])
+
+    def to_rows(self) -> List[Row]:
+        return [
+            (d, None if np.isnan(v) else v)
+            for d, v in zip(self.dates.astype(str).tolist(), self.values.tolist())
+        ]
+
+
+def canonical_frequency(frequency: Optional[str]) -> Optional[str]:
+    """'M', 'Monthly', 'wef', 'bwem' … → 'm', 'w', 'bw' (None if unknown)."""
+    if not frequency:
+        return None
+    code = frequency.strip().lower()
+    code = _ALIASES.get(code.split(",")[0], code)
+    if code.startswith("bw"):
+        return "bw"
+    if code.startswith("we") or code == "w":
+        return "w"
+    return code if code in _RANK else None
+
+
+def is_coarser(target: str, native: str) -> bool:
+    return _RANK[target] > _RANK[native]
+
+
+def period_labels(dates: np.ndarray, frequency: str) -> np.ndarray:
+    """Label of the `frequency` period containing each date."""
+    if frequency == "d":
+        return dates
+    if frequency in ("w", "bw"):
+        days = dates.astype(np.int64)
+        # 1970-01-01 was a Thursday: Monday = 0 … Friday = 4
+        friday = days + (4 - (days + 3) % 7) % 7
+        if frequency == "bw":
+            # Two-week buckets anchored on Friday 1970-01-02
+            offset = (friday - 1) % 14
+            friday = friday + np.where(offset > 0, 14 - offset, 0)
+        return friday.astype("datetime64[D]")
+    if frequency == "a":
+        return dates.astype("datetime64[Y]").astype("datetime64[D]")
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    step = {"m": 1, "q": 3, "sa": 6}[frequency]
+    return (months - months % step).astype("datetime64[M]").astype("datetime64[D]")
+
+
+def period_start(labels: np.ndarray, frequency: str) -> np.ndarray:
+    """First day of the periods labelled by `period_labels` (weeks end on Friday)."""
+    if frequency == "w":
+        return labels - 6 * _DAY
+    if frequency == "bw":
+        return labels - 13 * _DAY
+    return labels
+
+
+def history_start(
+    since: str, native_frequency: Optional[str], frequency: Optional[str] = None
+) -> str:
+    """
+    First date to read for `transform(..., since=since)`: the start of the
+    period `HISTORY_DAYS` (a year plus a period) before the one containing
+    `since`, so every aggregated period is complete and each change at the
+    start of the window has its previous-period / year-ago base.
+    """
+    native = canonical_frequency(native_frequency) or "d"
+    target = canonical_frequency(frequency) or native
+    if not is_coarser(target, native):
+        target = native
+    first = period_start(period_labels(np.array([since], dtype="datetime64[D]"), target), target)
+    back = first - HISTORY_DAYS * _DAY
+    return str(period_start(period_labels(back, target), target)[0])
+
+
+def aggregate(series: SeriesArrays, frequency: str, method: str = "avg") -> SeriesArrays:
+    """Down-sample to `frequency` with `avg` / `sum` / `eop`."""
+    if method not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation method '{method}'")
+    series = series.dropna()
+    if not len(series):
+        return series
+    labels = period_labels(series.dates, frequency)
+    # Dates are sorted, so every period is one contiguous run
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    ends = np.r_[starts[1:], len(labels)]
+    if method == "eop":
+        values = series.values[ends - 1]
+    else:
+        values = np.add.reduceat(series.values, starts)
+        if method == "avg":
+            values = values / (ends - starts)
+    return SeriesArrays(labels[starts], values)
+
+
+def _year_ago(dates: np.ndarray) -> np.ndarray:
+    month = dates.astype("datetime64[M]")
+    day = dates - month.astype("datetime64[D]")
+    previous = (month - 12).astype("datetime64[D]")
+    # 29 February → 28 February
+    return np.minimum(previous + day, (month - 11).astype("datetime64[D]") - _DAY)
+
+
+def apply_units(series: SeriesArrays, units: str, frequency: str) -> SeriesArrays:
+    """FRED `units` transform of a series at `frequency` (missing values dropped)."""
+    if units not in UNITS:
+        raise ValueError(f"Unknown units '{units}'")
+    series = series.dropna()
+    if units == "lin" or not len(series):
+        return series
+    dates, x = series.dates, series.values
+    n = PERIODS_PER_YEAR.get(frequency, 1)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if units == "log":
+            out_dates, out = dates, np.where(x > 0, np.log(x), np.nan)
+        elif units in ("ch1", "pc1"):
+            target = _year_ago(dates)
+            j = np.searchsorted(dates, target, side="right") - 1
+            base = x[np.maximum(j, 0)]
+            # The nearest observation at most a week before the same day last year
+            found = (j >= 0) & (target - dates[np.maximum(j, 0)] <= 7 * _DAY)
+            change = x - base if units == "ch1" else (x / base - 1) * 100
+            out_dates, out = dates, np.where(found, change, np.nan)
+        else:
+            prev, cur = x[:-1], x[1:]
+            out_dates = dates[1:]
+            if units == "chg":
+                out = cur - prev
+            elif units == "pch":
+                out = (cur / prev - 1) * 100
+            elif units == "pca":
+                out = ((cur / prev) ** n - 1) * 100
+            else:
+                out = (np.log(cur) - np.log(prev)) * 100
+                if units == "cca":
+                    out = out * n
+    out = np.round(out, 6)
+    keep = np.isfinite(out)
+    return SeriesArrays(out_dates[keep], out[keep])
+
+
+def transform(
+    series: SeriesArrays,
+    native_frequency: Optional[str],
+    frequency: Optional[str] = None,
+    aggregation: str = "avg",
+    units: Optional[str] = None,
+    since: Optional[str] = None,
+) -> Tuple[SeriesArrays, str]:
+    """
+    Aggregate (only ever down-sampling) and apply units.
+
+    Returns the result and the frequency it is at; a request for a finer
+    frequency than the native one is served at the native frequency. Pass
+    observations from `history_start(since, ...)` on so changes at the
+    start of the window have their base; output is trimmed to the period
+    containing `since`.
+    """
+    native = canonical_frequency(native_frequency) or "d"
+    target = canonical_frequency(frequency) or native
+    if is_coarser(target, native):
+        series = aggregate(series, target, aggregation)
+    else:
+        target = native
+    out = apply_units(series, units or "lin", target)
+    if since:
+        first = period_labels(np.array([since], dtype="datetime64[D]"), target)[0]
+        out = out.window(str(first))
+    return out, target
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    index = np.where(np.isfinite(values), np.arange(len(values)), 0)
+    np.maximum.accumulate(index, out=index)
+    return values[index]
+
+
+def align(
+    columns: Dict[str, SeriesArrays], how: str = "outer"
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Put several series on one date axis.
+
+    `outer`: union of dates, NaN where a series has no value; `inner`: only
+    dates every series has; `ffill`: union of dates with each series carried
+    forward from its last value (NaN before its first one).
+    """
+    if how not in ALIGNMENTS:
+        raise ValueError(f"Unknown alignment '{how}'")
+    columns = {key: series.dropna() for key, series in columns.items()}
+    if not columns:
+        return np.array([], dtype="datetime64[D]"), {}
+    axes = [series.dates for series in columns.values()]
+    dates = reduce(np.intersect1d, axes) if how == "inner" else np.unique(np.concatenate(axes))
+    out: Dict[str, np.ndarray] = {}
+    for key, series in columns.items():
+        values = np.full(len(dates), np.nan)
+        pos = np.searchsorted(dates, series.dates)
+        hit = pos < len(dates)
+        hit[hit] = dates[pos[hit]] == series.dates[hit]
+        values[pos[hit]] = series.values[hit]
+        out[key] = _ffill(values) if how == "ffill" else values
+    return dates, out
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+
+def rolling_stats(values: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """Rolling mean, sample standard deviation and z-score (NaN until `window` values)."""
+    x = np.asarray(values, dtype=np.float64)
+    mean = np.full(len(x), np.nan)
+    std = np.full(len(x), np.nan)
+    if window >= 2 and len(x) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(x, window)
+        mean[window - 1 :] = windows.mean(axis=1)
+        std[window - 1 :] = windows.std(axis=1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = np.where(std > 0, (x - mean) / std, np.nan)
+    return {"mean": mean, "std": std, "zscore": zscore}
+
+
+def _rounded(value: float, digits: int) -> Optional[float]:
+    return round(float(value), digits) if np.isfinite(value) else None
+
+
+def series_analytics(values: np.ndarray) -> Dict[str, Any]:
+    """Moving averages, latest changes and summary statistics of a value array."""
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    if len(x) < 2:
+        return {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        period_change = (x[-1] - x[-2]) / x[-2] * 100 if x[-2] != 0 else np.nan
+        yoy_change = (
+            (x[-1] - x[-12]) / x[-12] * 100 if len(x) >= 12 and x[-12] != 0 else np.nan
+        )
+    mean = x.mean()
+    volatility = x.std(ddof=1)
+    return {
+        "moving_averages": {
+            "ma5": _rounded(x[-5:].mean(), 4) if len(x) >= 5 else None,
+            "ma20": _rounded(x[-20:].mean(), 4) if len(x) >= 20 else None,
+        },
+        "percent_changes": {
+            "period_change": _rounded(period_change, 2),
+            "yoy_change": _rounded(yoy_change, 2),
+        },
+        "statistics": {
+            "mean": _rounded(mean, 4),
+            "min": _rounded(x.min(), 4),
+            "max": _rounded(x.max(), 4),
+            "volatility": _rounded(volatility, 4),
+            "zscore": _rounded((x[-1] - mean) / volatility, 4) if volatility > 0 else None,
+        },
+    }
@@ -6,26 +6,22 @@ Monitors usage of deprecated routes and logs warnings.
 
 import logging
 from typing import Callable, Optional
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
 
-class DeprecatedRouteMonitorMiddleware(BaseHTTPMiddleware):
+class DeprecatedRouteMonitorMiddleware:
     """
-    Middleware to monitor deprecated route usage.
+    Middleware to monitor deprecated route usage (pure ASGI).
+
+    Not part of the default stack while it has nothing to monitor.
     """
-    
+
     def __init__(self, app, cache_service_factory: Optional[Callable] = None):
-        super().__init__(app)
+        self.app = app
         self.cache_service_factory = cache_service_factory
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process the request and monitor for deprecated routes.
-        """
+
+    async def __call__(self, scope, receive, send):
         # For now, just pass through without monitoring
         # This can be extended later to track deprecated route usage
-        response = await call_next(request)
-        return response
\ No newline at end of file
+        await self.app(scope, receive, send)
@@ -6,7 +6,7 @@ Security headers, constants, and configuration for JWT authentication.
 """
 
 import logging
-from typing import Set
+from typing import Set, Tuple
 
 logger = logging.getLogger("aevorex_finbot_api.middleware.jwt_auth.config")
 
@@ -50,12 +50,34 @@ PUBLIC_ENDPOINTS: Set[str] = {
     "/metrics",
 }
 
+# Path prefixes that are public as a whole (docs, market data, webhooks, ...)
+PUBLIC_PREFIXES: Tuple[str, ...] = (
+    "/docs",
+    "/redoc",
+    "/api/v1/eodhd/",
+    "/api/v1/ticker-tape/",
+    "/api/v1/macro/",
+    "/api/v1/fundamentals/",
+    "/api/v1/tradingview/",
+    "/api/v1/search/",
+    "/api/v1/summary/",
+    "/api/v1/chat/",
+    "/api/v1/billing/",  # webhooks
+    "/api/v1/diagnostics/",  # admin key checked by the router
+    "/health",
+    "/ping",
+)
+
 # JWT Configuration defaults
 JWT_DEFAULTS = {
     "algorithm": "HS256",
     "token_expiration": 900,  # 15 minutes
     "max_refresh_age": 3600,  # 1 hour
     "blacklist_ttl": 3600,  # 1 hour
+    "claims_cache_size": 10000,  # verified-claims LRU entries per process
+    "bloom_capacity": 100000,  # revoked token IDs before the FP rate degrades
+    "bloom_error_rate": 0.001,
+    "bloom_rebuild_seconds": 3600,  # periodic rebuild drops expired revocations
 }
 
 # JWT Configuration from environment
@@ -74,53 +96,6 @@ def is_public_endpoint(path: str) -> bool:
     """
     Check if the endpoint is public (doesn't require authentication)
     """
-    # Exact match
-    if path in PUBLIC_ENDPOINTS:
-        return True
-
-    # Pattern matching for API documentation
-    if path.startswith("/docs") or path.startswith("/redoc"):
-        return True
-
-    # EODHD endpoint patterns
-    if path.startswith("/api/v1/eodhd/"):
-        return True
-
-    # Ticker tape endpoint patterns
-    if path.startswith("/api/v1/ticker-tape/"):
-        return True
-
-    # Macro endpoint patterns
-    if path.startswith("/api/v1/macro/"):
-        return True
-
-    # Fundamentals endpoint patterns
-    if path.startswith("/api/v1/fundamentals/"):
-        return True
-
-
-    # TradingView endpoint patterns
-    if path.startswith("/api/v1/tradingview/"):
-        return True
-
-    # Search endpoint patterns
-    if path.startswith("/api/v1/search/"):
-        return True
-
-    # Summary endpoint patterns
-    if path.startswith("/api/v1/summary/"):
-        return True
-
-    # Chat endpoint patterns
-    if path.startswith("/api/v1/chat/"):
-        return True
-
-    # Billing endpoint patterns (webhooks)
-    if path.startswith("/api/v1/billing/"):
-        return True
-
-    # Health check patterns
-    if path.startswith("/health") or path.startswith("/ping"):
-        return True
+    from ..path_policy import get_path_policy_engine
 
-    return False
+    return get_path_policy_engine().lookup(path).public
@@ -0,0 +1,248 @@
+"""
+JWT Revocation Fast Path
+========================
+
+Local structures that let the validator skip Redis on the common path:
+
+- `TokenClaimsCache`: in-process LRU of verified claims keyed by token hash,
+  each entry living until the token's own `exp`.
+- `BloomFilter`: compact set of revoked token IDs (SHA-256 of the token).
+  A negative answer is definitive, so Redis is only asked on a positive.
+- `RevocationRegistry`: keeps the Bloom filter in sync across workers. It
+  hydrates from the `jwt:revoked` sorted set (score = expiry) and listens on
+  the `jwt:revocations` pub/sub channel for new revocations.
+
+`revoke_token_id` is the single write path used by the token creator and
+validator: blacklist key + sorted set + publish in one pipeline.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+from .config import JWT_DEFAULTS
+
+logger = logging.getLogger("aevorex_finbot_api.middleware.jwt_auth.revocation")
+
+REVOKED_SET_KEY = "jwt:revoked"
+REVOCATION_CHANNEL = "jwt:revocations"
+
+
+def token_id(token: str) -> str:
+    """Stable identifier for a token (used for cache and revocation lookups)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over a bytearray (double hashing, SHA-256)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TokenClaimsCache:
+    """LRU of verified token claims, each valid until the token's `exp`."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, tid: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(tid)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            self._entries.pop(tid, None)
+            return None
+        self._entries.move_to_end(tid)
+        return claims
+
+    def put(self, tid: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if not exp:
+            return  # never cache tokens without an expiry
+        self._entries[tid] = (float(exp), claims)
+        self._entries.move_to_end(tid)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def evict(self, tid: str) -> None:
+        self._entries.pop(tid, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RevocationRegistry:
+    """Locally replicated Bloom filter of revoked token IDs."""
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis],
+        capacity: int = JWT_DEFAULTS["bloom_capacity"],
+        error_rate: float = JWT_DEFAULTS["bloom_error_rate"],
+        rebuild_seconds: int = JWT_DEFAULTS["bloom_rebuild_seconds"],
+    ):
+        self.redis_client = redis_client
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_seconds = rebuild_seconds
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.claims_cache = TokenClaimsCache(JWT_DEFAULTS["claims_cache_size"])
+        self._task: Optional[asyncio.Task] = None
+        self._synced = False
+
+    def might_be_revoked(self, tid: str) -> bool:
+        return tid in self.bloom
+
+    def mark_revoked(self, tid: str) -> None:
+        self.bloom.add(tid)
+        self.claims_cache.evict(tid)
+
+    async def ensure_started(self) -> None:
+        """Start the pub/sub listener (idempotent; it hydrates on subscribe).
+
+        Until the first hydrate completes `synced` is False and the validator
+        checks Redis for every token.
+        """
+        if self.redis_client is None or (self._task and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._listen())
+
+    async def _hydrate(self) -> bool:
+        """Rebuild the filter from the revoked set (drops expired entries)."""
+        try:
+            now = time.time()
+            await self.redis_client.zremrangebyscore(REVOKED_SET_KEY, "-inf", now)
+            members = await self.redis_client.zrangebyscore(REVOKED_SET_KEY, now, "+inf")
+        except Exception as e:
+            # Fail closed: without a synced filter every lookup is a "positive"
+            logger.warning(f"Revocation hydrate failed, using Redis per request: {e}")
+            self._synced = False
+            return False
+        fresh = BloomFilter(max(self.capacity, len(members) * 2), self.error_rate)
+        for m in members:
+            fresh.add(m.decode() if isinstance(m, bytes) else m)
+        self.bloom = fresh
+        self._synced = True
+        logger.info(f"Revocation filter hydrated with {len(members)} token IDs")
+        return True
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                # Re-hydrate after (re)subscribing so no revocation is missed
+                backoff = 1.0
+                hydrate_backoff = 1.0
+                last_rebuild = time.monotonic()
+                retry_at = None if await self._hydrate() else last_rebuild + hydrate_backoff
+                while True:
+                    msg = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if msg and msg.get("type") == "message":
+                        data = msg.get("data")
+                        self.mark_revoked(data.decode() if isinstance(data, bytes) else data)
+                    now = time.monotonic()
+                    if now - last_rebuild > self.rebuild_seconds or (
+                        retry_at is not None and now >= retry_at
+                    ):
+                        last_rebuild = now
+                        if await self._hydrate():
+                            retry_at, hydrate_backoff = None, 1.0
+                        else:
+                            # Failed hydrate: retry with backoff, not only at the next rebuild
+                            hydrate_backoff = min(hydrate_backoff * 2, 60.0)
+                            retry_at = now + hydrate_backoff
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._synced = False
+                logger.warning(f"Revocation listener error, retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    @property
+    def synced(self) -> bool:
+        return self._synced
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+_registries: Dict[int, RevocationRegistry] = {}
+
+
+def get_revocation_registry(redis_client: Optional[redis.Redis]) -> RevocationRegistry:
+    """One registry (and one listener) per Redis client per process."""
+    key = id(redis_client)
+    if key not in _registries:
+        _registries[key] = RevocationRegistry(redis_client)
+    return _registries[key]
+
+
+async def start_revocation_listeners() -> None:
+    """Start (and hydrate) every Redis-backed registry before the first request."""
+    for registry in list(_registries.values()):
+        await registry.ensure_started()
+
+
+async def stop_revocation_listeners() -> None:
+    for registry in list(_registries.values()):
+        await registry.stop()
+
+
+async def revoke_token_id(
+    redis_client: Optional[redis.Redis], token: str, ttl: int, reason: str = "revoked"
+) -> str:
+    """Blacklist `token` in Redis, record it for hydration and broadcast it."""
+    tid = token_id(token)
+    get_revocation_registry(redis_client).mark_revoked(tid)
+    if redis_client is None:
+        return tid
+    pipe = redis_client.pipeline()
+    pipe.setex(f"blacklist:{token}", ttl, reason)
+    pipe.zadd(REVOKED_SET_KEY, {tid: time.time() + ttl})
+    pipe.publish(REVOCATION_CHANNEL, tid)
+    await pipe.execute()
+    return tid
@@ -13,6 +13,7 @@ from fastapi import HTTPException, status
 import redis.asyncio as redis
 
 from .config import JWT_DEFAULTS
+from .revocation import revoke_token_id
 
 logger = logging.getLogger("aevorex_finbot_api.middleware.jwt_auth.creator")
 
@@ -100,8 +101,8 @@ class JWTTokenCreator:
 
             # Blacklist old token
             if self.redis_client:
-                await self.redis_client.setex(
-                    f"blacklist:{token}", JWT_DEFAULTS["blacklist_ttl"], "refreshed"
+                await revoke_token_id(
+                    self.redis_client, token, JWT_DEFAULTS["blacklist_ttl"], "refreshed"
                 )
 
             logger.info(f"Token refreshed for user: {payload.get('email', 'unknown')}")
@@ -123,9 +124,7 @@ class JWTTokenCreator:
 
         try:
             # Add token to blacklist
-            await self.redis_client.setex(
-                f"blacklist:{token}", self.token_expiration, "revoked"
-            )
+            await revoke_token_id(self.redis_client, token, self.token_expiration)
 
             # Remove from active sessions
             payload = jwt.decode(
@@ -13,6 +13,7 @@ from fastapi import Request, HTTPException, status
 import redis.asyncio as redis
 
 from .config import REQUIRED_JWT_FIELDS
+from .revocation import get_revocation_registry, revoke_token_id, token_id
 
 logger = logging.getLogger("aevorex_finbot_api.middleware.jwt_auth.validator")
 
@@ -33,6 +34,8 @@ class JWTTokenValidator:
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.redis_client = redis_client
+        self.revocations = get_revocation_registry(redis_client)
+        self.claims_cache = self.revocations.claims_cache
 
     async def extract_token(self, request: Request) -> str:
         """
@@ -63,17 +66,37 @@ class JWTTokenValidator:
     async def validate_token(self, token: str) -> Dict[str, Any]:
         """
         Validate JWT token and return user data
+
+        Fast path: verified claims are served from the in-process cache and
+        Redis is only consulted when the revocation Bloom filter reports a
+        (possible) hit or has not been synced yet.
         """
-        try:
-            # Check if token is blacklisted
-            if self.redis_client:
+        tid = token_id(token)
+        await self.revocations.ensure_started()
+
+        if self.redis_client and (
+            not self.revocations.synced or self.revocations.might_be_revoked(tid)
+        ):
+            # Check if token is blacklisted (authoritative)
+            try:
                 is_blacklisted = await self.redis_client.get(f"blacklist:{token}")
-                if is_blacklisted:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token has been revoked",
-                    )
+            except Exception as e:
+                # Redis down: a synced filter's positive stays revoked (fail
+                # closed); without a filter fail open like is_token_blacklisted
+                logger.error(f"Error checking token blacklist: {str(e)}")
+                is_blacklisted = self.revocations.synced
+            if is_blacklisted:
+                self.claims_cache.evict(tid)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token has been revoked",
+                )
 
+        cached = self.claims_cache.get(tid)
+        if cached is not None:
+            return cached
+
+        try:
             # Decode and validate token
             payload = jwt.decode(
                 token,  # PyJWT v2+ handles string tokens directly
@@ -98,6 +121,7 @@ class JWTTokenValidator:
                     )
 
             logger.debug(f"Token validated for user: {payload.get('email', 'unknown')}")
+            self.claims_cache.put(tid, payload)
             return payload
 
         except jwt.ExpiredSignatureError:
@@ -133,7 +157,7 @@ class JWTTokenValidator:
             return False
 
         try:
-            await self.redis_client.setex(f"blacklist:{token}", ttl, "revoked")
+            await revoke_token_id(self.redis_client, token, ttl)
             logger.info("Token blacklisted successfully")
             return True
         except Exception as e:
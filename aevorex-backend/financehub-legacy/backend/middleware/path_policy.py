@@ -0,0 +1,301 @@
+"""
+Path Policy Engine
+==================
+
+One lookup answers every per-path question the request pipeline asks:
+
+- `exempt`        – skip the pipeline entirely (health, metrics, docs)
+- `public`        – no bearer token required
+- `limit/window`  – rate limit
+- `plan`          – minimum subscription plan (None = any)
+- `cache_control` – default `Cache-Control` header (None = leave as is)
+
+Rules are (exact path | path prefix) → attribute. They are compiled into a
+radix tree whose edges are matched with `str.startswith`, and every
+attribute is resolved independently by longest match (exact beats prefix).
+Results are memoized per path.
+
+The compiled-in defaults come from the JWT and rate-limiter configuration.
+`FINBOT_PATH_POLICY_FILE` may point to a JSON file with overrides; it is
+re-read when its mtime changes, so limits can change without a redeploy. The
+mtime is checked at most every `FINBOT_PATH_POLICY_RELOAD_SECONDS`, on the IO
+executor – a lookup never touches the filesystem:
+
+    {
+      "rate_limits": {"/api/v1/stock/": [200, 60]},
+      "public": ["/api/v1/status"],
+      "public_prefixes": ["/api/v1/public/"],
+      "exempt": ["/healthz"],
+      "plans": {"/api/v1/stock/premium/": "pro"},
+      "cache_control": {"/api/v1/macro/": "public, max-age=60"}
+    }
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .jwt_auth.config import PUBLIC_ENDPOINTS, PUBLIC_PREFIXES
+from .rate_limiter.config import EXEMPT_ENDPOINTS, RATE_LIMIT_RULES
+
+logger = logging.getLogger("aevorex_finbot_api.middleware.path_policy")
+
+POLICY_FILE_ENV = "FINBOT_PATH_POLICY_FILE"
+RELOAD_SECONDS = float(os.getenv("FINBOT_PATH_POLICY_RELOAD_SECONDS", "5"))
+
+EXEMPT_PREFIXES: Tuple[str, ...] = ("/docs", "/redoc")
+
+# Minimum plan per path prefix (enforced by the request pipeline)
+PLAN_RULES: Dict[str, str] = {}
+
+# Default Cache-Control per path prefix (only set when the route did not)
+CACHE_RULES: Dict[str, str] = {}
+
+_POLICY_MEMO_SIZE = 8192
+
+
+class PathPolicy:
+    """Resolved per-path policy."""
+
+    __slots__ = ("exempt", "public", "limit", "window", "plan", "cache_control")
+
+    def __init__(
+        self,
+        exempt: bool = False,
+        public: bool = False,
+        limit: int = 1000,
+        window: int = 60,
+        plan: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ):
+        self.exempt = exempt
+        self.public = public
+        self.limit = limit
+        self.window = window
+        self.plan = plan
+        self.cache_control = cache_control
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"PathPolicy({fields})"
+
+
+class _Node:
+    __slots__ = ("label", "children", "prefix", "exact")
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.children: Dict[str, "_Node"] = {}
+        self.prefix: Dict[str, Any] = {}  # attrs for paths under this node
+        self.exact: Dict[str, Any] = {}  # attrs for exactly this path
+
+
+class PathPolicyTrie:
+    """Radix tree of path rules (edges are string fragments)."""
+
+    def __init__(self):
+        self.root = _Node()
+
+    def insert(self, path: str, attr: str, value: Any, exact: bool = False) -> None:
+        node = self.root
+        rest = path
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                child = _Node(rest)
+                node.children[rest[0]] = child
+                node = child
+                break
+            label = child.label
+            common = 0
+            limit = min(len(label), len(rest))
+            while common < limit and label[common] == rest[common]:
+                common += 1
+            if common < len(label):
+                # Split the edge at the divergence point
+                mid = _Node(label[:common])
+                child.label = label[common:]
+                mid.children[child.label[0]] = child
+                node.children[rest[0]] = mid
+                child = mid
+            node = child
+            rest = rest[common:]
+        (node.exact if exact else node.prefix)[attr] = value
+
+    def resolve(self, path: str) -> Dict[str, Any]:
+        """Longest-match value per attribute for `path`."""
+        found: Dict[str, Any] = dict(self.root.prefix)
+        node = self.root
+        pos = 0
+        end = len(path)
+        while pos < end:
+            child = node.children.get(path[pos])
+            if child is None or not path.startswith(child.label, pos):
+                break
+            pos += len(child.label)
+            node = child
+            if node.prefix:
+                found.update(node.prefix)
+        if pos == end and node.exact:
+            found.update(node.exact)
+        return found
+
+
+def _compile(overrides: Dict[str, Any]) -> Tuple[PathPolicyTrie, Tuple[int, int]]:
+    trie = PathPolicyTrie()
+
+    rate_rules = dict(RATE_LIMIT_RULES)
+    for path, value in (overrides.get("rate_limits") or {}).items():
+        rate_rules[path] = (int(value[0]), int(value[1]))
+    default_rate = rate_rules.pop("default")
+    for path, limits in rate_rules.items():
+        # Rules have always applied to the exact path and everything under it
+        trie.insert(path, "rate", tuple(limits))
+
+    def add_all(paths: Iterable[str], attr: str, value: Any, exact: bool) -> None:
+        for p in paths:
+            trie.insert(p, attr, value, exact=exact)
+
+    add_all(PUBLIC_ENDPOINTS, "public", True, exact=True)
+    add_all(PUBLIC_PREFIXES, "public", True, exact=False)
+    add_all(overrides.get("public") or (), "public", True, exact=True)
+    add_all(overrides.get("public_prefixes") or (), "public", True, exact=False)
+
+    add_all(EXEMPT_ENDPOINTS, "exempt", True, exact=True)
+    add_all(EXEMPT_PREFIXES, "exempt", True, exact=False)
+    add_all(overrides.get("exempt") or (), "exempt", True, exact=True)
+
+    for path, plan in {**PLAN_RULES, **(overrides.get("plans") or {})}.items():
+        trie.insert(path, "plan", str(plan).lower() if plan else None)
+    for path, value in {**CACHE_RULES, **(overrides.get("cache_control") or {})}.items():
+        trie.insert(path, "cache_control", value or None)
+
+    return trie, (int(default_rate[0]), int(default_rate[1]))
+
+
+class PathPolicyEngine:
+    """Compiled, memoized and hot-reloadable path policy lookup."""
+
+    def __init__(
+        self, policy_file: Optional[str] = None, reload_seconds: float = RELOAD_SECONDS
+    ):
+        self.policy_file = policy_file if policy_file is not None else os.getenv(POLICY_FILE_ENV)
+        self.reload_seconds = reload_seconds
+        self._mtime: Optional[float] = None
+        self._next_check = time.monotonic() + reload_seconds
+        self._check_task: Optional[asyncio.Task] = None
+        self.version = 0
+        try:
+            overrides = self._read_overrides()
+        except Exception as e:
+            logger.error(f"Invalid path policy file {self.policy_file}, using defaults: {e}")
+            overrides = {}
+        self._build(overrides)
+
+    def _read_overrides(self) -> Dict[str, Any]:
+        if not self.policy_file:
+            return {}
+        try:
+            self._mtime = os.stat(self.policy_file).st_mtime
+            with open(self.policy_file, "r", encoding="utf-8") as fh:
+                return json.load(fh) or {}
+        except FileNotFoundError:
+            self._mtime = None
+            return {}
+
+    def _build(self, overrides: Dict[str, Any]) -> None:
+        trie, default_rate = _compile(overrides)
+        # One assignment – lookups (and memo writes) never mix two tables
+        self._table: Tuple[PathPolicyTrie, Tuple[int, int], Dict[str, PathPolicy]] = (
+            trie,
+            default_rate,
+            {},
+        )
+        self.version += 1
+
+    def reload(self) -> bool:
+        """Re-read the override file and recompile. Returns False on error."""
+        try:
+            self._build(self._read_overrides())
+        except Exception as e:
+            logger.error(f"Path policy reload failed, keeping previous table: {e}")
+            return False
+        logger.info(f"Path policy table reloaded (version {self.version})")
+        return True
+
+    def _maybe_reload(self) -> None:
+        try:
+            mtime = os.stat(self.policy_file).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self.reload()
+
+    def _schedule_check(self, now: float) -> None:
+        self._next_check = now + self.reload_seconds
+        if self._check_task is not None and not self._check_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._maybe_reload()  # no loop (scripts) – blocking is fine here
+            return
+        from backend.core.performance.executors import IO, run_blocking
+
+        self._check_task = loop.create_task(run_blocking(IO, self._maybe_reload))
+
+    def lookup(self, path: str) -> PathPolicy:
+        if self.policy_file:
+            now = time.monotonic()
+            if now >= self._next_check:
+                self._schedule_check(now)
+
+        trie, default_rate, memo = self._table
+        policy = memo.get(path)
+        if policy is not None:
+            return policy
+
+        attrs = trie.resolve(path)
+        limit, window = attrs.get("rate", default_rate)
+        policy = PathPolicy(
+            exempt=bool(attrs.get("exempt")),
+            public=bool(attrs.get("public")),
+            limit=limit,
+            window=window,
+            plan=attrs.get("plan"),
+            cache_control=attrs.get("cache_control"),
+        )
+        if len(memo) >= _POLICY_MEMO_SIZE:
+            memo.clear()  # parameterised paths – keep it bounded
+        memo[path] = policy
+        return policy
+
+    def describe(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Flattened rule list (debug / admin views)."""
+        rules: List[Tuple[str, Dict[str, Any]]] = []
+
+        def walk(node: _Node, prefix: str) -> None:
+            path = prefix + node.label
+            if node.prefix:
+                rules.append((path + "*", dict(node.prefix)))
+            if node.exact:
+                rules.append((path, dict(node.exact)))
+            for child in node.children.values():
+                walk(child, path)
+
+        walk(self._table[0].root, "")
+        return sorted(rules)
+
+
+_engine: Optional[PathPolicyEngine] = None
+
+
+def get_path_policy_engine() -> PathPolicyEngine:
+    """Process-wide engine (compiled on first use, i.e. at startup)."""
+    global _engine
+    if _engine is None:
+        _engine = PathPolicyEngine()
+    return _engine
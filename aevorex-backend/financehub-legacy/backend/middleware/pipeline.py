@@ -0,0 +1,348 @@
+"""
+Request Pipeline Middleware
+===========================
+
+Single pure-ASGI layer that replaces the stacked `BaseHTTPMiddleware`
+classes (JWT auth, rate limiting, timing). Pure ASGI means no extra task and
+no response-stream wrapper per request, so SSE backpressure reaches the
+client socket unchanged.
+
+Per request:
+1. one `PathPolicyEngine` lookup (exempt? public? limit? plan? caching?),
+2. exempt paths (`/health`, `/metrics`, ...) are handed to the app directly
+   (only the security headers are added),
+3. if `RATE_LIMIT_ENABLED`, the local rate limiter decides (no Redis round
+   trip) before any token work, so failed authentication is limited too: a token whose claims are
+   already cached counts against its user, anything else against the IP,
+4. non-public paths validate the bearer token (claims cache fast path),
+5. plan-gated paths check the cached entitlement,
+6. security / rate-limit / cache / timing headers are added on
+   `http.response.start`.
+
+Non-exempt requests also get a trace (`core.metrics.tracing`); its finished
+phases are returned in `Server-Timing` and the trace id in `X-Trace-Id`.
+"""
+
+import json
+import logging
+import time
+from typing import List, Optional, Tuple
+
+import redis.asyncio as redis
+from fastapi import HTTPException, status
+
+from ..core.metrics.tracing import end_trace, span, start_trace
+from .jwt_auth.config import SECURITY_HEADERS
+from .jwt_auth.revocation import token_id
+from .jwt_auth.token_validator import JWTTokenValidator
+from .path_policy import PathPolicyEngine, get_path_policy_engine
+from .rate_limiter.limiter import HybridRateLimiter
+
+logger = logging.getLogger("aevorex_finbot_api.middleware.pipeline")
+
+_CORS_FALLBACK_HEADERS = (
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"GET, POST, PUT, DELETE, OPTIONS"),
+    (b"access-control-allow-headers", b"Authorization, Content-Type"),
+)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers") or ():
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _client_identifier(scope, user: Optional[dict]) -> str:
+    """Same identity rules as the rate limiter config (user, then IP)."""
+    if user and user.get("user_id"):
+        return f"user:{user['user_id']}"
+    forwarded_for = _header(scope, b"x-forwarded-for")
+    if forwarded_for:
+        return f"ip:{forwarded_for.split(',')[0].strip()}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def _base_headers(message, security_headers) -> Tuple[List[Tuple[bytes, bytes]], set]:
+    """Response headers plus the security / CORS fallback headers every
+    response got from the old stack; also returns the names already present."""
+    headers = list(message.get("headers") or ())
+    present = {k.lower() for k, _ in headers}
+    headers.extend(security_headers)
+    # CORSMiddleware answers for allowed origins; keep the old permissive
+    # defaults only where it did not
+    headers.extend(h for h in _CORS_FALLBACK_HEADERS if h[0] not in present)
+    return headers, present
+
+
+async def _send_json(send, status_code: int, content: dict, headers=()) -> None:
+    body = json.dumps(content).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def _tracing_settings():
+    try:
+        from ..config import settings
+
+        return settings.TRACING
+    except Exception:  # pragma: no cover – config not loadable (benchmarks)
+        return None
+
+
+class RequestPipelineMiddleware:
+    """
+    Pure-ASGI auth + rate-limit + timing middleware
+    """
+
+    def __init__(
+        self,
+        app,
+        secret_key: str,
+        redis_client: Optional[redis.Redis] = None,
+        algorithm: str = "HS256",
+        policies: Optional[PathPolicyEngine] = None,
+        enable_rate_limit: bool = False,
+        enable_tracing: Optional[bool] = None,
+    ):
+        self.app = app
+        self.validator = JWTTokenValidator(
+            secret_key=secret_key, algorithm=algorithm, redis_client=redis_client
+        )
+        self.limiter = HybridRateLimiter(redis_client) if enable_rate_limit else None
+        self.policies = policies or get_path_policy_engine()
+        tracing = _tracing_settings()
+        self.tracing = (
+            bool(tracing and tracing.ENABLED) if enable_tracing is None else enable_tracing
+        )
+        self.server_timing = bool(tracing.SERVER_TIMING) if tracing else True
+        self._security_headers = [
+            (k.lower().encode("latin-1"), v.encode("latin-1"))
+            for k, v in SECURITY_HEADERS.items()
+        ]
+        logger.info("Request pipeline middleware initialized")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        policy = self.policies.lookup(path)
+        if policy.exempt:
+            security_headers = self._security_headers
+
+            async def send_with_security_headers(message):
+                if message["type"] == "http.response.start":
+                    headers, _ = _base_headers(message, security_headers)
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_security_headers)
+            return
+
+        if not self.tracing:
+            await self._handle(scope, receive, send, path, policy, None)
+            return
+        trace, trace_token = start_trace("request", _header(scope, b"traceparent"))
+        trace.root.set(**{"http.method": scope.get("method", ""), "http.target": path})
+        try:
+            await self._handle(scope, receive, send, path, policy, trace)
+        finally:
+            end_trace(trace, trace_token)
+
+    async def _handle(self, scope, receive, send, path, policy, trace) -> None:
+        start = time.perf_counter()
+        extra_headers: List[Tuple[bytes, bytes]] = []
+
+        if self.limiter is not None:
+            allowed, remaining, reset_time = self.limiter.consume(
+                _client_identifier(scope, self._cached_user(scope)), policy.limit, policy.window
+            )
+            rate_headers = [
+                (b"x-ratelimit-limit", str(policy.limit).encode()),
+                (b"x-ratelimit-remaining", str(remaining).encode()),
+                (b"x-ratelimit-reset", str(reset_time).encode()),
+                (b"x-ratelimit-window", str(policy.window).encode()),
+            ]
+            if not allowed:
+                retry_after = max(1, reset_time - int(time.time()))
+                logger.warning(f"Rate limit exceeded on {path}")
+                await _send_json(
+                    send,
+                    status.HTTP_429_TOO_MANY_REQUESTS,
+                    {
+                        "detail": "Rate limit exceeded",
+                        "limit": policy.limit,
+                        "window": policy.window,
+                        "retry_after": retry_after,
+                    },
+                    [*rate_headers, (b"retry-after", str(retry_after).encode())],
+                )
+                return
+            extra_headers.extend(rate_headers)
+
+        user = None
+        if not policy.public or policy.plan:
+            try:
+                token = self._bearer_token(scope)
+                with span("auth"):
+                    user = await self.validator.validate_token(token)
+            except HTTPException as e:
+                logger.warning(f"Authentication failed for {path}: {e.detail}")
+                await _send_json(
+                    send,
+                    e.status_code,
+                    {"detail": e.detail, "authenticated": False},
+                    self._security_headers,
+                )
+                return
+            except Exception as e:
+                logger.error(f"Unexpected error in request pipeline auth: {str(e)}")
+                await _send_json(
+                    send,
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    {"detail": "Internal authentication error"},
+                )
+                return
+            state = scope.setdefault("state", {})
+            state["user"] = user
+            state["token"] = token
+
+        if policy.plan:
+            with span("auth.plan"):
+                plan_allowed = await self._plan_allows(user, policy.plan)
+        if policy.plan and not plan_allowed:
+            await _send_json(
+                send,
+                status.HTTP_402_PAYMENT_REQUIRED,
+                {"detail": f"Plan {policy.plan} or higher required"},
+                self._security_headers,
+            )
+            return
+
+        security_headers = self._security_headers
+        server_timing = self.server_timing
+        cache_control = (
+            (b"cache-control", policy.cache_control.encode("latin-1"))
+            if policy.cache_control
+            else None
+        )
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers, present = _base_headers(message, security_headers)
+                headers.extend(extra_headers)
+                if cache_control and b"cache-control" not in present:
+                    headers.append(cache_control)
+                headers.append(
+                    (b"x-process-time", f"{time.perf_counter() - start:.4f}".encode())
+                )
+                if trace is not None:
+                    trace.root.set(**{"http.status_code": message.get("status", 0)})
+                    headers.append((b"x-trace-id", trace.trace_id.encode()))
+                    if server_timing:
+                        headers.append(
+                            (b"server-timing", trace.server_timing().encode("latin-1"))
+                        )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    async def _plan_allows(user: Optional[dict], required: str) -> bool:
+        """Check the user's plan through the (cached) subscription lookup."""
+        from ..models.subscription import SubscriptionPlan, plan_allows
+        from .subscription_middleware import get_subscription_middleware
+
+        try:
+            required_plan = SubscriptionPlan(required)
+        except ValueError:
+            logger.error(f"Unknown plan '{required}' in path policy – denying")
+            return False
+        if not user or not user.get("user_id"):
+            return False
+        middleware = get_subscription_middleware()
+        try:
+            user_with_sub = await middleware.get_user_subscription(str(user["user_id"]))
+        except Exception as e:
+            logger.error(f"Plan check failed: {str(e)}")
+            return False
+        return bool(
+            user_with_sub
+            and user_with_sub.has_active_subscription
+            and plan_allows(user_with_sub.plan, required_plan)
+        )
+
+    def _cached_user(self, scope) -> Optional[dict]:
+        """Claims of an already verified bearer token (no validation work)."""
+        authorization = _header(scope, b"authorization")
+        if not authorization:
+            return None
+        scheme, _, token = authorization.partition(" ")
+        if not token or scheme.lower() != "bearer":
+            return None
+        return self.validator.claims_cache.get(token_id(token))
+
+    @staticmethod
+    def _bearer_token(scope) -> str:
+        authorization = _header(scope, b"authorization")
+        if not authorization:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Authorization header missing",
+            )
+        scheme, _, token = authorization.partition(" ")
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authorization header format",
+            )
+        if scheme.lower() != "bearer":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authorization scheme",
+            )
+        return token
+
+
+def create_request_pipeline(
+    app,
+    secret_key: str,
+    redis_url: Optional[str] = None,
+    algorithm: str = "HS256",
+    enable_redis: bool = True,
+    enable_rate_limit: bool = False,
+) -> RequestPipelineMiddleware:
+    """
+    Factory used with `app.add_middleware` (mirrors `create_jwt_middleware`)
+    """
+    redis_client = None
+    if enable_redis and redis_url:
+        try:
+            redis_client = redis.from_url(redis_url)
+            logger.info("Redis client configured for request pipeline")
+        except Exception as e:
+            logger.warning(f"Failed to configure Redis for request pipeline: {str(e)}")
+            redis_client = None
+
+    return RequestPipelineMiddleware(
+        app=app,
+        secret_key=secret_key,
+        redis_client=redis_client,
+        algorithm=algorithm,
+        enable_rate_limit=enable_rate_limit,
+    )
@@ -0,0 +1,166 @@
+"""
+In-process benchmark: legacy middleware stack vs. the pure-ASGI pipeline.
+
+    python -m backend.middleware.pipeline_benchmark --requests 5000
+
+Both stacks wrap the same trivial Starlette app and are driven through
+`httpx.ASGITransport` (no sockets), so the numbers isolate middleware
+overhead. Scenarios: an exempt path (`/health`), a public path and an
+authenticated path with a valid bearer token. Redis is not used.
+
+"before" is exactly the previous `create_app` stack: `JWTAuthMiddleware`
+(outermost) around the pass-through `DeprecatedRouteMonitorMiddleware` (as a
+`BaseHTTPMiddleware`). "after" is the pipeline as `create_app` registers it
+by default (rate limiting off, see `RATE_LIMIT_ENABLED`); `--rate-limit`
+adds an "after+rl" run with the limiter on (limits lifted, no 429s).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+import httpx
+import jwt
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from backend.middleware.jwt_auth.middleware import JWTAuthMiddleware
+from backend.middleware.pipeline import RequestPipelineMiddleware
+
+SECRET = "benchmark-secret"
+SCENARIOS = {
+    "exempt": "/health",
+    "public": "/api/v1/macro/ecb/rates",
+    "authenticated": "/api/v1/stock/premium/AAPL",
+}
+
+
+class _PassThrough(BaseHTTPMiddleware):
+    """The old no-op DeprecatedRouteMonitorMiddleware."""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+@dataclass
+class BenchResult:
+    stack: str
+    scenario: str
+    requests: int
+    seconds: float
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+def _app() -> Starlette:
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    return Starlette(
+        routes=[
+            Route("/health", ok),
+            Route("/api/v1/macro/ecb/rates", ok),
+            Route("/api/v1/stock/premium/{ticker}", ok),
+        ]
+    )
+
+
+def build_before():
+    # Same nesting as the old add_middleware order (JWT outermost)
+    return JWTAuthMiddleware(_PassThrough(_app()), secret_key=SECRET)
+
+
+def build_after():
+    return RequestPipelineMiddleware(_app(), secret_key=SECRET)
+
+
+def build_after_rate_limited():
+    return RequestPipelineMiddleware(_app(), secret_key=SECRET, enable_rate_limit=True)
+
+
+def _token() -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"user_id": "bench", "email": "bench@example.com", "iat": now, "exp": now + 3600},
+        SECRET,
+        algorithm="HS256",
+    )
+
+
+async def _run(asgi_app, path: str, requests: int, concurrency: int, headers) -> float:
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm-up (claims cache, policy memo, ...)
+        for _ in range(20):
+            await client.get(path, headers=headers)
+
+        per_worker = max(1, requests // concurrency)
+
+        async def worker():
+            for _ in range(per_worker):
+                resp = await client.get(path, headers=headers)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"{path} → {resp.status_code}: {resp.text}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+
+async def benchmark(
+    requests: int, concurrency: int, rate_limit: bool = False
+) -> list[BenchResult]:
+    stacks = [("before", build_before), ("after", build_after)]
+    if rate_limit:
+        _raise_limits()
+        stacks.append(("after+rl", build_after_rate_limited))
+    headers = {"Authorization": f"Bearer {_token()}", "X-Forwarded-For": "10.0.0.1"}
+    results = []
+    for scenario, path in SCENARIOS.items():
+        for name, factory in stacks:
+            seconds = await _run(factory(), path, requests, concurrency, headers)
+            results.append(
+                BenchResult(name, scenario, (requests // concurrency) * concurrency, seconds)
+            )
+    return results
+
+
+def _raise_limits() -> None:
+    """Lift every rate limit so throughput, not 429s, is measured."""
+    from backend.middleware.rate_limiter.config import RATE_LIMIT_RULES
+
+    for key, (_, window) in list(RATE_LIMIT_RULES.items()):
+        RATE_LIMIT_RULES[key] = (10**9, window)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="also run the pipeline with rate limiting on"
+    )
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(benchmark(args.requests, args.concurrency, args.rate_limit))
+    print(f"{'scenario':<15}{'stack':<10}{'req/s':>10}")
+    by_key = {(r.scenario, r.stack): r for r in results}
+    stacks = list(dict.fromkeys(r.stack for r in results))
+    for scenario in SCENARIOS:
+        for stack in stacks:
+            r = by_key[(scenario, stack)]
+            print(f"{scenario:<15}{stack:<10}{r.rps:>10.0f}")
+        before, after = by_key[(scenario, "before")], by_key[(scenario, "after")]
+        if before.rps:
+            print(f"{'':<15}{'gain':<10}{after.rps / before.rps:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,17 @@
 Rate Limiting Middleware for FinanceHub
 =======================================
 
-Modular rate limiting system with Redis sliding window implementation.
+Modular rate limiting system: local GCRA decisions with Redis counter sync.
 """
 
 from .middleware import RateLimiterMiddleware
-from .limiter import SlidingWindowLimiter
+from .limiter import HybridRateLimiter, SlidingWindowLimiter
 from .config import RATE_LIMIT_RULES, DEFAULT_LIMITS
 from .factory import create_rate_limiter
 
 __all__ = [
     "RateLimiterMiddleware",
+    "HybridRateLimiter",
     "SlidingWindowLimiter",
     "RATE_LIMIT_RULES",
     "DEFAULT_LIMITS",
@@ -34,6 +34,13 @@ DEFAULT_LIMITS = {
     "burst": 50,  # burst allowance
 }
 
+# Local limiter state is reconciled with Redis on this interval (one INCRBY
+# per active client); it bounds how far workers can overshoot a shared limit
+SYNC_INTERVAL_SECONDS = 1.0
+
+# Upper bound on per-process limiter state (LRU-evicted beyond this)
+MAX_TRACKED_CLIENTS = 100_000
+
 # Rate limit headers to include in responses
 RATE_LIMIT_HEADERS = {
     "X-RateLimit-Limit": "limit",
@@ -43,38 +50,39 @@ RATE_LIMIT_HEADERS = {
 }
 
 # Exempt endpoints from rate limiting
-EXEMPT_ENDPOINTS = {"/api/v1/health", "/docs", "/openapi.json", "/redoc", "/metrics"}
+EXEMPT_ENDPOINTS = {
+    "/api/v1/health",
+    "/health",
+    "/ping",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/metrics",
+}
 
 
 def get_rate_limit_for_path(path: str) -> Tuple[int, int]:
     """
     Get rate limit configuration for a specific path
 
+    Resolved by the compiled path policy engine (longest matching rule).
+
     Returns:
         Tuple of (requests_per_window, window_seconds)
     """
-    # Check for exact matches first
-    if path in RATE_LIMIT_RULES:
-        return RATE_LIMIT_RULES[path]
-
-    # Check for prefix matches
-    for pattern, limits in RATE_LIMIT_RULES.items():
-        if pattern != "default" and path.startswith(pattern):
-            return limits
+    from ..path_policy import get_path_policy_engine
 
-    # Return default limits
-    return RATE_LIMIT_RULES["default"]
+    policy = get_path_policy_engine().lookup(path)
+    return policy.limit, policy.window
 
 
 def is_exempt_endpoint(path: str) -> bool:
     """
     Check if endpoint is exempt from rate limiting
     """
-    return (
-        path in EXEMPT_ENDPOINTS
-        or path.startswith("/docs")
-        or path.startswith("/redoc")
-    )
+    from ..path_policy import get_path_policy_engine
+
+    return get_path_policy_engine().lookup(path).exempt
 
 
 def get_client_identifier(request) -> str:
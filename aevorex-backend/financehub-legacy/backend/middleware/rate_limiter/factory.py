@@ -10,7 +10,7 @@ from typing import Optional
 import redis.asyncio as redis
 
 from .middleware import RateLimiterMiddleware
-from .limiter import SlidingWindowLimiter
+from .limiter import HybridRateLimiter
 
 logger = logging.getLogger("aevorex_finbot_api.middleware.rate_limiter.factory")
 
@@ -47,19 +47,19 @@ def create_rate_limiter(
 
 def create_sliding_window_limiter(
     redis_client: Optional[redis.Redis] = None,
-) -> SlidingWindowLimiter:
+) -> HybridRateLimiter:
     """
-    Factory function to create sliding window limiter
+    Factory function to create the (hybrid GCRA) window limiter
 
     Args:
         redis_client: Redis client instance (optional)
 
     Returns:
-        Configured SlidingWindowLimiter instance
+        Configured HybridRateLimiter instance
     """
-    limiter = SlidingWindowLimiter(redis_client=redis_client)
+    limiter = HybridRateLimiter(redis_client=redis_client)
 
-    logger.info("Sliding window limiter created successfully")
+    logger.info("Hybrid rate limiter created successfully")
     return limiter
 
 
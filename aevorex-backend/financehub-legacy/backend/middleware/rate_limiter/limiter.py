@@ -1,62 +1,101 @@
 """
-Sliding Window Rate Limiter
-===========================
-
-Redis-based sliding window rate limiter implementation.
+Hybrid GCRA Rate Limiter
+========================
+
+Per-process GCRA (generic cell rate algorithm) decides every request
+locally – no Redis round trip on the request path. Consumption is
+reconciled with the other workers in the background:
+
+- each process accumulates the requests it admitted per client,
+- every `sync_interval` it flushes them with one `INCRBY` per client into a
+  fixed-size counter `rate_limit:{client}:{window}:{window_index}`,
+- the counter value returned by `INCRBY` tells the process how much budget
+  the *other* workers consumed, which is charged to its local GCRA state.
+
+Redis therefore holds one integer per client per window (instead of one
+sorted-set member per request), and an unavailable Redis only means the
+limit is enforced per process.
 """
 
-import time
+import asyncio
 import logging
+import math
+import time
+from collections import OrderedDict
 from typing import Optional, Tuple
+
 import redis.asyncio as redis
 
+from .config import MAX_TRACKED_CLIENTS, SYNC_INTERVAL_SECONDS
+
 logger = logging.getLogger("aevorex_finbot_api.middleware.rate_limiter.limiter")
 
 
-class SlidingWindowLimiter:
-    """
-    Redis-based sliding window rate limiter
+class _BucketState:
+    """GCRA state plus the reconciliation bookkeeping for one client/window."""
+
+    __slots__ = ("tat", "window_index", "local_count", "pending", "remote_count")
+
+    def __init__(self, window_index: int):
+        self.tat = 0.0  # theoretical arrival time
+        self.window_index = window_index
+        self.local_count = 0  # admitted by this process in the window
+        self.pending = 0  # admitted but not yet flushed to Redis
+        self.remote_count = 0  # consumed by other processes (last sync)
 
-    Uses Redis sorted sets to implement a sliding window counter.
+
+class HybridRateLimiter:
+    """
+    Local GCRA rate limiter with asynchronous Redis reconciliation
     """
 
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        sync_interval: float = SYNC_INTERVAL_SECONDS,
+        max_clients: int = MAX_TRACKED_CLIENTS,
+    ):
         self.redis_client = redis_client
-        self.script_sha = None
-
-        # Lua script for atomic sliding window operations
-        self.lua_script = """
-        local key = KEYS[1]
-        local window = tonumber(ARGV[1])
-        local limit = tonumber(ARGV[2])
-        local now = tonumber(ARGV[3])
-        local ttl = tonumber(ARGV[4])
-        
-        -- Remove expired entries
-        redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
-        
-        -- Count current entries
-        local current = redis.call('ZCARD', key)
-        
-        if current < limit then
-            -- Add current request
-            redis.call('ZADD', key, now, now)
-            -- Set expiration
-            redis.call('EXPIRE', key, ttl)
-            return {1, limit - current - 1, now + window}
-        else
-            -- Rate limit exceeded
-            local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
-            local reset_time = oldest[2] and (oldest[2] + window) or (now + window)
-            return {0, 0, reset_time}
-        end
-        """
+        self.sync_interval = sync_interval
+        self.max_clients = max_clients
+        self._states: "OrderedDict[Tuple[str, int, int], _BucketState]" = OrderedDict()
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def _state(self, identifier: str, limit: int, window: int, now: float) -> _BucketState:
+        key = (identifier, limit, window)
+        window_index = int(now // window)
+        state = self._states.get(key)
+        if state is None:
+            state = _BucketState(window_index)
+            self._states[key] = state
+            while len(self._states) > self.max_clients:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(key)
+            if state.window_index != window_index:
+                # New fixed window: unflushed usage of the old one is moot
+                state.window_index = window_index
+                state.local_count = 0
+                state.pending = 0
+                state.remote_count = 0
+        return state
+
+    def _ensure_sync_task(self) -> None:
+        if self.redis_client is None:
+            return
+        if self._sync_task is None or self._sync_task.done():
+            try:
+                self._sync_task = asyncio.get_running_loop().create_task(
+                    self._sync_loop()
+                )
+            except RuntimeError:
+                pass  # no running loop (sync context) – stay local-only
 
     async def check_rate_limit(
         self, identifier: str, limit: int, window: int
     ) -> Tuple[bool, int, int]:
         """
-        Check if request is within rate limit
+        Check if request is within rate limit (decided locally)
 
         Args:
             identifier: Client identifier (user ID or IP)
@@ -66,79 +105,111 @@ class SlidingWindowLimiter:
         Returns:
             Tuple of (allowed, remaining, reset_time)
         """
-        if not self.redis_client:
-            # If Redis is not available, allow all requests
-            logger.warning("Redis not available for rate limiting, allowing request")
-            return True, limit - 1, int(time.time()) + window
-
+        return self.consume(identifier, limit, window)
+
+    def consume(self, identifier: str, limit: int, window: int) -> Tuple[bool, int, int]:
+        """Synchronous core of `check_rate_limit`."""
+        self._ensure_sync_task()
+        now = time.time()
+        limit = max(1, limit)
+        interval = window / limit  # emission interval
+        state = self._state(identifier, limit, window, now)
+
+        tat = max(state.tat, now)
+        new_tat = tat + interval
+        if new_tat - now > window:
+            # Budget exhausted – next cell is admitted once tat - window passes
+            return False, 0, int(math.ceil(tat - window + interval))
+
+        state.tat = new_tat
+        state.local_count += 1
+        state.pending += 1
+        remaining = int((window - (new_tat - now)) // interval)
+        return True, max(0, remaining), int(math.ceil(new_tat))
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Rate limit sync failed: {str(e)}")
+
+    async def sync(self) -> None:
+        """Flush pending consumption (one INCRBY per client) and apply remote usage."""
+        if self.redis_client is None:
+            return
+        now = time.time()
+        batch = []
+        for key, state in list(self._states.items()):
+            window = key[2]
+            if state.pending or state.tat > now:
+                # INCRBY 0 for active clients still picks up remote usage
+                batch.append((key, state, state.pending, state.window_index))
+                state.pending = 0
+            elif state.tat < now and state.window_index != int(now // window):
+                # Idle and fully replenished – forget it
+                self._states.pop(key, None)
+        if not batch:
+            return
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for (identifier, _limit, window), _state, pending, window_index in batch:
+            counter = f"rate_limit:{identifier}:{window}:{window_index}"
+            pipe.incrby(counter, pending)
+            pipe.expire(counter, window * 2)
         try:
-            now = int(time.time() * 1000)  # Use milliseconds for precision
-            key = f"rate_limit:{identifier}"
-            ttl = window + 60  # Keep data slightly longer than window
-
-            # Load script if not already loaded
-            if not self.script_sha:
-                self.script_sha = await self.redis_client.script_load(self.lua_script)
-
-            # Execute atomic sliding window check
-            result = await self.redis_client.evalsha(
-                self.script_sha,
-                1,
-                key,
-                window * 1000,  # Convert to milliseconds
-                limit,
-                now,
-                ttl,
-            )
-
-            allowed = bool(result[0])
-            remaining = int(result[1])
-            reset_time = int(result[2] / 1000)  # Convert back to seconds
-
-            if not allowed:
-                logger.info(
-                    f"Rate limit exceeded for {identifier}: {limit} requests per {window}s"
-                )
-
-            return allowed, remaining, reset_time
-
-        except Exception as e:
-            logger.error(f"Error checking rate limit: {str(e)}")
-            # On error, allow the request to avoid blocking legitimate traffic
-            return True, limit - 1, int(time.time()) + window
+            results = await pipe.execute()
+        except Exception:
+            # Put the budget back so it is flushed on the next attempt
+            for _key, state, pending, window_index in batch:
+                if state.window_index == window_index:
+                    state.pending += pending
+            raise
+
+        for i, ((_identifier, limit, window), state, _pending, window_index) in enumerate(
+            batch
+        ):
+            if state.window_index != window_index:
+                continue
+            global_count = int(results[i * 2])
+            # Requests admitted locally since the flush are not in global_count yet
+            remote = max(0, global_count - (state.local_count - state.pending))
+            delta = remote - state.remote_count
+            if delta > 0:
+                state.tat = max(state.tat, time.time()) + delta * (window / max(1, limit))
+                state.remote_count = remote
 
     async def get_current_usage(self, identifier: str, window: int) -> int:
         """
-        Get current usage count for identifier
+        Get current usage count (local + last known remote) for identifier
         """
-        if not self.redis_client:
-            return 0
-
-        try:
-            now = int(time.time() * 1000)
-            key = f"rate_limit:{identifier}"
-
-            # Remove expired entries
-            await self.redis_client.zremrangebyscore(key, 0, now - (window * 1000))
-
-            # Get current count
-            count = await self.redis_client.zcard(key)
-            return count
-
-        except Exception as e:
-            logger.error(f"Error getting rate limit usage: {str(e)}")
-            return 0
+        return sum(
+            state.local_count + state.remote_count
+            for (ident, _limit, win), state in self._states.items()
+            if ident == identifier and win == window
+        )
 
     async def reset_limit(self, identifier: str) -> bool:
         """
         Reset rate limit for identifier
         """
+        keys = [k for k in self._states if k[0] == identifier]
+        for key in keys:
+            self._states.pop(key, None)
         if not self.redis_client:
-            return False
+            return bool(keys)
 
         try:
-            key = f"rate_limit:{identifier}"
-            await self.redis_client.delete(key)
+            now = time.time()
+            counters = [
+                f"rate_limit:{identifier}:{window}:{int(now // window)}"
+                for _ident, _limit, window in keys
+            ]
+            if counters:
+                await self.redis_client.delete(*counters)
             logger.info(f"Rate limit reset for {identifier}")
             return True
 
@@ -150,26 +221,26 @@ class SlidingWindowLimiter:
         """
         Get rate limiter statistics
         """
-        if not self.redis_client:
-            return {"active_limits": 0, "redis_available": False}
-
+        return {
+            "active_limits": len(self._states),
+            "redis_available": self.redis_client is not None,
+            "pending_sync": sum(s.pending for s in self._states.values()),
+            "sync_interval": self.sync_interval,
+        }
+
+    async def close(self) -> None:
+        """Flush outstanding consumption and stop the sync task."""
+        if self._sync_task and not self._sync_task.done():
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
         try:
-            # Get all rate limit keys
-            keys = await self.redis_client.keys("rate_limit:*")
-
-            stats = {
-                "active_limits": len(keys),
-                "redis_available": True,
-                "total_requests_tracked": 0,
-            }
-
-            # Count total requests being tracked
-            for key in keys:
-                count = await self.redis_client.zcard(key)
-                stats["total_requests_tracked"] += count
+            await self.sync()
+        except Exception as e:
+            logger.warning(f"Final rate limit sync failed: {str(e)}")
 
-            return stats
 
-        except Exception as e:
-            logger.error(f"Error getting rate limiter stats: {str(e)}")
-            return {"active_limits": 0, "redis_available": False, "error": str(e)}
+# Backwards-compatible name (the limiter used to be a Redis sorted-set window)
+SlidingWindowLimiter = HybridRateLimiter
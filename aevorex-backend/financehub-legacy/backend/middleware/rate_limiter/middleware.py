@@ -2,7 +2,8 @@
 Rate Limiter Middleware
 =======================
 
-FastAPI middleware for rate limiting using sliding window algorithm.
+FastAPI middleware for rate limiting using a local GCRA limiter with
+background Redis reconciliation.
 """
 
 import time
@@ -14,7 +15,7 @@ from starlette.responses import JSONResponse
 import redis.asyncio as redis
 
 from .config import get_rate_limit_for_path, is_exempt_endpoint, get_client_identifier
-from .limiter import SlidingWindowLimiter
+from .limiter import HybridRateLimiter
 
 logger = logging.getLogger("aevorex_finbot_api.middleware.rate_limiter")
 
@@ -23,13 +24,13 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
     """
     Rate Limiting Middleware
 
-    Implements sliding window rate limiting with Redis backend.
+    Decides locally (GCRA) and reconciles usage with Redis in the background.
     """
 
     def __init__(self, app, redis_client: Optional[redis.Redis] = None):
         super().__init__(app)
         self.redis_client = redis_client
-        self.limiter = SlidingWindowLimiter(redis_client)
+        self.limiter = HybridRateLimiter(redis_client)
 
         logger.info("Rate Limiter Middleware initialized")
 
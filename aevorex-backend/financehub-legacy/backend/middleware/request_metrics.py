@@ -0,0 +1,77 @@
+"""
+Request Metrics Middleware
+==========================
+
+Outermost pure-ASGI layer that records `fh_http_requests_total` /
+`fh_http_request_duration_seconds` by method, route template and status,
+plus the in-flight gauge (see `core.metrics.service_metrics`). It also binds
+the ASGI scope to the request task so the loop stall detector can name the
+route of a blocking task (`core.metrics.loop_diagnostics`).
+
+The route label is the matched path template (`/api/v1/stock/{ticker}`),
+which Starlette leaves in `scope["route"]` after routing. Unmatched paths
+and requests answered before routing (401 / 429 / preflight) share fixed
+labels so scanners cannot blow up label cardinality.
+"""
+
+import time
+
+from ..core.metrics import SERVICE_METRICS
+from ..core.metrics.loop_diagnostics import get_loop_stall_detector
+from ..core.metrics.service_metrics import REJECTED_ROUTE, UNMATCHED_ROUTE
+
+_SKIPPED_PATHS = frozenset({"/metrics"})
+
+
+def _route_template(scope, status_code: int) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template:
+        return template
+    # Mounted sub-apps (static files, proxies) only leave root_path behind
+    if scope.get("root_path"):
+        return scope["root_path"]
+    # Answered before routing (auth / rate limit / CORS preflight)
+    return UNMATCHED_ROUTE if status_code == 404 else REJECTED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure-ASGI request counter / latency histogram
+    """
+
+    def __init__(self, app, metrics=SERVICE_METRICS, stall_detector=None):
+        self.app = app
+        self.metrics = metrics
+        self.stall_detector = stall_detector or get_loop_stall_detector()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in _SKIPPED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stall_detector = self.stall_detector if self.stall_detector.running else None
+        if stall_detector is not None:
+            stall_detector.bind_request(scope)
+        self.metrics.http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.http_in_flight.dec()
+            if stall_detector is not None:
+                stall_detector.unbind_request()
+            self.metrics.observe_http_request(
+                scope.get("method", ""),
+                _route_template(scope, status_code),
+                status_code,
+                time.perf_counter() - start,
+            )
@@ -13,9 +13,11 @@ from ..models.subscription import (
     SubscriptionPlan,
     UserWithSubscription,
     SubscriptionCheckResponse,
+    plan_allows,
 )
 from .jwt_auth.deps import get_current_user
 from ..core.services.subscription_service import SubscriptionService
+from ..core.services.entitlement_cache import get_entitlement_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +31,14 @@ class SubscriptionMiddleware:
     async def get_user_subscription(
         self, user_id: str
     ) -> Optional[UserWithSubscription]:
-        """Get user with subscription information."""
+        """Get user with subscription information (via the entitlement cache)."""
         if not self.subscription_service:
             from ..core.services.subscription_service import get_subscription_service
 
             self.subscription_service = await get_subscription_service()
-        return await self.subscription_service.get_user_with_subscription(user_id)
+        return await get_entitlement_cache().get_or_load(
+            str(user_id), self.subscription_service.get_user_with_subscription
+        )
 
     def require_active_subscription(
         self, min_plan: SubscriptionPlan = SubscriptionPlan.FREE
@@ -122,17 +126,7 @@ class SubscriptionMiddleware:
         self, user_plan: SubscriptionPlan, required_plan: SubscriptionPlan
     ) -> bool:
         """Check if user plan has access to required plan level."""
-        plan_hierarchy = {
-            SubscriptionPlan.FREE: 0,
-            SubscriptionPlan.PRO: 1,
-            SubscriptionPlan.TEAM: 2,
-            SubscriptionPlan.ENTERPRISE: 3,
-        }
-
-        user_level = plan_hierarchy.get(user_plan, 0)
-        required_level = plan_hierarchy.get(required_plan, 0)
-
-        return user_level >= required_level
+        return plan_allows(user_plan, required_plan)
 
     async def check_subscription_status(
         self, user_id: str
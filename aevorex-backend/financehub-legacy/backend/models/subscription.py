@@ -35,6 +35,20 @@ class SubscriptionPlan(str, Enum):
     ENTERPRISE = "enterprise"
 
 
+# Plan order used for "plan X or higher" checks
+PLAN_LEVELS = {
+    SubscriptionPlan.FREE: 0,
+    SubscriptionPlan.PRO: 1,
+    SubscriptionPlan.TEAM: 2,
+    SubscriptionPlan.ENTERPRISE: 3,
+}
+
+
+def plan_allows(user_plan: SubscriptionPlan, required_plan: SubscriptionPlan) -> bool:
+    """Check if `user_plan` has access to the `required_plan` level."""
+    return PLAN_LEVELS.get(user_plan, 0) >= PLAN_LEVELS.get(required_plan, 0)
+
+
 class PaymentProvider(str, Enum):
     """Supported payment providers."""
 
@@ -13,6 +13,8 @@ import os
 import os
 
 _CACHE_MODE = os.getenv("FINANCEHUB_CACHE_MODE", "memory").lower().strip()  # Default to memory for MCP testing
+# True when a real Redis server backs the cache (and may be shared by other components)
+REDIS_MODE = _CACHE_MODE != "memory"
 
 if _CACHE_MODE == "memory":
     # ---------------------------------------------------------------------
@@ -20,6 +22,7 @@ if _CACHE_MODE == "memory":
     # ---------------------------------------------------------------------
 
     from typing import Any
+    from backend.core.metrics import SERVICE_METRICS
     from backend.utils.logger_config import get_logger
     logger = get_logger(__name__)
 
@@ -35,6 +38,14 @@ if _CACHE_MODE == "memory":
             self._store: dict[str, tuple[Any, float]] = {}  # (value, expiry_timestamp)
 
         async def get(self, key: str):
+            started = time.perf_counter()
+            value = self._lookup(key)
+            SERVICE_METRICS.observe_cache_get(
+                key, value, time.perf_counter() - started, "memory"
+            )
+            return value
+
+        def _lookup(self, key: str):
             if key not in self._store:
                 return None
             
@@ -60,6 +71,16 @@ if _CACHE_MODE == "memory":
         async def exists(self, key: str):
             return bool(key in self._store)
 
+        async def get_many(self, keys: list[str]) -> list:
+            """Batch get – mirrors Redis MGET (None for missing/expired keys)."""
+            return [await self.get(k) for k in keys]
+
+        async def set_many(self, mapping: dict, ttl: int = 300) -> bool:
+            """Batch set – mirrors the Redis pipelined SETEX (one TTL for all keys)."""
+            for key, value in mapping.items():
+                await self.set(key, value, ttl=ttl)
+            return True
+
         async def close(self):  # noqa: D401
             self._store.clear()
 
@@ -97,6 +118,7 @@ else:
     # ---------------------------------------------------------------------
     import redis.asyncio as redis
     from redis.exceptions import ConnectionError
+    from backend.core.metrics import SERVICE_METRICS
     from backend.utils.logger_config import get_logger
     logger = get_logger(__name__)
 
@@ -372,7 +394,11 @@ else:
                 if not self.redis_client:
                     return None
 
+                started = time.perf_counter()
                 result_str: str | None = await self.redis_client.get(key)
+                SERVICE_METRICS.observe_cache_get(
+                    key, result_str, time.perf_counter() - started, "redis"
+                )
                 return result_str
 
             except Exception as e:
@@ -405,7 +431,11 @@ else:
                 else:
                     value_str = str(value)
 
+                started = time.perf_counter()
                 await self.redis_client.setex(key, ttl, value_str)
+                SERVICE_METRICS.observe_cache_set(
+                    key, len(value_str), time.perf_counter() - started, "redis"
+                )
                 return True
 
             except Exception as e:
@@ -428,6 +458,55 @@ else:
                     )
                 return False
 
+        async def get_many(self, keys: list[str]) -> list[Optional[str]]:
+            """Batch get via a single MGET round trip (None for missing keys)."""
+            if not keys:
+                return []
+            try:
+                await self._ensure_connection()
+                if not self.redis_client:
+                    return [None] * len(keys)
+                started = time.perf_counter()
+                values = list(await self.redis_client.mget(keys))
+                elapsed = time.perf_counter() - started
+                SERVICE_METRICS.observe_cache_op("mget", elapsed, "redis")
+                for key, value in zip(keys, values):
+                    SERVICE_METRICS.observe_cache_get(key, value, None, "redis")
+                return values
+            except Exception as e:
+                logger.error(
+                    f"[CacheService(Redis)] [MGET:{len(keys)} keys] Error: {e}"
+                )
+                return [None] * len(keys)
+
+        async def set_many(
+            self, mapping: dict[str, Union[str, dict, list]], ttl: Optional[int] = None
+        ) -> bool:
+            """Batch set via one pipelined SETEX round trip (same TTL for every key)."""
+            if not mapping:
+                return True
+            try:
+                await self._ensure_connection()
+                if not self.redis_client:
+                    return False
+                ttl = ttl or self.default_ttl
+                started = time.perf_counter()
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value in mapping.items():
+                    if isinstance(value, (dict, list)):
+                        value = json.dumps(value, ensure_ascii=False)
+                    pipe.setex(key, ttl, str(value))
+                await pipe.execute()
+                SERVICE_METRICS.observe_cache_op(
+                    "mset", time.perf_counter() - started, "redis"
+                )
+                return True
+            except Exception as e:
+                logger.error(
+                    f"[CacheService(Redis)] [MSET:{len(mapping)} keys] Error: {e}"
+                )
+                return False
+
         async def delete(self, key: str) -> bool:
             """Delete key from Redis"""
             try: